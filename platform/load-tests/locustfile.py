@@ -17,6 +17,7 @@ Usage:
 Test Scenarios:
     - TestAPIGateway: General API gateway health and routing
     - TestDataLayer: L01 data layer operations (CRUD)
+    - TestDataLayerReadReplicas: L01 read-heavy mix for read-replica routing
     - TestTaskExecution: L03 task execution workflows
     - TestModelGateway: L04 model gateway LLM requests
     - TestFullUserJourney: End-to-end user workflows
@@ -448,6 +449,80 @@ class ToolExecutionTasks(TaskSet):
             name="GET /api/v1/tools/:name"
         )
 
+class ReadReplicaTasks(TaskSet):
+    """
+    Task set for L01 read-replica routing: 10 reads per write.
+
+    Reads after a write send back the X-Write-LSN token as X-Min-LSN, the
+    way L01Client does, so they exercise the read-your-writes path.
+    """
+
+    def on_start(self):
+        """Initialize goal tracking and the read-your-writes token."""
+        self.goal_ids = []
+        self.write_lsn = None
+
+    def _read_headers(self) -> Dict[str, str]:
+        return {"X-Min-LSN": self.write_lsn} if self.write_lsn else {}
+
+    @task(1)
+    def create_goal(self):
+        """Create a goal on the primary."""
+        payload = {
+            "goal_id": fake.uuid4(),
+            "agent_did": f"did:agent:{fake.uuid4()}",
+            "goal_text": random.choice(SAMPLE_TASKS),
+        }
+        with self.client.post(
+            "/goals/",
+            json=payload,
+            name="POST /goals/",
+            catch_response=True
+        ) as response:
+            if response.status_code == 201:
+                self.goal_ids.append(payload["goal_id"])
+                self.write_lsn = response.headers.get("X-Write-LSN", self.write_lsn)
+                response.success()
+            else:
+                response.failure(f"Failed to create goal: {response.status_code}")
+
+    @task(3)
+    def read_own_goal(self):
+        """Read back a goal this user wrote (read-your-writes)."""
+        if self.goal_ids:
+            self.client.get(
+                f"/goals/{random.choice(self.goal_ids[-20:])}",
+                headers=self._read_headers(),
+                name="GET /goals/:id"
+            )
+
+    @task(2)
+    def list_goals(self):
+        """List recent goals (lag-tolerant read)."""
+        self.client.get("/goals/", params={"limit": 50}, name="GET /goals/")
+
+    @task(2)
+    def list_agents(self):
+        """List agents (lag-tolerant read)."""
+        self.client.get("/agents/", params={"limit": 50}, name="GET /agents/")
+
+    @task(2)
+    def metric_aggregates(self):
+        """Aggregate a metric (rollup scan)."""
+        self.client.get(
+            "/metrics/aggregates/request_latency_ms",
+            name="GET /metrics/aggregates/:name"
+        )
+
+    @task(1)
+    def query_metrics(self):
+        """Page through raw metric points."""
+        self.client.get(
+            "/metrics/",
+            params={"metric_name": "request_latency_ms", "limit": 500},
+            name="GET /metrics/"
+        )
+
 # ============================================================================
 # User Classes for Different Load Test Scenarios
 # ============================================================================
@@ -537,6 +612,29 @@ class TestToolExecution(HttpUser):
             "Authorization": f"Bearer {TEST_API_KEY}"
         })
 
+class TestDataLayerReadReplicas(HttpUser):
+    """
+    Test L01 read-replica routing under a read-heavy load.
+
+    Run against L01 directly, once without and once with
+    POSTGRES_REPLICA_URLS set, and compare primary CPU
+    (pg_stat_activity / host metrics) and GET latencies between the two
+    runs. GET /health/replicas shows how many reads replicas served and
+    how many fell back to the primary for lag or read-your-writes:
+
+        locust -f locustfile.py --host=http://localhost:8001 TestDataLayerReadReplicas \\
+            --users 200 --spawn-rate 20 --run-time 5m --headless
+    """
+    tasks = [ReadReplicaTasks]
+    wait_time = between(0.5, 1.5)
+    weight = 1
+
+    def on_start(self):
+        """Set up authentication headers for all requests."""
+        self.client.headers.update({
+            "Authorization": f"Bearer {TEST_API_KEY}"
+        })
+
 class TestFullUserJourney(HttpUser):
     """
     Test complete user journey end-to-end.
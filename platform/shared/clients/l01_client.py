@@ -9,16 +9,21 @@ from typing import Dict, Any, List, Optional
 from uuid import UUID
 import logging
 
+from ..wire import WireClient, decode_response
+
 logger = logging.getLogger(__name__)
 
 
 class L01Client:
     """Client for L01 Data Layer API."""
 
-    def __init__(self, base_url: str = "http://localhost:8002", timeout: float = 30.0, api_key: Optional[str] = None):
+    def __init__(self, base_url: str = "http://localhost:8002", timeout: float = 30.0, api_key: Optional[str] = None,
+                 wire_format: Optional[str] = None, limits: Optional[httpx.Limits] = None):
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.api_key = api_key
+        self.wire_format = wire_format
+        self.limits = limits
         self._client = None
 
     async def _get_client(self) -> httpx.AsyncClient:
@@ -27,10 +32,12 @@ class L01Client:
             headers = {}
             if self.api_key:
                 headers["X-API-Key"] = self.api_key
-            self._client = httpx.AsyncClient(
+            self._client = WireClient(
                 base_url=self.base_url,
                 timeout=self.timeout,
-                headers=headers
+                headers=headers,
+                wire_format=self.wire_format,
+                limits=self.limits
             )
         return self._client
 
@@ -53,14 +60,14 @@ class L01Client:
             "metadata": metadata or {},
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_agent(self, agent_id: UUID) -> Dict[str, Any]:
         """Get agent by ID."""
         client = await self._get_client()
         response = await client.get(f"/agents/{agent_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_agents(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
         """List agents."""
@@ -70,14 +77,14 @@ class L01Client:
             params["status"] = status
         response = await client.get("/agents/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_agent(self, agent_id: UUID, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update agent."""
         client = await self._get_client()
         response = await client.patch(f"/agents/{agent_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def delete_agent(self, agent_id: UUID) -> bool:
         """Delete agent."""
@@ -99,7 +106,7 @@ class L01Client:
             "metadata": metadata or {},
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def query_events(self, aggregate_id: Optional[UUID] = None,
                           event_type: Optional[str] = None,
@@ -113,7 +120,7 @@ class L01Client:
             params["event_type"] = event_type
         response = await client.get("/events/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Tool methods
     async def register_tool(self, name: str, schema_def: Dict[str, Any],
@@ -128,21 +135,21 @@ class L01Client:
             "schema_def": schema_def,
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_tool(self, tool_id: UUID) -> Dict[str, Any]:
         """Get tool by ID."""
         client = await self._get_client()
         response = await client.get(f"/tools/{tool_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_tools(self, enabled_only: bool = False) -> List[Dict[str, Any]]:
         """List tools."""
         client = await self._get_client()
         response = await client.get("/tools/", params={"enabled_only": enabled_only})
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_tool_execution(
         self,
@@ -201,14 +208,14 @@ class L01Client:
 
         response = await client.post("/tools/tool-executions", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_tool_execution_by_invocation(self, invocation_id: UUID) -> Dict[str, Any]:
         """Get tool execution by invocation ID."""
         client = await self._get_client()
         response = await client.get(f"/tools/executions/by-invocation/{invocation_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_tool_execution(
         self,
@@ -268,7 +275,7 @@ class L01Client:
 
         response = await client.patch(f"/tools/executions/{invocation_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_tool_executions(
         self,
@@ -296,7 +303,7 @@ class L01Client:
 
         response = await client.get("/tools/executions", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Goal methods
     async def create_goal(self, agent_id: UUID, description: str,
@@ -311,21 +318,21 @@ class L01Client:
             "priority": priority,
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_goal(self, goal_id: UUID) -> Dict[str, Any]:
         """Get goal by ID."""
         client = await self._get_client()
         response = await client.get(f"/goals/{goal_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_goal(self, goal_id: UUID, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update goal."""
         client = await self._get_client()
         response = await client.patch(f"/goals/{goal_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_goals(self, agent_id: Optional[UUID] = None, limit: int = 100) -> List[Dict[str, Any]]:
         """List goals, optionally filtered by agent_id."""
@@ -335,7 +342,7 @@ class L01Client:
             params["agent_id"] = str(agent_id)
         response = await client.get("/goals/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Plan methods
     async def create_plan(self, goal_id: UUID, agent_id: UUID,
@@ -350,21 +357,21 @@ class L01Client:
             "steps": steps,
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_plan(self, plan_id: UUID) -> Dict[str, Any]:
         """Get plan by ID."""
         client = await self._get_client()
         response = await client.get(f"/plans/{plan_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_plan(self, plan_id: UUID, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update plan."""
         client = await self._get_client()
         response = await client.patch(f"/plans/{plan_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Task methods
     async def create_task(self, plan_id: UUID, agent_id: UUID,
@@ -380,14 +387,14 @@ class L01Client:
             "input_data": input_data or {},
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_task(self, task_id: UUID, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update task."""
         client = await self._get_client()
         response = await client.patch(f"/plans/tasks/{task_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Evaluation methods
     async def record_evaluation(self, agent_id: UUID, evaluation_type: str,
@@ -408,14 +415,14 @@ class L01Client:
             payload["task_id"] = str(task_id)
         response = await client.post("/evaluations/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_agent_stats(self, agent_id: UUID) -> Dict[str, Any]:
         """Get agent evaluation statistics."""
         client = await self._get_client()
         response = await client.get(f"/evaluations/agent/{agent_id}/stats")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Feedback methods
     async def record_feedback(self, agent_id: UUID, feedback_type: str,
@@ -435,14 +442,14 @@ class L01Client:
             payload["task_id"] = str(task_id)
         response = await client.post("/feedback/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_unprocessed_feedback(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get unprocessed feedback."""
         client = await self._get_client()
         response = await client.get("/feedback/unprocessed", params={"limit": limit})
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Model usage methods
     async def record_model_usage(
@@ -513,7 +520,7 @@ class L01Client:
 
         response = await client.post("/models/usage", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # L05 Planning methods
     async def record_goal(
@@ -552,7 +559,7 @@ class L01Client:
 
         response = await client.post("/goals/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_goal_status(
         self,
@@ -569,7 +576,7 @@ class L01Client:
 
         response = await client.patch(f"/goals/{goal_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_plan(
         self,
@@ -622,7 +629,7 @@ class L01Client:
 
         response = await client.post("/plans/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_plan_status(
         self,
@@ -660,14 +667,14 @@ class L01Client:
 
         response = await client.patch(f"/plans/{plan_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_plan(self, plan_id: str) -> Dict[str, Any]:
         """Get plan by ID."""
         client = await self._get_client()
         response = await client.get(f"/plans/{plan_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Config methods
     async def get_config(self, namespace: str, key: str) -> Dict[str, Any]:
@@ -675,14 +682,14 @@ class L01Client:
         client = await self._get_client()
         response = await client.get(f"/config/{namespace}/{key}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def set_config(self, namespace: str, key: str, value: Dict[str, Any]) -> Dict[str, Any]:
         """Set configuration."""
         client = await self._get_client()
         response = await client.put(f"/config/{namespace}/{key}", json=value)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Session methods
     async def create_session(
@@ -703,14 +710,14 @@ class L01Client:
             "runtime_metadata": runtime_metadata or {},
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_session(self, session_id: UUID) -> Dict[str, Any]:
         """Get session by ID."""
         client = await self._get_client()
         response = await client.get(f"/sessions/{session_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_session(
         self,
@@ -734,7 +741,7 @@ class L01Client:
 
         response = await client.patch(f"/sessions/{session_id}", json=update_data)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_sessions(
         self,
@@ -748,7 +755,7 @@ class L01Client:
             params["agent_id"] = str(agent_id)
         response = await client.get("/sessions/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Training Example methods (L07 Learning)
     async def create_training_example(
@@ -789,14 +796,14 @@ class L01Client:
             "metadata": metadata or {},
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_training_example(self, example_id: UUID) -> Dict[str, Any]:
         """Get training example by ID."""
         client = await self._get_client()
         response = await client.get(f"/training-examples/{example_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_training_examples(
         self,
@@ -820,7 +827,7 @@ class L01Client:
             params["source_type"] = source_type
         response = await client.get("/training-examples/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_training_example(
         self,
@@ -831,7 +838,7 @@ class L01Client:
         client = await self._get_client()
         response = await client.patch(f"/training-examples/{example_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def delete_training_example(self, example_id: UUID) -> bool:
         """Delete training example."""
@@ -844,7 +851,7 @@ class L01Client:
         client = await self._get_client()
         response = await client.get("/training-examples/statistics")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Dataset methods (L07 Learning)
     async def create_dataset(
@@ -867,14 +874,14 @@ class L01Client:
             "statistics": statistics or {},
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_dataset(self, dataset_id: UUID) -> Dict[str, Any]:
         """Get dataset by ID."""
         client = await self._get_client()
         response = await client.get(f"/datasets/{dataset_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_datasets(
         self,
@@ -892,7 +899,7 @@ class L01Client:
             params["tag_filter"] = tag_filter
         response = await client.get("/datasets/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_dataset(
         self,
@@ -903,7 +910,7 @@ class L01Client:
         client = await self._get_client()
         response = await client.patch(f"/datasets/{dataset_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def delete_dataset(self, dataset_id: UUID) -> bool:
         """Delete dataset."""
@@ -924,7 +931,7 @@ class L01Client:
             params={"split": split}
         )
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def remove_example_from_dataset(
         self,
@@ -948,21 +955,21 @@ class L01Client:
             params["split"] = split
         response = await client.get(f"/datasets/{dataset_id}/examples", params=params)
         response.raise_for_status()
-        return [UUID(id_str) for id_str in response.json()]
+        return [UUID(id_str) for id_str in decode_response(response)]
 
     async def get_dataset_split_counts(self, dataset_id: UUID) -> Dict[str, int]:
         """Get count of examples in each split."""
         client = await self._get_client()
         response = await client.get(f"/datasets/{dataset_id}/split-counts")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_dataset_statistics(self) -> Dict[str, Any]:
         """Get dataset service statistics."""
         client = await self._get_client()
         response = await client.get("/datasets/statistics")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # L06 Evaluation methods
 
@@ -1001,14 +1008,14 @@ class L01Client:
 
         response = await client.post("/quality-scores/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_quality_score(self, score_id: str) -> Dict[str, Any]:
         """Get quality score by ID."""
         client = await self._get_client()
         response = await client.get(f"/quality-scores/{score_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_metric(
         self,
@@ -1038,7 +1045,7 @@ class L01Client:
 
         response = await client.post("/metrics/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def query_metrics(
         self,
@@ -1068,7 +1075,7 @@ class L01Client:
 
         response = await client.get("/metrics/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_anomaly(
         self,
@@ -1114,14 +1121,14 @@ class L01Client:
 
         response = await client.post("/anomalies/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_anomaly(self, anomaly_id: str) -> Dict[str, Any]:
         """Get anomaly by ID."""
         client = await self._get_client()
         response = await client.get(f"/anomalies/{anomaly_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_anomaly_status(
         self,
@@ -1144,7 +1151,7 @@ class L01Client:
 
         response = await client.patch(f"/anomalies/{anomaly_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_compliance_result(
         self,
@@ -1177,14 +1184,14 @@ class L01Client:
 
         response = await client.post("/compliance-results/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_compliance_result(self, result_id: str) -> Dict[str, Any]:
         """Get compliance result by ID."""
         client = await self._get_client()
         response = await client.get(f"/compliance-results/{result_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_alert(
         self,
@@ -1223,7 +1230,7 @@ class L01Client:
 
         response = await client.post("/alerts/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_alert_delivery(
         self,
@@ -1245,14 +1252,14 @@ class L01Client:
 
         response = await client.patch(f"/alerts/{alert_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_alert(self, alert_id: str) -> Dict[str, Any]:
         """Get alert by ID."""
         client = await self._get_client()
         response = await client.get(f"/alerts/{alert_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # ===================================================================
     # L09 API Gateway Methods
@@ -1332,7 +1339,7 @@ class L01Client:
 
         response = await client.post("/api-requests/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_authentication_event(
         self,
@@ -1372,7 +1379,7 @@ class L01Client:
 
         response = await client.post("/authentication-events/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_rate_limit_event(
         self,
@@ -1415,7 +1422,7 @@ class L01Client:
 
         response = await client.post("/rate-limit-events/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # ===================================================================
     # L10 Human Interface Methods
@@ -1471,7 +1478,7 @@ class L01Client:
 
         response = await client.post("/user-interactions/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_control_operation(
         self,
@@ -1521,7 +1528,7 @@ class L01Client:
 
         response = await client.post("/control-operations/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_control_operation(
         self,
@@ -1549,7 +1556,7 @@ class L01Client:
 
         response = await client.patch(f"/control-operations/{operation_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # ===================================================================
     # L11 Integration Layer Methods
@@ -1598,7 +1605,7 @@ class L01Client:
 
         response = await client.post("/saga-executions/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_saga_execution(
         self,
@@ -1632,7 +1639,7 @@ class L01Client:
 
         response = await client.patch(f"/saga-executions/{saga_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_saga_step(
         self,
@@ -1683,7 +1690,7 @@ class L01Client:
 
         response = await client.post("/saga-steps/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_saga_step(
         self,
@@ -1720,7 +1727,7 @@ class L01Client:
 
         response = await client.patch(f"/saga-steps/{step_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_circuit_breaker_event(
         self,
@@ -1767,7 +1774,7 @@ class L01Client:
 
         response = await client.post("/circuit-breaker-events/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_service_registry_event(
         self,
@@ -1807,4 +1814,4 @@ class L01Client:
 
         response = await client.post("/service-registry-events/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
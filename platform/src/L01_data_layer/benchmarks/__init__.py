@@ -0,0 +1,6 @@
+"""
+L01 Data Layer - Benchmarks
+
+Standalone benchmark scripts, run with:
+    python -m L01_data_layer.benchmarks.<name> --help
+"""
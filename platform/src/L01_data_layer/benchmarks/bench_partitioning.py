@@ -0,0 +1,155 @@
+"""
+L01 Data Layer - Partitioning Benchmark
+
+Loads the same synthetic metrics into a plain heap table with a btree on
+timestamp and into a daily range-partitioned table with a BRIN index,
+then compares:
+- percentile aggregates over a one-day and a seven-day window
+- retention: DELETE of expired rows vs DROP of expired partitions
+
+Rows are generated server-side with generate_series, spread evenly over
+--days days ending now. Tables are created in a scratch schema that is
+dropped afterwards. Needs a PostgreSQL 12+ server.
+
+Usage:
+    python -m L01_data_layer.benchmarks.bench_partitioning --dsn postgresql://... --rows 10000000
+    python -m L01_data_layer.benchmarks.bench_partitioning --dsn postgresql://... --rows 100000000 --days 60
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import asyncpg
+
+SCHEMA = "l01_bench"
+
+HEAP_TABLE = f"""
+CREATE TABLE {SCHEMA}.metrics_heap (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    metric_name VARCHAR(255) NOT NULL,
+    value DECIMAL(20,6) NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    PRIMARY KEY (id)
+)
+"""
+
+PARTITIONED_TABLE = f"""
+CREATE TABLE {SCHEMA}.metrics_part (
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    metric_name VARCHAR(255) NOT NULL,
+    value DECIMAL(20,6) NOT NULL,
+    timestamp TIMESTAMP NOT NULL,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp)
+"""
+
+LOAD = """
+INSERT INTO {table} (metric_name, value, timestamp)
+SELECT
+    'metric_' || (g % 20),
+    random() * 1000,
+    $1::timestamp + (g * $2::float8) * interval '1 second'
+FROM generate_series(0, $3 - 1) AS g
+"""
+
+AGGREGATE = """
+SELECT metric_name, PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY value)
+FROM {table}
+WHERE timestamp >= $1 AND timestamp < $2
+GROUP BY metric_name
+"""
+
+
+async def timed(conn: asyncpg.Connection, query: str, *args) -> float:
+    """Run a query and return elapsed milliseconds."""
+    start = time.perf_counter()
+    await conn.execute(query, *args)
+    return (time.perf_counter() - start) * 1000
+
+
+async def setup(conn: asyncpg.Connection, rows: int, days: int, start: datetime) -> None:
+    """Create and load both tables."""
+    await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+    await conn.execute(f"CREATE SCHEMA {SCHEMA}")
+    await conn.execute(HEAP_TABLE)
+    await conn.execute(f"CREATE INDEX ON {SCHEMA}.metrics_heap (timestamp)")
+    await conn.execute(PARTITIONED_TABLE)
+    for day in range(days + 1):
+        lower = start + timedelta(days=day)
+        await conn.execute(
+            f"CREATE TABLE {SCHEMA}.metrics_part_p{lower:%Y%m%d} "
+            f"PARTITION OF {SCHEMA}.metrics_part "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{(lower + timedelta(days=1)).isoformat()}')"
+        )
+    await conn.execute(f"CREATE INDEX ON {SCHEMA}.metrics_part USING BRIN (timestamp)")
+
+    seconds_per_row = days * 86400 / rows
+    for table in ("metrics_heap", "metrics_part"):
+        elapsed = await timed(
+            conn, LOAD.format(table=f"{SCHEMA}.{table}"), start, seconds_per_row, rows
+        )
+        await conn.execute(f"VACUUM ANALYZE {SCHEMA}.{table}")
+        print(f"loaded {rows:,} rows into {table} in {elapsed / 1000:.1f}s")
+
+
+async def bench_aggregates(conn: asyncpg.Connection, end: datetime, repeat: int) -> None:
+    """Time the percentile query over trailing windows."""
+    print(f"\n{'query':<22}{'heap ms':>12}{'partitioned ms':>18}")
+    for label, window in (("p95 / 1 day", timedelta(days=1)), ("p95 / 7 days", timedelta(days=7))):
+        lower = end - window
+        results = []
+        for table in ("metrics_heap", "metrics_part"):
+            query = AGGREGATE.format(table=f"{SCHEMA}.{table}")
+            await conn.execute(query, lower, end)  # warm cache
+            samples = [await timed(conn, query, lower, end) for _ in range(repeat)]
+            results.append(sorted(samples)[len(samples) // 2])
+        print(f"{label:<22}{results[0]:>12.1f}{results[1]:>18.1f}")
+
+
+async def bench_retention(conn: asyncpg.Connection, start: datetime, expire_days: int) -> None:
+    """Expire the oldest days by DELETE on the heap and by DROP on the partitions."""
+    cutoff = start + timedelta(days=expire_days)
+    delete_ms = await timed(
+        conn, f"DELETE FROM {SCHEMA}.metrics_heap WHERE timestamp < $1", cutoff
+    )
+
+    drop_ms = 0.0
+    for day in range(expire_days):
+        name = f"{SCHEMA}.metrics_part_p{start + timedelta(days=day):%Y%m%d}"
+        drop_ms += await timed(conn, f"ALTER TABLE {SCHEMA}.metrics_part DETACH PARTITION {name}")
+        drop_ms += await timed(conn, f"DROP TABLE {name}")
+
+    print(f"\nretention of {expire_days} days")
+    print(f"{'heap DELETE':<22}{delete_ms:>12.1f} ms (plus VACUUM to reclaim space)")
+    print(f"{'partition DROP':<22}{drop_ms:>12.1f} ms")
+
+
+async def run(args: argparse.Namespace) -> None:
+    end = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = end - timedelta(days=args.days)
+    conn = await asyncpg.connect(args.dsn)
+    try:
+        await setup(conn, args.rows, args.days, start)
+        await bench_aggregates(conn, end, args.repeat)
+        await bench_retention(conn, start, args.expire_days)
+    finally:
+        if not args.keep:
+            await conn.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        await conn.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dsn", required=True, help="PostgreSQL connection string")
+    parser.add_argument("--rows", type=int, default=10_000_000, help="Rows to load per table")
+    parser.add_argument("--days", type=int, default=30, help="Days the rows are spread over")
+    parser.add_argument("--expire-days", type=int, default=7, help="Oldest days removed by the retention run")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per aggregate query (median reported)")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch schema afterwards")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,41 +5,210 @@ This client provides a typed interface for all other layers to interact with L01
 """
 
 import httpx
-from typing import Dict, Any, List, Optional
-from uuid import UUID
+import json
+from datetime import datetime
+from typing import AsyncIterator, Dict, Any, List, Optional
+from uuid import UUID, uuid4
 import logging
 
+from shared.wire import WireClient, decode_response
+
+from .pagination import NEXT_CURSOR_HEADER, encode_cursor
+from .replicas import MIN_LSN_HEADER, WRITE_LSN_HEADER, parse_lsn
+from .write_buffer import WriteBehindBuffer
+
 logger = logging.getLogger(__name__)
 
+# Single-record endpoints and their bulk counterparts
+BULK_ENDPOINTS = {
+    "/models/usage": "/models/usage/bulk",
+    "/api-requests/": "/api-requests/bulk",
+    "/metrics/": "/metrics/bulk",
+    "/tools/tool-executions": "/tools/tool-executions/bulk",
+    "/saga-steps/": "/saga-steps/bulk",
+}
+
+
+def _is_retryable(error: Exception) -> bool:
+    """Client errors (other than 429) will fail again on retry."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return True
+
 
 class L01Client:
     """Client for L01 Data Layer API."""
 
-    def __init__(self, base_url: str = "http://localhost:8002", timeout: float = 30.0, api_key: Optional[str] = None):
+    def __init__(self, base_url: str = "http://localhost:8002", timeout: float = 30.0, api_key: Optional[str] = None,
+                 write_behind: bool = False, batch_size: int = 500, flush_interval: float = 1.0,
+                 max_pending: int = 10000, wire_format: Optional[str] = None,
+                 limits: Optional[httpx.Limits] = None):
+        """
+        Initialize L01 client.
+
+        Args:
+            base_url: L01 Data Layer URL
+            timeout: Request timeout in seconds
+            api_key: Optional API key
+            write_behind: Buffer model usage, API request, metric, tool
+                execution and saga step records and send them to the bulk
+                endpoints in batches. The record_* methods then return the
+                queued payload instead of the stored row.
+            batch_size: Records per bulk request
+            flush_interval: Seconds between background flushes
+            max_pending: Outstanding records before record_* calls block
+            wire_format: "msgpack" or "json" request/response bodies
+                (default: msgpack when the package is installed)
+            limits: Connection pool limits shared by concurrent calls
+        """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
         self.api_key = api_key
+        self.wire_format = wire_format
+        self.limits = limits
         self._client = None
+        self._last_write_lsn: Optional[str] = None
+        self._write_buffer: Optional[WriteBehindBuffer] = None
+        if write_behind:
+            self._write_buffer = WriteBehindBuffer(
+                self._send_bulk,
+                max_batch_size=batch_size,
+                flush_interval=flush_interval,
+                max_pending=max_pending,
+                is_retryable=_is_retryable,
+            )
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create HTTP client with authentication headers."""
+        """Get or create the pooled HTTP client with authentication headers."""
         if self._client is None:
             headers = {}
             if self.api_key:
                 headers["X-API-Key"] = self.api_key
-            self._client = httpx.AsyncClient(
+            self._client = WireClient(
                 base_url=self.base_url,
                 timeout=self.timeout,
-                headers=headers
+                headers=headers,
+                wire_format=self.wire_format,
+                limits=self.limits,
+                event_hooks={"response": [self._track_write_lsn]}
             )
         return self._client
 
+    async def _track_write_lsn(self, response: httpx.Response) -> None:
+        """
+        Remember the newest write position and send it with every request.
+
+        Keeps reads served by L01 read replicas consistent with this
+        client's own writes.
+        """
+        lsn = response.headers.get(WRITE_LSN_HEADER)
+        if not lsn or parse_lsn(lsn) is None:
+            return
+        if self._last_write_lsn is None or parse_lsn(lsn) > parse_lsn(self._last_write_lsn):
+            self._last_write_lsn = lsn
+            self._client.headers[MIN_LSN_HEADER] = lsn
+
     async def close(self):
-        """Close HTTP client."""
+        """Flush buffered writes and close HTTP client."""
+        if self._write_buffer:
+            await self._write_buffer.close()
         if self._client:
             await self._client.aclose()
             self._client = None
 
+    async def flush(self) -> int:
+        """
+        Send all buffered writes now.
+
+        Returns:
+            Records still buffered because their batch failed
+        """
+        if not self._write_buffer:
+            return 0
+        return await self._write_buffer.flush()
+
+    def get_write_buffer_stats(self) -> Optional[Dict[str, Any]]:
+        """Get write-behind buffer statistics (None when disabled)."""
+        return self._write_buffer.get_stats() if self._write_buffer else None
+
+    async def _write(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a record, or queue it for the bulk endpoint in write-behind mode."""
+        if self._write_buffer:
+            # Stamp the time the record was made, not when its batch lands
+            payload.setdefault("created_at", datetime.utcnow().isoformat())
+            await self._write_buffer.add(BULK_ENDPOINTS[path], payload)
+            return payload
+        client = await self._get_client()
+        response = await client.post(path, json=payload)
+        response.raise_for_status()
+        return decode_response(response)
+
+    async def _send_bulk(self, path: str, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """POST a batch of records to a bulk endpoint."""
+        client = await self._get_client()
+        response = await client.post(path, json=records)
+        response.raise_for_status()
+        return decode_response(response)
+
+    async def paginate(self, path: str, params: Optional[Dict[str, Any]] = None,
+                       page_size: int = 100) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Iterate over every item of a cursor-paginated list endpoint.
+
+        Works with /events/, /tools/executions, /training-examples/,
+        /datasets/ and /metrics/ by following the X-Next-Cursor header.
+        """
+        client = await self._get_client()
+        params = {**(params or {}), "limit": page_size}
+        while True:
+            response = await client.get(path, params=params)
+            response.raise_for_status()
+            for item in decode_response(response):
+                yield item
+            cursor = response.headers.get(NEXT_CURSOR_HEADER)
+            if not cursor:
+                return
+            params["cursor"] = cursor
+
+    async def export_table(self, table: str, start_time: Optional[str] = None,
+                           end_time: Optional[str] = None, cursor: Optional[str] = None,
+                           batch_size: int = 1000, max_retries: int = 3) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Stream every row of a table from the NDJSON export endpoint, oldest first.
+
+        Rows are parsed one line at a time, so memory use is constant. If
+        the connection drops, the export resumes after the last row seen.
+        """
+        client = await self._get_client()
+        time_column = "timestamp" if table in ("metrics", "api_requests") else "created_at"
+        params: Dict[str, Any] = {"batch_size": batch_size}
+        if start_time:
+            params["start_time"] = start_time
+        if end_time:
+            params["end_time"] = end_time
+
+        retries = 0
+        while True:
+            if cursor:
+                params["cursor"] = cursor
+            try:
+                async with client.stream("GET", f"/export/{table}", params=params, timeout=None) as response:
+                    response.raise_for_status()
+                    async for line in response.aiter_lines():
+                        if not line:
+                            continue
+                        row = json.loads(line)
+                        cursor = encode_cursor(datetime.fromisoformat(row[time_column]), row["id"])
+                        retries = 0
+                        yield row
+                return
+            except httpx.TransportError as e:
+                retries += 1
+                if retries > max_retries:
+                    raise
+                logger.warning(f"Export of {table} interrupted ({e}), resuming")
+
     # Agent methods
     async def create_agent(self, name: str, agent_type: str = "general",
                           configuration: Optional[Dict[str, Any]] = None,
@@ -53,14 +222,14 @@ class L01Client:
             "metadata": metadata or {},
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_agent(self, agent_id: UUID) -> Dict[str, Any]:
         """Get agent by ID."""
         client = await self._get_client()
         response = await client.get(f"/agents/{agent_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_agents(self, status: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
         """List agents."""
@@ -70,14 +239,14 @@ class L01Client:
             params["status"] = status
         response = await client.get("/agents/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_agent(self, agent_id: UUID, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update agent."""
         client = await self._get_client()
         response = await client.patch(f"/agents/{agent_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def delete_agent(self, agent_id: UUID) -> bool:
         """Delete agent."""
@@ -88,18 +257,44 @@ class L01Client:
     # Event methods
     async def publish_event(self, event_type: str, aggregate_type: str,
                            aggregate_id: UUID, payload: Dict[str, Any],
-                           metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        """Publish an event."""
+                           metadata: Optional[Dict[str, Any]] = None,
+                           expected_version: Optional[int] = None) -> Dict[str, Any]:
+        """Publish an event.
+
+        With expected_version, the append fails with a 409 HTTPStatusError
+        if the aggregate is no longer at that version.
+        """
         client = await self._get_client()
-        response = await client.post("/events/", json={
+        body = {
             "event_type": event_type,
             "aggregate_type": aggregate_type,
             "aggregate_id": str(aggregate_id),
             "payload": payload,
             "metadata": metadata or {},
-        })
+        }
+        if expected_version is not None:
+            body["expected_version"] = expected_version
+        response = await client.post("/events/", json=body)
+        response.raise_for_status()
+        return decode_response(response)
+
+    async def replay_aggregate(self, aggregate_type: str, aggregate_id: UUID) -> Dict[str, Any]:
+        """Get an aggregate's latest snapshot, the events after it and its current state."""
+        client = await self._get_client()
+        response = await client.get(f"/events/aggregates/{aggregate_type}/{aggregate_id}/replay")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
+
+    async def save_snapshot(self, aggregate_type: str, aggregate_id: UUID,
+                            version: int, state: Dict[str, Any]) -> bool:
+        """Store aggregate state as of version; returns False if a newer snapshot exists."""
+        client = await self._get_client()
+        response = await client.put(
+            f"/events/aggregates/{aggregate_type}/{aggregate_id}/snapshot",
+            json={"version": version, "state": state},
+        )
+        response.raise_for_status()
+        return decode_response(response)["saved"]
 
     async def query_events(self, aggregate_id: Optional[UUID] = None,
                           event_type: Optional[str] = None,
@@ -113,7 +308,7 @@ class L01Client:
             params["event_type"] = event_type
         response = await client.get("/events/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Tool methods
     async def register_tool(self, name: str, schema_def: Dict[str, Any],
@@ -128,21 +323,21 @@ class L01Client:
             "schema_def": schema_def,
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_tool(self, tool_id: UUID) -> Dict[str, Any]:
         """Get tool by ID."""
         client = await self._get_client()
         response = await client.get(f"/tools/{tool_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_tools(self, enabled_only: bool = False) -> List[Dict[str, Any]]:
         """List tools."""
         client = await self._get_client()
         response = await client.get("/tools/", params={"enabled_only": enabled_only})
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_tool_execution(
         self,
@@ -166,7 +361,6 @@ class L01Client:
         timeout_seconds: Optional[int] = None
     ) -> Dict[str, Any]:
         """Record a tool execution with rich metadata."""
-        client = await self._get_client()
         payload = {
             "invocation_id": str(invocation_id),
             "tool_name": tool_name,
@@ -199,16 +393,14 @@ class L01Client:
         if timeout_seconds:
             payload["timeout_seconds"] = timeout_seconds
 
-        response = await client.post("/tools/tool-executions", json=payload)
-        response.raise_for_status()
-        return response.json()
+        return await self._write("/tools/tool-executions", payload)
 
     async def get_tool_execution_by_invocation(self, invocation_id: UUID) -> Dict[str, Any]:
         """Get tool execution by invocation ID."""
         client = await self._get_client()
         response = await client.get(f"/tools/executions/by-invocation/{invocation_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_tool_execution(
         self,
@@ -268,7 +460,7 @@ class L01Client:
 
         response = await client.patch(f"/tools/executions/{invocation_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_tool_executions(
         self,
@@ -296,7 +488,7 @@ class L01Client:
 
         response = await client.get("/tools/executions", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Goal methods
     async def create_goal(self, agent_id: UUID, description: str,
@@ -311,21 +503,21 @@ class L01Client:
             "priority": priority,
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_goal(self, goal_id: UUID) -> Dict[str, Any]:
         """Get goal by ID."""
         client = await self._get_client()
         response = await client.get(f"/goals/{goal_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_goal(self, goal_id: UUID, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update goal."""
         client = await self._get_client()
         response = await client.patch(f"/goals/{goal_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_goals(self, agent_id: Optional[UUID] = None, limit: int = 100) -> List[Dict[str, Any]]:
         """List goals, optionally filtered by agent_id."""
@@ -335,7 +527,7 @@ class L01Client:
             params["agent_id"] = str(agent_id)
         response = await client.get("/goals/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Plan methods
     async def create_plan(self, goal_id: UUID, agent_id: UUID,
@@ -350,21 +542,21 @@ class L01Client:
             "steps": steps,
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_plan(self, plan_id: UUID) -> Dict[str, Any]:
         """Get plan by ID."""
         client = await self._get_client()
         response = await client.get(f"/plans/{plan_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_plan(self, plan_id: UUID, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update plan."""
         client = await self._get_client()
         response = await client.patch(f"/plans/{plan_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Task methods
     async def create_task(self, plan_id: UUID, agent_id: UUID,
@@ -380,14 +572,14 @@ class L01Client:
             "input_data": input_data or {},
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_task(self, task_id: UUID, updates: Dict[str, Any]) -> Dict[str, Any]:
         """Update task."""
         client = await self._get_client()
         response = await client.patch(f"/plans/tasks/{task_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Evaluation methods
     async def record_evaluation(self, agent_id: UUID, evaluation_type: str,
@@ -408,14 +600,14 @@ class L01Client:
             payload["task_id"] = str(task_id)
         response = await client.post("/evaluations/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_agent_stats(self, agent_id: UUID) -> Dict[str, Any]:
         """Get agent evaluation statistics."""
         client = await self._get_client()
         response = await client.get(f"/evaluations/agent/{agent_id}/stats")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Feedback methods
     async def record_feedback(self, agent_id: UUID, feedback_type: str,
@@ -435,14 +627,14 @@ class L01Client:
             payload["task_id"] = str(task_id)
         response = await client.post("/feedback/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_unprocessed_feedback(self, limit: int = 100) -> List[Dict[str, Any]]:
         """Get unprocessed feedback."""
         client = await self._get_client()
         response = await client.get("/feedback/unprocessed", params={"limit": limit})
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Model usage methods
     async def record_model_usage(
@@ -471,8 +663,6 @@ class L01Client:
         metadata: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Record model usage with rich metadata."""
-        client = await self._get_client()
-
         payload = {
             "request_id": request_id,
             "model_provider": model_provider,
@@ -511,9 +701,7 @@ class L01Client:
         if error_message:
             payload["error_message"] = error_message
 
-        response = await client.post("/models/usage", json=payload)
-        response.raise_for_status()
-        return response.json()
+        return await self._write("/models/usage", payload)
 
     # L05 Planning methods
     async def record_goal(
@@ -552,7 +740,7 @@ class L01Client:
 
         response = await client.post("/goals/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_goal_status(
         self,
@@ -569,7 +757,7 @@ class L01Client:
 
         response = await client.patch(f"/goals/{goal_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_plan(
         self,
@@ -622,7 +810,7 @@ class L01Client:
 
         response = await client.post("/plans/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_plan_status(
         self,
@@ -660,14 +848,14 @@ class L01Client:
 
         response = await client.patch(f"/plans/{plan_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_plan(self, plan_id: str) -> Dict[str, Any]:
         """Get plan by ID."""
         client = await self._get_client()
         response = await client.get(f"/plans/{plan_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Config methods
     async def get_config(self, namespace: str, key: str) -> Dict[str, Any]:
@@ -675,14 +863,14 @@ class L01Client:
         client = await self._get_client()
         response = await client.get(f"/config/{namespace}/{key}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def set_config(self, namespace: str, key: str, value: Dict[str, Any]) -> Dict[str, Any]:
         """Set configuration."""
         client = await self._get_client()
         response = await client.put(f"/config/{namespace}/{key}", json=value)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Session methods
     async def create_session(
@@ -703,14 +891,14 @@ class L01Client:
             "runtime_metadata": runtime_metadata or {},
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_session(self, session_id: UUID) -> Dict[str, Any]:
         """Get session by ID."""
         client = await self._get_client()
         response = await client.get(f"/sessions/{session_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_session(
         self,
@@ -734,7 +922,7 @@ class L01Client:
 
         response = await client.patch(f"/sessions/{session_id}", json=update_data)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_sessions(
         self,
@@ -748,7 +936,7 @@ class L01Client:
             params["agent_id"] = str(agent_id)
         response = await client.get("/sessions/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Training Example methods (L07 Learning)
     async def create_training_example(
@@ -789,14 +977,14 @@ class L01Client:
             "metadata": metadata or {},
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_training_example(self, example_id: UUID) -> Dict[str, Any]:
         """Get training example by ID."""
         client = await self._get_client()
         response = await client.get(f"/training-examples/{example_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_training_examples(
         self,
@@ -820,7 +1008,7 @@ class L01Client:
             params["source_type"] = source_type
         response = await client.get("/training-examples/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_training_example(
         self,
@@ -831,7 +1019,7 @@ class L01Client:
         client = await self._get_client()
         response = await client.patch(f"/training-examples/{example_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def delete_training_example(self, example_id: UUID) -> bool:
         """Delete training example."""
@@ -844,7 +1032,7 @@ class L01Client:
         client = await self._get_client()
         response = await client.get("/training-examples/statistics")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # Dataset methods (L07 Learning)
     async def create_dataset(
@@ -867,14 +1055,14 @@ class L01Client:
             "statistics": statistics or {},
         })
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_dataset(self, dataset_id: UUID) -> Dict[str, Any]:
         """Get dataset by ID."""
         client = await self._get_client()
         response = await client.get(f"/datasets/{dataset_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def list_datasets(
         self,
@@ -892,7 +1080,7 @@ class L01Client:
             params["tag_filter"] = tag_filter
         response = await client.get("/datasets/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_dataset(
         self,
@@ -903,7 +1091,7 @@ class L01Client:
         client = await self._get_client()
         response = await client.patch(f"/datasets/{dataset_id}", json=updates)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def delete_dataset(self, dataset_id: UUID) -> bool:
         """Delete dataset."""
@@ -924,7 +1112,7 @@ class L01Client:
             params={"split": split}
         )
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def remove_example_from_dataset(
         self,
@@ -948,21 +1136,21 @@ class L01Client:
             params["split"] = split
         response = await client.get(f"/datasets/{dataset_id}/examples", params=params)
         response.raise_for_status()
-        return [UUID(id_str) for id_str in response.json()]
+        return [UUID(id_str) for id_str in decode_response(response)]
 
     async def get_dataset_split_counts(self, dataset_id: UUID) -> Dict[str, int]:
         """Get count of examples in each split."""
         client = await self._get_client()
         response = await client.get(f"/datasets/{dataset_id}/split-counts")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_dataset_statistics(self) -> Dict[str, Any]:
         """Get dataset service statistics."""
         client = await self._get_client()
         response = await client.get("/datasets/statistics")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # L06 Evaluation methods
 
@@ -1001,14 +1189,14 @@ class L01Client:
 
         response = await client.post("/quality-scores/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_quality_score(self, score_id: str) -> Dict[str, Any]:
         """Get quality score by ID."""
         client = await self._get_client()
         response = await client.get(f"/quality-scores/{score_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_metric(
         self,
@@ -1020,10 +1208,12 @@ class L01Client:
         agent_id: Optional[UUID] = None,
         tenant_id: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Record a time-series metric point."""
-        client = await self._get_client()
+        """Record a time-series metric point.
 
+        The point gets its row id here, so a retried write is stored once.
+        """
         payload = {
+            "id": str(uuid4()),
             "metric_name": metric_name,
             "value": value,
             "timestamp": timestamp,
@@ -1036,9 +1226,7 @@ class L01Client:
         if tenant_id:
             payload["tenant_id"] = tenant_id
 
-        response = await client.post("/metrics/", json=payload)
-        response.raise_for_status()
-        return response.json()
+        return await self._write("/metrics/", payload)
 
     async def query_metrics(
         self,
@@ -1068,7 +1256,63 @@ class L01Client:
 
         response = await client.get("/metrics/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
+
+    async def get_metric_aggregates(
+        self,
+        metric_name: str,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        agent_id: Optional[UUID] = None,
+        tenant_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get count, avg, min, max, stddev and p50/p95/p99 for a metric (None if no points)."""
+        client = await self._get_client()
+
+        params = {}
+        if start_time:
+            params["start_time"] = start_time
+        if end_time:
+            params["end_time"] = end_time
+        if agent_id:
+            params["agent_id"] = str(agent_id)
+        if tenant_id:
+            params["tenant_id"] = tenant_id
+
+        response = await client.get(f"/metrics/aggregates/{metric_name}", params=params)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return decode_response(response)
+
+    async def get_metric_series(
+        self,
+        metric_name: str,
+        resolution: Optional[str] = None,
+        start_time: Optional[str] = None,
+        end_time: Optional[str] = None,
+        agent_id: Optional[UUID] = None,
+        tenant_id: Optional[str] = None,
+        max_points: int = 500
+    ) -> Dict[str, Any]:
+        """Get per-bucket metric statistics from the 1m/1h/1d rollups."""
+        client = await self._get_client()
+
+        params = {"max_points": max_points}
+        if resolution:
+            params["resolution"] = resolution
+        if start_time:
+            params["start_time"] = start_time
+        if end_time:
+            params["end_time"] = end_time
+        if agent_id:
+            params["agent_id"] = str(agent_id)
+        if tenant_id:
+            params["tenant_id"] = tenant_id
+
+        response = await client.get(f"/metrics/rollups/{metric_name}", params=params)
+        response.raise_for_status()
+        return decode_response(response)
 
     async def record_anomaly(
         self,
@@ -1114,14 +1358,14 @@ class L01Client:
 
         response = await client.post("/anomalies/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_anomaly(self, anomaly_id: str) -> Dict[str, Any]:
         """Get anomaly by ID."""
         client = await self._get_client()
         response = await client.get(f"/anomalies/{anomaly_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_anomaly_status(
         self,
@@ -1144,7 +1388,7 @@ class L01Client:
 
         response = await client.patch(f"/anomalies/{anomaly_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_compliance_result(
         self,
@@ -1177,14 +1421,14 @@ class L01Client:
 
         response = await client.post("/compliance-results/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_compliance_result(self, result_id: str) -> Dict[str, Any]:
         """Get compliance result by ID."""
         client = await self._get_client()
         response = await client.get(f"/compliance-results/{result_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_alert(
         self,
@@ -1223,7 +1467,7 @@ class L01Client:
 
         response = await client.post("/alerts/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_alert_delivery(
         self,
@@ -1245,14 +1489,14 @@ class L01Client:
 
         response = await client.patch(f"/alerts/{alert_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_alert(self, alert_id: str) -> Dict[str, Any]:
         """Get alert by ID."""
         client = await self._get_client()
         response = await client.get(f"/alerts/{alert_id}")
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # ===================================================================
     # L09 API Gateway Methods
@@ -1286,8 +1530,6 @@ class L01Client:
         metadata: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Record an API request."""
-        client = await self._get_client()
-
         payload = {
             "request_id": request_id,
             "trace_id": trace_id,
@@ -1330,9 +1572,7 @@ class L01Client:
         if metadata:
             payload["metadata"] = metadata
 
-        response = await client.post("/api-requests/", json=payload)
-        response.raise_for_status()
-        return response.json()
+        return await self._write("/api-requests/", payload)
 
     async def record_authentication_event(
         self,
@@ -1372,7 +1612,7 @@ class L01Client:
 
         response = await client.post("/authentication-events/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_rate_limit_event(
         self,
@@ -1415,7 +1655,7 @@ class L01Client:
 
         response = await client.post("/rate-limit-events/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # ===================================================================
     # L10 Human Interface Methods
@@ -1471,7 +1711,7 @@ class L01Client:
 
         response = await client.post("/user-interactions/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_control_operation(
         self,
@@ -1521,7 +1761,7 @@ class L01Client:
 
         response = await client.post("/control-operations/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_control_operation(
         self,
@@ -1549,7 +1789,7 @@ class L01Client:
 
         response = await client.patch(f"/control-operations/{operation_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # ===================================================================
     # L11 Integration Layer Methods
@@ -1598,7 +1838,7 @@ class L01Client:
 
         response = await client.post("/saga-executions/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_saga_execution(
         self,
@@ -1632,7 +1872,7 @@ class L01Client:
 
         response = await client.patch(f"/saga-executions/{saga_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_saga_step(
         self,
@@ -1653,8 +1893,6 @@ class L01Client:
         metadata: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Record a saga step."""
-        client = await self._get_client()
-
         payload = {
             "step_id": step_id,
             "saga_id": saga_id,
@@ -1681,9 +1919,7 @@ class L01Client:
         if metadata:
             payload["metadata"] = metadata
 
-        response = await client.post("/saga-steps/", json=payload)
-        response.raise_for_status()
-        return response.json()
+        return await self._write("/saga-steps/", payload)
 
     async def update_saga_step(
         self,
@@ -1720,7 +1956,7 @@ class L01Client:
 
         response = await client.patch(f"/saga-steps/{step_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_circuit_breaker_event(
         self,
@@ -1767,7 +2003,7 @@ class L01Client:
 
         response = await client.post("/circuit-breaker-events/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def record_service_registry_event(
         self,
@@ -1807,4 +2043,4 @@ class L01Client:
 
         response = await client.post("/service-registry-events/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
@@ -3,26 +3,44 @@ Database connection and schema management for L01 Data Layer.
 """
 
 import asyncpg
-from typing import Optional
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import quote
 import logging
 
+from shared.db_pool import ManagedPool, PoolConfig, get_pool_manager
+
+from .migrations import Migration, MigrationRunner
+from .partitioning import PARTITIONED_TABLES
+from .replicas import ReplicaRouter, replica_dsns_from_env
+
 logger = logging.getLogger(__name__)
 
 DATABASE_SCHEMA = """
+-- Append-only tables are range partitioned on their timestamp column.
+-- Daily/weekly partitions are created ahead of time and dropped after
+-- their retention period by PartitionManager; the DEFAULT partition only
+-- catches rows outside the pre-created range. Primary and unique keys
+-- must include the partition key, so retries are deduplicated through
+-- partition_dedupe_keys instead.
+
 -- Core event sourcing
 CREATE TABLE IF NOT EXISTS events (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     event_type VARCHAR(255) NOT NULL,
     aggregate_type VARCHAR(100) NOT NULL,
     aggregate_id UUID NOT NULL,
     payload JSONB NOT NULL,
     metadata JSONB DEFAULT '{}',
-    created_at TIMESTAMP DEFAULT NOW(),
-    version INTEGER DEFAULT 1
-);
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    version INTEGER DEFAULT 1,
+    PRIMARY KEY (id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE TABLE IF NOT EXISTS events_default PARTITION OF events DEFAULT;
 CREATE INDEX IF NOT EXISTS idx_events_aggregate ON events(aggregate_type, aggregate_id);
 CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type);
-CREATE INDEX IF NOT EXISTS idx_events_created ON events(created_at);
+CREATE INDEX IF NOT EXISTS idx_events_created_brin ON events USING BRIN (created_at);
+CREATE INDEX IF NOT EXISTS idx_events_created_id ON events(created_at, id);
 
 -- L02 Agent Runtime
 CREATE TABLE IF NOT EXISTS agents (
@@ -52,8 +70,8 @@ CREATE TABLE IF NOT EXISTS tools (
 );
 
 CREATE TABLE IF NOT EXISTS tool_executions (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    invocation_id UUID UNIQUE NOT NULL,
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    invocation_id UUID NOT NULL,
     tool_id UUID REFERENCES tools(id),
     tool_name VARCHAR(255) NOT NULL,
     tool_version VARCHAR(50),
@@ -100,10 +118,14 @@ CREATE TABLE IF NOT EXISTS tool_executions (
     timeout_seconds INTEGER,
 
     -- Timestamps
-    created_at TIMESTAMP DEFAULT NOW(),
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
     started_at TIMESTAMP,
-    completed_at TIMESTAMP
-);
+    completed_at TIMESTAMP,
+
+    PRIMARY KEY (id, created_at),
+    UNIQUE (invocation_id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE TABLE IF NOT EXISTS tool_executions_default PARTITION OF tool_executions DEFAULT;
 
 CREATE INDEX IF NOT EXISTS idx_tool_executions_invocation ON tool_executions(invocation_id);
 CREATE INDEX IF NOT EXISTS idx_tool_executions_tool ON tool_executions(tool_id);
@@ -111,12 +133,13 @@ CREATE INDEX IF NOT EXISTS idx_tool_executions_agent ON tool_executions(agent_id
 CREATE INDEX IF NOT EXISTS idx_tool_executions_status ON tool_executions(status);
 CREATE INDEX IF NOT EXISTS idx_tool_executions_session ON tool_executions(session_id);
 CREATE INDEX IF NOT EXISTS idx_tool_executions_tenant ON tool_executions(tenant_id);
-CREATE INDEX IF NOT EXISTS idx_tool_executions_created ON tool_executions(created_at);
+CREATE INDEX IF NOT EXISTS idx_tool_executions_created_brin ON tool_executions USING BRIN (created_at);
+CREATE INDEX IF NOT EXISTS idx_tool_executions_created_id ON tool_executions(created_at, id);
 
 -- L04 Model Gateway
 CREATE TABLE IF NOT EXISTS model_usage (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    request_id VARCHAR(255) UNIQUE NOT NULL,
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    request_id VARCHAR(255) NOT NULL,
 
     -- Agent context
     agent_id UUID REFERENCES agents(id),
@@ -154,8 +177,12 @@ CREATE TABLE IF NOT EXISTS model_usage (
     metadata JSONB DEFAULT '{}',
 
     -- Timestamps
-    created_at TIMESTAMP DEFAULT NOW()
-);
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+
+    PRIMARY KEY (id, created_at),
+    UNIQUE (request_id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE TABLE IF NOT EXISTS model_usage_default PARTITION OF model_usage DEFAULT;
 
 CREATE INDEX IF NOT EXISTS idx_model_usage_request ON model_usage(request_id);
 CREATE INDEX IF NOT EXISTS idx_model_usage_agent ON model_usage(agent_id);
@@ -163,7 +190,8 @@ CREATE INDEX IF NOT EXISTS idx_model_usage_agent_did ON model_usage(agent_did);
 CREATE INDEX IF NOT EXISTS idx_model_usage_session ON model_usage(session_id);
 CREATE INDEX IF NOT EXISTS idx_model_usage_tenant ON model_usage(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_model_usage_model ON model_usage(model_provider, model_name);
-CREATE INDEX IF NOT EXISTS idx_model_usage_created ON model_usage(created_at);
+CREATE INDEX IF NOT EXISTS idx_model_usage_created_brin ON model_usage USING BRIN (created_at);
+CREATE INDEX IF NOT EXISTS idx_model_usage_created_id ON model_usage(created_at, id);
 
 -- L05 Planning
 CREATE TABLE IF NOT EXISTS goals (
@@ -332,7 +360,7 @@ CREATE INDEX IF NOT EXISTS idx_quality_scores_assessment ON quality_scores(asses
 
 -- L06 Metrics (Time-series)
 CREATE TABLE IF NOT EXISTS metrics (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
     metric_name VARCHAR(255) NOT NULL,
     metric_type VARCHAR(50) DEFAULT 'gauge',
     value DECIMAL(20,6) NOT NULL,
@@ -346,10 +374,14 @@ CREATE TABLE IF NOT EXISTS metrics (
     agent_id UUID REFERENCES agents(id),
     tenant_id VARCHAR(255),
 
-    created_at TIMESTAMP DEFAULT NOW()
-);
+    created_at TIMESTAMP DEFAULT NOW(),
+
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+CREATE TABLE IF NOT EXISTS metrics_default PARTITION OF metrics DEFAULT;
 CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics(metric_name);
-CREATE INDEX IF NOT EXISTS idx_metrics_timestamp ON metrics(timestamp);
+CREATE INDEX IF NOT EXISTS idx_metrics_timestamp_brin ON metrics USING BRIN (timestamp);
+CREATE INDEX IF NOT EXISTS idx_metrics_timestamp_id ON metrics(timestamp, id);
 CREATE INDEX IF NOT EXISTS idx_metrics_agent ON metrics(agent_id);
 CREATE INDEX IF NOT EXISTS idx_metrics_tenant ON metrics(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_metrics_labels ON metrics USING GIN(labels);
@@ -484,6 +516,7 @@ CREATE TABLE IF NOT EXISTS training_examples (
 CREATE INDEX IF NOT EXISTS idx_training_examples_agent ON training_examples(agent_id);
 CREATE INDEX IF NOT EXISTS idx_training_examples_quality ON training_examples(quality_score);
 CREATE INDEX IF NOT EXISTS idx_training_examples_domain ON training_examples(domain);
+CREATE INDEX IF NOT EXISTS idx_training_examples_created_id ON training_examples(created_at, id);
 
 CREATE TABLE IF NOT EXISTS datasets (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -499,6 +532,7 @@ CREATE TABLE IF NOT EXISTS datasets (
     updated_at TIMESTAMP DEFAULT NOW()
 );
 CREATE INDEX IF NOT EXISTS idx_datasets_name ON datasets(name);
+CREATE INDEX IF NOT EXISTS idx_datasets_created_id ON datasets(created_at, id);
 
 CREATE TABLE IF NOT EXISTS dataset_examples (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -552,8 +586,8 @@ CREATE TABLE IF NOT EXISTS sessions (
 
 -- L09 API Gateway
 CREATE TABLE IF NOT EXISTS api_requests (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    request_id VARCHAR(255) UNIQUE NOT NULL,
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    request_id VARCHAR(255) NOT NULL,
     trace_id VARCHAR(255),
     span_id VARCHAR(255),
     timestamp TIMESTAMP NOT NULL,
@@ -577,9 +611,14 @@ CREATE TABLE IF NOT EXISTS api_requests (
     headers JSONB DEFAULT '{}',
     query_params JSONB DEFAULT '{}',
     metadata JSONB DEFAULT '{}',
-    created_at TIMESTAMP DEFAULT NOW()
-);
-CREATE INDEX IF NOT EXISTS idx_api_requests_timestamp ON api_requests(timestamp DESC);
+    created_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (id, timestamp),
+    UNIQUE (request_id, timestamp)
+) PARTITION BY RANGE (timestamp);
+CREATE TABLE IF NOT EXISTS api_requests_default PARTITION OF api_requests DEFAULT;
+CREATE INDEX IF NOT EXISTS idx_api_requests_request ON api_requests(request_id);
+CREATE INDEX IF NOT EXISTS idx_api_requests_timestamp_brin ON api_requests USING BRIN (timestamp);
+CREATE INDEX IF NOT EXISTS idx_api_requests_timestamp_id ON api_requests(timestamp, id);
 CREATE INDEX IF NOT EXISTS idx_api_requests_consumer ON api_requests(consumer_id);
 CREATE INDEX IF NOT EXISTS idx_api_requests_tenant ON api_requests(tenant_id);
 CREATE INDEX IF NOT EXISTS idx_api_requests_status ON api_requests(status_code);
@@ -694,8 +733,8 @@ CREATE INDEX IF NOT EXISTS idx_saga_executions_status ON saga_executions(status)
 CREATE INDEX IF NOT EXISTS idx_saga_executions_started ON saga_executions(started_at DESC);
 
 CREATE TABLE IF NOT EXISTS saga_steps (
-    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-    step_id VARCHAR(255) UNIQUE NOT NULL,
+    id UUID NOT NULL DEFAULT gen_random_uuid(),
+    step_id VARCHAR(255) NOT NULL,
     saga_id VARCHAR(255) NOT NULL,
     step_name VARCHAR(255) NOT NULL,
     step_index INTEGER NOT NULL,
@@ -710,9 +749,14 @@ CREATE TABLE IF NOT EXISTS saga_steps (
     compensation_result JSONB,
     retry_count INTEGER DEFAULT 0,
     metadata JSONB DEFAULT '{}',
-    created_at TIMESTAMP DEFAULT NOW(),
-    updated_at TIMESTAMP DEFAULT NOW()
-);
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (id, created_at),
+    UNIQUE (step_id, created_at)
+) PARTITION BY RANGE (created_at);
+CREATE TABLE IF NOT EXISTS saga_steps_default PARTITION OF saga_steps DEFAULT;
+CREATE INDEX IF NOT EXISTS idx_saga_steps_step ON saga_steps(step_id);
+CREATE INDEX IF NOT EXISTS idx_saga_steps_created_brin ON saga_steps USING BRIN (created_at);
 CREATE INDEX IF NOT EXISTS idx_saga_steps_saga ON saga_steps(saga_id);
 CREATE INDEX IF NOT EXISTS idx_saga_steps_status ON saga_steps(status);
 
@@ -756,72 +800,466 @@ CREATE INDEX IF NOT EXISTS idx_service_registry_events_service ON service_regist
 CREATE INDEX IF NOT EXISTS idx_service_registry_events_type ON service_registry_events(event_type);
 """
 
+# Tables that are range partitioned by DATABASE_SCHEMA
+_PARTITIONED = "ARRAY[" + ", ".join(f"'{t}'" for t in PARTITIONED_TABLES) + "]"
+
+# (table, partition column, interval, retention days) for the DO blocks below
+_PARTITION_SPECS = ",\n        ".join(
+    f"('{t}', '{s.column}', '{s.interval}', {s.retention_days if s.retention_days is not None else 'NULL'})"
+    for t, s in PARTITIONED_TABLES.items()
+)
+
+# Unique keys of partitioned tables include the partition column, so a
+# retried insert with a defaulted timestamp would not collide with the
+# first one. Each table's dedupe key is recorded in this unpartitioned
+# table by a BEFORE INSERT trigger, which skips rows whose key exists.
+# PartitionManager deletes keys together with the expired partitions.
+PARTITION_DEDUPE_KEYS = """
+CREATE TABLE IF NOT EXISTS partition_dedupe_keys (
+    table_name VARCHAR(63) NOT NULL,
+    key VARCHAR(255) NOT NULL,
+    created_at TIMESTAMP NOT NULL,
+    PRIMARY KEY (table_name, key)
+);
+CREATE INDEX IF NOT EXISTS idx_partition_dedupe_keys_created ON partition_dedupe_keys(table_name, created_at);
+
+-- Arguments: table name, key column, partition column
+CREATE OR REPLACE FUNCTION skip_duplicate_key() RETURNS trigger AS $$
+DECLARE
+    row_data JSONB := to_jsonb(NEW);
+BEGIN
+    IF row_data ->> TG_ARGV[1] IS NULL THEN
+        RETURN NEW;
+    END IF;
+    INSERT INTO partition_dedupe_keys (table_name, key, created_at)
+    VALUES (TG_ARGV[0], row_data ->> TG_ARGV[1], (row_data ->> TG_ARGV[2])::timestamp)
+    ON CONFLICT DO NOTHING;
+    IF NOT FOUND THEN
+        RETURN NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+""" + "".join(
+    f"""
+DROP TRIGGER IF EXISTS trg_{t}_dedupe ON {t};
+CREATE TRIGGER trg_{t}_dedupe BEFORE INSERT ON {t}
+    FOR EACH ROW EXECUTE FUNCTION skip_duplicate_key('{t}', '{s.dedupe_key}', '{s.column}');
+"""
+    for t, s in PARTITIONED_TABLES.items() if s.dedupe_key
+)
+
+# Deployments created before partitioning have plain heap tables under the
+# partitioned names. Move them (and their index names) aside so the
+# baseline can create the partitioned tables.
+RENAME_LEGACY_HEAP_TABLES = f"""
+DO $$
+DECLARE
+    t TEXT;
+    idx TEXT;
+BEGIN
+    FOREACH t IN ARRAY {_PARTITIONED} LOOP
+        CONTINUE WHEN NOT EXISTS (
+            SELECT 1 FROM pg_class WHERE oid = to_regclass(t) AND relkind = 'r'
+        );
+        FOR idx IN
+            SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+            WHERE i.indrelid = to_regclass(t)
+        LOOP
+            EXECUTE format('ALTER INDEX %I RENAME TO %I', idx, left(idx, 56) || '_legacy');
+        END LOOP;
+        EXECUTE format('ALTER TABLE %I RENAME TO %I', t, t || '_legacy');
+    END LOOP;
+END $$;
+"""
+
+# Copy legacy rows into the partitioned tables (columns both have in
+# common) and drop the legacy table. Partitions covering the retained
+# legacy rows are created first, as a range partition cannot be created
+# while the DEFAULT partition holds rows for it; rows past retention are
+# not copied. A table that cannot be copied is kept and reported as a
+# warning.
+COPY_LEGACY_ROWS = f"""
+DO $$
+DECLARE
+    spec RECORD;
+    t TEXT;
+    cols TEXT;
+    lo TIMESTAMP;
+    hi TIMESTAMP;
+    bound TIMESTAMP;
+    width INTERVAL;
+    retained TEXT;
+BEGIN
+    FOR spec IN SELECT * FROM (VALUES
+        {_PARTITION_SPECS}
+    ) AS s(tbl, col, unit, retention_days) LOOP
+        t := spec.tbl;
+        CONTINUE WHEN to_regclass(t || '_legacy') IS NULL;
+        SELECT string_agg(quote_ident(c.column_name), ', ' ORDER BY c.ordinal_position) INTO cols
+        FROM information_schema.columns c
+        WHERE c.table_schema = current_schema() AND c.table_name = t
+          AND c.column_name IN (
+              SELECT column_name FROM information_schema.columns
+              WHERE table_schema = current_schema() AND table_name = t || '_legacy'
+          );
+        retained := 'TRUE';
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = current_schema() AND table_name = t || '_legacy'
+                  AND column_name = spec.col
+            ) THEN
+                EXECUTE format('SELECT min(%I), max(%I) FROM %I', spec.col, spec.col, t || '_legacy')
+                INTO lo, hi;
+                IF spec.retention_days IS NOT NULL THEN
+                    lo := GREATEST(lo, NOW()::timestamp - make_interval(days => spec.retention_days));
+                    retained := format('%I >= %L', spec.col, lo);
+                END IF;
+                width := ('1 ' || spec.unit)::interval;
+                bound := date_trunc(spec.unit, lo);
+                WHILE bound <= hi LOOP
+                    EXECUTE format(
+                        'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+                        t || '_p' || to_char(bound, 'YYYYMMDD'), t, bound, bound + width
+                    );
+                    bound := bound + width;
+                END LOOP;
+            END IF;
+            EXECUTE format(
+                'INSERT INTO %I (%s) SELECT %s FROM %I WHERE %s ON CONFLICT DO NOTHING',
+                t, cols, cols, t || '_legacy', retained
+            );
+            EXECUTE format('DROP TABLE %I', t || '_legacy');
+        EXCEPTION WHEN others THEN
+            RAISE WARNING 'Kept %: copy into % failed: %', t || '_legacy', t, SQLERRM;
+        END;
+    END LOOP;
+END $$;
+"""
+
+# Metric rollups maintained by MetricRollupService. sketch holds the
+# QuantileSketch bins; rollup_state records up to where each resolution
+# is complete.
+METRIC_ROLLUPS = """
+CREATE TABLE IF NOT EXISTS metric_rollups (
+    resolution VARCHAR(8) NOT NULL,
+    bucket_start TIMESTAMP NOT NULL,
+    metric_name VARCHAR(255) NOT NULL,
+    agent_id UUID,
+    tenant_id VARCHAR(255),
+    count BIGINT NOT NULL,
+    sum DOUBLE PRECISION NOT NULL,
+    sum_sq DOUBLE PRECISION NOT NULL,
+    min DOUBLE PRECISION NOT NULL,
+    max DOUBLE PRECISION NOT NULL,
+    sketch JSONB NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_metric_rollups_lookup ON metric_rollups(metric_name, resolution, bucket_start);
+CREATE INDEX IF NOT EXISTS idx_metric_rollups_bucket ON metric_rollups(resolution, bucket_start);
+
+CREATE TABLE IF NOT EXISTS metric_rollup_state (
+    resolution VARCHAR(8) PRIMARY KEY,
+    watermark TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT NOW()
+);
+"""
+
+# Transactional outbox: EventStore writes the message to publish in the
+# same statement as the event; OutboxRelay publishes and deletes it.
+EVENT_OUTBOX = """
+CREATE TABLE IF NOT EXISTS event_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    event_id UUID NOT NULL,
+    aggregate_type VARCHAR(100) NOT NULL,
+    aggregate_id UUID NOT NULL,
+    version INTEGER NOT NULL,
+    message JSONB NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+"""
+
+# Aggregate snapshots for replay. EventStore assigns versions per
+# aggregate on every append; existing events are renumbered 1..n in
+# (created_at, id) order first, since clients used to send their own
+# (mostly 1). The version index serves snapshot tails and version checks
+# and supersedes idx_events_aggregate.
+AGGREGATE_SNAPSHOTS = """
+UPDATE events e
+SET version = numbered.version
+FROM (
+    SELECT id, created_at,
+           ROW_NUMBER() OVER (PARTITION BY aggregate_type, aggregate_id ORDER BY created_at, id) AS version
+    FROM events
+) numbered
+WHERE e.id = numbered.id AND e.created_at = numbered.created_at
+  AND e.version IS DISTINCT FROM numbered.version;
+
+CREATE INDEX IF NOT EXISTS idx_events_aggregate_version ON events(aggregate_type, aggregate_id, version);
+DROP INDEX IF EXISTS idx_events_aggregate;
+
+CREATE TABLE IF NOT EXISTS aggregate_snapshots (
+    aggregate_type VARCHAR(100) NOT NULL,
+    aggregate_id UUID NOT NULL,
+    version INTEGER NOT NULL,
+    state JSONB NOT NULL DEFAULT '{}',
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (aggregate_type, aggregate_id)
+);
+"""
+
+# Forward-only schema migrations; append new ones, never edit released ones
+MIGRATIONS = [
+    Migration(1, "rename_legacy_heap_tables", RENAME_LEGACY_HEAP_TABLES),
+    Migration(2, "baseline", DATABASE_SCHEMA + PARTITION_DEDUPE_KEYS),
+    Migration(3, "copy_legacy_rows", COPY_LEGACY_ROWS),
+    Migration(4, "metric_rollups", METRIC_ROLLUPS),
+    Migration(5, "event_outbox", EVENT_OUTBOX),
+    Migration(6, "aggregate_snapshots", AGGREGATE_SNAPSHOTS),
+]
+
+
+def parse_timestamp(value: Optional[Union[str, datetime]]) -> Optional[datetime]:
+    """
+    Parse an ISO-8601 timestamp for a TIMESTAMP (without time zone) column.
+
+    Aware values are converted to naive UTC, as binary COPY rejects them.
+    """
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def convert_records(
+    records: Sequence[Any],
+    convert: Callable[[Any], tuple]
+) -> Tuple[List[tuple], List[int]]:
+    """
+    Convert the records of a bulk request to row tuples one by one.
+
+    A record that is missing a field or has a value of the wrong type is
+    left out, so one bad record does not fail its whole batch.
+
+    Args:
+        records: Records as received
+        convert: Builds the row tuple of one record; raises KeyError,
+            TypeError or ValueError (including pydantic's
+            ValidationError) for an invalid record
+
+    Returns:
+        Row tuples of the valid records and indexes of the invalid ones
+    """
+    rows = []
+    rejected = []
+    for index, record in enumerate(records):
+        try:
+            rows.append(convert(record))
+        except (KeyError, TypeError, ValueError) as e:
+            logger.warning(f"Rejected bulk record {index}: {e!r}")
+            rejected.append(index)
+    return rows, rejected
+
+
+async def bulk_insert(
+    pool: asyncpg.Pool,
+    table: str,
+    columns: Sequence[str],
+    records: List[tuple],
+    conflict_columns: Optional[Sequence[str]] = None,
+    returning: Optional[str] = None
+) -> Union[int, List[Any]]:
+    """
+    Insert many rows with a single COPY.
+
+    Without conflict_columns rows are copied straight into the table.
+    With them, rows are copied into a temporary staging table and moved
+    with INSERT ... ON CONFLICT DO NOTHING, so a retried batch skips
+    the rows that already landed instead of failing.
+
+    Args:
+        pool: Connection pool
+        table: Target table
+        columns: Column names, in record order
+        records: Row tuples
+        conflict_columns: Unique key used to skip duplicates (on
+            partitioned tables it includes the partition key; rows
+            whose dedupe key exists are skipped by a trigger as well)
+        returning: Column whose inserted values are returned
+
+    Returns:
+        Number of inserted rows, or the inserted `returning` values
+    """
+    if not records:
+        return [] if returning else 0
+
+    column_list = ", ".join(columns)
+    async with pool.acquire() as conn:
+        if not conflict_columns and returning is None:
+            await conn.copy_records_to_table(table, records=records, columns=list(columns))
+            return len(records)
+
+        async with conn.transaction():
+            staging = f"_bulk_{table}"
+            await conn.execute(
+                f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            await conn.copy_records_to_table(staging, records=records, columns=list(columns))
+            query = f"INSERT INTO {table} ({column_list}) SELECT {column_list} FROM {staging}"
+            if conflict_columns:
+                query += f" ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING"
+            if returning:
+                rows = await conn.fetch(f"{query} RETURNING {returning}")
+                return [row[returning] for row in rows]
+            status = await conn.execute(query)
+            return int(status.split()[-1])
+
+
+async def fetch_deduplicated(
+    conn: asyncpg.Connection,
+    table: str,
+    key: Any,
+    returning: str = "*"
+) -> Optional[asyncpg.Record]:
+    """
+    Fetch the row that made an insert into a partitioned table a duplicate.
+
+    The dedupe trigger turns an insert whose dedupe key already exists
+    into a no-op, so INSERT ... RETURNING yields no row. Callers use this
+    to return the row recorded by the first attempt instead.
+
+    Args:
+        conn: Database connection
+        table: Partitioned table with a dedupe key
+        key: Dedupe key value
+        returning: Columns to select
+
+    Returns:
+        The earliest row with that key, or None
+    """
+    spec = PARTITIONED_TABLES[table]
+    return await conn.fetchrow(
+        f"SELECT {returning} FROM {table} WHERE {spec.dedupe_key} = $1 "
+        f"ORDER BY {spec.column} LIMIT 1",
+        key,
+    )
+
+
+# L01 serves every layer, so its request pool is larger than the default
+L01_OLTP_POOL = PoolConfig(min_size=5, max_size=20)
+
 
 class Database:
     """PostgreSQL database manager with connection pooling."""
 
     def __init__(self, host: str = "localhost", port: int = 5432,
                  database: str = "agentic", user: str = "postgres",
-                 password: str = "postgres"):
+                 password: str = "postgres", replica_dsns: Optional[List[str]] = None,
+                 max_replica_lag_seconds: float = 5.0):
         self.host = host
         self.port = port
         self.database = database
         self.user = user
         self.password = password
-        self.pool: Optional[asyncpg.Pool] = None
+        self.pool: Optional[ManagedPool] = None
+        self._workload_pools: Dict[str, ManagedPool] = {}
+        self.replica_dsns = replica_dsns or []
+        self.max_replica_lag_seconds = max_replica_lag_seconds
+        self.replicas: Optional[ReplicaRouter] = None
+
+    @property
+    def dsn(self) -> str:
+        """Connection string for the shared pool manager (credentials percent-encoded)."""
+        user = quote(self.user, safe="")
+        password = quote(self.password, safe="")
+        database = quote(self.database, safe="")
+        return f"postgresql://{user}:{password}@{self.host}:{self.port}/{database}"
 
     async def connect(self):
-        """Create connection pool."""
+        """Get the OLTP connection pool from the shared pool manager."""
         if self.pool is None:
             try:
-                self.pool = await asyncpg.create_pool(
-                    host=self.host,
-                    port=self.port,
-                    database=self.database,
-                    user=self.user,
-                    password=self.password,
-                    min_size=5,
-                    max_size=20,
-                    command_timeout=60
-                )
+                self.pool = await get_pool_manager().get_pool("oltp", self.dsn, defaults=L01_OLTP_POOL)
                 logger.info(f"Connected to database {self.database}")
+                if self.replica_dsns:
+                    self.replicas = ReplicaRouter(self.pool, self.replica_dsns, self.max_replica_lag_seconds)
+                    await self.replicas.start()
             except Exception as e:
                 logger.error(f"Failed to connect to database: {e}")
                 raise
 
     async def disconnect(self):
-        """Close connection pool."""
+        """Release connection pools."""
+        if self.replicas:
+            await self.replicas.stop()
+            self.replicas = None
+        for pool in self._workload_pools.values():
+            await pool.close()
+        self._workload_pools.clear()
         if self.pool:
             await self.pool.close()
             self.pool = None
             logger.info("Database connection closed")
 
-    async def initialize_schema(self):
-        """Create all tables and indexes."""
+    async def get_workload_pool(self, name: str) -> ManagedPool:
+        """
+        Pool for a non-request workload ("bulk" or "analytics").
+
+        Keeps COPY loads, exports and aggregate scans from holding the
+        connections that request handlers need.
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+        if name == "oltp":
+            return self.pool
+        if name not in self._workload_pools:
+            self._workload_pools[name] = await get_pool_manager().get_pool(name, self.dsn)
+        return self._workload_pools[name]
+
+    def read_pool(self, min_lsn: Optional[str] = None) -> ManagedPool:
+        """
+        Pool for a read that tolerates replication lag.
+
+        Goes to a caught-up read replica when replicas are configured and
+        to the primary otherwise. Writes, and reads inside a write
+        transaction, must use self.pool.
+
+        Args:
+            min_lsn: WAL position the read must reflect (read-your-writes token)
+        """
+        if not self.pool:
+            raise RuntimeError("Database not connected")
+        if self.replicas is None:
+            return self.pool
+        return self.replicas.read_pool(min_lsn)
+
+    async def write_lsn(self) -> Optional[str]:
+        """Primary WAL position to hand to clients after a write (None without replicas)."""
+        if self.replicas is None:
+            return None
+        return await self.replicas.current_lsn()
+
+    async def initialize_schema(self) -> List[int]:
+        """
+        Bring the schema up to date by applying pending migrations.
+
+        Safe to call from every replica on every start: existing data is
+        kept, and when nothing is pending this is a single query.
+
+        Returns:
+            Migration versions applied by this call
+        """
         if not self.pool:
             raise RuntimeError("Database not connected")
 
         try:
-            async with self.pool.acquire() as conn:
-                # Migration: Drop old tables to apply new schemas
-                await conn.execute("DROP TABLE IF EXISTS tool_executions CASCADE")
-                logger.info("Dropped old tool_executions table for schema migration")
-
-                await conn.execute("DROP TABLE IF EXISTS model_usage CASCADE")
-                logger.info("Dropped old model_usage table for schema migration")
-
-                await conn.execute("DROP TABLE IF EXISTS tasks CASCADE")
-                logger.info("Dropped old tasks table for schema migration")
-
-                await conn.execute("DROP TABLE IF EXISTS plans CASCADE")
-                logger.info("Dropped old plans table for schema migration")
-
-                await conn.execute("DROP TABLE IF EXISTS goals CASCADE")
-                logger.info("Dropped old goals table for schema migration")
-
-                # Execute main schema
-                await conn.execute(DATABASE_SCHEMA)
-            logger.info("Database schema initialized")
+            applied = await MigrationRunner(self.pool, MIGRATIONS).migrate()
+            if applied:
+                logger.info(f"Applied schema migrations {applied}")
+            return applied
         except Exception as e:
             logger.error(f"Failed to initialize schema: {e}")
             raise
@@ -839,7 +1277,7 @@ class Database:
             logger.error(f"Health check failed: {e}")
             return False
 
-    def get_pool(self) -> asyncpg.Pool:
+    def get_pool(self) -> ManagedPool:
         """Get connection pool."""
         if not self.pool:
             raise RuntimeError("Database not connected")
@@ -871,5 +1309,7 @@ db = Database(
     port=_db_port,
     database=_db_name,
     user=_db_user,
-    password=_db_password
+    password=_db_password,
+    replica_dsns=replica_dsns_from_env(),
+    max_replica_lag_seconds=float(os.getenv("POSTGRES_REPLICA_MAX_LAG_SECONDS", "5")),
 )
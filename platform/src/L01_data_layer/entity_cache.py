@@ -0,0 +1,287 @@
+"""
+Read-through cache for rarely changing L01 entities.
+
+Agents, tools, configurations and sessions are cached in two tiers: a
+small in-process LRU in front of a shared Redis copy. Reads fall through
+to Postgres on a miss and populate both tiers; writes go through the
+owning service, which stores the new row in both tiers before publishing
+its event (agent.updated, tool.updated, config.updated, ...).
+
+Every entry carries the entity's version (configurations: their version
+column, others: updated_at). An entry is only replaced by one with an
+equal or newer version, so a slow reader that loaded a row before an
+update cannot put the old row back after it; deletes leave a tombstone
+that blocks re-population until it expires. In Redis the compare-and-set
+is a Lua script.
+
+Other replicas learn about writes from the l01:events channel and drop
+their in-process copy, falling back to Redis on the next read. If the
+subscription drops, the in-process tier is cleared on reconnect; its TTL
+bounds staleness if an event is lost.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from .redis_client import RedisClient, redis_client
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T", bound=BaseModel)
+
+# Entity kinds and the event aggregate_type that invalidates them
+CACHED_AGGREGATES = {"agent", "tool", "config", "session"}
+
+# Version of a deleted entity; newer than any real version
+TOMBSTONE_VERSION = 1e300
+
+# SET key to "version|payload" unless the stored version is newer.
+# Returns 1 if written, 0 if a newer entry (or tombstone) was kept.
+_SET_IF_NEWER = """
+local current = redis.call('GET', KEYS[1])
+if current then
+    local sep = string.find(current, '|', 1, true)
+    if sep and tonumber(string.sub(current, 1, sep - 1)) > tonumber(ARGV[1]) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], ARGV[1] .. '|' .. ARGV[2], 'EX', ARGV[3])
+return 1
+"""
+
+
+def entity_version(entity: BaseModel) -> float:
+    """Monotonic version of an entity row."""
+    version = getattr(entity, "version", None)
+    if isinstance(version, int):
+        return float(version)
+    return entity.updated_at.timestamp()
+
+
+class EntityCache:
+    """Two-tier (in-process + Redis) versioned read-through cache."""
+
+    def __init__(
+        self,
+        redis_client: RedisClient,
+        local_ttl: float = 30.0,
+        redis_ttl: int = 300,
+        max_local_entries: int = 10000,
+        channel: str = "l01:events",
+    ):
+        """
+        Initialize entity cache.
+
+        Args:
+            redis_client: Redis client for the shared tier and invalidation events
+            local_ttl: Seconds an in-process entry is trusted without an event
+            redis_ttl: Seconds a Redis entry (or tombstone) lives
+            max_local_entries: In-process LRU capacity
+            channel: Pub/sub channel the entity events are published on
+        """
+        self.redis_client = redis_client
+        self.local_ttl = local_ttl
+        self.redis_ttl = redis_ttl
+        self.max_local_entries = max_local_entries
+        self.channel = channel
+        # key -> (version, expires_at, entity or None for a tombstone)
+        self._local: "OrderedDict[str, Tuple[float, float, Optional[BaseModel]]]" = OrderedDict()
+        self._script = None
+        self._script_client = None
+        self._task: Optional[asyncio.Task] = None
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    @staticmethod
+    def key(kind: str, entity_id: Any) -> str:
+        return f"l01:cache:{kind}:{entity_id}"
+
+    async def start(self) -> None:
+        """Listen for entity events in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        """Stop listening for entity events."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def get(
+        self,
+        kind: str,
+        entity_id: Any,
+        model: Type[T],
+        loader: Callable[[], Awaitable[Optional[T]]],
+    ) -> Optional[T]:
+        """
+        Get an entity, loading and caching it on a miss.
+
+        Args:
+            kind: Entity kind (agent, tool, config, session)
+            entity_id: Entity key
+            model: Pydantic model of the entity
+            loader: Reads the entity from Postgres (None if it does not exist)
+        """
+        key = self.key(kind, entity_id)
+        stats = self._kind_stats(kind)
+
+        local = self._local.get(key)
+        if local is not None and local[1] > time.monotonic() and local[2] is not None:
+            self._local.move_to_end(key)
+            stats["local_hits"] += 1
+            return local[2]
+
+        cached = await self._redis_get(key)
+        if cached is not None and cached[0] < TOMBSTONE_VERSION:
+            entity = model.model_validate_json(cached[1])
+            self._put_local(key, cached[0], entity)
+            stats["redis_hits"] += 1
+            return entity
+
+        stats["misses"] += 1
+        entity = await loader()
+        if entity is not None:
+            await self.put(kind, entity_id, entity)
+        return entity
+
+    async def put(self, kind: str, entity_id: Any, entity: BaseModel) -> None:
+        """Store an entity in both tiers unless a newer version is cached."""
+        key = self.key(kind, entity_id)
+        version = entity_version(entity)
+        self._put_local(key, version, entity)
+        await self._redis_set(key, version, entity.model_dump_json(), kind)
+
+    async def invalidate(self, kind: str, entity_id: Any, deleted: bool = False) -> None:
+        """
+        Drop an entity from both tiers.
+
+        Args:
+            deleted: Leave a tombstone so that in-flight reads of the old
+                row cannot re-populate the cache
+        """
+        key = self.key(kind, entity_id)
+        self._kind_stats(kind)["invalidations"] += 1
+        if deleted:
+            self._put_local(key, TOMBSTONE_VERSION, None)
+            await self._redis_set(key, TOMBSTONE_VERSION, "", kind)
+            return
+        self._local.pop(key, None)
+        client = self.redis_client.client
+        if client is not None:
+            try:
+                await client.delete(key)
+            except Exception as e:
+                logger.warning(f"Failed to invalidate {key}: {e}")
+
+    def invalidate_local(self, kind: str, entity_id: Any) -> None:
+        """Drop the in-process copy only (another replica wrote the entity)."""
+        if self._local.pop(self.key(kind, entity_id), None) is not None:
+            self._kind_stats(kind)["invalidations"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hits, misses and hit rate per entity kind."""
+        result: Dict[str, Any] = {"local_entries": len(self._local)}
+        for kind, stats in self._stats.items():
+            lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+            result[kind] = {
+                **stats,
+                "hit_rate": (stats["local_hits"] + stats["redis_hits"]) / lookups if lookups else 0.0,
+            }
+        return result
+
+    def _kind_stats(self, kind: str) -> Dict[str, int]:
+        if kind not in self._stats:
+            self._stats[kind] = {
+                "local_hits": 0,
+                "redis_hits": 0,
+                "misses": 0,
+                "stale_writes_rejected": 0,
+                "invalidations": 0,
+            }
+        return self._stats[kind]
+
+    def _put_local(self, key: str, version: float, entity: Optional[BaseModel]) -> None:
+        current = self._local.get(key)
+        if current is not None and current[0] > version and current[1] > time.monotonic():
+            return
+        self._local[key] = (version, time.monotonic() + self.local_ttl, entity)
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+    async def _redis_get(self, key: str) -> Optional[Tuple[float, str]]:
+        client = self.redis_client.client
+        if client is None:
+            return None
+        try:
+            value = await client.get(key)
+        except Exception as e:
+            logger.warning(f"Cache read of {key} failed: {e}")
+            return None
+        if not value:
+            return None
+        version, _, payload = value.partition("|")
+        return float(version), payload
+
+    async def _redis_set(self, key: str, version: float, payload: str, kind: str) -> None:
+        client = self.redis_client.client
+        if client is None:
+            return
+        try:
+            if self._script is None or self._script_client is not client:
+                self._script = client.register_script(_SET_IF_NEWER)
+                self._script_client = client
+            written = await self._script(keys=[key], args=[repr(version), payload, self.redis_ttl])
+            if not written:
+                self._kind_stats(kind)["stale_writes_rejected"] += 1
+        except Exception as e:
+            logger.warning(f"Cache write of {key} failed: {e}")
+
+    def _handle_event(self, event: Dict[str, Any]) -> None:
+        aggregate_type = event.get("aggregate_type")
+        if aggregate_type in CACHED_AGGREGATES and event.get("aggregate_id"):
+            self.invalidate_local(aggregate_type, event["aggregate_id"])
+
+    async def _run_loop(self) -> None:
+        """Drop in-process entries written by other replicas."""
+        while True:
+            client = self.redis_client.client
+            if client is None:
+                await asyncio.sleep(1.0)
+                continue
+            pubsub = client.pubsub()
+            try:
+                await pubsub.subscribe(self.channel)
+                # Events may have been missed while unsubscribed
+                self._local.clear()
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        self._handle_event(json.loads(message["data"]))
+                    except (ValueError, TypeError, AttributeError):
+                        continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Entity cache invalidation listener failed: {e}")
+                await asyncio.sleep(1.0)
+            finally:
+                try:
+                    await pubsub.close()
+                except Exception:
+                    pass
+
+
+# Global entity cache instance
+entity_cache = EntityCache(redis_client)
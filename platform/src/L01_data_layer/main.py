@@ -12,8 +12,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from .database import db
+from .entity_cache import entity_cache
 from .redis_client import redis_client
-from .middleware import AuthenticationMiddleware
+from .services import PartitionManager, MetricRollupService, OutboxRelay
+from .middleware import AuthenticationMiddleware, WireFormatMiddleware, WriteLSNMiddleware
 from .routers import (
     health_router,
     events_router,
@@ -29,6 +31,7 @@ from .routers import (
     training_examples_router,
     datasets_router,
     models_router,
+    export_router,
     # L06 Evaluation
     quality_scores_router,
     metrics_router,
@@ -56,10 +59,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+partition_manager: PartitionManager = None
+metric_rollups: MetricRollupService = None
+outbox_relay: OutboxRelay = None
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifecycle."""
+    global partition_manager, metric_rollups, outbox_relay
+
     # Startup
     logger.info("Starting L01 Data Layer...")
 
@@ -68,14 +77,33 @@ async def lifespan(app: FastAPI):
         await db.connect()
         logger.info("Database connected")
 
-        # Initialize schema
+        # Apply pending schema migrations
         await db.initialize_schema()
-        logger.info("Database schema initialized")
+        logger.info("Database schema up to date")
+
+        # Create upcoming partitions and drop expired ones
+        partition_manager = PartitionManager(db.pool)
+        await partition_manager.start()
+        logger.info("Partition maintenance started")
+
+        # Keep metric rollups up to date
+        metric_rollups = MetricRollupService(await db.get_workload_pool("analytics"))
+        await metric_rollups.start()
+        logger.info("Metric rollups started")
 
         # Connect to Redis
         await redis_client.connect()
         logger.info("Redis connected")
 
+        # Drop cached entities written by other replicas
+        await entity_cache.start()
+        logger.info("Entity cache invalidation started")
+
+        # Publish events written to the outbox
+        outbox_relay = OutboxRelay(db.pool, redis_client)
+        await outbox_relay.start()
+        logger.info("Event outbox relay started")
+
         logger.info("L01 Data Layer started successfully")
 
     except Exception as e:
@@ -86,6 +114,13 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down L01 Data Layer...")
+    if outbox_relay:
+        await outbox_relay.stop()
+    await entity_cache.stop()
+    if metric_rollups:
+        await metric_rollups.stop()
+    if partition_manager:
+        await partition_manager.stop()
     await db.disconnect()
     await redis_client.disconnect()
     logger.info("L01 Data Layer shut down")
@@ -123,6 +158,9 @@ async def health_live():
     """Unauthenticated liveness check for monitoring and load balancers."""
     return {"status": "alive"}
 
+# Hand out read-your-writes tokens when reads go to replicas
+app.add_middleware(BaseHTTPMiddleware, dispatch=WriteLSNMiddleware(app))
+
 # Add Authentication middleware
 # Note: Authentication can be disabled by setting L01_AUTH_DISABLED=true
 import os
@@ -132,6 +170,9 @@ if os.getenv("L01_AUTH_DISABLED", "false").lower() != "true":
 else:
     logger.warning("L01 authentication middleware DISABLED - not recommended for production!")
 
+# Accept and return MessagePack bodies (outermost, so every response is covered)
+app.add_middleware(WireFormatMiddleware)
+
 # Register routers
 app.include_router(health_router)
 app.include_router(events_router)
@@ -147,6 +188,7 @@ app.include_router(sessions_router)
 app.include_router(training_examples_router)
 app.include_router(datasets_router)
 app.include_router(models_router)
+app.include_router(export_router)
 # L06 Evaluation
 app.include_router(quality_scores_router)
 app.include_router(metrics_router)
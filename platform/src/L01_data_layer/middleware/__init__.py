@@ -3,5 +3,7 @@ L01 Data Layer Middleware
 """
 
 from .auth import AuthenticationMiddleware, generate_api_key
+from .wire_format import WireFormatMiddleware
+from .write_lsn import WriteLSNMiddleware
 
-__all__ = ["AuthenticationMiddleware", "generate_api_key"]
+__all__ = ["AuthenticationMiddleware", "WireFormatMiddleware", "WriteLSNMiddleware", "generate_api_key"]
@@ -0,0 +1,127 @@
+"""
+L01 Data Layer Wire Format Middleware
+
+Lets clients exchange MessagePack instead of JSON. Request bodies sent
+with Content-Type: application/msgpack are converted to JSON before
+routing, and JSON responses are re-encoded as MessagePack when the
+request's Accept header asks for it. Routers only ever see JSON.
+
+Streaming responses (NDJSON exports) and non-JSON responses pass through
+unchanged.
+"""
+
+import logging
+
+import orjson
+
+from shared.wire import MSGPACK_MEDIA_TYPE, is_msgpack, msgpack, pack, unpack
+
+logger = logging.getLogger(__name__)
+
+
+def _header(scope, name: bytes) -> str:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return ""
+
+
+class WireFormatMiddleware:
+    """ASGI middleware transcoding MessagePack request and response bodies."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or msgpack is None:
+            await self.app(scope, receive, send)
+            return
+
+        msgpack_request = is_msgpack(_header(scope, b"content-type"))
+        msgpack_response = is_msgpack(_header(scope, b"accept"))
+        if not msgpack_request and not msgpack_response:
+            await self.app(scope, receive, send)
+            return
+
+        if msgpack_request:
+            receive = await self._transcode_request(scope, receive)
+        if msgpack_response:
+            send = self._transcoding_send(send)
+        await self.app(scope, receive, send)
+
+    async def _transcode_request(self, scope, receive):
+        """Read the MessagePack body and replay it to the app as JSON."""
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            if message["type"] != "http.request":
+                # Client disconnected before sending the body
+                return receive
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+
+        try:
+            body = orjson.dumps(unpack(body)) if body else body
+        except Exception as e:
+            logger.warning(f"Invalid MessagePack request body: {e}")
+            # Leave the body as is; validation rejects it with a 422
+        headers = [(k, v) for k, v in scope["headers"] if k not in (b"content-type", b"content-length")]
+        headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        scope["headers"] = headers
+
+        sent = False
+
+        async def replay():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        return replay
+
+    def _transcoding_send(self, send):
+        """Buffer JSON responses and send them as MessagePack."""
+        start = None
+        chunks = []
+
+        async def transcode(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                if _content_type(message).startswith("application/json"):
+                    start = message
+                    return
+                await send(message)
+                return
+
+            if message["type"] != "http.response.body" or start is None:
+                await send(message)
+                return
+
+            chunks.append(message.get("body", b""))
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            try:
+                body = pack(orjson.loads(body)) if body else body
+                content_type = MSGPACK_MEDIA_TYPE.encode()
+            except Exception as e:
+                logger.warning(f"Failed to encode response as MessagePack: {e}")
+                content_type = b"application/json"
+            headers = [
+                (k, v) for k, v in start.get("headers", [])
+                if k not in (b"content-type", b"content-length")
+            ]
+            headers += [(b"content-type", content_type), (b"content-length", str(len(body)).encode())]
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body, "more_body": False})
+
+        return transcode
+
+
+def _content_type(message) -> str:
+    for key, value in message.get("headers", []):
+        if key == b"content-type":
+            return value.decode("latin-1")
+    return ""
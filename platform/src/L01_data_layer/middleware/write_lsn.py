@@ -0,0 +1,46 @@
+"""
+L01 Data Layer Read-Your-Writes Middleware
+
+Stamps successful write responses with the primary's WAL position so that
+clients can require later reads to be served from a caught-up replica.
+"""
+
+import logging
+
+from fastapi import Request
+
+from ..database import db
+from ..replicas import WRITE_LSN_HEADER
+
+logger = logging.getLogger(__name__)
+
+WRITE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+class WriteLSNMiddleware:
+    """
+    Adds WRITE_LSN_HEADER to successful write responses.
+
+    Only active when read replicas are configured; without them every
+    read goes to the primary and no token is needed.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, request: Request, call_next):
+        """Process request, then stamp the write position on writes"""
+        response = await call_next(request)
+
+        if request.method not in WRITE_METHODS or response.status_code >= 400 or db.replicas is None:
+            return response
+
+        try:
+            lsn = await db.write_lsn()
+        except Exception as e:
+            # Without a token the client's next read may see a lagging replica
+            logger.warning(f"Failed to read write LSN: {e}")
+            return response
+        if lsn:
+            response.headers[WRITE_LSN_HEADER] = lsn
+        return response
@@ -0,0 +1,150 @@
+"""
+Versioned schema migrations for L01 Data Layer.
+
+Migrations are forward-only and numbered. Applied migrations are
+recorded in schema_migrations together with a checksum of their SQL, so
+an edited migration is detected instead of silently diverging. A
+startup check that finds nothing pending is a single SELECT; applying
+migrations takes a PostgreSQL advisory lock so that only one replica
+migrates during a rolling deploy while the others wait.
+
+To change the schema, append a Migration to database.MIGRATIONS; never
+edit one that has been released.
+"""
+
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_lock key shared by every L01 replica ("L01_MIGR")
+MIGRATION_LOCK_ID = 0x4C30315F4D494752
+
+SCHEMA_MIGRATIONS_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version INTEGER PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    checksum VARCHAR(64) NOT NULL,
+    execution_ms INTEGER,
+    applied_at TIMESTAMP DEFAULT NOW()
+)
+"""
+
+
+class MigrationError(Exception):
+    """Migration history does not match the migrations in code."""
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One forward schema migration."""
+
+    version: int
+    name: str
+    sql: str
+
+    @property
+    def checksum(self) -> str:
+        """SHA-256 of the migration SQL."""
+        return hashlib.sha256(self.sql.encode()).hexdigest()
+
+
+class MigrationRunner:
+    """Applies pending migrations once across all replicas."""
+
+    def __init__(self, pool: asyncpg.Pool, migrations: Sequence[Migration]):
+        versions = [m.version for m in migrations]
+        if versions != sorted(set(versions)):
+            raise ValueError("Migration versions must be unique and ascending")
+        self.pool = pool
+        self.migrations = list(migrations)
+
+    async def migrate(self) -> List[int]:
+        """
+        Apply pending migrations.
+
+        Returns:
+            Versions applied by this call (empty if the schema was current)
+        """
+        async with self.pool.acquire() as conn:
+            if await self._is_current(conn):
+                logger.info("Database schema is up to date")
+                return []
+
+            # Session-level lock: other replicas block here until we finish,
+            # then see the migrations as applied
+            await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_ID)
+            try:
+                await conn.execute(SCHEMA_MIGRATIONS_TABLE)
+                applied = await self._applied(conn)
+                self._verify(applied)
+
+                done = []
+                for migration in self.migrations:
+                    if migration.version in applied:
+                        continue
+                    await self._apply(conn, migration)
+                    done.append(migration.version)
+                return done
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_ID)
+
+    async def status(self) -> List[Dict[str, Any]]:
+        """List migrations with their applied time (None if pending)."""
+        async with self.pool.acquire() as conn:
+            exists = await conn.fetchval("SELECT to_regclass('schema_migrations') IS NOT NULL")
+            rows = {}
+            if exists:
+                for row in await conn.fetch("SELECT version, applied_at FROM schema_migrations"):
+                    rows[row["version"]] = row["applied_at"]
+        return [
+            {"version": m.version, "name": m.name, "applied_at": rows.get(m.version)}
+            for m in self.migrations
+        ]
+
+    async def _is_current(self, conn: asyncpg.Connection) -> bool:
+        """Whether every migration is applied with a matching checksum (no locks taken)."""
+        if not await conn.fetchval("SELECT to_regclass('schema_migrations') IS NOT NULL"):
+            return False
+        applied = await self._applied(conn)
+        self._verify(applied)
+        return all(m.version in applied for m in self.migrations)
+
+    async def _applied(self, conn: asyncpg.Connection) -> Dict[int, str]:
+        """Applied versions and their checksums."""
+        rows = await conn.fetch("SELECT version, checksum FROM schema_migrations")
+        return {row["version"]: row["checksum"] for row in rows}
+
+    def _verify(self, applied: Dict[int, str]) -> None:
+        """Fail if an applied migration was edited afterwards."""
+        for migration in self.migrations:
+            checksum = applied.get(migration.version)
+            if checksum is not None and checksum != migration.checksum:
+                raise MigrationError(
+                    f"Checksum mismatch for migration {migration.version} "
+                    f"({migration.name}): it was changed after being applied"
+                )
+
+    async def _apply(self, conn: asyncpg.Connection, migration: Migration) -> None:
+        """Run one migration and record it in the same transaction."""
+        logger.info(f"Applying migration {migration.version}: {migration.name}")
+        start = time.perf_counter()
+        async with conn.transaction():
+            await conn.execute(migration.sql)
+            execution_ms = int((time.perf_counter() - start) * 1000)
+            await conn.execute(
+                """
+                INSERT INTO schema_migrations (version, name, checksum, execution_ms)
+                VALUES ($1, $2, $3, $4)
+                """,
+                migration.version,
+                migration.name,
+                migration.checksum,
+                execution_ms,
+            )
+        logger.info(f"Applied migration {migration.version} in {execution_ms}ms")
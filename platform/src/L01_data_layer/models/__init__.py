@@ -5,7 +5,7 @@ from .config import Configuration, ConfigCreate, ConfigUpdate
 from .document import Document, DocumentCreate, DocumentUpdate
 from .error_codes import L01ErrorCode
 from .evaluation import Evaluation, EvaluationCreate
-from .event import Event, EventCreate
+from .event import Event, EventCreate, AggregateSnapshot, SnapshotCreate, AggregateReplay
 from .feedback import FeedbackEntry, FeedbackCreate, FeedbackUpdate
 from .goal import Goal, GoalCreate, GoalUpdate, GoalStatus
 from .model_usage import ModelUsage, ModelUsageCreate
@@ -31,6 +31,9 @@ __all__ = [
     "EvaluationCreate",
     "Event",
     "EventCreate",
+    "AggregateSnapshot",
+    "SnapshotCreate",
+    "AggregateReplay",
     "FeedbackEntry",
     "FeedbackCreate",
     "FeedbackUpdate",
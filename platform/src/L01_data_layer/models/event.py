@@ -1,7 +1,7 @@
 """Event models for event sourcing."""
 
 from pydantic import BaseModel, Field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 from uuid import UUID, uuid4
 
@@ -13,7 +13,10 @@ class EventCreate(BaseModel):
     aggregate_id: UUID = Field(..., description="Aggregate ID")
     payload: Dict[str, Any] = Field(default_factory=dict, description="Event payload")
     metadata: Dict[str, Any] = Field(default_factory=dict, description="Event metadata")
-    version: int = Field(default=1, description="Event version")
+    expected_version: Optional[int] = Field(
+        default=None,
+        description="Append only if the aggregate's latest version is this",
+    )
 
 
 class Event(BaseModel):
@@ -29,3 +32,28 @@ class Event(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class AggregateSnapshot(BaseModel):
+    """Aggregate state as of a version."""
+    aggregate_type: str
+    aggregate_id: UUID
+    version: int
+    state: Dict[str, Any] = Field(default_factory=dict)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class SnapshotCreate(BaseModel):
+    """Snapshot save request."""
+    version: int = Field(..., description="Aggregate version the state includes")
+    state: Dict[str, Any] = Field(..., description="Aggregate state")
+
+
+class AggregateReplay(BaseModel):
+    """Latest snapshot of an aggregate and the events after it."""
+    aggregate_type: str
+    aggregate_id: UUID
+    version: int = Field(..., description="Latest aggregate version")
+    snapshot: Optional[AggregateSnapshot] = None
+    events: List[Event] = Field(default_factory=list, description="Events after the snapshot, by version")
+    state: Dict[str, Any] = Field(default_factory=dict, description="Snapshot state with the events applied")
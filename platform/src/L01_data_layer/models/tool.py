@@ -91,6 +91,9 @@ class ToolExecutionCreate(BaseModel):
     memory_mb_limit: Optional[int] = None
     timeout_seconds: Optional[int] = None
 
+    # Record time (bulk ingestion; defaults to insert time)
+    created_at: Optional[datetime] = None
+
 
 class ToolExecutionUpdate(BaseModel):
     """Tool execution update request."""
@@ -0,0 +1,83 @@
+"""
+Keyset (cursor) pagination helpers for L01 list endpoints.
+
+A cursor encodes the sort key (timestamp, id) of the last row of a page.
+The next page is everything strictly after it in the listing order,
+which uses the (timestamp, id) index instead of scanning and discarding
+OFFSET rows. Cursors are opaque url-safe strings to clients.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+
+# Response header carrying the cursor of the next page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorError(ValueError):
+    """Cursor could not be decoded."""
+
+
+def encode_cursor(timestamp: datetime, row_id: Any) -> str:
+    """Encode the sort key of a row as an opaque cursor."""
+    raw = json.dumps([timestamp.isoformat(), str(row_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursorError(f"Invalid cursor: {cursor}") from e
+
+
+def keyset_condition(
+    cursor: Optional[str],
+    param_idx: int,
+    column: str = "created_at",
+    descending: bool = True
+) -> Tuple[Optional[str], List[Any], int]:
+    """
+    WHERE condition selecting rows after a cursor.
+
+    Args:
+        cursor: Cursor from the previous page (None for the first page)
+        param_idx: Next free query parameter index
+        column: Timestamp column of the sort key
+        descending: Whether the listing is newest first
+
+    Returns:
+        (condition or None, parameters, next free parameter index)
+    """
+    if not cursor:
+        return None, [], param_idx
+    timestamp, row_id = decode_cursor(cursor)
+    op = "<" if descending else ">"
+    condition = f"({column}, id) {op} (${param_idx}, ${param_idx + 1})"
+    return condition, [timestamp, row_id], param_idx + 2
+
+
+def order_by(column: str = "created_at", descending: bool = True) -> str:
+    """ORDER BY clause matching keyset_condition."""
+    direction = "DESC" if descending else "ASC"
+    return f"ORDER BY {column} {direction}, id {direction}"
+
+
+def next_cursor(items: List[Any], limit: int, column: str = "created_at") -> Optional[str]:
+    """
+    Cursor for the page after items, or None if this was the last page.
+
+    Items may be models or mappings with the sort key fields.
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    if isinstance(last, dict):
+        return encode_cursor(last[column], last["id"])
+    return encode_cursor(getattr(last, column), last.id)
@@ -0,0 +1,52 @@
+"""
+Partition layout of the time-partitioned L01 tables.
+
+Shared by the schema migrations (database.py) and PartitionManager so
+both agree on each table's partition column, interval and retention.
+"""
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+
+@dataclass(frozen=True)
+class PartitionSpec:
+    """How a table is partitioned and how long partitions are kept.
+
+    dedupe_key names the column that identifies a row across retries.
+    Unique keys of a partitioned table must include the partition
+    column, so this key is kept in partition_dedupe_keys instead.
+    """
+
+    column: str
+    interval: str = "day"
+    retention_days: Optional[int] = None
+    dedupe_key: Optional[str] = None
+
+    @property
+    def step(self) -> timedelta:
+        """Width of one partition."""
+        if self.interval == "week":
+            return timedelta(weeks=1)
+        if self.interval == "day":
+            return timedelta(days=1)
+        raise ValueError(f"Unsupported partition interval: {self.interval}")
+
+    def floor(self, moment: datetime) -> datetime:
+        """Lower bound of the partition containing moment."""
+        start = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+        if self.interval == "week":
+            start -= timedelta(days=start.weekday())
+        return start
+
+
+# Partitioned tables; events are kept forever as the event-sourcing log
+PARTITIONED_TABLES: Dict[str, PartitionSpec] = {
+    "events": PartitionSpec("created_at", "week"),
+    "metrics": PartitionSpec("timestamp", "day", retention_days=30),
+    "api_requests": PartitionSpec("timestamp", "day", retention_days=30, dedupe_key="request_id"),
+    "tool_executions": PartitionSpec("created_at", "day", retention_days=90, dedupe_key="invocation_id"),
+    "saga_steps": PartitionSpec("created_at", "week", retention_days=90, dedupe_key="step_id"),
+    "model_usage": PartitionSpec("created_at", "week", retention_days=365, dedupe_key="request_id"),
+}
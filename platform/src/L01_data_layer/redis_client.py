@@ -5,7 +5,7 @@ Redis client for event publishing and caching.
 import redis.asyncio as redis
 import json
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
@@ -74,6 +74,62 @@ class RedisClient:
         except Exception as e:
             logger.error(f"Failed to publish event {event_type}: {e}")
 
+    async def publish_events(self, events: List[Dict[Any, Any]]):
+        """
+        Publish several events to the l01:events channel in one round trip.
+
+        Args:
+            events: Dicts with the publish_event arguments
+        """
+        if not self.client:
+            logger.warning("Redis not connected, skipping event publish")
+            return
+        if not events:
+            return
+
+        timestamp = datetime.utcnow().isoformat()
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for event in events:
+                pipe.publish("l01:events", json.dumps({
+                    "event_type": event["event_type"],
+                    "aggregate_type": event["aggregate_type"],
+                    "aggregate_id": event["aggregate_id"],
+                    "payload": event["payload"],
+                    "metadata": event.get("metadata") or {},
+                    "timestamp": timestamp
+                }))
+            await pipe.execute()
+            logger.debug(f"Published {len(events)} events")
+        except Exception as e:
+            logger.error(f"Failed to publish {len(events)} events: {e}")
+
+    async def publish_messages(self, messages: List[str], stream: Optional[str] = None,
+                               stream_maxlen: Optional[int] = None):
+        """
+        Publish pre-serialized events in order in one pipelined round trip.
+
+        Each message is PUBLISHed to l01:events and, if stream is given,
+        also XADDed to that stream (trimmed to about stream_maxlen entries).
+        Unlike publish_event, errors are raised so the caller can retry.
+
+        Args:
+            messages: JSON-encoded events
+            stream: Optional Redis stream to append to
+            stream_maxlen: Approximate stream length cap
+        """
+        if not self.client:
+            raise RuntimeError("Redis not connected")
+        if not messages:
+            return
+
+        pipe = self.client.pipeline(transaction=False)
+        for message in messages:
+            pipe.publish("l01:events", message)
+            if stream:
+                pipe.xadd(stream, {"event": message}, maxlen=stream_maxlen, approximate=True)
+        await pipe.execute()
+
     async def health_check(self) -> bool:
         """Check Redis connectivity."""
         if not self.client:
@@ -0,0 +1,207 @@
+"""
+Read-replica routing for L01 read endpoints.
+
+Replicas are configured with POSTGRES_REPLICA_URLS (comma-separated
+DSNs). A background check records each replica's replayed WAL position
+and replication delay; reads go round-robin to replicas that are within
+max_lag_seconds of the primary and fall back to the primary otherwise.
+
+Read-your-writes: every successful write response carries the primary's
+WAL position after the write (WRITE_LSN_HEADER). A client that sends it
+back on later reads (MIN_LSN_HEADER) is only served by a replica that has
+replayed at least that far, so it never reads older data than it wrote.
+L01Client and shared.clients.L01Client do this automatically.
+"""
+
+import asyncio
+import itertools
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+from shared.db_pool import ManagedPool, get_pool_manager
+from shared.wire import MIN_LSN_HEADER, WRITE_LSN_HEADER, parse_lsn  # noqa: F401  (re-exported)
+
+logger = logging.getLogger(__name__)
+
+
+def replica_dsns_from_env() -> List[str]:
+    """Replica DSNs from POSTGRES_REPLICA_URLS."""
+    return [dsn.strip() for dsn in os.getenv("POSTGRES_REPLICA_URLS", "").split(",") if dsn.strip()]
+
+
+class _Replica:
+    """A replica pool and its last observed replication state."""
+
+    def __init__(self, index: int, pool: ManagedPool):
+        self.index = index
+        self.pool = pool
+        self.healthy = False
+        self.replay_lsn: Optional[int] = None
+        self.lag_seconds: Optional[float] = None
+        self.lag_bytes: Optional[int] = None
+
+
+class ReplicaRouter:
+    """Chooses the pool a read is served from."""
+
+    def __init__(
+        self,
+        primary: ManagedPool,
+        replica_dsns: List[str],
+        max_lag_seconds: float = 5.0,
+        check_interval: float = 1.0,
+    ):
+        """
+        Initialize replica router.
+
+        Args:
+            primary: Primary (read-write) pool
+            replica_dsns: Connection strings of streaming replicas
+            max_lag_seconds: Replicas further behind than this are not read from
+            check_interval: Seconds between replication state checks
+        """
+        self.primary = primary
+        self.replica_dsns = replica_dsns
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self._replicas: List[_Replica] = []
+        self._next = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "replica_reads": 0,
+            "primary_reads": 0,
+            "lag_fallbacks": 0,
+            "lsn_fallbacks": 0,
+        }
+
+    async def start(self) -> None:
+        """Open replica pools and check their state in the background."""
+        manager = get_pool_manager()
+        for index, dsn in enumerate(self.replica_dsns):
+            try:
+                pool = await manager.get_pool(f"replica{index}", dsn, defaults=self.primary.config)
+            except Exception as e:
+                logger.error(f"Failed to connect to read replica {index}: {e}")
+                continue
+            self._replicas.append(_Replica(index, pool))
+        await self.check()
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+        logger.info(f"Routing reads to {len(self._replicas)} replica(s)")
+
+    async def stop(self) -> None:
+        """Stop state checks and release replica pools."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for replica in self._replicas:
+            await replica.pool.close()
+        self._replicas.clear()
+
+    def read_pool(self, min_lsn: Optional[str] = None) -> ManagedPool:
+        """
+        Pool to serve a read from.
+
+        Args:
+            min_lsn: WAL position the read must reflect (from MIN_LSN_HEADER)
+
+        Returns:
+            A caught-up replica pool, or the primary pool
+        """
+        required = parse_lsn(min_lsn)
+        candidates = [replica for replica in self._replicas if replica.healthy]
+        if not candidates:
+            if self._replicas:
+                self._stats["lag_fallbacks"] += 1
+            self._stats["primary_reads"] += 1
+            return self.primary
+        if required is not None:
+            candidates = [
+                replica for replica in candidates
+                if replica.replay_lsn is not None and replica.replay_lsn >= required
+            ]
+            if not candidates:
+                self._stats["lsn_fallbacks"] += 1
+                self._stats["primary_reads"] += 1
+                return self.primary
+        self._stats["replica_reads"] += 1
+        return candidates[next(self._next) % len(candidates)].pool
+
+    async def current_lsn(self) -> str:
+        """The primary's current WAL position (the read-your-writes token)."""
+        async with self.primary.acquire() as conn:
+            return await conn.fetchval("SELECT pg_current_wal_lsn()::text")
+
+    async def check(self) -> None:
+        """Refresh the replication state of every replica."""
+        if not self._replicas:
+            return
+        try:
+            primary_lsn = parse_lsn(await self.current_lsn())
+        except Exception as e:
+            logger.error(f"Failed to read primary WAL position: {e}")
+            primary_lsn = None
+        for replica in self._replicas:
+            await self._check_replica(replica, primary_lsn)
+
+    async def _check_replica(self, replica: _Replica, primary_lsn: Optional[int]) -> None:
+        """Record a replica's replayed position and lag; mark it unhealthy on error."""
+        try:
+            async with replica.pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    SELECT pg_last_wal_replay_lsn()::text AS replay_lsn,
+                           EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp())::float8 AS lag_seconds
+                    """
+                )
+        except Exception as e:
+            if replica.healthy:
+                logger.warning(f"Read replica {replica.index} unavailable: {e}")
+            replica.healthy = False
+            return
+
+        replica.replay_lsn = parse_lsn(row["replay_lsn"])
+        if replica.replay_lsn is None:
+            # Not in recovery: a misconfigured DSN pointing at a primary
+            replica.healthy = False
+            return
+        replica.lag_bytes = max(primary_lsn - replica.replay_lsn, 0) if primary_lsn is not None else None
+        if replica.lag_bytes == 0:
+            # Fully replayed; the replay timestamp only ages while the primary is idle
+            replica.lag_seconds = 0.0
+        else:
+            replica.lag_seconds = row["lag_seconds"]
+        healthy = replica.lag_seconds is not None and replica.lag_seconds <= self.max_lag_seconds
+        if replica.healthy and not healthy:
+            logger.warning(f"Read replica {replica.index} is {replica.lag_seconds}s behind, reading from primary")
+        replica.healthy = healthy
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Routing counters and the last observed state of each replica."""
+        return {
+            **self._stats,
+            "max_lag_seconds": self.max_lag_seconds,
+            "replicas": [
+                {
+                    "index": replica.index,
+                    "healthy": replica.healthy,
+                    "lag_seconds": replica.lag_seconds,
+                    "lag_bytes": replica.lag_bytes,
+                }
+                for replica in self._replicas
+            ],
+        }
+
+    async def _run_loop(self) -> None:
+        """Check replicas every check_interval seconds."""
+        while True:
+            await asyncio.sleep(self.check_interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.error(f"Read replica check failed: {e}")
@@ -14,6 +14,7 @@ from .sessions import router as sessions_router
 from .training_examples import router as training_examples_router
 from .datasets import router as datasets_router
 from .models import router as models_router
+from .export import router as export_router
 
 # L06 Evaluation routers
 from .quality_scores import router as quality_scores_router
@@ -52,6 +53,7 @@ __all__ = [
     "training_examples_router",
     "datasets_router",
     "models_router",
+    "export_router",
     # L06 Evaluation
     "quality_scores_router",
     "metrics_router",
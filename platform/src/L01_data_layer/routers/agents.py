@@ -1,18 +1,23 @@
 """Agent endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException
 from typing import Optional
 from uuid import UUID
 
 from ..models import Agent, AgentCreate, AgentUpdate, AgentStatus
 from ..services import AgentRegistry
 from ..database import db
+from ..entity_cache import entity_cache
 from ..redis_client import redis_client
+from ..replicas import MIN_LSN_HEADER
 
 router = APIRouter(prefix="/agents", tags=["agents"])
 
 def get_agent_registry():
-    return AgentRegistry(db.get_pool(), redis_client)
+    return AgentRegistry(db.get_pool(), redis_client, entity_cache)
+
+def get_agent_reader(min_lsn: Optional[str] = Header(None, alias=MIN_LSN_HEADER)):
+    return AgentRegistry(db.read_pool(min_lsn), redis_client, entity_cache)
 
 @router.post("/", response_model=Agent, status_code=201)
 async def create_agent(agent_data: AgentCreate, registry: AgentRegistry = Depends(get_agent_registry)):
@@ -23,12 +28,12 @@ async def list_agents(
     status: Optional[AgentStatus] = None,
     limit: int = 100,
     offset: int = 0,
-    registry: AgentRegistry = Depends(get_agent_registry)
+    registry: AgentRegistry = Depends(get_agent_reader)
 ):
     return await registry.list_agents(status, limit, offset)
 
 @router.get("/{agent_id}", response_model=Agent)
-async def get_agent(agent_id: UUID, registry: AgentRegistry = Depends(get_agent_registry)):
+async def get_agent(agent_id: UUID, registry: AgentRegistry = Depends(get_agent_reader)):
     agent = await registry.get_agent(agent_id)
     if not agent:
         raise HTTPException(status_code=404, detail="Agent not found")
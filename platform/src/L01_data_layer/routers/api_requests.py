@@ -2,16 +2,25 @@
 
 import json
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 
-from ..database import db
+from ..database import db, bulk_insert, convert_records, fetch_deduplicated, parse_timestamp
 
 router = APIRouter(prefix="/api-requests", tags=["api-gateway"])
 
+API_REQUEST_COLUMNS = (
+    "request_id", "trace_id", "span_id", "timestamp", "method", "path",
+    "consumer_id", "tenant_id", "authenticated", "auth_method",
+    "status_code", "latency_ms", "request_size_bytes", "response_size_bytes",
+    "rate_limit_tier", "idempotency_key", "idempotent_cache_hit",
+    "error_code", "error_message", "client_ip", "user_agent",
+    "headers", "query_params", "metadata",
+)
+
 
 class APIRequestCreate(BaseModel):
     """API request creation model."""
@@ -98,6 +107,13 @@ async def create_api_request(request_data: APIRequestCreate):
                 query_params_json,
                 metadata_json,
             )
+            if record is None:
+                # Retried request; return what the first attempt recorded
+                record = await fetch_deduplicated(
+                    conn, "api_requests", request_data.request_id,
+                    "id, request_id, trace_id, span_id, timestamp, method, path, "
+                    "status_code, latency_ms, created_at"
+                )
 
             return dict(record)
 
@@ -105,6 +121,55 @@ async def create_api_request(request_data: APIRequestCreate):
         raise HTTPException(status_code=500, detail=f"Failed to create API request: {str(e)}")
 
 
+def _api_request_row(record: dict) -> tuple:
+    """Row tuple of one bulk API request record."""
+    r = APIRequestCreate.model_validate(record)
+    return (
+        r.request_id,
+        r.trace_id,
+        r.span_id,
+        parse_timestamp(r.timestamp),
+        r.method,
+        r.path,
+        r.consumer_id,
+        r.tenant_id,
+        r.authenticated,
+        r.auth_method,
+        r.status_code,
+        r.latency_ms,
+        r.request_size_bytes,
+        r.response_size_bytes,
+        r.rate_limit_tier,
+        r.idempotency_key,
+        r.idempotent_cache_hit,
+        r.error_code,
+        r.error_message,
+        r.client_ip,
+        r.user_agent,
+        json.dumps(r.headers or {}),
+        json.dumps(r.query_params or {}),
+        json.dumps(r.metadata or {}),
+    )
+
+
+@router.post("/bulk", status_code=201)
+async def create_api_requests_bulk(records: List[dict]):
+    """Create many API request records with one COPY; duplicate request IDs are skipped.
+
+    Invalid records are left out and their indexes returned in "rejected".
+    """
+    rows, rejected = convert_records(records, _api_request_row)
+    try:
+        inserted = await bulk_insert(
+            await db.get_workload_pool("bulk"), "api_requests", API_REQUEST_COLUMNS, rows,
+            conflict_columns=("request_id", "timestamp")
+        )
+        return {"received": len(records), "inserted": inserted, "rejected": rejected}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create API requests: {str(e)}")
+
+
 @router.get("/{request_id}")
 async def get_api_request(request_id: str):
     """Get API request by request_id."""
@@ -3,11 +3,13 @@ from fastapi import APIRouter, Depends, HTTPException
 from ..models import Configuration, ConfigCreate
 from ..services import ConfigStore
 from ..database import db
+from ..entity_cache import entity_cache
+from ..redis_client import redis_client
 
 router = APIRouter(prefix="/config", tags=["config"])
 
 def get_config_store():
-    return ConfigStore(db.get_pool())
+    return ConfigStore(db.get_pool(), redis_client, entity_cache)
 
 @router.get("/{namespace}/{key}", response_model=Configuration)
 async def get_config(namespace: str, key: str, store: ConfigStore = Depends(get_config_store)):
@@ -1,10 +1,11 @@
 """Dataset endpoints for L07 integration."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from typing import Optional, List
 from uuid import UUID
 from ..models import Dataset, DatasetCreate, DatasetUpdate, DatasetSplit
 from ..services import DatasetService
 from ..database import db
+from ..pagination import NEXT_CURSOR_HEADER, InvalidCursorError, next_cursor
 from ..redis_client import redis_client
 
 router = APIRouter(prefix="/datasets", tags=["datasets", "learning"])
@@ -25,19 +26,29 @@ async def create_dataset(
 
 @router.get("/", response_model=list[Dataset])
 async def list_datasets(
+    response: Response,
     name_filter: Optional[str] = None,
     tag_filter: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     service: DatasetService = Depends(get_dataset_service)
 ):
-    """List datasets with optional filters."""
-    return await service.list_datasets(
-        name_filter=name_filter,
-        tag_filter=tag_filter,
-        limit=limit,
-        offset=offset
-    )
+    """List datasets with optional filters (cursor of next page in X-Next-Cursor)."""
+    try:
+        datasets = await service.list_datasets(
+            name_filter=name_filter,
+            tag_filter=tag_filter,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    cursor = next_cursor(datasets, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return datasets
 
 
 @router.get("/statistics")
@@ -1,12 +1,13 @@
 """Event endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from typing import Optional
 from uuid import UUID
 
-from ..models import Event, EventCreate
-from ..services import EventStore
+from ..models import Event, EventCreate, AggregateReplay, SnapshotCreate
+from ..services import EventStore, VersionConflictError
 from ..database import db
+from ..pagination import NEXT_CURSOR_HEADER, InvalidCursorError, next_cursor
 from ..redis_client import redis_client
 
 router = APIRouter(prefix="/events", tags=["events"])
@@ -16,18 +17,50 @@ def get_event_store():
 
 @router.post("/", response_model=Event, status_code=201)
 async def create_event(event_data: EventCreate, store: EventStore = Depends(get_event_store)):
-    return await store.create_event(event_data)
+    try:
+        return await store.create_event(event_data)
+    except VersionConflictError as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 @router.get("/", response_model=list[Event])
 async def list_events(
+    response: Response,
     aggregate_id: Optional[UUID] = None,
     aggregate_type: Optional[str] = None,
     event_type: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     store: EventStore = Depends(get_event_store)
 ):
-    return await store.query_events(aggregate_id, aggregate_type, event_type, limit, offset)
+    try:
+        events = await store.query_events(aggregate_id, aggregate_type, event_type, limit, offset, cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    cursor = next_cursor(events, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return events
+
+@router.get("/aggregates/{aggregate_type}/{aggregate_id}/replay", response_model=AggregateReplay)
+async def replay_aggregate(
+    aggregate_type: str,
+    aggregate_id: UUID,
+    store: EventStore = Depends(get_event_store)
+):
+    """Latest snapshot of an aggregate, the events after it and the resulting state."""
+    return await store.replay(aggregate_type, aggregate_id)
+
+@router.put("/aggregates/{aggregate_type}/{aggregate_id}/snapshot")
+async def save_snapshot(
+    aggregate_type: str,
+    aggregate_id: UUID,
+    snapshot: SnapshotCreate,
+    store: EventStore = Depends(get_event_store)
+):
+    """Store aggregate state computed by the caller; older versions are ignored."""
+    saved = await store.save_snapshot(aggregate_type, aggregate_id, snapshot.version, snapshot.state)
+    return {"saved": saved}
 
 @router.get("/{event_id}", response_model=Event)
 async def get_event(event_id: UUID, store: EventStore = Depends(get_event_store)):
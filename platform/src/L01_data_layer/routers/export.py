@@ -0,0 +1,94 @@
+"""Streaming NDJSON export router."""
+
+from typing import Any, AsyncIterator, List, Optional
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from ..database import db, parse_timestamp
+from ..pagination import InvalidCursorError, keyset_condition, order_by
+
+router = APIRouter(prefix="/export", tags=["export"])
+
+# Exportable tables and the timestamp column of their sort key
+EXPORTABLE_TABLES = {
+    "events": "created_at",
+    "tool_executions": "created_at",
+    "model_usage": "created_at",
+    "training_examples": "created_at",
+    "datasets": "created_at",
+    "metrics": "timestamp",
+    "api_requests": "timestamp",
+}
+
+
+async def _stream_rows(query: str, params: List[Any], batch_size: int) -> AsyncIterator[str]:
+    """Yield NDJSON chunks from a server-side cursor, batch_size rows at a time."""
+    pool = await db.get_workload_pool("analytics")
+    async with pool.acquire() as conn:
+        async with conn.transaction(isolation="repeatable_read", readonly=True):
+            lines = []
+            async for row in conn.cursor(query, *params, prefetch=batch_size):
+                lines.append(row["line"])
+                if len(lines) >= batch_size:
+                    yield "\n".join(lines) + "\n"
+                    lines = []
+            if lines:
+                yield "\n".join(lines) + "\n"
+
+
+@router.get("/{table}")
+async def export_table(
+    table: str,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    cursor: Optional[str] = None,
+    batch_size: int = Query(1000, ge=1, le=10000),
+):
+    """
+    Stream a table as newline-delimited JSON, oldest first.
+
+    Rows are ordered by (timestamp, id) and read through a server-side
+    cursor, so memory use does not depend on the table size. To resume an
+    interrupted export, pass the cursor of the last row received.
+    """
+    column = EXPORTABLE_TABLES.get(table)
+    if column is None:
+        raise HTTPException(status_code=404, detail=f"Table not exportable: {table}")
+
+    conditions = []
+    params = []
+    param_count = 1
+
+    if start_time:
+        conditions.append(f"{column} >= ${param_count}")
+        params.append(parse_timestamp(start_time))
+        param_count += 1
+
+    if end_time:
+        conditions.append(f"{column} <= ${param_count}")
+        params.append(parse_timestamp(end_time))
+        param_count += 1
+
+    try:
+        keyset, keyset_params, param_count = keyset_condition(
+            cursor, param_count, column=column, descending=False
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if keyset:
+        conditions.append(keyset)
+        params.extend(keyset_params)
+
+    where_clause = " AND ".join(conditions) if conditions else "TRUE"
+    query = f"""
+        SELECT row_to_json(t)::text AS line
+        FROM {table} t
+        WHERE {where_clause}
+        {order_by(column, descending=False)}
+    """
+
+    return StreamingResponse(
+        _stream_rows(query, params, batch_size),
+        media_type="application/x-ndjson",
+    )
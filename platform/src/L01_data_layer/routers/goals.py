@@ -1,11 +1,12 @@
 """Goals API router for L05 Planning integration."""
 
 import json
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 from typing import Optional
 from uuid import UUID
 
 from ..database import db
+from ..replicas import MIN_LSN_HEADER
 
 router = APIRouter(prefix="/goals", tags=["goals"])
 
@@ -62,11 +63,11 @@ async def create_goal(goal_data: dict):
 
 
 @router.get("/{goal_id}")
-async def get_goal(goal_id: str):
+async def get_goal(goal_id: str, min_lsn: Optional[str] = Header(None, alias=MIN_LSN_HEADER)):
     """Get goal by goal_id."""
     query = "SELECT * FROM goals WHERE goal_id = $1"
 
-    async with db.pool.acquire() as conn:
+    async with db.read_pool(min_lsn).acquire() as conn:
         row = await conn.fetchrow(query, goal_id)
         if not row:
             raise HTTPException(status_code=404, detail="Goal not found")
@@ -115,7 +116,8 @@ async def list_goals(
     agent_did: Optional[str] = None,
     status: Optional[str] = None,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    min_lsn: Optional[str] = Header(None, alias=MIN_LSN_HEADER)
 ):
     """List goals with filters."""
     conditions = []
@@ -146,6 +148,6 @@ async def list_goals(
     """
     params.extend([limit, offset])
 
-    async with db.pool.acquire() as conn:
+    async with db.read_pool(min_lsn).acquire() as conn:
         rows = await conn.fetch(query, *params)
         return [dict(row) for row in rows]
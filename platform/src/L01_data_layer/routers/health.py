@@ -1,8 +1,11 @@
 """Health check endpoints."""
 
 from fastapi import APIRouter, Depends
+from shared.db_pool import get_pool_manager
 from ..database import db
+from ..entity_cache import entity_cache
 from ..redis_client import redis_client
+from ..services import OutboxRelay
 
 router = APIRouter(prefix="/health", tags=["health"])
 
@@ -23,3 +26,26 @@ async def readiness():
         "database": "up" if db_ok else "down",
         "redis": "up" if redis_ok else "down",
     }
+
+@router.get("/outbox")
+async def outbox_lag():
+    """Event outbox backlog: pending messages and age of the oldest (relay lag)."""
+    relay = OutboxRelay(db.get_pool(), redis_client)
+    return await relay.get_lag()
+
+@router.get("/pools")
+async def pool_stats():
+    """Connection pool size, utilisation and acquire wait time per workload."""
+    return get_pool_manager().get_stats()
+
+@router.get("/replicas")
+async def replica_status():
+    """Read replica lag and how many reads were served by replicas vs the primary."""
+    if db.replicas is None:
+        return {"enabled": False}
+    return {"enabled": True, **db.replicas.get_stats()}
+
+@router.get("/cache")
+async def cache_stats():
+    """Entity cache hits (in-process and Redis), misses and hit rate per entity kind."""
+    return entity_cache.get_stats()
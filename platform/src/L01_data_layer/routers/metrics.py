@@ -1,26 +1,47 @@
 """Metrics API router for L06 Evaluation integration."""
 
 import json
-from datetime import datetime
-from fastapi import APIRouter, HTTPException, Query
-from typing import Optional, Dict
-from uuid import UUID
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from typing import Optional, Dict, List
+from uuid import UUID, uuid4
 
-from ..database import db
+from ..database import db, bulk_insert, convert_records, parse_timestamp
+from ..pagination import NEXT_CURSOR_HEADER, InvalidCursorError, keyset_condition, next_cursor, order_by
+from ..replicas import MIN_LSN_HEADER
+from ..services import MetricRollupService
+from ..services.metric_rollup import RESOLUTIONS
 
 router = APIRouter(prefix="/metrics", tags=["metrics"])
 
 
+async def get_metric_rollups(min_lsn: Optional[str] = Header(None, alias=MIN_LSN_HEADER)):
+    # Rollup scans go to a read replica if there is one, else to the analytics pool
+    if db.replicas is not None:
+        return MetricRollupService(db.read_pool(min_lsn))
+    return MetricRollupService(await db.get_workload_pool("analytics"))
+
+METRIC_COLUMNS = (
+    "id", "metric_name", "metric_type", "value", "timestamp",
+    "labels", "agent_id", "tenant_id",
+)
+
+
 @router.post("/", status_code=201)
 async def create_metric(metric_data: dict):
-    """Create a new metric point."""
+    """Create a new metric point.
+
+    Metrics have no natural key, so clients send the row id; a retried
+    point with the same id and timestamp returns the stored row.
+    """
     query = """
         INSERT INTO metrics (
-            metric_name, metric_type, value, timestamp,
+            id, metric_name, metric_type, value, timestamp,
             labels, agent_id, tenant_id
         ) VALUES (
-            $1, $2, $3, $4, $5, $6, $7
+            COALESCE($1, gen_random_uuid()), $2, $3, $4, $5, $6, $7, $8
         )
+        ON CONFLICT (id, timestamp) DO NOTHING
         RETURNING *
     """
 
@@ -32,9 +53,11 @@ async def create_metric(metric_data: dict):
 
         # Convert labels dict to JSON string for JSONB
         labels_json = json.dumps(metric_data.get("labels", {}))
+        metric_id = UUID(str(metric_data["id"])) if metric_data.get("id") else None
 
         row = await conn.fetchrow(
             query,
+            metric_id,
             metric_data["metric_name"],
             metric_data.get("metric_type", "gauge"),
             metric_data["value"],
@@ -43,20 +66,65 @@ async def create_metric(metric_data: dict):
             metric_data.get("agent_id"),
             metric_data.get("tenant_id")
         )
+        if row is None:
+            row = await conn.fetchrow(
+                "SELECT * FROM metrics WHERE id = $1 AND timestamp = $2",
+                metric_id,
+                timestamp,
+            )
 
         return dict(row)
 
 
+def _metric_row(metric_data: dict) -> tuple:
+    """Row tuple of one bulk metric record."""
+    timestamp = parse_timestamp(metric_data["timestamp"])
+    if timestamp is None:
+        raise ValueError("timestamp is empty")
+    return (
+        UUID(str(metric_data["id"])) if metric_data.get("id") else uuid4(),
+        str(metric_data["metric_name"]),
+        metric_data.get("metric_type", "gauge"),
+        float(metric_data["value"]),
+        timestamp,
+        json.dumps(metric_data.get("labels", {})),
+        UUID(str(metric_data["agent_id"])) if metric_data.get("agent_id") else None,
+        metric_data.get("tenant_id"),
+    )
+
+
+@router.post("/bulk", status_code=201)
+async def create_metrics_bulk(records: List[dict]):
+    """Create many metric points with one COPY.
+
+    Points whose (id, timestamp) already exists are skipped, so a retried
+    batch is safe when the client assigned the ids. Invalid records are
+    left out and their indexes returned in "rejected".
+    """
+    rows, rejected = convert_records(records, _metric_row)
+    inserted = await bulk_insert(
+        await db.get_workload_pool("bulk"), "metrics", METRIC_COLUMNS, rows,
+        conflict_columns=("id", "timestamp")
+    )
+    return {"received": len(records), "inserted": inserted, "rejected": rejected}
+
+
 @router.get("/")
 async def query_metrics(
+    response: Response,
     metric_name: str,
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
     agent_id: Optional[UUID] = None,
     tenant_id: Optional[str] = None,
-    limit: int = Query(1000, le=10000)
+    limit: int = Query(1000, le=10000),
+    cursor: Optional[str] = None,
+    min_lsn: Optional[str] = Header(None, alias=MIN_LSN_HEADER)
 ):
-    """Query metrics with time range and filters."""
+    """Query metrics with time range and filters, newest first.
+
+    The cursor of the next page is returned in the X-Next-Cursor header.
+    """
     conditions = [f"metric_name = $1"]
     params = [metric_name]
     param_count = 2
@@ -83,18 +151,31 @@ async def query_metrics(
         params.append(tenant_id)
         param_count += 1
 
+    try:
+        keyset, keyset_params, param_count = keyset_condition(cursor, param_count, column="timestamp")
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if keyset:
+        conditions.append(keyset)
+        params.extend(keyset_params)
+
     where_clause = " AND ".join(conditions)
     query = f"""
         SELECT * FROM metrics
         WHERE {where_clause}
-        ORDER BY timestamp DESC
+        {order_by("timestamp")}
         LIMIT ${param_count}
     """
     params.append(limit)
 
-    async with db.pool.acquire() as conn:
+    async with db.read_pool(min_lsn).acquire() as conn:
         rows = await conn.fetch(query, *params)
-        return [dict(row) for row in rows]
+        metrics = [dict(row) for row in rows]
+
+    cursor = next_cursor(metrics, limit, column="timestamp")
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return metrics
 
 
 @router.get("/aggregates/{metric_name}")
@@ -102,47 +183,54 @@ async def get_metric_aggregates(
     metric_name: str,
     start_time: Optional[str] = None,
     end_time: Optional[str] = None,
-    agent_id: Optional[UUID] = None
+    agent_id: Optional[UUID] = None,
+    tenant_id: Optional[str] = None,
+    rollups: MetricRollupService = Depends(get_metric_rollups)
 ):
-    """Get aggregated statistics for a metric."""
-    conditions = [f"metric_name = $1"]
-    params = [metric_name]
-    param_count = 2
+    """Get aggregated statistics for a metric.
 
-    if start_time:
-        conditions.append(f"timestamp >= ${param_count}")
-        start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-        params.append(start_dt)
-        param_count += 1
+    Answered from the coarsest rollup buckets inside the range plus raw
+    points at its edges; percentiles are estimates within 1%.
+    """
+    start = parse_timestamp(start_time)
+    end = parse_timestamp(end_time)
+    # end_time is inclusive, rollup ranges are half-open
+    if end:
+        end += timedelta(microseconds=1)
 
-    if end_time:
-        conditions.append(f"timestamp <= ${param_count}")
-        end_dt = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-        params.append(end_dt)
-        param_count += 1
+    stats = await rollups.aggregate(metric_name, start, end, agent_id, tenant_id)
+    if not stats:
+        raise HTTPException(status_code=404, detail="No metrics found")
+    return stats
 
-    if agent_id:
-        conditions.append(f"agent_id = ${param_count}")
-        params.append(agent_id)
-        param_count += 1
 
-    where_clause = " AND ".join(conditions)
-    query = f"""
-        SELECT
-            COUNT(*) as count,
-            AVG(value) as avg,
-            MIN(value) as min,
-            MAX(value) as max,
-            STDDEV(value) as stddev,
-            PERCENTILE_CONT(0.5) WITHIN GROUP (ORDER BY value) as p50,
-            PERCENTILE_CONT(0.95) WITHIN GROUP (ORDER BY value) as p95,
-            PERCENTILE_CONT(0.99) WITHIN GROUP (ORDER BY value) as p99
-        FROM metrics
-        WHERE {where_clause}
+@router.get("/rollups/{metric_name}")
+async def get_metric_series(
+    metric_name: str,
+    resolution: Optional[str] = None,
+    start_time: Optional[str] = None,
+    end_time: Optional[str] = None,
+    agent_id: Optional[UUID] = None,
+    tenant_id: Optional[str] = None,
+    max_points: int = Query(500, ge=1, le=10000),
+    rollups: MetricRollupService = Depends(get_metric_rollups)
+):
+    """Get per-bucket statistics for a metric, for dashboards.
+
+    Without a resolution, the finest one giving at most max_points
+    buckets over the range is used. Defaults to the last 24 hours.
     """
+    end = parse_timestamp(end_time) or datetime.utcnow()
+    start = parse_timestamp(start_time) or end - timedelta(days=1)
+
+    if resolution is None:
+        span = end - start
+        resolution = next(
+            (name for name, (_, step) in RESOLUTIONS.items() if span / step <= max_points),
+            "1d",
+        )
+    elif resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown resolution: {resolution}")
 
-    async with db.pool.acquire() as conn:
-        row = await conn.fetchrow(query, *params)
-        if not row or row["count"] == 0:
-            raise HTTPException(status_code=404, detail="No metrics found")
-        return dict(row)
+    buckets = await rollups.series(metric_name, resolution, start, end, agent_id, tenant_id)
+    return {"resolution": resolution, "buckets": buckets}
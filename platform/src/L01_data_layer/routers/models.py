@@ -1,14 +1,25 @@
 """Model usage API router."""
 
 import json
+from datetime import datetime
 from fastapi import APIRouter, HTTPException
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
-from ..database import db
+from ..database import db, bulk_insert, convert_records, fetch_deduplicated, parse_timestamp
 
 router = APIRouter(prefix="/models", tags=["models"])
 
+MODEL_USAGE_COLUMNS = (
+    "request_id", "agent_id", "agent_did", "tenant_id", "session_id",
+    "model_provider", "model_name", "model_id",
+    "input_tokens", "output_tokens", "cached_tokens", "total_tokens",
+    "latency_ms", "cached",
+    "cost_estimate", "cost_input_cents", "cost_output_cents", "cost_cached_cents",
+    "finish_reason", "error_message", "response_status", "metadata",
+    "created_at",
+)
+
 
 @router.post("/usage", status_code=201)
 async def record_model_usage(usage_data: dict):
@@ -58,10 +69,58 @@ async def record_model_usage(usage_data: dict):
             usage_data.get("response_status", "success"),
             metadata_json
         )
+        if row is None:
+            # Retried request; return what the first attempt recorded
+            row = await fetch_deduplicated(conn, "model_usage", usage_data["request_id"])
 
         return dict(row)
 
 
+def _usage_row(usage_data: dict, now: datetime) -> tuple:
+    """Row tuple of one bulk model usage record."""
+    return (
+        str(usage_data["request_id"]),
+        UUID(str(usage_data["agent_id"])) if usage_data.get("agent_id") else None,
+        usage_data.get("agent_did"),
+        usage_data.get("tenant_id"),
+        usage_data.get("session_id"),
+        str(usage_data["model_provider"]),
+        str(usage_data["model_name"]),
+        usage_data.get("model_id"),
+        int(usage_data["input_tokens"]),
+        int(usage_data["output_tokens"]),
+        int(usage_data.get("cached_tokens") or 0),
+        usage_data.get("total_tokens"),
+        usage_data.get("latency_ms"),
+        usage_data.get("cached", False),
+        usage_data.get("cost_estimate"),
+        usage_data.get("cost_input_cents"),
+        usage_data.get("cost_output_cents"),
+        usage_data.get("cost_cached_cents"),
+        usage_data.get("finish_reason"),
+        usage_data.get("error_message"),
+        usage_data.get("response_status", "success"),
+        json.dumps(usage_data.get("metadata") or {}),
+        parse_timestamp(usage_data.get("created_at")) or now,
+    )
+
+
+@router.post("/usage/bulk", status_code=201)
+async def record_model_usage_bulk(records: List[dict]):
+    """Record many model usage rows with one COPY; duplicate request IDs are skipped.
+
+    A retried batch is skipped by request ID, whatever created_at it carries.
+    Invalid records are left out and their indexes returned in "rejected".
+    """
+    now = datetime.utcnow()
+    rows, rejected = convert_records(records, lambda usage_data: _usage_row(usage_data, now))
+    inserted = await bulk_insert(
+        await db.get_workload_pool("bulk"), "model_usage", MODEL_USAGE_COLUMNS, rows,
+        conflict_columns=("request_id", "created_at")
+    )
+    return {"received": len(records), "inserted": inserted, "rejected": rejected}
+
+
 @router.get("/usage")
 async def list_model_usage(
     agent_id: Optional[UUID] = None,
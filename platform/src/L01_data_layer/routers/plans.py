@@ -2,11 +2,12 @@
 
 import json
 from datetime import datetime
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 from typing import Optional
 from uuid import UUID
 
 from ..database import db
+from ..replicas import MIN_LSN_HEADER
 
 router = APIRouter(prefix="/plans", tags=["plans"])
 
@@ -57,11 +58,11 @@ async def create_plan(plan_data: dict):
 
 
 @router.get("/{plan_id}")
-async def get_plan(plan_id: str):
+async def get_plan(plan_id: str, min_lsn: Optional[str] = Header(None, alias=MIN_LSN_HEADER)):
     """Get plan by plan_id."""
     query = "SELECT * FROM plans WHERE plan_id = $1"
 
-    async with db.pool.acquire() as conn:
+    async with db.read_pool(min_lsn).acquire() as conn:
         row = await conn.fetchrow(query, plan_id)
         if not row:
             raise HTTPException(status_code=404, detail="Plan not found")
@@ -155,7 +156,8 @@ async def list_plans(
     agent_id: Optional[UUID] = None,
     status: Optional[str] = None,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    min_lsn: Optional[str] = Header(None, alias=MIN_LSN_HEADER)
 ):
     """List plans with filters."""
     conditions = []
@@ -186,6 +188,6 @@ async def list_plans(
     """
     params.extend([limit, offset])
 
-    async with db.pool.acquire() as conn:
+    async with db.read_pool(min_lsn).acquire() as conn:
         rows = await conn.fetch(query, *params)
         return [dict(row) for row in rows]
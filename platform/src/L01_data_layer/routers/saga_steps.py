@@ -2,15 +2,22 @@
 
 import json
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 
-from ..database import db
+from ..database import db, bulk_insert, convert_records, fetch_deduplicated, parse_timestamp
 
 router = APIRouter(prefix="/saga-steps", tags=["integration"])
 
+SAGA_STEP_COLUMNS = (
+    "step_id", "saga_id", "step_name", "step_index", "service_id", "status",
+    "started_at", "completed_at", "request", "response", "error_message",
+    "compensation_executed", "compensation_result", "retry_count", "metadata",
+    "created_at",
+)
+
 
 class SagaStepCreate(BaseModel):
     """Saga step creation model."""
@@ -29,6 +36,7 @@ class SagaStepCreate(BaseModel):
     compensation_result: Optional[dict] = None
     retry_count: int = 0
     metadata: Optional[dict] = None
+    created_at: Optional[str] = None
 
 
 class SagaStepUpdate(BaseModel):
@@ -88,6 +96,12 @@ async def create_saga_step(step_data: SagaStepCreate):
                 step_data.retry_count,
                 metadata_json,
             )
+            if record is None:
+                # Retried step; return what the first attempt recorded
+                record = await fetch_deduplicated(
+                    conn, "saga_steps", step_data.step_id,
+                    "id, step_id, saga_id, step_name, step_index, status, created_at"
+                )
 
             return dict(record)
 
@@ -95,6 +109,48 @@ async def create_saga_step(step_data: SagaStepCreate):
         raise HTTPException(status_code=500, detail=f"Failed to create saga step: {str(e)}")
 
 
+def _saga_step_row(record: dict, now: datetime) -> tuple:
+    """Row tuple of one bulk saga step record."""
+    step = SagaStepCreate.model_validate(record)
+    return (
+        step.step_id,
+        step.saga_id,
+        step.step_name,
+        step.step_index,
+        step.service_id,
+        step.status,
+        parse_timestamp(step.started_at),
+        parse_timestamp(step.completed_at),
+        json.dumps(step.request or {}),
+        json.dumps(step.response) if step.response else None,
+        step.error_message,
+        step.compensation_executed,
+        json.dumps(step.compensation_result) if step.compensation_result else None,
+        step.retry_count,
+        json.dumps(step.metadata or {}),
+        parse_timestamp(step.created_at) or now,
+    )
+
+
+@router.post("/bulk", status_code=201)
+async def create_saga_steps_bulk(records: List[dict]):
+    """Create many saga step records with one COPY; duplicate step IDs are skipped.
+
+    Invalid records are left out and their indexes returned in "rejected".
+    """
+    now = datetime.utcnow()
+    rows, rejected = convert_records(records, lambda record: _saga_step_row(record, now))
+    try:
+        inserted = await bulk_insert(
+            await db.get_workload_pool("bulk"), "saga_steps", SAGA_STEP_COLUMNS, rows,
+            conflict_columns=("step_id", "created_at")
+        )
+        return {"received": len(records), "inserted": inserted, "rejected": rejected}
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to create saga steps: {str(e)}")
+
+
 @router.patch("/{step_id}")
 async def update_saga_step(step_id: str, update_data: SagaStepUpdate):
     """Update a saga step."""
@@ -5,12 +5,13 @@ from uuid import UUID
 from ..models import Session, SessionCreate, SessionUpdate
 from ..services import SessionService
 from ..database import db
+from ..entity_cache import entity_cache
 from ..redis_client import redis_client
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 
 def get_session_service():
-    return SessionService(db.get_pool(), redis_client)
+    return SessionService(db.get_pool(), redis_client, entity_cache)
 
 @router.post("/", response_model=Session, status_code=201)
 async def create_session(session_data: SessionCreate, service: SessionService = Depends(get_session_service)):
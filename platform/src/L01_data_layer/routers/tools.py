@@ -1,18 +1,20 @@
 """Tool endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from typing import Optional
 from uuid import UUID
 
 from ..models import Tool, ToolCreate, ToolUpdate, ToolExecution, ToolExecutionCreate, ToolExecutionUpdate
 from ..services import ToolRegistry
-from ..database import db
+from ..database import db, convert_records
+from ..pagination import NEXT_CURSOR_HEADER, InvalidCursorError, next_cursor
+from ..entity_cache import entity_cache
 from ..redis_client import redis_client
 
 router = APIRouter(prefix="/tools", tags=["tools"])
 
 def get_tool_registry():
-    return ToolRegistry(db.get_pool(), redis_client)
+    return ToolRegistry(db.get_pool(), redis_client, entity_cache)
 
 @router.post("/", response_model=Tool, status_code=201)
 async def register_tool(tool_data: ToolCreate, registry: ToolRegistry = Depends(get_tool_registry)):
@@ -40,6 +42,19 @@ async def update_tool(tool_id: UUID, tool_data: ToolUpdate, registry: ToolRegist
 async def record_tool_execution(exec_data: ToolExecutionCreate, registry: ToolRegistry = Depends(get_tool_registry)):
     return await registry.record_execution(exec_data)
 
+@router.post("/tool-executions/bulk", status_code=201)
+async def record_tool_executions_bulk(
+    records: list[dict],
+    registry: ToolRegistry = Depends(get_tool_registry)
+):
+    """Record many tool executions with one COPY; duplicate invocation IDs are skipped.
+
+    Invalid records are left out and their indexes returned in "rejected".
+    """
+    executions, rejected = convert_records(records, ToolExecutionCreate.model_validate)
+    inserted = await registry.record_executions(executions)
+    return {"received": len(records), "inserted": len(inserted), "rejected": rejected}
+
 @router.get("/tool-executions/{execution_id}", response_model=ToolExecution)
 async def get_tool_execution(execution_id: UUID, registry: ToolRegistry = Depends(get_tool_registry)):
     execution = await registry.get_execution(execution_id)
@@ -69,6 +84,7 @@ async def update_execution(
 
 @router.get("/executions", response_model=list[ToolExecution])
 async def list_executions(
+    response: Response,
     agent_id: Optional[UUID] = None,
     tool_name: Optional[str] = None,
     session_id: Optional[str] = None,
@@ -76,15 +92,24 @@ async def list_executions(
     status: Optional[str] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     registry: ToolRegistry = Depends(get_tool_registry)
 ):
-    """List tool executions with filters."""
-    return await registry.list_executions(
-        agent_id=agent_id,
-        tool_name=tool_name,
-        session_id=session_id,
-        tenant_id=tenant_id,
-        status=status,
-        limit=limit,
-        offset=offset
-    )
+    """List tool executions with filters (cursor of next page in X-Next-Cursor)."""
+    try:
+        executions = await registry.list_executions(
+            agent_id=agent_id,
+            tool_name=tool_name,
+            session_id=session_id,
+            tenant_id=tenant_id,
+            status=status,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    cursor = next_cursor(executions, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return executions
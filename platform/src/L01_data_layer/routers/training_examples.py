@@ -1,10 +1,11 @@
 """Training example endpoints for L07 integration."""
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
 from typing import Optional
 from uuid import UUID
 from ..models import TrainingExample, TrainingExampleCreate, TrainingExampleUpdate, ExampleSource
 from ..services import TrainingExampleService
 from ..database import db
+from ..pagination import NEXT_CURSOR_HEADER, InvalidCursorError, next_cursor
 from ..redis_client import redis_client
 
 router = APIRouter(prefix="/training-examples", tags=["training_examples", "learning"])
@@ -25,23 +26,33 @@ async def create_training_example(
 
 @router.get("/", response_model=list[TrainingExample])
 async def list_training_examples(
+    response: Response,
     agent_id: Optional[UUID] = None,
     domain: Optional[str] = None,
     min_quality: Optional[float] = None,
     source_type: Optional[ExampleSource] = None,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     service: TrainingExampleService = Depends(get_training_example_service)
 ):
-    """List training examples with optional filters."""
-    return await service.list_examples(
-        agent_id=agent_id,
-        domain=domain,
-        min_quality=min_quality,
-        source_type=source_type,
-        limit=limit,
-        offset=offset
-    )
+    """List training examples with optional filters (cursor of next page in X-Next-Cursor)."""
+    try:
+        examples = await service.list_examples(
+            agent_id=agent_id,
+            domain=domain,
+            min_quality=min_quality,
+            source_type=source_type,
+            limit=limit,
+            offset=offset,
+            cursor=cursor
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    cursor = next_cursor(examples, limit)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+    return examples
 
 
 @router.get("/statistics")
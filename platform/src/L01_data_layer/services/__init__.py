@@ -1,6 +1,6 @@
 """Services for L01 Data Layer."""
 
-from .event_store import EventStore
+from .event_store import EventStore, VersionConflictError, register_reducer
 from .agent_registry import AgentRegistry
 from .tool_registry import ToolRegistry
 from .config_store import ConfigStore
@@ -12,9 +12,14 @@ from .document_store import DocumentStore
 from .session_service import SessionService
 from .training_example_service import TrainingExampleService
 from .dataset_service import DatasetService
+from .partition_manager import PartitionManager, PartitionSpec, PARTITIONED_TABLES
+from .metric_rollup import MetricRollupService
+from .outbox_relay import OutboxRelay
 
 __all__ = [
     "EventStore",
+    "VersionConflictError",
+    "register_reducer",
     "AgentRegistry",
     "ToolRegistry",
     "ConfigStore",
@@ -26,4 +31,9 @@ __all__ = [
     "SessionService",
     "TrainingExampleService",
     "DatasetService",
+    "PartitionManager",
+    "PartitionSpec",
+    "PARTITIONED_TABLES",
+    "MetricRollupService",
+    "OutboxRelay",
 ]
@@ -7,6 +7,7 @@ import logging
 import json
 
 from ..models import Agent, AgentCreate, AgentUpdate, AgentStatus
+from ..entity_cache import EntityCache
 from ..redis_client import RedisClient
 
 logger = logging.getLogger(__name__)
@@ -15,9 +16,10 @@ logger = logging.getLogger(__name__)
 class AgentRegistry:
     """Agent registry service."""
 
-    def __init__(self, db_pool: asyncpg.Pool, redis_client: RedisClient):
+    def __init__(self, db_pool: asyncpg.Pool, redis_client: RedisClient, cache: Optional[EntityCache] = None):
         self.db_pool = db_pool
         self.redis_client = redis_client
+        self.cache = cache
 
     def _row_to_agent(self, row) -> Agent:
         """Convert database row to Agent model, parsing JSON fields."""
@@ -63,6 +65,11 @@ class AgentRegistry:
 
     async def get_agent(self, agent_id: UUID) -> Optional[Agent]:
         """Get agent by ID."""
+        if self.cache:
+            return await self.cache.get("agent", agent_id, Agent, lambda: self._load_agent(agent_id))
+        return await self._load_agent(agent_id)
+
+    async def _load_agent(self, agent_id: UUID) -> Optional[Agent]:
         async with self.db_pool.acquire() as conn:
             row = await conn.fetchrow(
                 """
@@ -75,7 +82,7 @@ class AgentRegistry:
         if not row:
             return None
 
-        return Agent(**dict(row))
+        return self._row_to_agent(row)
 
     async def list_agents(
         self, status: Optional[AgentStatus] = None, limit: int = 100, offset: int = 0
@@ -130,6 +137,8 @@ class AgentRegistry:
             return None
 
         agent = self._row_to_agent(row)
+        if self.cache:
+            await self.cache.put("agent", agent.id, agent)
 
         # Publish event
         await self.redis_client.publish_event(
@@ -150,6 +159,8 @@ class AgentRegistry:
         deleted = result.split()[-1] == "1"
 
         if deleted:
+            if self.cache:
+                await self.cache.invalidate("agent", agent_id, deleted=True)
             await self.redis_client.publish_event(
                 event_type="agent.deleted",
                 aggregate_type="agent",
@@ -4,7 +4,9 @@ import asyncpg
 from typing import Optional, List, Dict, Any
 import logging
 
+from ..entity_cache import EntityCache
 from ..models import Configuration, ConfigCreate
+from ..redis_client import RedisClient
 
 logger = logging.getLogger(__name__)
 
@@ -12,11 +14,21 @@ logger = logging.getLogger(__name__)
 class ConfigStore:
     """Configuration store service."""
 
-    def __init__(self, db_pool: asyncpg.Pool):
+    def __init__(self, db_pool: asyncpg.Pool, redis_client: Optional[RedisClient] = None,
+                 cache: Optional[EntityCache] = None):
         self.db_pool = db_pool
+        self.redis_client = redis_client
+        self.cache = cache
 
     async def get_config(self, namespace: str, key: str) -> Optional[Configuration]:
         """Get configuration value."""
+        if self.cache:
+            return await self.cache.get(
+                "config", f"{namespace}/{key}", Configuration, lambda: self._load_config(namespace, key)
+            )
+        return await self._load_config(namespace, key)
+
+    async def _load_config(self, namespace: str, key: str) -> Optional[Configuration]:
         async with self.db_pool.acquire() as conn:
             row = await conn.fetchrow(
                 """
@@ -48,7 +60,18 @@ class ConfigStore:
                 config_data.value,
             )
 
-        return Configuration(**dict(row))
+        config = Configuration(**dict(row))
+        if self.cache:
+            await self.cache.put("config", f"{config.namespace}/{config.key}", config)
+
+        if self.redis_client:
+            await self.redis_client.publish_event(
+                event_type="config.updated",
+                aggregate_type="config",
+                aggregate_id=f"{config.namespace}/{config.key}",
+                payload={"version": config.version},
+            )
+        return config
 
     async def list_configs(self, namespace: str) -> List[Configuration]:
         """List all configurations in a namespace."""
@@ -18,6 +18,7 @@ from ..models.dataset import (
     DatasetSplit,
 )
 from ..models.error_codes import L01ErrorCode
+from ..pagination import keyset_condition, order_by
 from ..redis_client import RedisClient
 
 logger = logging.getLogger(__name__)
@@ -204,15 +205,17 @@ class DatasetService:
         name_filter: Optional[str] = None,
         tag_filter: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[Dataset]:
-        """List datasets with optional filters.
+        """List datasets with optional filters, newest first.
 
         Args:
             name_filter: Filter by name substring
             tag_filter: Filter by tag
             limit: Maximum results
-            offset: Results offset
+            offset: Results offset (ignored when cursor is given)
+            cursor: Cursor of the previous page
 
         Returns:
             List of datasets
@@ -231,12 +234,18 @@ class DatasetService:
             values.append(tag_filter)
             param_idx += 1
 
+        keyset, keyset_values, param_idx = keyset_condition(cursor, param_idx)
+        if keyset:
+            conditions.append(keyset)
+            values.extend(keyset_values)
+            offset = 0
+
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
         query = f"""
             SELECT * FROM datasets
             {where_clause}
-            ORDER BY created_at DESC
+            {order_by()}
             LIMIT ${param_idx} OFFSET ${param_idx + 1}
         """
 
@@ -1,39 +1,128 @@
 """Event store service for event sourcing."""
 
+import asyncio
 import asyncpg
-from typing import List, Optional
+import json
+from typing import Any, Callable, Dict, List, Optional, Set
 from uuid import UUID
 import logging
 
-from ..models import Event, EventCreate
+from ..models import Event, EventCreate, AggregateSnapshot, AggregateReplay
+from ..pagination import keyset_condition, order_by
 from ..redis_client import RedisClient
 
 logger = logging.getLogger(__name__)
 
+# Snapshot an aggregate after this many events, or when its snapshot is
+# this many seconds older than its latest event
+DEFAULT_SNAPSHOT_EVERY = 100
+DEFAULT_SNAPSHOT_INTERVAL = 300.0
+
+# Insert an event and its outbox message in one statement; $1-$6 are the
+# event columns
+_INSERT_EVENT = """
+    WITH e AS (
+        INSERT INTO events (event_type, aggregate_type, aggregate_id, payload, metadata, version)
+        VALUES ($1, $2, $3, $4, $5, $6)
+        RETURNING id, event_type, aggregate_type, aggregate_id, payload, metadata, created_at, version
+    ), outbox AS (
+        INSERT INTO event_outbox (event_id, aggregate_type, aggregate_id, version, message)
+        SELECT id, aggregate_type, aggregate_id, version, jsonb_build_object(
+            'event_id', id,
+            'event_type', event_type,
+            'aggregate_type', aggregate_type,
+            'aggregate_id', aggregate_id,
+            'payload', payload,
+            'metadata', COALESCE(metadata, '{}'::jsonb),
+            'version', version,
+            'timestamp', created_at
+        )
+        FROM e
+    )
+    SELECT * FROM e
+"""
+
+Reducer = Callable[[Dict[str, Any], Event], Dict[str, Any]]
+
+
+def merge_payload(state: Dict[str, Any], event: Event) -> Dict[str, Any]:
+    """Default reducer: the event payload overwrites top-level state fields."""
+    return {**state, **event.payload}
+
+
+_reducers: Dict[str, Reducer] = {}
+
+# Background snapshot tasks (EventStore instances are per request)
+_snapshot_tasks: Set[asyncio.Task] = set()
+
+
+def register_reducer(aggregate_type: str, reducer: Reducer) -> None:
+    """Set how events of an aggregate type fold into its snapshot state."""
+    _reducers[aggregate_type] = reducer
+
+
+class VersionConflictError(Exception):
+    """Aggregate has moved past the expected version."""
+
+    def __init__(self, aggregate_type: str, aggregate_id: UUID, expected: int, actual: int):
+        super().__init__(
+            f"{aggregate_type} {aggregate_id} is at version {actual}, expected {expected}"
+        )
+        self.expected = expected
+        self.actual = actual
+
 
 class EventStore:
     """Event store for event sourcing."""
 
-    def __init__(self, db_pool: asyncpg.Pool, redis_client: RedisClient):
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        redis_client: RedisClient,
+        snapshot_every: int = DEFAULT_SNAPSHOT_EVERY,
+        snapshot_interval: float = DEFAULT_SNAPSHOT_INTERVAL,
+    ):
         self.db_pool = db_pool
         self.redis_client = redis_client
+        self.snapshot_every = snapshot_every
+        self.snapshot_interval = snapshot_interval
 
     async def create_event(self, event_data: EventCreate) -> Event:
-        """Create a new event."""
+        """Create a new event.
+
+        The event and its outbox message are written by one statement, so
+        they commit together; OutboxRelay publishes the message to Redis
+        afterwards.
+
+        Appends are serialized per aggregate with a transaction-level
+        advisory lock and the event gets the aggregate's latest version
+        + 1, so versions are gapless and follow commit order. With
+        expected_version set, the append fails with VersionConflictError
+        unless the latest version equals it.
+        """
         async with self.db_pool.acquire() as conn:
-            row = await conn.fetchrow(
-                """
-                INSERT INTO events (event_type, aggregate_type, aggregate_id, payload, metadata, version)
-                VALUES ($1, $2, $3, $4, $5, $6)
-                RETURNING id, event_type, aggregate_type, aggregate_id, payload, metadata, created_at, version
-                """,
-                event_data.event_type,
-                event_data.aggregate_type,
-                event_data.aggregate_id,
-                event_data.payload,
-                event_data.metadata,
-                event_data.version,
-            )
+            async with conn.transaction():
+                await conn.execute(
+                    "SELECT pg_advisory_xact_lock(hashtextextended($1, 0))",
+                    f"{event_data.aggregate_type}:{event_data.aggregate_id}",
+                )
+                current = await self._current_version(
+                    conn, event_data.aggregate_type, event_data.aggregate_id
+                )
+                if event_data.expected_version is not None and current != event_data.expected_version:
+                    raise VersionConflictError(
+                        event_data.aggregate_type, event_data.aggregate_id,
+                        event_data.expected_version, current,
+                    )
+                row = await conn.fetchrow(
+                    _INSERT_EVENT,
+                    event_data.event_type,
+                    event_data.aggregate_type,
+                    event_data.aggregate_id,
+                    event_data.payload,
+                    event_data.metadata,
+                    current + 1,
+                )
 
         event = Event(
             id=row["id"],
@@ -46,14 +135,10 @@ class EventStore:
             version=row["version"],
         )
 
-        # Publish to Redis
-        await self.redis_client.publish_event(
-            event_type=event.event_type,
-            aggregate_type=event.aggregate_type,
-            aggregate_id=str(event.aggregate_id),
-            payload=event.payload,
-            metadata=event.metadata,
-        )
+        if event.version % self.snapshot_every == 0:
+            task = asyncio.create_task(self._snapshot_in_background(event.aggregate_type, event.aggregate_id))
+            _snapshot_tasks.add(task)
+            task.add_done_callback(_snapshot_tasks.discard)
 
         logger.info(f"Created event {event.id} of type {event.event_type}")
         return event
@@ -78,8 +163,13 @@ class EventStore:
         event_type: Optional[str] = None,
         limit: int = 100,
         offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> List[Event]:
-        """Query events with filters."""
+        """Query events with filters, newest first.
+
+        Pass the cursor of the previous page to continue after it (offset
+        is then ignored).
+        """
         conditions = []
         params = []
         param_count = 1
@@ -99,13 +189,19 @@ class EventStore:
             params.append(event_type)
             param_count += 1
 
+        keyset, keyset_params, param_count = keyset_condition(cursor, param_count)
+        if keyset:
+            conditions.append(keyset)
+            params.extend(keyset_params)
+            offset = 0
+
         where_clause = " AND ".join(conditions) if conditions else "TRUE"
 
         query = f"""
             SELECT id, event_type, aggregate_type, aggregate_id, payload, metadata, created_at, version
             FROM events
             WHERE {where_clause}
-            ORDER BY created_at DESC
+            {order_by()}
             LIMIT ${param_count} OFFSET ${param_count + 1}
         """
         params.extend([limit, offset])
@@ -114,3 +210,123 @@ class EventStore:
             rows = await conn.fetch(query, *params)
 
         return [Event(**dict(row)) for row in rows]
+
+    async def replay(self, aggregate_type: str, aggregate_id: UUID) -> AggregateReplay:
+        """
+        Latest snapshot of an aggregate plus the events after it.
+
+        Reads one snapshot row and the tail from the (aggregate_type,
+        aggregate_id, version) index, so cost does not grow with history.
+        Versions are assigned under the per-aggregate append lock, so a
+        version is never visible before the ones below it. Takes a new
+        snapshot when the tail is snapshot_every events long or the
+        snapshot is older than snapshot_interval.
+        """
+        async with self.db_pool.acquire() as conn:
+            snapshot_row = await conn.fetchrow(
+                """
+                SELECT aggregate_type, aggregate_id, version, state, created_at,
+                       EXTRACT(EPOCH FROM NOW() - created_at)::float8 AS age
+                FROM aggregate_snapshots
+                WHERE aggregate_type = $1 AND aggregate_id = $2
+                """,
+                aggregate_type,
+                aggregate_id,
+            )
+            since = snapshot_row["version"] if snapshot_row else 0
+            rows = await conn.fetch(
+                """
+                SELECT id, event_type, aggregate_type, aggregate_id, payload, metadata, created_at, version
+                FROM events
+                WHERE aggregate_type = $1 AND aggregate_id = $2 AND version > $3
+                ORDER BY version
+                """,
+                aggregate_type,
+                aggregate_id,
+                since,
+            )
+
+        snapshot = None
+        state: Dict[str, Any] = {}
+        if snapshot_row:
+            snapshot = AggregateSnapshot(
+                aggregate_type=snapshot_row["aggregate_type"],
+                aggregate_id=snapshot_row["aggregate_id"],
+                version=snapshot_row["version"],
+                state=_load_state(snapshot_row["state"]),
+                created_at=snapshot_row["created_at"],
+            )
+            state = dict(snapshot.state)
+
+        events = [Event(**dict(row)) for row in rows]
+        reducer = _reducers.get(aggregate_type, merge_payload)
+        for event in events:
+            state = reducer(state, event)
+        version = events[-1].version if events else since
+
+        stale = snapshot_row is not None and snapshot_row["age"] >= self.snapshot_interval
+        if events and (len(events) >= self.snapshot_every or stale):
+            await self.save_snapshot(aggregate_type, aggregate_id, version, state)
+
+        return AggregateReplay(
+            aggregate_type=aggregate_type,
+            aggregate_id=aggregate_id,
+            version=version,
+            snapshot=snapshot,
+            events=events,
+            state=state,
+        )
+
+    async def save_snapshot(
+        self,
+        aggregate_type: str,
+        aggregate_id: UUID,
+        version: int,
+        state: Dict[str, Any]
+    ) -> bool:
+        """
+        Store an aggregate's state as of version.
+
+        Returns:
+            False if the aggregate has no event at version, or a snapshot
+            at the same or a later version already exists
+        """
+        async with self.db_pool.acquire() as conn:
+            status = await conn.execute(
+                """
+                INSERT INTO aggregate_snapshots (aggregate_type, aggregate_id, version, state)
+                SELECT $1::varchar, $2::uuid, $3::int, $4::jsonb
+                WHERE EXISTS (
+                    SELECT 1 FROM events
+                    WHERE aggregate_type = $1 AND aggregate_id = $2 AND version = $3
+                )
+                ON CONFLICT (aggregate_type, aggregate_id) DO UPDATE
+                SET version = EXCLUDED.version, state = EXCLUDED.state, created_at = NOW()
+                WHERE aggregate_snapshots.version < EXCLUDED.version
+                """,
+                aggregate_type,
+                aggregate_id,
+                version,
+                json.dumps(state, default=str),
+            )
+        return status.endswith(" 1")
+
+    async def _current_version(self, conn: asyncpg.Connection, aggregate_type: str, aggregate_id: UUID) -> int:
+        """Latest version of an aggregate (0 if it has no events)."""
+        return await conn.fetchval(
+            "SELECT COALESCE(MAX(version), 0) FROM events WHERE aggregate_type = $1 AND aggregate_id = $2",
+            aggregate_type,
+            aggregate_id,
+        )
+
+    async def _snapshot_in_background(self, aggregate_type: str, aggregate_id: UUID) -> None:
+        """Replay an aggregate so that a snapshot is taken, logging failures."""
+        try:
+            await self.replay(aggregate_type, aggregate_id)
+        except Exception as e:
+            logger.warning(f"Failed to snapshot {aggregate_type} {aggregate_id}: {e}")
+
+
+def _load_state(value: Any) -> Dict[str, Any]:
+    """Snapshot state from a JSONB column (asyncpg returns JSON as text)."""
+    return json.loads(value) if isinstance(value, str) else (value or {})
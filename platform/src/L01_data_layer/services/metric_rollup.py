@@ -0,0 +1,532 @@
+"""
+Continuous metric rollups.
+
+Raw metric points are rolled up per (metric_name, agent_id, tenant_id)
+into 1-minute buckets, minute buckets into 1-hour buckets and hour
+buckets into 1-day buckets. Each bucket stores count, sum, sum of
+squares, min, max and a mergeable quantile sketch, so any range can be
+answered from a handful of buckets instead of every raw row.
+
+Maintenance is incremental: each level keeps a watermark (rollups are
+complete for buckets before it) and a refresh only recomputes buckets
+from the previous watermark minus a late-arrival window. Points that
+arrive later than that window are kept in raw metrics but are not
+reflected in the rollups.
+
+Aggregate queries split the requested range into the coarsest buckets
+that fit inside it and read the uncovered edges and the not yet rolled
+up tail from raw metrics. Edges older than the retention of the finer
+data are widened to whole coarser buckets instead.
+"""
+
+import asyncio
+import json
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+import asyncpg
+
+from ..sketch import DEFAULT_RELATIVE_ACCURACY, MIN_INDEXABLE_VALUE, QuantileSketch, gamma_for
+from .partition_manager import PARTITIONED_TABLES
+
+logger = logging.getLogger(__name__)
+
+# Rollup resolutions, finest first: name -> (date_trunc unit, bucket width)
+RESOLUTIONS: Dict[str, Tuple[str, timedelta]] = {
+    "1m": ("minute", timedelta(minutes=1)),
+    "1h": ("hour", timedelta(hours=1)),
+    "1d": ("day", timedelta(days=1)),
+}
+
+# How long buckets of each resolution are kept (None = forever)
+ROLLUP_RETENTION: Dict[str, Optional[timedelta]] = {
+    "1m": timedelta(days=30),
+    "1h": timedelta(days=365),
+    "1d": None,
+}
+
+# How long raw metric points are kept (partitions are dropped after this)
+RAW_RETENTION = timedelta(days=PARTITIONED_TABLES["metrics"].retention_days)
+
+# pg_advisory_lock key so that one replica refreshes at a time ("L01_ROLL")
+ROLLUP_LOCK_ID = 0x4C30315F524F4C4C
+
+_EPOCH = datetime(1970, 1, 1)
+
+_ROLLUP_COLUMNS = (
+    "resolution, bucket_start, metric_name, agent_id, tenant_id, "
+    "count, sum, sum_sq, min, max, sketch"
+)
+
+
+def floor_time(moment: datetime, step: timedelta) -> datetime:
+    """Start of the step-aligned bucket containing moment."""
+    return _EPOCH + ((moment - _EPOCH) // step) * step
+
+
+def ceil_time(moment: datetime, step: timedelta) -> datetime:
+    """Smallest step-aligned time not before moment."""
+    floor = floor_time(moment, step)
+    return floor if floor == moment else floor + step
+
+
+def plan_segments(
+    start: datetime,
+    end: datetime,
+    watermarks: Dict[str, datetime],
+    horizons: Optional[Dict[Optional[str], datetime]] = None
+) -> List[Tuple[Optional[str], datetime, datetime]]:
+    """
+    Cover [start, end) with the coarsest complete rollup buckets.
+
+    An edge that would need finer data from before that data's horizon
+    is covered by the whole coarser bucket instead, so the segments may
+    extend past [start, end) there.
+
+    Args:
+        start: Range start (inclusive)
+        end: Range end (exclusive)
+        watermarks: Resolution -> time before which its buckets are complete
+        horizons: Resolution (None for raw metrics) -> oldest time whose
+            data is still kept; missing entries are kept forever
+
+    Returns:
+        (resolution or None for raw metrics, segment start, segment end),
+        in time order
+    """
+    levels = [name for name in RESOLUTIONS if name in watermarks]
+    horizons = horizons or {}
+
+    def expired(level: int, moment: datetime) -> bool:
+        """Whether data of levels[level] (raw below 0) at moment is gone."""
+        horizon = horizons.get(levels[level] if level >= 0 else None)
+        return horizon is not None and moment < horizon
+
+    def cover(lo: datetime, hi: datetime, level: int) -> List[Tuple[Optional[str], datetime, datetime]]:
+        if lo >= hi:
+            return []
+        if level < 0:
+            return [(None, lo, hi)]
+        name = levels[level]
+        step = RESOLUTIONS[name][1]
+        first = ceil_time(lo, step)
+        last = floor_time(min(hi, watermarks[name]), step)
+        if first > lo and expired(level - 1, lo):
+            first = floor_time(lo, step)
+        if last < hi and expired(level - 1, hi) and ceil_time(hi, step) <= watermarks[name]:
+            last = ceil_time(hi, step)
+        if first >= last:
+            return cover(lo, hi, level - 1)
+        return cover(lo, first, level - 1) + [(name, first, last)] + cover(last, hi, level - 1)
+
+    return cover(start, end, len(levels) - 1)
+
+
+class MetricRollupService:
+    """Maintains metric rollups and answers aggregate queries from them."""
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        interval_seconds: float = 60,
+        settle_seconds: float = 30,
+        late_seconds: float = 300,
+        backfill_chunk: timedelta = timedelta(days=1),
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    ):
+        """
+        Initialize metric rollup service.
+
+        Args:
+            db_pool: Database connection pool
+            interval_seconds: Seconds between background refreshes
+            settle_seconds: Minutes younger than this are not rolled up yet
+            late_seconds: Window of already rolled up minutes recomputed per refresh
+            backfill_chunk: Raw time range rolled up per transaction
+            relative_accuracy: Relative error of percentile estimates
+        """
+        self.db_pool = db_pool
+        self.interval_seconds = interval_seconds
+        self.settle = timedelta(seconds=settle_seconds)
+        self.late = timedelta(seconds=late_seconds)
+        self.backfill_chunk = backfill_chunk
+        self.relative_accuracy = relative_accuracy
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Refresh periodically in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        """Stop background refreshes."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def refresh(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Roll up new raw metrics and propagate them to coarser resolutions.
+
+        Does nothing if another replica is refreshing.
+
+        Returns:
+            Buckets written per resolution
+        """
+        now = now or datetime.utcnow()
+        written: Dict[str, int] = {}
+        async with self.db_pool.acquire() as conn:
+            if not await conn.fetchval("SELECT pg_try_advisory_lock($1)", ROLLUP_LOCK_ID):
+                return written
+            try:
+                watermarks = await self._get_watermarks(conn)
+
+                # Minutes from raw metrics
+                step = RESOLUTIONS["1m"][1]
+                target = floor_time(now - self.settle, step)
+                if "1m" in watermarks:
+                    lo = floor_time(watermarks["1m"] - self.late, step)
+                else:
+                    first = await conn.fetchval("SELECT MIN(timestamp) FROM metrics")
+                    if first is None:
+                        return written
+                    lo = floor_time(first, step)
+                touched = lo
+                written["1m"] = 0
+                while lo < target:
+                    hi = min(lo + self.backfill_chunk, target)
+                    written["1m"] += await self._rollup(conn, "1m", lo, hi)
+                    lo = hi
+                source_watermark = max(target, watermarks.get("1m", target))
+
+                # Hours from minutes, days from hours
+                source = "1m"
+                for name in ("1h", "1d"):
+                    step = RESOLUTIONS[name][1]
+                    target = floor_time(source_watermark, step)
+                    lo = floor_time(min(touched, watermarks.get(name, touched)), step)
+                    if lo < target:
+                        written[name] = await self._rollup(conn, name, lo, target, source)
+                    touched = lo
+                    source = name
+                    source_watermark = max(target, watermarks.get(name, target))
+
+                await self._apply_retention(conn, now)
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock($1)", ROLLUP_LOCK_ID)
+
+        if any(written.values()):
+            logger.info(f"Metric rollups refreshed: {written}")
+        return written
+
+    async def aggregate(
+        self,
+        metric_name: str,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        agent_id: Optional[UUID] = None,
+        tenant_id: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Aggregate statistics for a metric over [start, end).
+
+        Returns:
+            count, avg, min, max, stddev, p50, p95 and p99, or None if
+            there are no points
+        """
+        filters, filter_params = self._filters(agent_id, tenant_id)
+        sketch = QuantileSketch(self.relative_accuracy)
+        totals = _Totals()
+
+        async with self.db_pool.acquire() as conn:
+            watermarks = await self._get_watermarks(conn)
+            if start is None:
+                start = await self._first_timestamp(conn, metric_name)
+                if start is None:
+                    return None
+            end = end or datetime.utcnow()
+
+            segments = plan_segments(start, end, watermarks, self._horizons(datetime.utcnow()))
+            for resolution, lo, hi in segments:
+                if resolution is None:
+                    rows = await conn.fetch(
+                        f"""
+                        SELECT {self._sketch_key()} AS key, COUNT(*) AS count,
+                               SUM(value)::float8 AS sum, SUM(value * value)::float8 AS sum_sq,
+                               MIN(value)::float8 AS min, MAX(value)::float8 AS max
+                        FROM metrics
+                        WHERE metric_name = $1 AND timestamp >= $2 AND timestamp < $3 {filters}
+                        GROUP BY 1
+                        """,
+                        metric_name, lo, hi, *filter_params,
+                    )
+                    for row in rows:
+                        totals.add(row)
+                        sketch.merge({row["key"]: row["count"]})
+                else:
+                    rows = await conn.fetch(
+                        f"""
+                        SELECT count, sum, sum_sq, min, max, sketch
+                        FROM metric_rollups
+                        WHERE metric_name = $1 AND bucket_start >= $2 AND bucket_start < $3
+                          {filters} AND resolution = ${4 + len(filter_params)}
+                        """,
+                        metric_name, lo, hi, *filter_params, resolution,
+                    )
+                    for row in rows:
+                        totals.add(row)
+                        sketch.merge(_load_bins(row["sketch"]))
+
+        return totals.summary(sketch)
+
+    async def series(
+        self,
+        metric_name: str,
+        resolution: str,
+        start: datetime,
+        end: datetime,
+        agent_id: Optional[UUID] = None,
+        tenant_id: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-bucket statistics for a metric, oldest first.
+
+        Buckets are merged across agents and tenants unless filtered.
+        Only buckets that are already rolled up are returned.
+        """
+        if resolution not in RESOLUTIONS:
+            raise ValueError(f"Unknown resolution: {resolution}")
+        filters, filter_params = self._filters(agent_id, tenant_id)
+        param_idx = 4 + len(filter_params)
+
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"""
+                SELECT bucket_start, count, sum, sum_sq, min, max, sketch
+                FROM metric_rollups
+                WHERE metric_name = $1 AND bucket_start >= $2 AND bucket_start < $3
+                  {filters} AND resolution = ${param_idx}
+                ORDER BY bucket_start
+                """,
+                metric_name, start, end, *filter_params, resolution,
+            )
+
+        buckets: Dict[datetime, Tuple[_Totals, QuantileSketch]] = {}
+        for row in rows:
+            totals, sketch = buckets.setdefault(
+                row["bucket_start"], (_Totals(), QuantileSketch(self.relative_accuracy))
+            )
+            totals.add(row)
+            sketch.merge(_load_bins(row["sketch"]))
+
+        return [
+            {"bucket_start": bucket_start, **totals.summary(sketch)}
+            for bucket_start, (totals, sketch) in buckets.items()
+        ]
+
+    async def _rollup(
+        self,
+        conn: asyncpg.Connection,
+        resolution: str,
+        lo: datetime,
+        hi: datetime,
+        source: Optional[str] = None
+    ) -> int:
+        """Recompute the buckets of resolution in [lo, hi) and advance its watermark."""
+        if source is None:
+            query = self._raw_rollup_query()
+            params = [lo, hi]
+        else:
+            query = self._merge_rollup_query(RESOLUTIONS[resolution][0])
+            params = [lo, hi, source]
+
+        async with conn.transaction():
+            await conn.execute(
+                "DELETE FROM metric_rollups WHERE resolution = $1 AND bucket_start >= $2 AND bucket_start < $3",
+                resolution, lo, hi,
+            )
+            status = await conn.execute(query, *params, resolution)
+            await conn.execute(
+                """
+                INSERT INTO metric_rollup_state (resolution, watermark, updated_at)
+                VALUES ($1, $2, NOW())
+                ON CONFLICT (resolution) DO UPDATE
+                SET watermark = GREATEST(metric_rollup_state.watermark, EXCLUDED.watermark),
+                    updated_at = NOW()
+                """,
+                resolution, hi,
+            )
+        return int(status.split()[-1])
+
+    def _raw_rollup_query(self) -> str:
+        """INSERT of minute buckets from raw metrics; params lo, hi, resolution."""
+        return f"""
+            INSERT INTO metric_rollups ({_ROLLUP_COLUMNS})
+            SELECT $3, bucket, metric_name, agent_id, tenant_id,
+                   SUM(n), SUM(s), SUM(sq), MIN(lo), MAX(hi), jsonb_object_agg(key, n)
+            FROM (
+                SELECT date_trunc('minute', timestamp) AS bucket, metric_name, agent_id, tenant_id,
+                       {self._sketch_key()} AS key, COUNT(*) AS n,
+                       SUM(value)::float8 AS s, SUM(value * value)::float8 AS sq,
+                       MIN(value)::float8 AS lo, MAX(value)::float8 AS hi
+                FROM metrics
+                WHERE timestamp >= $1 AND timestamp < $2
+                GROUP BY 1, 2, 3, 4, 5
+            ) k
+            GROUP BY bucket, metric_name, agent_id, tenant_id
+        """
+
+    @staticmethod
+    def _merge_rollup_query(unit: str) -> str:
+        """INSERT of coarser buckets merged from finer ones; params lo, hi, source, resolution."""
+        return f"""
+            WITH src AS (
+                SELECT date_trunc('{unit}', bucket_start) AS bucket, metric_name, agent_id, tenant_id,
+                       count, sum, sum_sq, min, max, sketch
+                FROM metric_rollups
+                WHERE resolution = $3 AND bucket_start >= $1 AND bucket_start < $2
+            ),
+            bins AS (
+                SELECT bucket, metric_name, agent_id, tenant_id, jsonb_object_agg(key, n) AS sketch
+                FROM (
+                    SELECT bucket, metric_name, agent_id, tenant_id, e.key, SUM(e.value::bigint) AS n
+                    FROM src, jsonb_each_text(src.sketch) e
+                    GROUP BY 1, 2, 3, 4, 5
+                ) k
+                GROUP BY 1, 2, 3, 4
+            )
+            INSERT INTO metric_rollups ({_ROLLUP_COLUMNS})
+            SELECT $4, t.bucket, t.metric_name, t.agent_id, t.tenant_id,
+                   t.count, t.sum, t.sum_sq, t.min, t.max, b.sketch
+            FROM (
+                SELECT bucket, metric_name, agent_id, tenant_id,
+                       SUM(count) AS count, SUM(sum) AS sum, SUM(sum_sq) AS sum_sq,
+                       MIN(min) AS min, MAX(max) AS max
+                FROM src
+                GROUP BY 1, 2, 3, 4
+            ) t
+            JOIN bins b
+              ON b.bucket = t.bucket AND b.metric_name = t.metric_name
+             AND b.agent_id IS NOT DISTINCT FROM t.agent_id
+             AND b.tenant_id IS NOT DISTINCT FROM t.tenant_id
+        """
+
+    def _sketch_key(self) -> str:
+        """SQL expression computing QuantileSketch.key(value)."""
+        log_gamma = math.log(gamma_for(self.relative_accuracy))
+        return (
+            f"CASE WHEN value > {MIN_INDEXABLE_VALUE} "
+            f"THEN 'p' || CEIL(LN(value::float8) / {log_gamma!r})::int "
+            f"WHEN value < -{MIN_INDEXABLE_VALUE} "
+            f"THEN 'n' || CEIL(LN(-value::float8) / {log_gamma!r})::int "
+            f"ELSE 'z' END"
+        )
+
+    @staticmethod
+    def _filters(agent_id: Optional[UUID], tenant_id: Optional[str]) -> Tuple[str, List[Any]]:
+        """Extra conditions, numbered after the metric name and time bounds ($1-$3)."""
+        conditions = []
+        params: List[Any] = []
+        if agent_id:
+            params.append(agent_id)
+            conditions.append(f"AND agent_id = ${3 + len(params)}")
+        if tenant_id:
+            params.append(tenant_id)
+            conditions.append(f"AND tenant_id = ${3 + len(params)}")
+        return " ".join(conditions), params
+
+    async def _get_watermarks(self, conn: asyncpg.Connection) -> Dict[str, datetime]:
+        """Watermark per resolution that has been rolled up at least once."""
+        rows = await conn.fetch("SELECT resolution, watermark FROM metric_rollup_state")
+        return {row["resolution"]: row["watermark"] for row in rows}
+
+    async def _first_timestamp(self, conn: asyncpg.Connection, metric_name: str) -> Optional[datetime]:
+        """Oldest raw point or rollup bucket of a metric."""
+        return await conn.fetchval(
+            """
+            SELECT LEAST(
+                (SELECT MIN(timestamp) FROM metrics WHERE metric_name = $1),
+                (SELECT MIN(bucket_start) FROM metric_rollups WHERE metric_name = $1)
+            )
+            """,
+            metric_name,
+        )
+
+    @staticmethod
+    def _horizons(now: datetime) -> Dict[Optional[str], datetime]:
+        """Oldest time still kept per resolution (None for raw metrics)."""
+        horizons: Dict[Optional[str], datetime] = {None: now - RAW_RETENTION}
+        for resolution, retention in ROLLUP_RETENTION.items():
+            if retention is not None:
+                horizons[resolution] = now - retention
+        return horizons
+
+    async def _apply_retention(self, conn: asyncpg.Connection, now: datetime) -> None:
+        """Delete buckets older than their resolution's retention."""
+        for resolution, retention in ROLLUP_RETENTION.items():
+            if retention is not None:
+                await conn.execute(
+                    "DELETE FROM metric_rollups WHERE resolution = $1 AND bucket_start < $2",
+                    resolution, now - retention,
+                )
+
+    async def _run_loop(self) -> None:
+        """Refresh every interval_seconds."""
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Metric rollup refresh failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+
+def _load_bins(value: Any) -> Dict[str, int]:
+    """Sketch bins from a JSONB column (asyncpg returns JSON as text)."""
+    return json.loads(value) if isinstance(value, str) else (value or {})
+
+
+class _Totals:
+    """Running count, sum, sum of squares, min and max."""
+
+    def __init__(self):
+        self.count = 0
+        self.sum = 0.0
+        self.sum_sq = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def add(self, row: Any) -> None:
+        self.count += row["count"]
+        self.sum += row["sum"]
+        self.sum_sq += row["sum_sq"]
+        self.min = row["min"] if self.min is None else min(self.min, row["min"])
+        self.max = row["max"] if self.max is None else max(self.max, row["max"])
+
+    def summary(self, sketch: QuantileSketch) -> Optional[Dict[str, Any]]:
+        if self.count == 0:
+            return None
+        stddev = None
+        if self.count > 1:
+            variance = (self.sum_sq - self.sum * self.sum / self.count) / (self.count - 1)
+            stddev = math.sqrt(max(variance, 0.0))
+
+        def percentile(q: float) -> float:
+            return min(max(sketch.quantile(q), self.min), self.max)
+
+        return {
+            "count": self.count,
+            "avg": self.sum / self.count,
+            "min": self.min,
+            "max": self.max,
+            "stddev": stddev,
+            "p50": percentile(0.5),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+        }
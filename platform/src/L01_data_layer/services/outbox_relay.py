@@ -0,0 +1,174 @@
+"""
+Outbox relay for event publication.
+
+EventStore writes each event and its outbox message in one statement,
+so an event is never stored without being queued for publication. The
+relay takes the oldest batch of event_outbox, publishes it to Redis in
+one pipelined round trip and deletes it in the same transaction. A crash
+between publishing and deleting republishes the batch: delivery is
+at-least-once, and consumers dedupe on event_id.
+
+Batches are serialized across replicas with a transaction-level advisory
+lock. Events of one aggregate are published in version order: EventStore
+assigns versions under a per-aggregate lock held until commit, so an
+event only becomes visible after every lower version of its aggregate,
+and within a batch messages are sent per aggregate by version. Events of
+different aggregates are not ordered relative to each other (outbox ids
+are allocated at insert time, not at commit).
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Optional
+
+import asyncpg
+
+from ..redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# pg_advisory_xact_lock key shared by every relay ("L01_OUTB")
+OUTBOX_LOCK_ID = 0x4C30315F4F555442
+
+# Redis stream that durable consumers can read with XREAD/XREADGROUP
+EVENT_STREAM = "l01:events:stream"
+
+
+class OutboxRelay:
+    """Publishes event_outbox rows to Redis in batches."""
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        redis_client: RedisClient,
+        batch_size: int = 500,
+        poll_interval: float = 0.1,
+        retry_interval: float = 1.0,
+        stream: Optional[str] = EVENT_STREAM,
+        stream_maxlen: int = 100000,
+        lag_warning_seconds: float = 30.0,
+    ):
+        """
+        Initialize outbox relay.
+
+        Args:
+            db_pool: Database connection pool
+            redis_client: Redis client to publish with
+            batch_size: Messages published per round trip
+            poll_interval: Seconds to wait when the outbox is drained
+            retry_interval: Seconds to wait after a failed batch
+            stream: Redis stream to also append events to (None to only PUBLISH)
+            stream_maxlen: Approximate stream length cap
+            lag_warning_seconds: Log a warning when the oldest message is older
+        """
+        self.db_pool = db_pool
+        self.redis_client = redis_client
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.retry_interval = retry_interval
+        self.stream = stream
+        self.stream_maxlen = stream_maxlen
+        self.lag_warning_seconds = lag_warning_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._stats = {
+            "published": 0,
+            "batches": 0,
+            "failures": 0,
+            "lag_seconds": 0.0,
+        }
+
+    async def start(self) -> None:
+        """Relay in the background."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        """Stop the background relay; unpublished messages stay in the outbox."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def relay_batch(self) -> int:
+        """
+        Publish and delete the oldest batch of outbox messages.
+
+        Returns:
+            Messages published (0 if the outbox is empty or another relay
+            holds the lock)
+        """
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                if not await conn.fetchval("SELECT pg_try_advisory_xact_lock($1)", OUTBOX_LOCK_ID):
+                    return 0
+                rows = await conn.fetch(
+                    """
+                    SELECT id, message::text AS message,
+                           EXTRACT(EPOCH FROM NOW() - created_at)::float8 AS age
+                    FROM (
+                        SELECT * FROM event_outbox
+                        ORDER BY id
+                        LIMIT $1
+                    ) batch
+                    ORDER BY aggregate_type, aggregate_id, version
+                    """,
+                    self.batch_size,
+                )
+                if not rows:
+                    self._stats["lag_seconds"] = 0.0
+                    return 0
+
+                # Publish before deleting; if this raises, the transaction
+                # rolls back and the batch is retried
+                await self.redis_client.publish_messages(
+                    [row["message"] for row in rows], self.stream, self.stream_maxlen
+                )
+                await conn.execute(
+                    "DELETE FROM event_outbox WHERE id = ANY($1::bigint[])",
+                    [row["id"] for row in rows],
+                )
+
+        lag = max(max(row["age"] for row in rows), 0.0)
+        self._stats["published"] += len(rows)
+        self._stats["batches"] += 1
+        self._stats["lag_seconds"] = lag
+        if lag > self.lag_warning_seconds:
+            logger.warning(f"Event outbox relay is {lag:.1f}s behind")
+        return len(rows)
+
+    async def get_lag(self) -> Dict[str, Any]:
+        """
+        Outbox backlog as seen by the database.
+
+        Returns:
+            pending messages and the age in seconds of the oldest one
+        """
+        async with self.db_pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT COUNT(*) AS pending,
+                       COALESCE(EXTRACT(EPOCH FROM NOW() - MIN(created_at)), 0)::float8 AS lag_seconds
+                FROM event_outbox
+                """
+            )
+        return {"pending": row["pending"], "lag_seconds": max(row["lag_seconds"], 0.0)}
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get relay statistics for this process."""
+        return dict(self._stats)
+
+    async def _run_loop(self) -> None:
+        """Drain the outbox continuously, pausing when it is empty."""
+        while True:
+            try:
+                published = await self.relay_batch()
+            except Exception as e:
+                self._stats["failures"] += 1
+                logger.error(f"Event outbox relay failed: {e}")
+                await asyncio.sleep(self.retry_interval)
+                continue
+            if published < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
@@ -0,0 +1,292 @@
+"""
+Partition maintenance for time-partitioned L01 tables.
+
+The append-heavy tables (events, metrics, tool_executions, model_usage,
+api_requests, saga_steps) are range-partitioned on their timestamp
+column. This service keeps partitions created ahead of time and drops
+partitions that are past their retention, which is a catalog operation
+instead of a DELETE over millions of rows.
+
+Partitions are named {table}_pYYYYMMDD after their lower bound. Rows
+outside every partition land in {table}_default; expired rows there are
+deleted row by row, and rows for a partition that is created later are
+moved into it. Partition DDL is serialized across replicas with a
+transaction-level advisory lock. Dedupe keys (see PartitionSpec) expire
+with the rows they belong to.
+"""
+
+import asyncio
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+
+from ..partitioning import PARTITIONED_TABLES, PartitionSpec
+
+logger = logging.getLogger(__name__)
+
+_PARTITION_SUFFIX = re.compile(r"_p(\d{8})$")
+
+# pg_advisory_xact_lock key shared by every L01 replica ("L01_PART")
+PARTITION_LOCK_ID = 0x4C30315F50415254
+
+
+class PartitionManager:
+    """Creates upcoming partitions and drops expired ones."""
+
+    def __init__(
+        self,
+        db_pool: asyncpg.Pool,
+        tables: Optional[Dict[str, PartitionSpec]] = None,
+        premake: int = 7,
+        interval_seconds: float = 3600,
+    ):
+        """
+        Initialize partition manager.
+
+        Args:
+            db_pool: Database connection pool
+            tables: Table name to partition spec (defaults to PARTITIONED_TABLES)
+            premake: Partitions to create ahead of the current one
+            interval_seconds: Seconds between background maintenance runs
+        """
+        self.db_pool = db_pool
+        self.tables = tables if tables is not None else PARTITIONED_TABLES
+        self.premake = premake
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Run maintenance once, then periodically in the background."""
+        try:
+            await self.run_maintenance()
+        except Exception as e:
+            # Partition upkeep must not keep L01 from starting
+            logger.error(f"Partition maintenance failed: {e}")
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        """Stop background maintenance."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def run_maintenance(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Create upcoming partitions and drop expired ones for every table.
+
+        Returns:
+            Created and dropped partition names
+        """
+        now = now or datetime.utcnow()
+        created: List[str] = []
+        dropped: List[str] = []
+        for table, spec in self.tables.items():
+            if not await self._is_partitioned(table):
+                logger.warning(f"Table {table} is not partitioned, skipping maintenance")
+                continue
+            created.extend(await self.ensure_partitions(table, spec, now))
+            dropped.extend(await self.drop_expired_partitions(table, spec, now))
+        if created or dropped:
+            logger.info(f"Partition maintenance: created {created}, dropped {dropped}")
+        return {"created": created, "dropped": dropped}
+
+    async def ensure_partitions(
+        self,
+        table: str,
+        spec: PartitionSpec,
+        now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Create the current partition and the next premake partitions.
+
+        Returns:
+            Names of partitions that did not exist before
+        """
+        now = now or datetime.utcnow()
+        existing = {p["name"] for p in await self.get_partitions(table)}
+        created = []
+        start = spec.floor(now)
+        for _ in range(self.premake + 1):
+            end = start + spec.step
+            name = f"{table}_p{start:%Y%m%d}"
+            if name not in existing:
+                try:
+                    await self._create_partition(table, spec, name, start, end)
+                    created.append(name)
+                except asyncpg.PostgresError as e:
+                    logger.warning(f"Could not create partition {name}: {e}")
+            start = end
+        return created
+
+    async def _create_partition(
+        self,
+        table: str,
+        spec: PartitionSpec,
+        name: str,
+        start: datetime,
+        end: datetime
+    ) -> None:
+        """
+        Create one partition of table for [start, end).
+
+        A range partition cannot be created while the default partition
+        holds rows for its range. In that case the partition is built as
+        a plain table, the rows are moved into it from the default
+        partition and it is attached, all in one transaction.
+        """
+        bounds = f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+        try:
+            async with self.db_pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute("SELECT pg_advisory_xact_lock($1)", PARTITION_LOCK_ID)
+                    await conn.execute(f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} {bounds}")
+            return
+        except asyncpg.CheckViolationError:
+            pass
+
+        async with self.db_pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute("SELECT pg_advisory_xact_lock($1)", PARTITION_LOCK_ID)
+                # Keep inserts from landing in the range between the move and the attach
+                await conn.execute(f"LOCK TABLE {table}_default IN ACCESS EXCLUSIVE MODE")
+                await conn.execute(
+                    f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+                )
+                result = await conn.execute(
+                    f"""
+                    WITH moved AS (
+                        DELETE FROM {table}_default
+                        WHERE {spec.column} >= $1 AND {spec.column} < $2
+                        RETURNING *
+                    )
+                    INSERT INTO {name} SELECT * FROM moved
+                    """,
+                    start,
+                    end,
+                )
+                await conn.execute(f"ALTER TABLE {table} ATTACH PARTITION {name} {bounds}")
+        logger.info(f"Created partition {name} with {result.split()[-1]} rows from {table}_default")
+
+    async def drop_expired_partitions(
+        self,
+        table: str,
+        spec: PartitionSpec,
+        now: Optional[datetime] = None
+    ) -> List[str]:
+        """
+        Drop partitions whose whole range is older than the retention.
+
+        Expired rows in the default partition are deleted as well. A
+        partition that cannot be dropped is logged and left for the next
+        run.
+
+        Returns:
+            Names of dropped partitions
+        """
+        if spec.retention_days is None:
+            return []
+        now = now or datetime.utcnow()
+        cutoff = now - timedelta(days=spec.retention_days)
+        dropped = []
+        for partition in await self.get_partitions(table):
+            start = partition["start"]
+            if start is None or start + spec.step > cutoff:
+                continue
+            name = partition["name"]
+            try:
+                async with self.db_pool.acquire() as conn:
+                    async with conn.transaction():
+                        await conn.execute("SELECT pg_advisory_xact_lock($1)", PARTITION_LOCK_ID)
+                        # Another replica may have dropped it while we waited
+                        if await conn.fetchval("SELECT to_regclass($1)", name) is None:
+                            continue
+                        await conn.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+                        await conn.execute(f"DROP TABLE {name}")
+                dropped.append(name)
+            except asyncpg.PostgresError as e:
+                logger.error(f"Could not drop partition {name}: {e}")
+
+        await self._purge_default(table, spec, cutoff)
+        if spec.dedupe_key:
+            await self._purge_dedupe_keys(table, cutoff)
+        return dropped
+
+    async def _purge_default(self, table: str, spec: PartitionSpec, cutoff: datetime) -> None:
+        """Delete rows older than cutoff from the default partition."""
+        name = f"{table}_default"
+        try:
+            async with self.db_pool.acquire() as conn:
+                result = await conn.execute(
+                    f"DELETE FROM {name} WHERE {spec.column} < $1",
+                    cutoff,
+                )
+        except asyncpg.PostgresError as e:
+            logger.error(f"Could not purge expired rows from {name}: {e}")
+            return
+        deleted = int(result.split()[-1])
+        if deleted:
+            logger.info(f"Deleted {deleted} expired rows from {name}")
+
+    async def _purge_dedupe_keys(self, table: str, cutoff: datetime) -> None:
+        """Delete dedupe keys of rows older than cutoff."""
+        try:
+            async with self.db_pool.acquire() as conn:
+                await conn.execute(
+                    "DELETE FROM partition_dedupe_keys WHERE table_name = $1 AND created_at < $2",
+                    table,
+                    cutoff,
+                )
+        except asyncpg.PostgresError as e:
+            logger.error(f"Could not purge expired dedupe keys of {table}: {e}")
+
+    async def get_partitions(self, table: str) -> List[Dict[str, Any]]:
+        """
+        List partitions of a table, oldest first.
+
+        The default partition has start None.
+        """
+        async with self.db_pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT c.relname AS name
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                JOIN pg_class p ON p.oid = i.inhparent
+                WHERE p.relname = $1
+                ORDER BY c.relname
+                """,
+                table,
+            )
+
+        partitions = []
+        for row in rows:
+            match = _PARTITION_SUFFIX.search(row["name"])
+            start = datetime.strptime(match.group(1), "%Y%m%d") if match else None
+            partitions.append({"name": row["name"], "start": start})
+        return partitions
+
+    async def _is_partitioned(self, table: str) -> bool:
+        """Whether table exists and is a partitioned table."""
+        async with self.db_pool.acquire() as conn:
+            relkind = await conn.fetchval(
+                "SELECT relkind FROM pg_class WHERE relname = $1 AND relkind IN ('r', 'p')",
+                table,
+            )
+        return relkind == "p"
+
+    async def _run_loop(self) -> None:
+        """Run maintenance every interval_seconds."""
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                await self.run_maintenance()
+            except Exception as e:
+                logger.error(f"Partition maintenance failed: {e}")
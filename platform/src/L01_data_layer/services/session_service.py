@@ -7,15 +7,18 @@ from typing import List, Optional
 from uuid import UUID
 
 from ..models import Session, SessionCreate, SessionUpdate
+from ..entity_cache import EntityCache
 from ..redis_client import RedisClient
 
 logger = logging.getLogger(__name__)
 
 
 class SessionService:
-    def __init__(self, db_pool: asyncpg.Pool, redis_client: Optional[RedisClient] = None):
+    def __init__(self, db_pool: asyncpg.Pool, redis_client: Optional[RedisClient] = None,
+                 cache: Optional[EntityCache] = None):
         self.db_pool = db_pool
         self.redis_client = redis_client
+        self.cache = cache
 
     def _row_to_session(self, row) -> Session:
         """Convert database row to Session model, parsing JSON fields."""
@@ -61,6 +64,11 @@ class SessionService:
         return session
 
     async def get_session(self, session_id: UUID) -> Optional[Session]:
+        if self.cache:
+            return await self.cache.get("session", session_id, Session, lambda: self._load_session(session_id))
+        return await self._load_session(session_id)
+
+    async def _load_session(self, session_id: UUID) -> Optional[Session]:
         async with self.db_pool.acquire() as conn:
             row = await conn.fetchrow(
                 """
@@ -108,6 +116,8 @@ class SessionService:
             row = await conn.fetchrow(query, *params)
 
         session = self._row_to_session(row) if row else None
+        if session and self.cache:
+            await self.cache.put("session", session.id, session)
 
         # Publish event
         if session and self.redis_client:
@@ -8,7 +8,10 @@ from datetime import datetime
 
 from ..models import Tool, ToolCreate, ToolUpdate, ToolExecution, ToolExecutionCreate, ToolExecutionUpdate
 import json
+from ..entity_cache import EntityCache
 from ..redis_client import RedisClient
+from ..database import bulk_insert, fetch_deduplicated, parse_timestamp
+from ..pagination import keyset_condition, order_by
 
 logger = logging.getLogger(__name__)
 
@@ -16,9 +19,10 @@ logger = logging.getLogger(__name__)
 class ToolRegistry:
     """Tool registry service."""
 
-    def __init__(self, db_pool: asyncpg.Pool, redis_client: RedisClient):
+    def __init__(self, db_pool: asyncpg.Pool, redis_client: RedisClient, cache: Optional[EntityCache] = None):
         self.db_pool = db_pool
         self.redis_client = redis_client
+        self.cache = cache
 
     async def register_tool(self, tool_data: ToolCreate) -> Tool:
         """Register a new tool."""
@@ -51,6 +55,11 @@ class ToolRegistry:
 
     async def get_tool(self, tool_id: UUID) -> Optional[Tool]:
         """Get tool by ID."""
+        if self.cache:
+            return await self.cache.get("tool", tool_id, Tool, lambda: self._load_tool(tool_id))
+        return await self._load_tool(tool_id)
+
+    async def _load_tool(self, tool_id: UUID) -> Optional[Tool]:
         async with self.db_pool.acquire() as conn:
             row = await conn.fetchrow(
                 """
@@ -115,7 +124,17 @@ class ToolRegistry:
         if not row:
             return None
 
-        return Tool(**dict(row))
+        tool = Tool(**dict(row))
+        if self.cache:
+            await self.cache.put("tool", tool.id, tool)
+
+        await self.redis_client.publish_event(
+            event_type="tool.updated",
+            aggregate_type="tool",
+            aggregate_id=str(tool.id),
+            payload={"updates": list(tool_data.model_dump(exclude_unset=True).keys())},
+        )
+        return tool
 
     async def record_execution(self, execution_data: ToolExecutionCreate) -> ToolExecution:
         """Record a tool execution with rich metadata."""
@@ -157,6 +176,10 @@ class ToolRegistry:
                 execution_data.memory_mb_limit,
                 execution_data.timeout_seconds,
             )
+            if row is None:
+                # Retried invocation; return what the first attempt recorded
+                row = await fetch_deduplicated(conn, "tool_executions", execution_data.invocation_id)
+                return self._row_to_execution(row)
 
         execution = self._row_to_execution(row)
 
@@ -175,6 +198,61 @@ class ToolRegistry:
         logger.info(f"Recorded tool execution {execution.invocation_id} ({execution.tool_name})")
         return execution
 
+    async def record_executions(self, executions: List[ToolExecutionCreate]) -> List[UUID]:
+        """
+        Record many tool executions with one COPY.
+
+        Executions whose invocation_id was already recorded are skipped,
+        so a retried batch is safe. One tool.execution.created event is
+        published per inserted row.
+
+        Returns:
+            Invocation IDs that were inserted
+        """
+        columns = (
+            "invocation_id", "tool_id", "tool_name", "tool_version",
+            "agent_id", "agent_did", "tenant_id", "session_id", "parent_sandbox_id",
+            "input_params", "status",
+            "async_mode", "priority", "idempotency_key", "require_approval",
+            "cpu_millicore_limit", "memory_mb_limit", "timeout_seconds",
+            "created_at",
+        )
+        now = datetime.utcnow()
+        records = [
+            (
+                e.invocation_id, e.tool_id, e.tool_name, e.tool_version,
+                e.agent_id, e.agent_did, e.tenant_id, e.session_id, e.parent_sandbox_id,
+                json.dumps(e.input_params), e.status.value,
+                e.async_mode, e.priority, e.idempotency_key, e.require_approval,
+                e.cpu_millicore_limit, e.memory_mb_limit, e.timeout_seconds,
+                parse_timestamp(e.created_at) or now,
+            )
+            for e in executions
+        ]
+        inserted = await bulk_insert(
+            self.db_pool, "tool_executions", columns, records,
+            conflict_columns=("invocation_id", "created_at"), returning="invocation_id"
+        )
+
+        by_invocation = {e.invocation_id: e for e in executions}
+        await self.redis_client.publish_events([
+            {
+                "event_type": "tool.execution.created",
+                "aggregate_type": "tool_execution",
+                "aggregate_id": str(e.invocation_id),
+                "payload": {
+                    "tool_name": e.tool_name,
+                    "agent_id": str(e.agent_id) if e.agent_id else None,
+                    "status": e.status.value,
+                    "session_id": e.session_id,
+                },
+            }
+            for e in (by_invocation[invocation_id] for invocation_id in inserted)
+        ])
+
+        logger.info(f"Recorded {len(inserted)}/{len(executions)} tool executions")
+        return inserted
+
     def _row_to_execution(self, row) -> ToolExecution:
         """Convert database row to ToolExecution model with JSON parsing."""
         execution_dict = dict(row)
@@ -283,9 +361,10 @@ class ToolRegistry:
         tenant_id: Optional[str] = None,
         status: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[ToolExecution]:
-        """List tool executions with filters."""
+        """List tool executions with filters, newest first (cursor overrides offset)."""
         conditions = []
         params = []
         param_count = 1
@@ -315,12 +394,18 @@ class ToolRegistry:
             params.append(status)
             param_count += 1
 
+        keyset, keyset_params, param_count = keyset_condition(cursor, param_count)
+        if keyset:
+            conditions.append(keyset)
+            params.extend(keyset_params)
+            offset = 0
+
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
         query = f"""
             SELECT * FROM tool_executions
             {where_clause}
-            ORDER BY created_at DESC
+            {order_by()}
             LIMIT ${param_count} OFFSET ${param_count + 1}
         """
         params.extend([limit, offset])
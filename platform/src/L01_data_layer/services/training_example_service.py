@@ -18,6 +18,7 @@ from ..models.training_example import (
     TaskType,
 )
 from ..models.error_codes import L01ErrorCode
+from ..pagination import keyset_condition, order_by
 from ..redis_client import RedisClient
 
 logger = logging.getLogger(__name__)
@@ -227,9 +228,10 @@ class TrainingExampleService:
         min_quality: Optional[float] = None,
         source_type: Optional[ExampleSource] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[str] = None
     ) -> List[TrainingExample]:
-        """List training examples with optional filters.
+        """List training examples with optional filters, newest first.
 
         Args:
             agent_id: Filter by agent ID
@@ -237,7 +239,8 @@ class TrainingExampleService:
             min_quality: Minimum quality score
             source_type: Filter by source type
             limit: Maximum results
-            offset: Results offset
+            offset: Results offset (ignored when cursor is given)
+            cursor: Cursor of the previous page
 
         Returns:
             List of training examples
@@ -266,12 +269,18 @@ class TrainingExampleService:
             values.append(source_type.value)
             param_idx += 1
 
+        keyset, keyset_values, param_idx = keyset_condition(cursor, param_idx)
+        if keyset:
+            conditions.append(keyset)
+            values.extend(keyset_values)
+            offset = 0
+
         where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
 
         query = f"""
             SELECT * FROM training_examples
             {where_clause}
-            ORDER BY created_at DESC
+            {order_by()}
             LIMIT ${param_idx} OFFSET ${param_idx + 1}
         """
 
@@ -0,0 +1,104 @@
+"""
+Mergeable quantile sketch for metric rollups.
+
+A DDSketch-style log-bucketed histogram: a value v > 0 is counted in bin
+"p{i}" with i = ceil(log(v) / log(gamma)), negative values in "n{i}" of
+their magnitude, and values near zero in "z". Quantile estimates are
+within relative_accuracy of the true value, and two sketches merge by
+adding their bin counts, so minute rollups can be summed into hour and
+day rollups without losing accuracy.
+
+Bins are stored as a JSONB object of bin key to count; the rollup SQL in
+services/metric_rollup.py computes the same keys server-side.
+"""
+
+import math
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+# Relative error of quantile estimates
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+# Magnitudes below this are counted as zero
+MIN_INDEXABLE_VALUE = 1e-9
+
+
+def gamma_for(relative_accuracy: float) -> float:
+    """Bin growth factor for a relative accuracy."""
+    return (1 + relative_accuracy) / (1 - relative_accuracy)
+
+
+class QuantileSketch:
+    """Log-bucketed quantile sketch with mergeable bin counts."""
+
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        bins: Optional[Mapping[str, int]] = None
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.gamma = gamma_for(relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.bins: Dict[str, int] = {}
+        if bins:
+            self.merge(bins)
+
+    @property
+    def count(self) -> int:
+        """Number of values added."""
+        return sum(self.bins.values())
+
+    def key(self, value: float) -> str:
+        """Bin key for a value."""
+        if value > MIN_INDEXABLE_VALUE:
+            return f"p{math.ceil(math.log(value) / self._log_gamma)}"
+        if value < -MIN_INDEXABLE_VALUE:
+            return f"n{math.ceil(math.log(-value) / self._log_gamma)}"
+        return "z"
+
+    def add(self, value: float, count: int = 1) -> None:
+        """Add a value."""
+        key = self.key(value)
+        self.bins[key] = self.bins.get(key, 0) + count
+
+    def merge(self, other) -> None:
+        """Add the bins of another sketch or a bins mapping."""
+        bins = other.bins if isinstance(other, QuantileSketch) else other
+        for key, count in bins.items():
+            self.bins[key] = self.bins.get(key, 0) + int(count)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the q-quantile (0 <= q <= 1).
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        total = self.count
+        if total == 0:
+            return None
+        rank = q * (total - 1)
+        seen = 0
+        for key, count in self._ordered():
+            seen += count
+            if seen > rank:
+                return self._value(key)
+        return self._value(key)
+
+    def _ordered(self) -> Iterable[Tuple[str, int]]:
+        """Bins in ascending order of value."""
+        def order(key: str) -> Tuple[int, int]:
+            if key == "z":
+                return (1, 0)
+            index = int(key[1:])
+            return (0, -index) if key[0] == "n" else (2, index)
+
+        return sorted(self.bins.items(), key=lambda item: order(item[0]))
+
+    def _value(self, key: str) -> float:
+        """Representative value of a bin (relative error bounded by the accuracy)."""
+        if key == "z":
+            return 0.0
+        magnitude = 2 * self.gamma ** int(key[1:]) / (self.gamma + 1)
+        return -magnitude if key[0] == "n" else magnitude
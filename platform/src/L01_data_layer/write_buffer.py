@@ -0,0 +1,223 @@
+"""
+Write-behind buffer for high-volume L01 writes.
+
+Records are queued per bulk endpoint and sent in batches when a queue
+reaches max_batch_size or every flush_interval seconds, whichever comes
+first. Batches for different endpoints are sent concurrently.
+
+Records are never dropped silently:
+- When max_pending records are queued or in flight, add() waits until
+  earlier batches are acknowledged (back-pressure).
+- Failed batches are retried with backoff and then put back at the
+  front of their queue, unless the error is marked non-retryable.
+- Records the endpoint reports as invalid (indexes in the "rejected"
+  field of its response) are dropped; the rest of the batch is stored.
+- close() flushes everything; records that still cannot be delivered
+  are logged and counted as dropped.
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindBuffer:
+    """Batches records per endpoint and flushes them in the background."""
+
+    def __init__(
+        self,
+        send: Callable[[str, List[Dict[str, Any]]], Awaitable[Any]],
+        max_batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_pending: int = 10000,
+        max_concurrency: int = 4,
+        max_retries: int = 3,
+        retry_backoff: float = 0.5,
+        is_retryable: Optional[Callable[[Exception], bool]] = None,
+    ):
+        """
+        Initialize write-behind buffer.
+
+        Args:
+            send: Coroutine sending one batch to an endpoint path; may
+                return a dict whose "rejected" lists invalid record indexes
+            max_batch_size: Records per batch
+            flush_interval: Seconds between background flushes
+            max_pending: Queued plus in-flight records before add() blocks
+            max_concurrency: Batches sent at the same time
+            max_retries: Retries per batch before it is requeued
+            retry_backoff: Initial retry delay in seconds (doubles per retry)
+            is_retryable: Returns False for errors that retrying cannot fix
+        """
+        self._send = send
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._is_retryable = is_retryable or (lambda error: True)
+
+        self._queues: Dict[str, Deque[Dict[str, Any]]] = {}
+        self._pending = 0
+        self._space = asyncio.Condition()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: Set[asyncio.Task] = set()
+        self._timer: Optional[asyncio.Task] = None
+        self._closed = False
+        self._stats = {
+            "enqueued": 0,
+            "flushed": 0,
+            "batches": 0,
+            "retries": 0,
+            "requeued": 0,
+            "rejected": 0,
+            "dropped": 0,
+            "backpressure_waits": 0,
+        }
+
+    @property
+    def pending(self) -> int:
+        """Records queued or in flight."""
+        return self._pending
+
+    async def add(self, path: str, record: Dict[str, Any]) -> None:
+        """
+        Queue a record for the bulk endpoint at path.
+
+        Blocks while max_pending records are outstanding.
+        """
+        if self._closed:
+            raise RuntimeError("Write-behind buffer is closed")
+
+        if self._pending >= self.max_pending:
+            self._stats["backpressure_waits"] += 1
+            self._flush_queued()
+            async with self._space:
+                await self._space.wait_for(
+                    lambda: self._pending < self.max_pending or self._closed
+                )
+            if self._closed:
+                raise RuntimeError("Write-behind buffer is closed")
+
+        queue = self._queues.setdefault(path, deque())
+        queue.append(record)
+        self._pending += 1
+        self._stats["enqueued"] += 1
+
+        if self._timer is None:
+            self._timer = asyncio.create_task(self._run_timer())
+        if len(queue) >= self.max_batch_size:
+            self._spawn(path)
+
+    async def flush(self) -> int:
+        """
+        Send everything queued and wait for in-flight batches.
+
+        Returns:
+            Records still queued afterwards (batches that failed and were requeued)
+        """
+        self._flush_queued()
+        while self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def close(self) -> int:
+        """
+        Stop the background flush and deliver remaining records.
+
+        Returns:
+            Records that could not be delivered
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            try:
+                await self._timer
+            except asyncio.CancelledError:
+                pass
+            self._timer = None
+
+        remaining = await self.flush()
+        self._closed = True
+        if remaining:
+            self._stats["dropped"] += remaining
+            logger.error(f"Write-behind buffer closed with {remaining} undelivered records")
+            self._queues.clear()
+            await self._release(remaining)
+        else:
+            async with self._space:
+                self._space.notify_all()
+        return remaining
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get buffer statistics."""
+        return {
+            **self._stats,
+            "pending": self._pending,
+            "queued": {path: len(queue) for path, queue in self._queues.items() if queue},
+            "inflight_batches": len(self._inflight),
+        }
+
+    def _flush_queued(self) -> None:
+        """Start sending every queued record."""
+        for path in list(self._queues):
+            while self._queues[path]:
+                self._spawn(path)
+
+    def _spawn(self, path: str) -> None:
+        """Take one batch off the queue for path and send it in the background."""
+        queue = self._queues.get(path)
+        if not queue:
+            return
+        batch = [queue.popleft() for _ in range(min(len(queue), self.max_batch_size))]
+        task = asyncio.create_task(self._send_batch(path, batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _send_batch(self, path: str, batch: List[Dict[str, Any]]) -> None:
+        """Send a batch, retrying with backoff; requeue it if all attempts fail."""
+        rejected: List[int] = []
+        async with self._semaphore:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    result = await self._send(path, batch)
+                    if isinstance(result, dict):
+                        rejected = result.get("rejected") or []
+                    break
+                except Exception as e:
+                    if not self._is_retryable(e):
+                        self._stats["rejected"] += len(batch)
+                        logger.error(f"Rejected batch of {len(batch)} records for {path}: {e}")
+                        await self._release(len(batch))
+                        return
+                    if attempt == self.max_retries:
+                        self._stats["requeued"] += len(batch)
+                        logger.warning(
+                            f"Failed to send {len(batch)} records to {path} after "
+                            f"{attempt + 1} attempts, requeued: {e}"
+                        )
+                        self._queues.setdefault(path, deque()).extendleft(reversed(batch))
+                        return
+                    self._stats["retries"] += 1
+                    await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+
+        if rejected:
+            self._stats["rejected"] += len(rejected)
+            logger.error(f"Rejected {len(rejected)} of {len(batch)} records for {path}: indexes {rejected}")
+        self._stats["flushed"] += len(batch) - len(rejected)
+        self._stats["batches"] += 1
+        await self._release(len(batch))
+
+    async def _release(self, count: int) -> None:
+        """Mark records as done and wake producers waiting for space."""
+        async with self._space:
+            self._pending -= count
+            self._space.notify_all()
+
+    async def _run_timer(self) -> None:
+        """Flush all queues every flush_interval seconds."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self._flush_queued()
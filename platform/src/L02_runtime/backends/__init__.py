@@ -10,6 +10,7 @@ The RuntimeBackend protocol defines the interface that all backends must impleme
 
 from .protocol import RuntimeBackend, ContainerInfo, ContainerState
 from .local_runtime import LocalRuntime
+from .container_stats import ContainerStats, ContainerStatsCollector
 from .kubernetes_runtime import KubernetesRuntime
 
 __all__ = [
@@ -17,5 +18,7 @@ __all__ = [
     "ContainerInfo",
     "ContainerState",
     "LocalRuntime",
+    "ContainerStats",
+    "ContainerStatsCollector",
     "KubernetesRuntime",
 ]
@@ -0,0 +1,426 @@
+"""
+Container Stats Collector
+
+Keeps the latest resource sample of every tracked container in an
+in-memory table, so that reading a container's usage is a dict lookup
+instead of a blocking one-shot Docker stats call (which samples for about
+a second and ties up an executor thread per container).
+
+Samples come from one of two sources per container:
+
+- cgroup v2: when the container's cgroup directory is visible (systemd or
+  cgroupfs driver), cpu.stat, memory.current/peak/max and the network
+  counters of a process in the container are read for all such
+  containers in one executor call every interval_seconds.
+- Docker stats stream: otherwise one daemon thread per container iterates
+  container.stats(stream=True), which the daemon pushes about once a
+  second. These threads are not taken from the default executor.
+
+Subscribers are called on the event loop with each new sample; samples
+that arrive while a subscriber is busy are coalesced to the latest one
+per container.
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from docker.errors import DockerException, NotFound
+
+from ..models import ResourceUsage
+
+
+logger = logging.getLogger(__name__)
+
+StatsListener = Callable[["ContainerStats"], Awaitable[None]]
+
+
+@dataclass
+class ContainerStats:
+    """Latest resource sample of a container"""
+    container_id: str
+    agent_id: Optional[str] = None
+    cpu_seconds: float = 0.0          # Cumulative CPU time
+    cpu_percent: float = 0.0          # 100 = one core busy
+    memory_mb: float = 0.0
+    memory_peak_mb: float = 0.0
+    memory_limit_mb: float = 0.0      # 0 if unlimited
+    network_bytes_sent: int = 0
+    network_bytes_received: int = 0
+    source: str = "stream"            # cgroup or stream
+    sampled_at: float = 0.0           # time.monotonic()
+
+    @property
+    def memory_percent(self) -> float:
+        if self.memory_limit_mb <= 0:
+            return 0.0
+        return self.memory_mb / self.memory_limit_mb * 100
+
+    def to_resource_usage(self) -> ResourceUsage:
+        return ResourceUsage(
+            cpu_seconds=self.cpu_seconds,
+            memory_peak_mb=self.memory_peak_mb,
+            tokens_consumed=0,  # Tracked separately by Resource Manager
+            network_bytes_sent=self.network_bytes_sent,
+            network_bytes_received=self.network_bytes_received,
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "container_id": self.container_id,
+            "agent_id": self.agent_id,
+            "cpu_seconds": self.cpu_seconds,
+            "cpu_percent": self.cpu_percent,
+            "memory_mb": self.memory_mb,
+            "memory_peak_mb": self.memory_peak_mb,
+            "memory_limit_mb": self.memory_limit_mb,
+            "memory_percent": self.memory_percent,
+            "network_bytes_sent": self.network_bytes_sent,
+            "network_bytes_received": self.network_bytes_received,
+            "source": self.source,
+        }
+
+
+def parse_docker_stats(
+    container_id: str,
+    stats: Dict[str, Any],
+    previous: Optional[ContainerStats] = None,
+) -> ContainerStats:
+    """
+    Build a sample from a Docker stats document.
+
+    Args:
+        container_id: Container identifier
+        stats: Decoded stats document (stream or one-shot)
+        previous: Previous sample, for the memory peak
+
+    Raises:
+        KeyError, TypeError: If the document has no CPU or memory section
+    """
+    cpu = stats["cpu_stats"]
+    precpu = stats.get("precpu_stats") or {}
+    total_usage = cpu["cpu_usage"]["total_usage"]
+
+    cpu_percent = 0.0
+    cpu_delta = total_usage - precpu.get("cpu_usage", {}).get("total_usage", total_usage)
+    system_delta = cpu.get("system_cpu_usage", 0) - precpu.get("system_cpu_usage", 0)
+    if cpu_delta > 0 and system_delta > 0:
+        online_cpus = cpu.get("online_cpus") or len(cpu["cpu_usage"].get("percpu_usage") or [1])
+        cpu_percent = cpu_delta / system_delta * online_cpus * 100
+
+    memory = stats["memory_stats"]
+    memory_mb = memory.get("usage", 0) / (1024 * 1024)
+    peak_mb = max(memory_mb, memory.get("max_usage", 0) / (1024 * 1024))
+    if previous is not None:
+        peak_mb = max(peak_mb, previous.memory_peak_mb)
+
+    networks = stats.get("networks") or {}
+    return ContainerStats(
+        container_id=container_id,
+        agent_id=previous.agent_id if previous else None,
+        cpu_seconds=total_usage / 1_000_000_000,
+        cpu_percent=cpu_percent,
+        memory_mb=memory_mb,
+        memory_peak_mb=peak_mb,
+        memory_limit_mb=memory.get("limit", 0) / (1024 * 1024),
+        network_bytes_sent=sum(n.get("tx_bytes", 0) for n in networks.values()),
+        network_bytes_received=sum(n.get("rx_bytes", 0) for n in networks.values()),
+        source="stream",
+        sampled_at=time.monotonic(),
+    )
+
+
+def _read(path: str) -> str:
+    with open(path) as f:
+        return f.read().strip()
+
+
+def read_cgroup_stats(
+    container_id: str,
+    cgroup_dir: str,
+    previous: Optional[ContainerStats] = None,
+) -> ContainerStats:
+    """
+    Build a sample from a container's cgroup v2 directory.
+
+    Args:
+        container_id: Container identifier
+        cgroup_dir: The container's cgroup directory
+        previous: Previous sample, for CPU percent and the memory peak
+
+    Raises:
+        OSError: If the cgroup is gone
+    """
+    now = time.monotonic()
+    cpu_seconds = 0.0
+    for line in _read(os.path.join(cgroup_dir, "cpu.stat")).splitlines():
+        key, _, value = line.partition(" ")
+        if key == "usage_usec":
+            cpu_seconds = int(value) / 1_000_000
+            break
+
+    memory_mb = int(_read(os.path.join(cgroup_dir, "memory.current"))) / (1024 * 1024)
+    try:
+        peak_mb = int(_read(os.path.join(cgroup_dir, "memory.peak"))) / (1024 * 1024)
+    except (OSError, ValueError):
+        peak_mb = memory_mb  # memory.peak needs Linux 5.19
+    limit = _read(os.path.join(cgroup_dir, "memory.max"))
+    limit_mb = 0.0 if limit == "max" else int(limit) / (1024 * 1024)
+
+    cpu_percent = 0.0
+    if previous is not None:
+        peak_mb = max(peak_mb, previous.memory_peak_mb)
+        elapsed = now - previous.sampled_at
+        if elapsed > 0:
+            cpu_percent = max(cpu_seconds - previous.cpu_seconds, 0.0) / elapsed * 100
+
+    # Network counters live in the container's network namespace
+    sent = received = 0
+    try:
+        pid = _read(os.path.join(cgroup_dir, "cgroup.procs")).split()[0]
+        for line in _read(f"/proc/{pid}/net/dev").splitlines()[2:]:
+            interface, _, counters = line.partition(":")
+            if interface.strip() == "lo":
+                continue
+            fields = counters.split()
+            received += int(fields[0])
+            sent += int(fields[8])
+    except (OSError, IndexError, ValueError):
+        if previous is not None:
+            sent, received = previous.network_bytes_sent, previous.network_bytes_received
+
+    return ContainerStats(
+        container_id=container_id,
+        agent_id=previous.agent_id if previous else None,
+        cpu_seconds=cpu_seconds,
+        cpu_percent=cpu_percent,
+        memory_mb=memory_mb,
+        memory_peak_mb=max(peak_mb, memory_mb),
+        memory_limit_mb=limit_mb,
+        network_bytes_sent=sent,
+        network_bytes_received=received,
+        source="cgroup",
+        sampled_at=now,
+    )
+
+
+class ContainerStatsCollector:
+    """Background collector of per-container resource samples."""
+
+    def __init__(self, docker_client=None, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize collector.
+
+        Args:
+            docker_client: Docker client for stats streams
+            config: Configuration dict with:
+                - source: auto (cgroup when visible, else stream), cgroup or stream
+                - interval_seconds: cgroup polling interval
+                - cgroup_root: cgroup v2 mount point
+        """
+        self.config = config or {}
+        self.docker_client = docker_client
+        self.source = self.config.get("source", "auto")
+        self.interval = self.config.get("interval_seconds", 1.0)
+        self.cgroup_root = self.config.get("cgroup_root", "/sys/fs/cgroup")
+
+        # Latest sample per container (the shared table)
+        self._samples: Dict[str, ContainerStats] = {}
+        self._agents: Dict[str, Optional[str]] = {}
+        # container_id -> cgroup directory, for cgroup-sourced containers
+        self._cgroups: Dict[str, str] = {}
+        # container_id -> stop flag of its stream thread
+        self._streams: Dict[str, threading.Event] = {}
+
+        self._listeners: List[StatsListener] = []
+        self._pending: Dict[str, ContainerStats] = {}
+        self._pending_event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._poll_task: Optional[asyncio.Task] = None
+        self._dispatch_task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        """Start polling cgroups and dispatching samples"""
+        self._loop = asyncio.get_running_loop()
+        self._pending_event = asyncio.Event()
+        if self._poll_task is None:
+            self._poll_task = asyncio.create_task(self._poll_loop())
+        if self._dispatch_task is None:
+            self._dispatch_task = asyncio.create_task(self._dispatch_loop())
+
+    async def stop(self) -> None:
+        """Stop all streams and background tasks"""
+        for container_id in list(self._agents):
+            self.untrack(container_id)
+        for task in (self._poll_task, self._dispatch_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._poll_task = None
+        self._dispatch_task = None
+
+    def subscribe(self, listener: StatsListener) -> None:
+        """Call a coroutine function with every new sample"""
+        self._listeners.append(listener)
+
+    def track(self, container_id: str, agent_id: Optional[str] = None, pid: Optional[int] = None) -> None:
+        """
+        Start collecting samples of a container.
+
+        Args:
+            container_id: Full container identifier
+            agent_id: Agent running in the container
+            pid: Process in the container, to locate its cgroup
+        """
+        if container_id in self._agents:
+            if agent_id:
+                self._agents[container_id] = agent_id
+            return
+        self._agents[container_id] = agent_id
+
+        cgroup_dir = self._find_cgroup(container_id, pid) if self.source != "stream" else None
+        if cgroup_dir:
+            self._cgroups[container_id] = cgroup_dir
+            logger.debug(f"Collecting stats of {container_id[:12]} from {cgroup_dir}")
+            return
+        if self.source == "cgroup":
+            logger.warning(f"No cgroup v2 directory for container {container_id[:12]}, using stats stream")
+        self._start_stream(container_id)
+
+    def untrack(self, container_id: str) -> None:
+        """Stop collecting samples of a container and drop its sample"""
+        self._agents.pop(container_id, None)
+        self._cgroups.pop(container_id, None)
+        self._samples.pop(container_id, None)
+        self._pending.pop(container_id, None)
+        stop = self._streams.pop(container_id, None)
+        if stop is not None:
+            stop.set()
+
+    def get(self, container_id: str) -> Optional[ContainerStats]:
+        """Latest sample of a container, None if there is none yet"""
+        return self._samples.get(container_id)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "tracked": len(self._agents),
+            "cgroup": len(self._cgroups),
+            "streams": len(self._streams),
+            "samples": len(self._samples),
+        }
+
+    def _find_cgroup(self, container_id: str, pid: Optional[int]) -> Optional[str]:
+        if not os.path.exists(os.path.join(self.cgroup_root, "cgroup.controllers")):
+            return None
+        candidates = [
+            os.path.join(self.cgroup_root, "system.slice", f"docker-{container_id}.scope"),
+            os.path.join(self.cgroup_root, "docker", container_id),
+        ]
+        if pid:
+            try:
+                for line in _read(f"/proc/{pid}/cgroup").splitlines():
+                    if line.startswith("0::"):
+                        candidates.insert(0, os.path.join(self.cgroup_root, line[3:].lstrip("/")))
+            except OSError:
+                pass
+        for candidate in candidates:
+            if os.path.exists(os.path.join(candidate, "memory.current")):
+                return candidate
+        return None
+
+    def _publish(self, sample: ContainerStats) -> None:
+        """Store a sample and queue it for subscribers (event loop thread)"""
+        if sample.container_id not in self._agents:
+            return  # Untracked meanwhile
+        sample.agent_id = self._agents[sample.container_id]
+        self._samples[sample.container_id] = sample
+        if self._listeners and self._pending_event is not None:
+            self._pending[sample.container_id] = sample
+            self._pending_event.set()
+
+    def _start_stream(self, container_id: str) -> None:
+        if self.docker_client is None or self._loop is None:
+            return
+        stop = threading.Event()
+        self._streams[container_id] = stop
+        thread = threading.Thread(
+            target=self._stream,
+            args=(container_id, stop),
+            name=f"stats-{container_id[:12]}",
+            daemon=True,
+        )
+        thread.start()
+
+    def _stream(self, container_id: str, stop: threading.Event) -> None:
+        """Iterate a container's stats stream (runs in its own thread)"""
+        previous = None
+        try:
+            container = self.docker_client.containers.get(container_id)
+            for stats in container.stats(stream=True, decode=True):
+                if stop.is_set():
+                    break
+                try:
+                    previous = parse_docker_stats(container_id, stats, previous)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.debug(f"Failed to parse container stats: {e}")
+                    continue
+                self._loop.call_soon_threadsafe(self._publish, previous)
+        except NotFound:
+            logger.debug(f"Container {container_id[:12]} gone, stats stream ended")
+        except DockerException as e:
+            logger.warning(f"Stats stream of {container_id[:12]} failed: {e}")
+        except RuntimeError:
+            pass  # Event loop closed
+        except Exception as e:
+            logger.warning(f"Unexpected error in stats stream of {container_id[:12]}: {e}")
+
+    def _read_cgroups(self, cgroups: Dict[str, str]) -> List[ContainerStats]:
+        """Sample all cgroup-sourced containers (runs in an executor thread)"""
+        samples = []
+        for container_id, cgroup_dir in cgroups.items():
+            try:
+                samples.append(read_cgroup_stats(container_id, cgroup_dir, self._samples.get(container_id)))
+            except (OSError, ValueError) as e:
+                logger.debug(f"Failed to read cgroup of {container_id[:12]}: {e}")
+        return samples
+
+    async def _poll_loop(self) -> None:
+        """Sample cgroup-sourced containers every interval"""
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                await asyncio.sleep(self.interval)
+                if not self._cgroups:
+                    continue
+                samples = await loop.run_in_executor(None, self._read_cgroups, dict(self._cgroups))
+                for sample in samples:
+                    self._publish(sample)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in cgroup stats loop: {e}")
+
+    async def _dispatch_loop(self) -> None:
+        """Hand the latest samples to subscribers"""
+        while True:
+            try:
+                await self._pending_event.wait()
+                self._pending_event.clear()
+                pending, self._pending = self._pending, {}
+                for sample in pending.values():
+                    for listener in self._listeners:
+                        try:
+                            await listener(sample)
+                        except Exception as e:
+                            logger.warning(f"Stats listener failed for {sample.container_id[:12]}: {e}")
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Error in stats dispatch loop: {e}")
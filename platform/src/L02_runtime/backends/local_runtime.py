@@ -24,6 +24,7 @@ from ..models import (
     NetworkPolicy,
 )
 from .protocol import ContainerInfo, ContainerState
+from .container_stats import ContainerStatsCollector, parse_docker_stats
 
 
 logger = logging.getLogger(__name__)
@@ -64,6 +65,7 @@ class LocalRuntime:
         self.docker_client: Optional[docker.DockerClient] = None
         self._container_registry: Dict[str, str] = {}  # agent_id -> container_id
         self._restricted_network: Optional[Network] = None
+        self.stats_collector: Optional[ContainerStatsCollector] = None
 
     async def initialize(self) -> None:
         """Connect to Docker daemon and setup restricted network"""
@@ -80,6 +82,13 @@ class LocalRuntime:
             # Create or get restricted network for egress filtering
             await self._ensure_restricted_network()
 
+            # Background collector of per-container resource samples
+            self.stats_collector = ContainerStatsCollector(
+                self.docker_client,
+                self.config.get("stats", {})
+            )
+            await self.stats_collector.start()
+
         except DockerException as e:
             raise RuntimeError(f"Failed to connect to Docker: {e}")
 
@@ -187,6 +196,8 @@ class LocalRuntime:
 
             # Register container
             self._container_registry[config.agent_id] = container.id
+            if self.stats_collector:
+                self.stats_collector.track(container.id, config.agent_id)
 
             # Create session_id (in production this would come from SessionBridge)
             session_id = f"session-{config.agent_id}"
@@ -328,6 +339,8 @@ class LocalRuntime:
                 if cid == container_id:
                     del self._container_registry[agent_id]
                     break
+            if self.stats_collector:
+                self.stats_collector.untrack(container.id)
 
         except NotFound:
             raise RuntimeError(f"Container {container_id} not found")
@@ -421,34 +434,28 @@ class LocalRuntime:
             raise RuntimeError(f"Failed to get container info: {e}")
 
     async def _get_container_stats(self, container: Container) -> ResourceUsage:
-        """Get container resource usage statistics"""
+        """
+        Get container resource usage statistics.
+
+        Reads the collector's latest sample. A container without one yet
+        is tracked from now on and sampled once with a one-shot stats call
+        (which blocks for about a second in the daemon).
+        """
+        if self.stats_collector:
+            sample = self.stats_collector.get(container.id)
+            if sample is not None:
+                return sample.to_resource_usage()
+            self.stats_collector.track(container.id, container.labels.get("agent_id"))
+
         try:
             loop = asyncio.get_event_loop()
             stats = await loop.run_in_executor(
                 None,
                 lambda: container.stats(stream=False)
             )
+            return parse_docker_stats(container.id, stats).to_resource_usage()
 
-            # Calculate CPU usage
-            cpu_delta = stats["cpu_stats"]["cpu_usage"]["total_usage"] - \
-                        stats["precpu_stats"]["cpu_usage"]["total_usage"]
-            system_delta = stats["cpu_stats"]["system_cpu_usage"] - \
-                          stats["precpu_stats"]["system_cpu_usage"]
-            cpu_seconds = cpu_delta / 1_000_000_000 if system_delta > 0 else 0
-
-            # Calculate memory usage
-            memory_usage = stats["memory_stats"].get("usage", 0)
-            memory_mb = memory_usage / (1024 * 1024)
-
-            return ResourceUsage(
-                cpu_seconds=cpu_seconds,
-                memory_peak_mb=memory_mb,
-                tokens_consumed=0,  # Tracked separately by Resource Manager
-                network_bytes_sent=stats.get("networks", {}).get("eth0", {}).get("tx_bytes", 0),
-                network_bytes_received=stats.get("networks", {}).get("eth0", {}).get("rx_bytes", 0),
-            )
-
-        except (KeyError, ValueError, ZeroDivisionError) as e:
+        except (KeyError, TypeError, ValueError, ZeroDivisionError) as e:
             logger.debug(f"Failed to parse container stats: {e}")
             return ResourceUsage()
         except DockerException as e:
@@ -585,6 +592,10 @@ class LocalRuntime:
 
     async def get_resource_usage(self, container_id: str) -> ResourceUsage:
         """Get current resource usage"""
+        if self.stats_collector:
+            sample = self.stats_collector.get(container_id)
+            if sample is not None:
+                return sample.to_resource_usage()
         info = await self.get_container_info(container_id)
         return info.resource_usage
 
@@ -606,6 +617,10 @@ class LocalRuntime:
 
     async def cleanup(self) -> None:
         """Cleanup and disconnect"""
+        if self.stats_collector:
+            await self.stats_collector.stop()
+            self.stats_collector = None
+
         if self.docker_client:
             loop = asyncio.get_event_loop()
 
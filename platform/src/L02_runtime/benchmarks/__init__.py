@@ -0,0 +1,6 @@
+"""
+L02 Agent Runtime - Benchmarks
+
+Standalone benchmark scripts, run with:
+    python -m L02_runtime.benchmarks.<name> --help
+"""
@@ -0,0 +1,236 @@
+"""
+L02 Agent Runtime - Checkpoint Pipeline Benchmark
+
+Checkpoints synthetic agent contexts (a growing conversation plus a few
+counters that change every step) and compares the old write path, the
+whole context gzip-compressed on the event loop, with the checkpoint
+pipeline: content-defined chunks stored once, compressed with zstd and a
+trained dictionary (gzip if zstandard is not installed) in an executor.
+
+Reports checkpoint throughput, the longest event-loop stall while
+checkpointing, bytes stored against the raw context size, and checks that
+every checkpoint restores byte-exact.
+
+Without --dsn chunks are kept in memory. With --dsn the checkpoints also
+go through StateManager against PostgreSQL (group commit and restore);
+the l02_runtime schema is created if missing and the benchmark's rows are
+deleted afterwards.
+
+Usage:
+    python -m L02_runtime.benchmarks.bench_checkpoint_pipeline
+    python -m L02_runtime.benchmarks.bench_checkpoint_pipeline --agents 20 --steps 200 --dsn postgresql://...
+"""
+
+import argparse
+import asyncio
+import gzip
+import hashlib
+import logging
+import random
+import time
+from typing import Any, Dict, List
+
+from ..models import AgentState
+from ..services.checkpoint_pipeline import (
+    ChunkCodec,
+    encode_checkpoint,
+    encode_json,
+    split_chunks,
+)
+from ..services.state_manager import StateManager
+
+WORDS = (
+    "agent tool call result plan step goal context memory retrieve summarize "
+    "document policy user request response error retry model token budget "
+    "observation action thought evaluate score cache latency"
+).split()
+
+
+def agent_contexts(agents: int, steps: int, seed: int = 7) -> List[List[Dict[str, Any]]]:
+    """Per agent, the context at every step."""
+    rng = random.Random(seed)
+    result = []
+    for agent in range(agents):
+        messages = []
+        history = []
+        for step in range(steps):
+            messages.append({
+                "role": rng.choice(["user", "assistant", "tool"]),
+                "content": " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 200))),
+                "step": step,
+            })
+            history.append({
+                "agent_id": f"agent-{agent}",
+                "step": step,
+                "tokens_used": step * 512 + rng.randint(0, 511),
+                "last_tool": rng.choice(WORDS),
+                "messages": list(messages),
+                "scratchpad": {"plan": [rng.choice(WORDS) for _ in range(8)]},
+            })
+        result.append(history)
+    return result
+
+
+class LoopMonitor:
+    """Measures the longest gap between event-loop ticks."""
+
+    def __init__(self, interval: float = 0.001):
+        self.interval = interval
+        self.max_stall = 0.0
+        self._task = None
+
+    async def __aenter__(self):
+        self._task = asyncio.create_task(self._run())
+        await asyncio.sleep(0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._task.cancel()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.max_stall = max(self.max_stall, loop.time() - start - self.interval)
+
+
+async def bench_gzip(contexts) -> Dict[str, float]:
+    """Old path: whole context JSON-encoded and gzipped on the event loop."""
+    stored = raw = count = 0
+    async with LoopMonitor() as monitor:
+        start = time.perf_counter()
+        for history in contexts:
+            for context in history:
+                data = encode_json(context)
+                compressed = gzip.compress(data)
+                raw += len(data)
+                stored += len(compressed)
+                count += 1
+                await asyncio.sleep(0)
+        elapsed = time.perf_counter() - start
+    return {"count": count, "seconds": elapsed, "raw": raw, "stored": stored, "stall": monitor.max_stall}
+
+
+async def bench_pipeline(contexts, compression: str, dictionary_samples: int) -> Dict[str, float]:
+    """Pipeline path with an in-memory chunk store."""
+    loop = asyncio.get_running_loop()
+    codec = ChunkCodec(compression)
+    store = {}
+    known = {}
+    restored = []
+    stored = raw = count = 0
+
+    if codec.uses_dictionary and dictionary_samples:
+        # Train on the first steps of the first agents, as the pipeline would
+        samples = []
+        for history in contexts:
+            for context in history[:5]:
+                samples.extend(split_chunks(encode_json(context)))
+        codec.add_dictionary(1, codec.train(samples[:dictionary_samples]))
+
+    async with LoopMonitor() as monitor:
+        start = time.perf_counter()
+        for history in contexts:
+            for context in history:
+                data = await loop.run_in_executor(None, encode_json, context)
+                encoded = await loop.run_in_executor(None, encode_checkpoint, data, codec, known)
+                for chunk in encoded.new_chunks:
+                    store[chunk.chunk_hash] = chunk
+                    known[chunk.chunk_hash] = (0.0, len(chunk.data))
+                    stored += len(chunk.data)
+                raw += len(data)
+                count += 1
+                restored.append((encoded.chunk_hashes, encoded.sha256))
+        elapsed = time.perf_counter() - start
+
+    for chunk_hashes, sha256 in restored:
+        data = b"".join(
+            codec.decompress(store[h].codec, store[h].dict_id, store[h].data) for h in chunk_hashes
+        )
+        assert hashlib.sha256(data).digest() == sha256, "restore is not byte-exact"
+
+    return {"count": count, "seconds": elapsed, "raw": raw, "stored": stored, "stall": monitor.max_stall}
+
+
+async def bench_state_manager(contexts, dsn: str, compression: str) -> Dict[str, float]:
+    """Pipeline through StateManager and PostgreSQL, with restore."""
+    manager = StateManager(config={
+        "postgresql_dsn": dsn,
+        "hot_state_backend": "none",
+        "checkpoint_compression": compression,
+        "checkpoint_dictionary_samples": 500,
+    })
+    await manager.initialize()
+    checkpoint_ids = []
+    try:
+        start = time.perf_counter()
+
+        async def run_agent(agent: int, history) -> None:
+            for context in history:
+                checkpoint_ids.append((await manager.create_checkpoint(
+                    agent_id=f"bench-agent-{agent}",
+                    session_id="bench",
+                    state=AgentState.RUNNING,
+                    context=context,
+                ), context))
+
+        await asyncio.gather(*(run_agent(i, history) for i, history in enumerate(contexts)))
+        elapsed = time.perf_counter() - start
+
+        for checkpoint_id, context in checkpoint_ids:
+            snapshot = await manager.restore_checkpoint(checkpoint_id)
+            assert encode_json(snapshot.context) == encode_json(context), "restore is not byte-exact"
+
+        stats = manager.get_statistics()["checkpoint_pipeline"]
+        return {
+            "count": len(checkpoint_ids),
+            "seconds": elapsed,
+            "raw": stats["raw_bytes"],
+            "stored": stats["stored_bytes"],
+            "batches": stats["batches"],
+        }
+    finally:
+        for checkpoint_id, _ in checkpoint_ids:
+            await manager.delete_checkpoint(checkpoint_id)
+        await manager.cleanup()
+
+
+def report(label: str, result: Dict[str, float]) -> None:
+    mb = result["raw"] / (1024 * 1024)
+    stall = f"{result['stall'] * 1000:>10.1f}" if "stall" in result else f"{'-':>10}"
+    print(
+        f"{label:<22}{result['count'] / result['seconds']:>12.0f}{mb / result['seconds']:>10.1f}"
+        f"{stall}{result['stored'] / 1024:>14,.0f}{result['stored'] / result['raw']:>10.1%}"
+    )
+
+
+async def run(args: argparse.Namespace) -> None:
+    logging.getLogger("L02_runtime").setLevel(logging.CRITICAL)
+    contexts = agent_contexts(args.agents, args.steps)
+    raw_mb = sum(len(encode_json(c)) for h in contexts for c in h) / (1024 * 1024)
+    print(f"{args.agents} agents x {args.steps} checkpoints, {raw_mb:.1f} MB of context JSON")
+    print(f"\n{'path':<22}{'ckpt/s':>12}{'MB/s':>10}{'stall ms':>10}{'stored KB':>14}{'of raw':>10}")
+
+    report("gzip on event loop", await bench_gzip(contexts))
+    report(f"pipeline ({ChunkCodec(args.compression).algorithm})",
+           await bench_pipeline(contexts, args.compression, 0))
+    if ChunkCodec(args.compression).uses_dictionary:
+        report("pipeline (zstd+dict)", await bench_pipeline(contexts, args.compression, args.dictionary_samples))
+    if args.dsn:
+        result = await bench_state_manager(contexts, args.dsn, args.compression)
+        report(f"StateManager ({result['batches']} tx)", result)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--agents", type=int, default=10, help="Agents checkpointing")
+    parser.add_argument("--steps", type=int, default=100, help="Checkpoints per agent")
+    parser.add_argument("--compression", default="zstd", help="zstd, gzip or none")
+    parser.add_argument("--dictionary-samples", type=int, default=1000, help="Chunks to train the dictionary on")
+    parser.add_argument("--dsn", help="PostgreSQL connection string (optional)")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+L02 Agent Runtime - Warm Pool Sizing Benchmark
+
+Replays a spawn trace against a simulated warm pool and compares a fixed
+pool of --fixed-size instances per runtime class with predictive sizing
+(WarmPoolPlanner) under the same idle-cost budget and half of it. Reports
+warm-hit ratio, mean and p99 spawn latency, idle instance-hours and
+instances created.
+
+Without --trace a synthetic trace is generated: a steady base rate per
+runtime class, a ramp every --season seconds, and a burst at the same
+point of every season plus random bursts. A recorded trace
+(WarmPoolManager.export_spawn_trace, JSON lines of timestamp and
+runtime_class) can be replayed with --trace; --save-trace writes the
+synthetic one.
+
+Usage:
+    python -m L02_runtime.benchmarks.bench_warm_pool
+    python -m L02_runtime.benchmarks.bench_warm_pool --trace spawns.jsonl --fixed-size 5
+"""
+
+import argparse
+import math
+import random
+from typing import Dict, List, Tuple
+
+from ..services.warm_pool_forecast import WarmPoolPlanner, dump_trace, load_trace, replay_trace
+
+# Cold-start latency per runtime class (seconds)
+COLD_START = {"runc": 1.5, "gvisor": 4.0, "kata": 9.0}
+
+# Base spawns per minute per runtime class
+BASE_RATE = {"runc": 2.0, "gvisor": 6.0, "kata": 1.0}
+
+
+def synthetic_trace(seasons: int, season: float, seed: int = 11) -> List[Tuple[float, str]]:
+    """Spawn events with a seasonal ramp, a recurring burst and random bursts."""
+    rng = random.Random(seed)
+    events = []
+    start = 1_700_000_000.0
+    step = 1.0
+    for runtime_class, per_minute in BASE_RATE.items():
+        t = 0.0
+        while t < seasons * season:
+            phase = (t % season) / season
+            rate = per_minute / 60 * (1 + 1.5 * math.sin(math.pi * phase) ** 2)
+            # Recurring burst at 60% of every season
+            if 0.6 <= phase < 0.6 + 30 / season:
+                rate *= 12
+            if rng.random() < rate * step:
+                events.append((start + t, runtime_class))
+            t += step
+        # Random bursts
+        for _ in range(seasons * 2):
+            at = rng.uniform(0, seasons * season)
+            for i in range(rng.randint(5, 15)):
+                events.append((start + at + i * rng.uniform(0.2, 1.0), runtime_class))
+    events.sort()
+    return events
+
+
+def report(label: str, result) -> None:
+    print(
+        f"{label:<16}{result.warm_hit_ratio:>10.1%}{result.mean_latency_seconds:>10.3f}"
+        f"{result.p99_latency_seconds:>10.2f}{result.idle_instance_hours:>14.1f}{result.instances_created:>10}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trace", help="Spawn trace to replay (JSON lines)")
+    parser.add_argument("--save-trace", help="Write the synthetic trace here")
+    parser.add_argument("--seasons", type=int, default=8, help="Seasons of synthetic trace")
+    parser.add_argument("--season", type=float, default=3600.0, help="Season length in seconds")
+    parser.add_argument("--fixed-size", type=int, default=4, help="Fixed pool size per runtime class")
+    parser.add_argument("--min-hit-probability", type=float, default=0.001,
+                        help="Predictive pool: smallest use probability worth an idle instance")
+    parser.add_argument("--replenish-interval", type=float, default=30.0, help="Seconds between pool top-ups")
+    args = parser.parse_args()
+
+    events = load_trace(args.trace) if args.trace else synthetic_trace(args.seasons, args.season)
+    if args.save_trace:
+        dump_trace(events, args.save_trace)
+    classes = sorted({runtime_class for _, runtime_class in events})
+    cold_start: Dict[str, float] = {cls: COLD_START.get(cls, 5.0) for cls in classes}
+    span = events[-1][0] - events[0][0] if events else 0.0
+    print(f"{len(events)} spawns over {span / 3600:.1f} h, classes: {', '.join(classes)}")
+
+    config = {
+        "runtime_classes": classes,
+        "season_seconds": args.season,
+        "replenish_interval_seconds": args.replenish_interval,
+        "min_size": 1,
+        "max_size": 30,
+        # Same idle budget as the fixed pool
+        "max_idle_cost_per_hour": args.fixed_size * len(classes),
+        "max_total_size": args.fixed_size * len(classes),
+        "min_hit_probability": args.min_hit_probability,
+    }
+
+    print(f"\n{'pool':<16}{'warm hit':>10}{'mean s':>10}{'p99 s':>10}{'idle inst-h':>14}{'created':>10}")
+    report(f"fixed ({args.fixed_size})", replay_trace(events, WarmPoolPlanner(config), cold_start, args.fixed_size))
+    report("predictive", replay_trace(events, WarmPoolPlanner(config), cold_start))
+    report("predictive, 1/2", replay_trace(
+        events,
+        WarmPoolPlanner({**config, "max_idle_cost_per_hour": config["max_idle_cost_per_hour"] / 2}),
+        cold_start,
+    ))
+
+
+if __name__ == "__main__":
+    main()
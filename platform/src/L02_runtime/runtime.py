@@ -146,6 +146,11 @@ class AgentRuntime:
         await self.agent_executor.initialize()
         await self.resource_manager.initialize()
 
+        # Push container samples to quota enforcement
+        stats_collector = getattr(self.backend, "stats_collector", None)
+        if stats_collector:
+            stats_collector.subscribe(self.resource_manager.on_container_stats)
+
         logger.info(
             f"AgentRuntime initialized with {backend_type} backend, "
             f"model_bridge={l04_base_url}"
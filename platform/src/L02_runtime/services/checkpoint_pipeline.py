@@ -0,0 +1,688 @@
+"""
+Checkpoint Pipeline
+
+Write path of StateManager checkpoints:
+
+1. The context is JSON-encoded, split into content-defined chunks and the
+   chunks not stored recently are compressed, all in an executor thread so
+   that large contexts do not stall the event loop.
+2. Encoded checkpoints are queued and group-committed: one transaction
+   stores the new chunks and the checkpoint rows of a whole batch. A
+   failed transaction is retried with backoff, then its checkpoints are
+   committed one by one.
+
+Chunks are keyed by the SHA-256 of their bytes and stored once in
+l02_runtime.checkpoint_chunks, so successive checkpoints of the same agent
+only add the chunks that changed. Chunk boundaries are chosen from the
+content (a hash of the bytes before each ',', '}', ']' or newline), so an
+insertion only changes the chunks around it instead of shifting every
+later boundary.
+
+Chunks are compressed with zstd using a dictionary trained on earlier
+chunks (small chunks compress poorly on their own), or with gzip when the
+zstandard package is not installed. The checkpoint row keeps the ordered
+chunk hashes and the SHA-256 of the whole encoding; restore reassembles
+the bytes and verifies the hash.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import re
+import time
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # Optional dependency, gzip fallback
+
+
+logger = logging.getLogger(__name__)
+
+# Candidate chunk boundaries: after a JSON separator or newline
+_ANCHOR = re.compile(rb'[,\n}\]]')
+
+# Bytes hashed to decide whether a candidate is a boundary
+_WINDOW = 16
+
+CHUNK_MIN_SIZE = 1024
+CHUNK_MAX_SIZE = 65536
+# One candidate in 8 is a boundary; JSON text has few separators
+CHUNK_MASK = 0x07
+
+DICTIONARY_SIZE = 112640
+
+
+def split_chunks(
+    data: bytes,
+    min_size: int = CHUNK_MIN_SIZE,
+    max_size: int = CHUNK_MAX_SIZE,
+    mask: int = CHUNK_MASK,
+) -> List[bytes]:
+    """
+    Split bytes into content-defined chunks.
+
+    Args:
+        data: Bytes to split
+        min_size: Smallest chunk (except the last)
+        max_size: Largest chunk; longer runs without a boundary are cut
+        mask: A candidate is a boundary if crc32(window) & mask == 0
+
+    Returns:
+        Chunks whose concatenation is data
+    """
+    chunks = []
+    start = 0
+    for match in _ANCHOR.finditer(data, min_size):
+        end = match.end()
+        while end - start > max_size:
+            chunks.append(data[start:start + max_size])
+            start += max_size
+        if end - start >= min_size and zlib.crc32(data[end - _WINDOW:end]) & mask == 0:
+            chunks.append(data[start:end])
+            start = end
+    while len(data) - start > max_size:
+        chunks.append(data[start:start + max_size])
+        start += max_size
+    if start < len(data):
+        chunks.append(data[start:])
+    return chunks
+
+
+def chunk_hash(chunk: bytes) -> bytes:
+    return hashlib.sha256(chunk).digest()
+
+
+class ChunkCodec:
+    """Compresses chunks with zstd (optionally with a dictionary) or gzip."""
+
+    def __init__(self, algorithm: str = "zstd", level: int = 3):
+        """
+        Initialize chunk codec.
+
+        Args:
+            algorithm: "zstd", "gzip" or "none" (zstd falls back to gzip
+                when zstandard is not installed)
+            level: Compression level
+        """
+        if algorithm == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed, compressing checkpoints with gzip")
+            algorithm = "gzip"
+        self.algorithm = algorithm
+        self.level = level
+        self.dict_id: Optional[int] = None
+        # dict_id -> dictionary, for decompressing chunks of older dictionaries
+        self._dictionaries: Dict[int, Any] = {}
+
+    @property
+    def uses_dictionary(self) -> bool:
+        return self.algorithm == "zstd"
+
+    def has_dictionary(self, dict_id: int) -> bool:
+        return dict_id in self._dictionaries
+
+    def add_dictionary(self, dict_id: int, data: bytes, current: bool = True) -> None:
+        """Register a trained dictionary; current ones are used for new chunks."""
+        self._dictionaries[dict_id] = zstandard.ZstdCompressionDict(data)
+        if current:
+            self.dict_id = dict_id
+
+    @staticmethod
+    def train(samples: List[bytes], size: int = DICTIONARY_SIZE) -> bytes:
+        """Train a zstd dictionary on sample chunks."""
+        return zstandard.train_dictionary(size, samples).as_bytes()
+
+    def compressor(self) -> "ChunkCompressor":
+        """Per-thread compressor (zstd compressors are not thread safe)."""
+        return ChunkCompressor(self)
+
+    def decompress(self, codec: str, dict_id: Optional[int], data: bytes) -> bytes:
+        if codec == "zstd":
+            if dict_id is not None:
+                decompressor = zstandard.ZstdDecompressor(dict_data=self._dictionaries[dict_id])
+            else:
+                decompressor = zstandard.ZstdDecompressor()
+            return decompressor.decompress(data)
+        if codec == "gzip":
+            return gzip.decompress(data)
+        return data
+
+
+class ChunkCompressor:
+    """Compresses chunks with a codec's current dictionary."""
+
+    def __init__(self, codec: ChunkCodec):
+        self.algorithm = codec.algorithm
+        self.level = codec.level
+        self.dict_id = codec.dict_id
+        self._zstd = None
+        if self.algorithm == "zstd":
+            dictionary = codec._dictionaries.get(self.dict_id) if self.dict_id is not None else None
+            self._zstd = zstandard.ZstdCompressor(level=self.level, dict_data=dictionary)
+
+    def compress(self, chunk: bytes) -> Tuple[str, Optional[int], bytes]:
+        """
+        Returns:
+            (codec, dict_id, data); chunks that do not shrink are stored raw
+        """
+        if self.algorithm == "zstd":
+            data = self._zstd.compress(chunk)
+            if len(data) < len(chunk):
+                return "zstd", self.dict_id, data
+        elif self.algorithm == "gzip":
+            data = gzip.compress(chunk, compresslevel=min(self.level, 9))
+            if len(data) < len(chunk):
+                return "gzip", None, data
+        return "none", None, chunk
+
+
+@dataclass
+class EncodedChunk:
+    """A chunk to store."""
+    chunk_hash: bytes
+    codec: str
+    dict_id: Optional[int]
+    data: bytes
+    raw_size: int
+
+
+@dataclass
+class EncodedCheckpoint:
+    """Result of encoding one checkpoint context."""
+    raw: bytes
+    sha256: bytes
+    chunk_hashes: List[bytes]
+    new_chunks: List[EncodedChunk]
+    # Size of all referenced chunks as stored (new and deduplicated)
+    stored_size: int = 0
+    samples: List[bytes] = field(default_factory=list)
+
+
+def encode_json(context: Dict[str, Any]) -> bytes:
+    """JSON encoding of a checkpoint context."""
+    return json.dumps(context).encode("utf-8")
+
+
+def encode_checkpoint(
+    raw: bytes,
+    codec: ChunkCodec,
+    known_chunks: "OrderedDict[bytes, Tuple[float, int]]",
+    sample_limit: int = 0,
+) -> EncodedCheckpoint:
+    """
+    Chunk and compress an encoded context (runs in an executor thread).
+
+    Args:
+        raw: JSON-encoded context
+        codec: Chunk codec
+        known_chunks: Hashes of chunks stored recently -> (time, stored size);
+            these are referenced without being compressed again
+        sample_limit: Raw new chunks to return as dictionary training samples
+    """
+    compressor = codec.compressor()
+    chunk_hashes = []
+    new_chunks = []
+    samples = []
+    stored_size = 0
+    seen = set()
+    for chunk in split_chunks(raw):
+        digest = chunk_hash(chunk)
+        chunk_hashes.append(digest)
+        known = known_chunks.get(digest)
+        if known is not None:
+            stored_size += known[1]
+            continue
+        if digest in seen:
+            continue
+        seen.add(digest)
+        chunk_codec, dict_id, data = compressor.compress(chunk)
+        new_chunks.append(EncodedChunk(digest, chunk_codec, dict_id, data, len(chunk)))
+        stored_size += len(data)
+        if len(samples) < sample_limit:
+            samples.append(chunk)
+    return EncodedCheckpoint(
+        raw=raw,
+        sha256=hashlib.sha256(raw).digest(),
+        chunk_hashes=chunk_hashes,
+        new_chunks=new_chunks,
+        stored_size=stored_size,
+        samples=samples,
+    )
+
+
+@dataclass
+class PendingCheckpoint:
+    """A submitted checkpoint that is not committed yet."""
+    agent_id: str
+    session_id: str
+    state: str
+    raw: bytes
+    metadata: Dict[str, Any]
+    created_at: datetime
+
+
+@dataclass
+class _Job:
+    row: Tuple[Any, ...]
+    encoded: EncodedCheckpoint
+    # None for write-behind checkpoints
+    future: Optional[asyncio.Future]
+
+
+class CheckpointPipeline:
+    """Encodes checkpoints off the event loop and group-commits them."""
+
+    def __init__(
+        self,
+        pg_pool,
+        compression: str = "zstd",
+        level: int = 3,
+        batch_size: int = 64,
+        batch_interval_ms: float = 10.0,
+        dictionary_samples: int = 2000,
+        known_chunk_ttl_seconds: float = 3600.0,
+        max_known_chunks: int = 100000,
+        commit_retries: int = 3,
+        retry_delay_ms: float = 100.0,
+    ):
+        """
+        Initialize checkpoint pipeline.
+
+        Args:
+            pg_pool: PostgreSQL pool
+            compression: Chunk compression ("zstd", "gzip" or "none")
+            level: Compression level
+            batch_size: Most checkpoints committed per transaction
+            batch_interval_ms: How long a batch waits for more checkpoints
+            dictionary_samples: Chunks collected before training a zstd
+                dictionary (0 disables training)
+            known_chunk_ttl_seconds: How long a stored chunk is referenced
+                without re-sending it; must stay well below checkpoint
+                retention, since a chunk's last_used_at is what keeps it
+                from being garbage collected
+            max_known_chunks: Capacity of the stored-chunk cache
+            commit_retries: Retries of a failed batch transaction
+                (with exponential backoff from retry_delay_ms)
+            retry_delay_ms: Delay before the first retry
+        """
+        self.pg_pool = pg_pool
+        self.codec = ChunkCodec(compression, level)
+        self.batch_size = batch_size
+        self.batch_interval = batch_interval_ms / 1000
+        self.dictionary_samples = dictionary_samples if self.codec.uses_dictionary else 0
+        self.known_chunk_ttl = known_chunk_ttl_seconds
+        self.max_known_chunks = max_known_chunks
+        self.commit_retries = commit_retries
+        self.retry_delay = retry_delay_ms / 1000
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+        # checkpoint_id -> checkpoint row, until committed
+        self._pending: Dict[str, "PendingCheckpoint"] = {}
+        # chunk hash -> (monotonic time stored or referenced, stored size)
+        self._known: "OrderedDict[bytes, Tuple[float, int]]" = OrderedDict()
+        self._samples: List[bytes] = []
+        self._train_task: Optional[asyncio.Task] = None
+
+        self._stats = {
+            "checkpoints": 0,
+            "batches": 0,
+            "raw_bytes": 0,
+            "stored_bytes": 0,
+            "chunks_referenced": 0,
+            "chunks_written": 0,
+            "encode_seconds": 0.0,
+            "failures": 0,
+        }
+
+    async def start(self) -> None:
+        """Load the current dictionary and start the commit loop."""
+        if self.codec.uses_dictionary:
+            try:
+                async with self.pg_pool.acquire() as conn:
+                    row = await conn.fetchrow(
+                        "SELECT dict_id, data FROM l02_runtime.checkpoint_dictionaries "
+                        "ORDER BY dict_id DESC LIMIT 1"
+                    )
+                if row:
+                    self.codec.add_dictionary(row["dict_id"], bytes(row["data"]))
+                    self.dictionary_samples = 0
+            except Exception as e:
+                logger.warning(f"Failed to load checkpoint dictionary: {e}")
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run_loop())
+
+    async def stop(self) -> None:
+        """Commit queued checkpoints and stop."""
+        if self._train_task is not None:
+            self._train_task.cancel()
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def submit(
+        self,
+        checkpoint_id: str,
+        agent_id: str,
+        session_id: str,
+        state: str,
+        raw: bytes,
+        metadata: Dict[str, Any],
+        wait: bool = True,
+    ) -> EncodedCheckpoint:
+        """
+        Encode a checkpoint and queue it for the next group commit.
+
+        Args:
+            raw: JSON-encoded context
+            wait: Wait until the checkpoint is committed; otherwise it is
+                written behind (restore still finds it while queued)
+
+        Returns:
+            The encoded checkpoint
+        """
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        sample_limit = max(self.dictionary_samples - len(self._samples), 0)
+        encoded = await loop.run_in_executor(
+            None, encode_checkpoint, raw, self.codec, self._known, sample_limit
+        )
+        self._stats["encode_seconds"] += time.perf_counter() - start
+        self._collect_samples(encoded.samples)
+
+        future = loop.create_future() if wait else None
+        row = (
+            checkpoint_id,
+            agent_id,
+            session_id,
+            state,
+            json.dumps(metadata),
+            encoded.stored_size,
+            len(raw),
+            encoded.chunk_hashes,
+            encoded.sha256,
+        )
+        self._pending[checkpoint_id] = PendingCheckpoint(
+            agent_id, session_id, state, raw, metadata, datetime.now(timezone.utc)
+        )
+        self._remember(encoded)
+        await self._queue.put(_Job(row, encoded, future))
+
+        if future is not None:
+            await future
+        return encoded
+
+    def pending(self, checkpoint_id: str) -> Optional["PendingCheckpoint"]:
+        """A checkpoint that is queued but not yet committed."""
+        return self._pending.get(checkpoint_id)
+
+    async def load(self, conn, chunk_hashes: List[bytes], sha256: Optional[bytes]) -> bytes:
+        """
+        Reassemble a chunked checkpoint.
+
+        Raises:
+            ValueError: If a chunk is missing or the bytes do not match sha256
+        """
+        rows = await conn.fetch(
+            "SELECT chunk_hash, codec, dict_id, data FROM l02_runtime.checkpoint_chunks "
+            "WHERE chunk_hash = ANY($1::bytea[])",
+            list(set(chunk_hashes)),
+        )
+        chunks = {bytes(row["chunk_hash"]): row for row in rows}
+        missing = [h for h in chunk_hashes if h not in chunks]
+        if missing:
+            raise ValueError(f"{len(missing)} checkpoint chunk(s) missing")
+
+        for dict_id in {row["dict_id"] for row in rows if row["dict_id"] is not None}:
+            if not self.codec.has_dictionary(dict_id):
+                data = await conn.fetchval(
+                    "SELECT data FROM l02_runtime.checkpoint_dictionaries WHERE dict_id = $1",
+                    dict_id,
+                )
+                self.codec.add_dictionary(dict_id, bytes(data), current=False)
+
+        def assemble() -> bytes:
+            raw = b"".join(
+                self.codec.decompress(chunks[h]["codec"], chunks[h]["dict_id"], bytes(chunks[h]["data"]))
+                for h in chunk_hashes
+            )
+            if sha256 is not None and hashlib.sha256(raw).digest() != bytes(sha256):
+                raise ValueError("checkpoint content does not match its hash")
+            return raw
+
+        return await asyncio.get_running_loop().run_in_executor(None, assemble)
+
+    def get_stats(self) -> Dict[str, Any]:
+        raw, stored = self._stats["raw_bytes"], self._stats["stored_bytes"]
+        return {
+            **self._stats,
+            "compression": self.codec.algorithm,
+            "dictionary_id": self.codec.dict_id,
+            "queued": self._queue.qsize(),
+            "storage_ratio": stored / raw if raw else 0.0,
+        }
+
+    def _remember(self, encoded: EncodedCheckpoint) -> None:
+        """Record chunks as stored so later checkpoints only reference them."""
+        now = time.monotonic()
+        for chunk in encoded.new_chunks:
+            self._known[chunk.chunk_hash] = (now, len(chunk.data))
+            self._known.move_to_end(chunk.chunk_hash)
+        while self._known:
+            digest, (stored_at, _) = next(iter(self._known.items()))
+            if len(self._known) <= self.max_known_chunks and now - stored_at <= self.known_chunk_ttl:
+                break
+            del self._known[digest]
+
+    def _collect_samples(self, samples: List[bytes]) -> None:
+        if not samples or self._train_task is not None or self.dictionary_samples <= 0:
+            return
+        self._samples.extend(samples)
+        if len(self._samples) >= self.dictionary_samples:
+            self._train_task = asyncio.create_task(self._train_dictionary())
+
+    async def _train_dictionary(self) -> None:
+        """Train a zstd dictionary on collected chunks and store it."""
+        samples, self._samples = self._samples, []
+        try:
+            data = await asyncio.get_running_loop().run_in_executor(None, self.codec.train, samples)
+            async with self.pg_pool.acquire() as conn:
+                dict_id = await conn.fetchval(
+                    "INSERT INTO l02_runtime.checkpoint_dictionaries (data) VALUES ($1) RETURNING dict_id",
+                    data,
+                )
+            self.codec.add_dictionary(dict_id, data)
+            self.dictionary_samples = 0
+            logger.info(f"Trained checkpoint dictionary {dict_id} on {len(samples)} chunks")
+        except Exception as e:
+            logger.warning(f"Checkpoint dictionary training failed: {e}")
+        finally:
+            self._train_task = None
+
+    async def _run_loop(self) -> None:
+        """Group-commit queued checkpoints."""
+        loop = asyncio.get_running_loop()
+        while True:
+            job = await self._queue.get()
+            if job is None:
+                return
+            batch = [job]
+            stopping = False
+            deadline = loop.time() + self.batch_interval
+            while len(batch) < self.batch_size:
+                try:
+                    job = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        job = await asyncio.wait_for(self._queue.get(), timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if job is None:
+                    stopping = True
+                    break
+                batch.append(job)
+
+            await self._commit(batch)
+            if stopping:
+                return
+
+    async def _commit(self, batch: List[_Job]) -> None:
+        """
+        Commit a batch, retrying failed transactions with backoff.
+
+        When the batch keeps failing, its checkpoints are committed one by
+        one so that a single bad checkpoint does not take the others down.
+        """
+        for attempt in range(self.commit_retries + 1):
+            try:
+                chunks = await self._write(batch)
+                break
+            except Exception as e:
+                self._forget(batch)
+                if attempt == self.commit_retries:
+                    if len(batch) > 1:
+                        logger.warning(f"Checkpoint batch failed, committing {len(batch)} checkpoints one by one: {e}")
+                        for job in batch:
+                            await self._commit_one(job)
+                    else:
+                        self._fail(batch[0], e)
+                    return
+                delay = self.retry_delay * 2 ** attempt
+                logger.warning(f"Checkpoint batch of {len(batch)} failed, retrying in {delay:.2f}s: {e}")
+                await asyncio.sleep(delay)
+
+        self._committed(batch, chunks)
+
+    async def _commit_one(self, job: _Job) -> None:
+        try:
+            chunks = await self._write([job])
+        except Exception as e:
+            self._forget([job])
+            self._fail(job, e)
+            return
+        self._committed([job], chunks)
+
+    async def _write(self, batch: List[_Job]) -> Dict[bytes, EncodedChunk]:
+        """
+        Store a batch's new chunks and checkpoint rows in one transaction.
+
+        A checkpoint referencing a chunk that is not stored (its batch
+        failed) is re-encoded with all of its chunks instead of failing
+        the batch.
+
+        Returns:
+            Chunks written
+        """
+        chunks: Dict[bytes, EncodedChunk] = {}
+        referenced = set()
+        for job in batch:
+            referenced.update(job.encoded.chunk_hashes)
+            for chunk in job.encoded.new_chunks:
+                chunks[chunk.chunk_hash] = chunk
+
+        async with self.pg_pool.acquire() as conn:
+            async with conn.transaction():
+                if chunks:
+                    await self._insert_chunks(conn, chunks.values())
+                reused = referenced - chunks.keys()
+                if reused:
+                    rows = await conn.fetch(
+                        "UPDATE l02_runtime.checkpoint_chunks SET last_used_at = NOW() "
+                        "WHERE chunk_hash = ANY($1::bytea[]) RETURNING chunk_hash",
+                        list(reused),
+                    )
+                    missing = reused - {bytes(row["chunk_hash"]) for row in rows}
+                    if missing:
+                        # Send these chunks again next time
+                        for digest in missing:
+                            self._known.pop(digest, None)
+                        resent = await self._reencode(
+                            [job for job in batch if missing.intersection(job.encoded.chunk_hashes)]
+                        )
+                        resent = {digest: chunk for digest, chunk in resent.items() if digest not in chunks}
+                        await self._insert_chunks(conn, resent.values())
+                        chunks.update(resent)
+                await conn.executemany(
+                    """
+                    INSERT INTO l02_runtime.checkpoints
+                        (checkpoint_id, agent_id, session_id, state, metadata,
+                         size_bytes, raw_size_bytes, chunk_hashes, context_sha256, compressed)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, true)
+                    """,
+                    [job.row for job in batch],
+                )
+        return chunks
+
+    async def _insert_chunks(self, conn, chunks) -> None:
+        await conn.executemany(
+            """
+            INSERT INTO l02_runtime.checkpoint_chunks
+                (chunk_hash, codec, dict_id, data, raw_size)
+            VALUES ($1, $2, $3, $4, $5)
+            ON CONFLICT (chunk_hash) DO UPDATE SET last_used_at = NOW()
+            """,
+            [(c.chunk_hash, c.codec, c.dict_id, c.data, c.raw_size) for c in chunks],
+        )
+
+    async def _reencode(self, jobs: List[_Job]) -> Dict[bytes, EncodedChunk]:
+        """
+        Re-encode checkpoints with all of their chunks.
+
+        Returns:
+            The chunks of the re-encoded checkpoints
+        """
+        loop = asyncio.get_running_loop()
+        chunks: Dict[bytes, EncodedChunk] = {}
+        for job in jobs:
+            encoded = await loop.run_in_executor(
+                None, encode_checkpoint, job.encoded.raw, self.codec, OrderedDict()
+            )
+            job.encoded = encoded
+            job.row = job.row[:5] + (encoded.stored_size,) + job.row[6:]
+            self._remember(encoded)
+            for chunk in encoded.new_chunks:
+                chunks[chunk.chunk_hash] = chunk
+            logger.info(f"Checkpoint {job.row[0]} referenced missing chunks, re-encoded it in full")
+        return chunks
+
+    def _forget(self, batch: List[_Job]) -> None:
+        """Chunks of a failed transaction may not exist; send them again next time."""
+        for job in batch:
+            for chunk in job.encoded.new_chunks:
+                self._known.pop(chunk.chunk_hash, None)
+
+    def _fail(self, job: _Job, error: Exception) -> None:
+        self._stats["failures"] += 1
+        self._pending.pop(job.row[0], None)
+        if job.future is None:
+            logger.error(f"Write-behind checkpoint {job.row[0]} lost: {error}")
+        elif not job.future.done():
+            job.future.set_exception(error)
+
+    def _committed(self, batch: List[_Job], chunks: Dict[bytes, EncodedChunk]) -> None:
+        self._stats["batches"] += 1
+        self._stats["checkpoints"] += len(batch)
+        self._stats["chunks_written"] += len(chunks)
+        self._stats["chunks_referenced"] += sum(len(job.encoded.chunk_hashes) for job in batch)
+        self._stats["raw_bytes"] += sum(len(job.encoded.raw) for job in batch)
+        self._stats["stored_bytes"] += sum(len(c.data) for c in chunks.values())
+        for job in batch:
+            self._pending.pop(job.row[0], None)
+            if job.future is not None and not job.future.done():
+                job.future.set_result(None)
@@ -9,13 +9,16 @@ Based on Section 3.3.10 of agent-runtime-layer-specification-v1.2-final-ASCII.md
 
 import asyncio
 import logging
+import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timezone
 from dataclasses import dataclass
 from enum import Enum
 
-from ..models import AgentConfig, AgentState, SpawnResult
+from ..models import AgentConfig, AgentState, SpawnResult, ResourceLimits, TrustLevel
 from ..models.fleet_models import ScalingMetrics, WarmInstance
+from .sandbox_manager import SandboxManager
+from .warm_pool_forecast import RUNTIME_CLASS_TRUST_LEVELS, WarmPoolPlanner
 
 
 logger = logging.getLogger(__name__)
@@ -68,7 +71,8 @@ class FleetManager:
                 - target_cpu_utilization: Target CPU percentage
                 - scale_up_stabilization_seconds: Scale up delay
                 - scale_down_stabilization_seconds: Scale down delay
-                - warm_pool: Warm pool configuration
+                - warm_pool: Warm pool configuration (enabled, size,
+                  runtime_class, runtime_classes, predictive, forecast, ...)
                 - graceful_drain: Drain configuration
         """
         self.config = config or {}
@@ -91,6 +95,19 @@ class FleetManager:
         self.warm_pool_refresh_interval = warm_pool_config.get(
             "refresh_interval_seconds", 3600
         )
+        self.warm_pool_replenish_interval = warm_pool_config.get(
+            "replenish_interval_seconds", 30
+        )
+        self.warm_pool_predictive = warm_pool_config.get("predictive", True)
+        self.warm_pool_runtime_class = warm_pool_config.get("runtime_class", "gvisor")
+        self._warm_pool_planner = WarmPoolPlanner({
+            **warm_pool_config.get("forecast", {}),
+            "runtime_classes": warm_pool_config.get("runtime_classes", [self.warm_pool_runtime_class]),
+            "replenish_interval_seconds": self.warm_pool_replenish_interval,
+        })
+        # Per runtime class; fixed size until the first forecast
+        self._warm_pool_targets: Dict[str, int] = {self.warm_pool_runtime_class: self.warm_pool_size}
+        self._warm_pool_wakeup = asyncio.Event()
 
         # Graceful drain configuration
         drain_config = self.config.get("graceful_drain", {})
@@ -564,59 +581,110 @@ class FleetManager:
         """
         Maintain warm pool at desired size.
 
-        Runs periodically to ensure warm instances are available.
+        Every replenish interval the per-runtime-class targets are
+        re-planned from the spawn forecast (when predictive) and stale or
+        surplus instances are removed; an acquisition wakes the loop to
+        top its class up to the current target right away.
         """
+        last_plan = time.monotonic()
+
         while self.warm_pool_enabled:
             try:
                 async with self._warm_pool_lock:
                     # Remove stale instances
                     await self._cleanup_stale_warm_instances()
 
+                    if self.warm_pool_predictive and time.monotonic() - last_plan >= self.warm_pool_replenish_interval:
+                        last_plan = time.monotonic()
+                        self._warm_pool_targets = self._warm_pool_planner.plan()
+                        await self._trim_warm_pool()
+
                     # Add instances if below target
-                    current_size = len(self._warm_pool)
-                    needed = self.warm_pool_size - current_size
+                    for runtime_class, target in self._warm_pool_targets.items():
+                        current_size = sum(
+                            1 for instance in self._warm_pool
+                            if instance.runtime_class == runtime_class
+                        )
+                        needed = target - current_size
 
-                    if needed > 0:
-                        logger.info(f"Warm pool: adding {needed} instances")
-                        for _ in range(needed):
-                            await self._create_warm_instance()
+                        if needed > 0:
+                            logger.info(f"Warm pool ({runtime_class}): adding {needed} instances")
+                            for _ in range(needed):
+                                await self._create_warm_instance(runtime_class)
 
             except Exception as e:
                 logger.error(f"Warm pool maintenance failed: {e}")
 
-            # Wait for next refresh cycle
-            await asyncio.sleep(self.warm_pool_refresh_interval)
+            # Wait for next replenish cycle or an acquisition
+            try:
+                await asyncio.wait_for(
+                    self._warm_pool_wakeup.wait(),
+                    timeout=self.warm_pool_replenish_interval
+                )
+            except asyncio.TimeoutError:
+                pass
+            self._warm_pool_wakeup.clear()
+
+    async def _trim_warm_pool(self) -> int:
+        """
+        Terminate the oldest warm instances above each class's target.
+
+        Returns:
+            Number of instances removed
+        """
+        trimmed = 0
+        for runtime_class in {instance.runtime_class for instance in self._warm_pool}:
+            instances = [i for i in self._warm_pool if i.runtime_class == runtime_class]
+            surplus = len(instances) - self._warm_pool_targets.get(runtime_class, 0)
+            for instance in sorted(instances, key=lambda i: i.created_at)[:max(surplus, 0)]:
+                if self._lifecycle_manager:
+                    try:
+                        await self._lifecycle_manager.terminate(
+                            instance.agent_id,
+                            reason="warm_pool_trim"
+                        )
+                    except Exception:
+                        pass
+                self._warm_pool.remove(instance)
+                trimmed += 1
+        return trimmed
 
-    async def _create_warm_instance(self) -> Optional[WarmInstance]:
+    async def _create_warm_instance(self, runtime_class: Optional[str] = None) -> Optional[WarmInstance]:
         """
         Create a warm (pre-initialized) instance.
 
+        Args:
+            runtime_class: Runtime class of the instance (default: warm pool runtime_class)
+
         Returns:
             WarmInstance or None if creation failed
         """
         if not self._lifecycle_manager:
             return None
 
+        runtime_class = runtime_class or self.warm_pool_runtime_class
+
         try:
-            # Create minimal config for warm instance
+            # Create minimal config for warm instance; the trust level selects the sandbox
             warm_config = AgentConfig(
                 agent_id=f"warm-{datetime.now(timezone.utc).timestamp()}",
-                trust_level="restricted",
-                resource_limits={"cpu_limit": 0.5, "memory_limit_mb": 512},
+                trust_level=RUNTIME_CLASS_TRUST_LEVELS.get(runtime_class, TrustLevel.STANDARD),
+                resource_limits=ResourceLimits(cpu="500m", memory="512Mi"),
                 tools=[],
                 environment={"WARM_INSTANCE": "true"},
             )
 
-            # Spawn in suspended state
-            result = await self._lifecycle_manager.spawn(
-                warm_config,
-                start_suspended=True
-            )
+            # Spawn and suspend until acquired; the spawn is what a cold start costs
+            started = time.monotonic()
+            result = await self._lifecycle_manager.spawn(warm_config)
+            self._warm_pool_planner.record_cold_start(runtime_class, time.monotonic() - started)
+            await self._lifecycle_manager.suspend(result.agent_id, checkpoint=False)
 
             warm_instance = WarmInstance(
                 agent_id=result.agent_id,
+                session_id=result.session_id,
+                runtime_class=runtime_class,
                 created_at=datetime.now(timezone.utc),
-                state=AgentState.SUSPENDED,
             )
 
             self._warm_pool.append(warm_instance)
@@ -667,20 +735,34 @@ class FleetManager:
         """
         Acquire an instance from the warm pool.
 
+        Takes an instance of the runtime class the configuration's trust
+        level maps to, and records the request for the spawn forecast.
+
         Args:
             config: Agent configuration to apply
 
         Returns:
             SpawnResult if warm instance acquired, None otherwise
         """
+        started = time.monotonic()
+        runtime_class = SandboxManager.TRUST_LEVEL_MAPPING.get(config.trust_level)
+        runtime_class = runtime_class.value if runtime_class else self.warm_pool_runtime_class
+
         async with self._warm_pool_lock:
-            if not self._warm_pool:
+            # Get oldest warm instance of the class
+            warm_instance = next(
+                (i for i in self._warm_pool if i.runtime_class == runtime_class),
+                None
+            )
+            if warm_instance is None:
                 self._warm_pool_misses += 1
+                self._warm_pool_planner.record_spawn(runtime_class, warm=False)
+                self._warm_pool_wakeup.set()
                 return None
 
-            # Get oldest warm instance
-            warm_instance = self._warm_pool.pop(0)
+            self._warm_pool.remove(warm_instance)
             self._warm_pool_hits += 1
+            self._warm_pool_wakeup.set()
 
         try:
             # Configure and activate the warm instance
@@ -692,6 +774,9 @@ class FleetManager:
                 await self._lifecycle_manager.resume(warm_instance.agent_id)
 
             logger.info(f"Acquired warm instance: {warm_instance.agent_id}")
+            self._warm_pool_planner.record_spawn(
+                runtime_class, warm=True, latency_seconds=time.monotonic() - started
+            )
 
             return SpawnResult(
                 agent_id=warm_instance.agent_id,
@@ -702,6 +787,7 @@ class FleetManager:
         except Exception as e:
             logger.error(f"Failed to acquire warm instance: {e}")
             self._warm_pool_misses += 1
+            self._warm_pool_planner.record_spawn(runtime_class, warm=False)
             return None
 
     def get_warm_pool_stats(self) -> Dict[str, Any]:
@@ -725,6 +811,9 @@ class FleetManager:
             "misses": self._warm_pool_misses,
             "hit_rate_percent": round(hit_rate, 2),
             "refresh_interval_seconds": self.warm_pool_refresh_interval,
+            "predictive": self.warm_pool_predictive,
+            "targets": dict(self._warm_pool_targets),
+            "forecast": self._warm_pool_planner.get_stats(),
         }
 
     # ==================== Autoscaling Methods ====================
@@ -877,6 +966,7 @@ class FleetManager:
 
         # Clear warm pool
         self.warm_pool_enabled = False
+        self._warm_pool_wakeup.set()
         async with self._warm_pool_lock:
             for instance in self._warm_pool:
                 if self._lifecycle_manager:
@@ -116,6 +116,9 @@ class ResourceManager:
         # Throttled agents: agent_id set
         self._throttled_agents: set = set()
 
+        # Latest container sample: agent_id -> ContainerStats
+        self._container_stats: Dict[str, Any] = {}
+
         # Background tasks
         self._report_task: Optional[asyncio.Task] = None
 
@@ -279,6 +282,49 @@ class ResourceManager:
         # Check for quota violations
         await self._check_quota_violations(agent_id, quota)
 
+    async def on_container_stats(self, stats) -> None:
+        """
+        Take a container sample pushed by the backend's stats collector.
+
+        The sample becomes the agent's live metrics. A new memory peak is
+        reported against the agent's quota, so memory violations are
+        enforced as soon as they are sampled. CPU is not reported here:
+        the CPU quota counts CPU seconds against the core limit and is fed
+        by report_usage callers.
+
+        Args:
+            stats: ContainerStats sample
+        """
+        agent_id = stats.agent_id
+        if not agent_id:
+            return
+        self._container_stats[agent_id] = stats
+
+        quota = self._quotas.get(agent_id)
+        if quota and stats.memory_mb > quota.usage.memory_peak_mb:
+            await self.report_usage(agent_id, memory_mb=stats.memory_mb)
+
+    async def get_agent_metrics(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get live container metrics for an agent.
+
+        Args:
+            agent_id: Agent identifier
+
+        Returns:
+            Dict with cpu_percent, memory_percent and memory_mb of the
+            latest sample, or None if no sample has arrived
+        """
+        stats = self._container_stats.get(agent_id)
+        if stats is None:
+            return None
+        return {
+            "cpu_percent": stats.cpu_percent,
+            "memory_percent": stats.memory_percent,
+            "memory_mb": stats.memory_mb,
+            "sampled_at": stats.sampled_at,
+        }
+
     async def _check_quota_violations(
         self,
         agent_id: str,
@@ -534,6 +580,7 @@ class ResourceManager:
             del self._usage[agent_id]
         if agent_id in self._warned:
             del self._warned[agent_id]
+        self._container_stats.pop(agent_id, None)
         self._throttled_agents.discard(agent_id)
 
         logger.info(f"Cleaned up quota for agent {agent_id}")
@@ -596,6 +643,7 @@ class ResourceManager:
         self._quotas.clear()
         self._usage.clear()
         self._warned.clear()
+        self._container_stats.clear()
         self._throttled_agents.clear()
 
         logger.info("ResourceManager cleanup complete")
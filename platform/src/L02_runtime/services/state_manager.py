@@ -11,7 +11,7 @@ import asyncio
 import json
 import gzip
 import logging
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Sequence
 from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass, asdict
 
@@ -25,12 +25,18 @@ try:
 except ImportError:
     redis = None  # Optional dependency
 
+from shared.db_pool import get_pool_manager
+
 from ..models import AgentState
 from ..models.checkpoint_models import Checkpoint, CheckpointMetadata
+from .checkpoint_pipeline import CheckpointPipeline, encode_json, zstandard
 
 
 logger = logging.getLogger(__name__)
 
+# Lifetime of hot state and hot logs in Redis
+HOT_STATE_TTL = timedelta(seconds=3600)
+
 
 class StateError(Exception):
     """State management error"""
@@ -74,7 +80,12 @@ class StateManager:
                 - hot_state_backend: Hot state cache (redis)
                 - auto_checkpoint_interval_seconds: Auto-checkpoint interval
                 - max_checkpoint_size_mb: Maximum checkpoint size
-                - checkpoint_compression: Compression algorithm (gzip)
+                - checkpoint_compression: Compression algorithm (zstd, gzip or none;
+                  zstd needs the zstandard package)
+                - checkpoint_batch_size: Checkpoints group-committed per transaction
+                - checkpoint_batch_interval_ms: How long a batch waits for more checkpoints
+                - checkpoint_dictionary_samples: Chunks collected before training
+                  a zstd dictionary (0 disables training)
                 - retention_days: Checkpoint retention period
                 - postgresql_dsn: PostgreSQL connection string
                 - redis_url: Redis connection URL
@@ -88,7 +99,9 @@ class StateManager:
             "auto_checkpoint_interval_seconds", 60
         )
         self.max_checkpoint_size_mb = self.config.get("max_checkpoint_size_mb", 100)
-        self.checkpoint_compression = self.config.get("checkpoint_compression", "gzip")
+        self.checkpoint_compression = self.config.get(
+            "checkpoint_compression", "zstd" if zstandard else "gzip"
+        )
         self.retention_days = self.config.get("retention_days", 30)
 
         # Connection strings
@@ -101,6 +114,7 @@ class StateManager:
         # Backend connections
         self._pg_pool: Optional[Any] = None
         self._redis_client: Optional[Any] = None
+        self._pipeline: Optional[CheckpointPipeline] = None
 
         # Background tasks
         self._auto_checkpoint_task: Optional[asyncio.Task] = None
@@ -116,16 +130,22 @@ class StateManager:
         # Initialize PostgreSQL connection pool
         if self.checkpoint_backend == "postgresql" and asyncpg:
             try:
-                self._pg_pool = await asyncpg.create_pool(
-                    self.postgresql_dsn,
-                    min_size=2,
-                    max_size=10,
-                )
+                # Shared OLTP pool, sized by DB_POOL_OLTP_* settings
+                self._pg_pool = await get_pool_manager().get_pool("oltp", self.postgresql_dsn)
                 logger.info("PostgreSQL connection pool initialized")
 
                 # Create checkpoints table if not exists
                 await self._create_checkpoint_table()
 
+                self._pipeline = CheckpointPipeline(
+                    self._pg_pool,
+                    compression=self.checkpoint_compression,
+                    batch_size=self.config.get("checkpoint_batch_size", 64),
+                    batch_interval_ms=self.config.get("checkpoint_batch_interval_ms", 10),
+                    dictionary_samples=self.config.get("checkpoint_dictionary_samples", 2000),
+                )
+                await self._pipeline.start()
+
             except Exception as e:
                 logger.warning(f"Failed to initialize PostgreSQL: {e}")
                 self._pg_pool = None
@@ -170,6 +190,29 @@ class StateManager:
             compressed BOOLEAN DEFAULT false
         );
 
+        -- Chunked checkpoints: ordered chunk hashes and hash of the whole context
+        ALTER TABLE l02_runtime.checkpoints ADD COLUMN IF NOT EXISTS chunk_hashes BYTEA[];
+        ALTER TABLE l02_runtime.checkpoints ADD COLUMN IF NOT EXISTS context_sha256 BYTEA;
+        ALTER TABLE l02_runtime.checkpoints ADD COLUMN IF NOT EXISTS raw_size_bytes BIGINT;
+
+        -- Content-addressed checkpoint chunks, shared between checkpoints
+        CREATE TABLE IF NOT EXISTS l02_runtime.checkpoint_chunks (
+            chunk_hash BYTEA PRIMARY KEY,
+            codec TEXT NOT NULL,
+            dict_id INTEGER,
+            data BYTEA NOT NULL,
+            raw_size INTEGER NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+            last_used_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+
+        -- Trained zstd dictionaries chunks are compressed with
+        CREATE TABLE IF NOT EXISTS l02_runtime.checkpoint_dictionaries (
+            dict_id SERIAL PRIMARY KEY,
+            data BYTEA NOT NULL,
+            created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+        );
+
         -- Create agent_state table
         CREATE TABLE IF NOT EXISTS l02_runtime.agent_state (
             agent_id TEXT PRIMARY KEY,
@@ -187,6 +230,10 @@ class StateManager:
             ON l02_runtime.checkpoints(session_id);
         CREATE INDEX IF NOT EXISTS idx_checkpoints_created_at
             ON l02_runtime.checkpoints(created_at);
+        CREATE INDEX IF NOT EXISTS idx_checkpoints_chunk_hashes
+            ON l02_runtime.checkpoints USING GIN (chunk_hashes);
+        CREATE INDEX IF NOT EXISTS idx_checkpoint_chunks_last_used_at
+            ON l02_runtime.checkpoint_chunks(last_used_at);
 
         -- Create indexes for agent_state table
         CREATE INDEX IF NOT EXISTS idx_agent_state_session_id
@@ -206,7 +253,8 @@ class StateManager:
         session_id: str,
         state: AgentState,
         context: Dict[str, Any],
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        wait: bool = True
     ) -> str:
         """
         Create a checkpoint for an agent.
@@ -217,6 +265,8 @@ class StateManager:
             state: Current agent state
             context: Execution context to checkpoint
             metadata: Optional checkpoint metadata
+            wait: Wait until the checkpoint is committed; otherwise return
+                once it is queued (write-behind)
 
         Returns:
             Checkpoint ID
@@ -228,10 +278,11 @@ class StateManager:
 
         logger.info(f"Creating checkpoint {checkpoint_id} for agent {agent_id}")
 
+        loop = asyncio.get_running_loop()
+
         try:
-            # Serialize context
-            context_json = json.dumps(context)
-            context_bytes = context_json.encode('utf-8')
+            # Serialize context off the event loop
+            context_bytes = await loop.run_in_executor(None, encode_json, context)
 
             # Check size before compression
             size_mb = len(context_bytes) / (1024 * 1024)
@@ -242,10 +293,28 @@ class StateManager:
                             f"{self.max_checkpoint_size_mb}MB"
                 )
 
+            # Chunk, compress and group-commit through the pipeline
+            if self._pipeline:
+                encoded = await self._pipeline.submit(
+                    checkpoint_id=checkpoint_id,
+                    agent_id=agent_id,
+                    session_id=session_id,
+                    state=state.value,
+                    raw=context_bytes,
+                    metadata=metadata or {},
+                    wait=wait,
+                )
+                logger.info(
+                    f"Checkpoint {checkpoint_id} {'created' if wait else 'queued'} "
+                    f"(size={len(context_bytes)} bytes, {len(encoded.chunk_hashes)} chunks, "
+                    f"{len(encoded.new_chunks)} new)"
+                )
+                return checkpoint_id
+
             # Compress if enabled
             compressed = False
             if self.checkpoint_compression == "gzip":
-                context_bytes = gzip.compress(context_bytes)
+                context_bytes = await loop.run_in_executor(None, gzip.compress, context_bytes)
                 compressed = True
 
             # Store in PostgreSQL
@@ -332,6 +401,18 @@ class StateManager:
         logger.info(f"Restoring checkpoint {checkpoint_id}")
 
         try:
+            # Queued write-behind checkpoint
+            pending = self._pipeline.pending(checkpoint_id) if self._pipeline else None
+            if pending is not None:
+                return StateSnapshot(
+                    agent_id=pending.agent_id,
+                    session_id=pending.session_id,
+                    state=AgentState(pending.state),
+                    context=json.loads(pending.raw),
+                    timestamp=pending.created_at,
+                    metadata=pending.metadata,
+                )
+
             # Load from PostgreSQL
             if self._pg_pool:
                 snapshot = await self._load_checkpoint_pg(checkpoint_id)
@@ -362,7 +443,7 @@ class StateManager:
 
         select_sql = """
         SELECT agent_id, session_id, state, context_data, metadata,
-               created_at, compressed
+               created_at, compressed, chunk_hashes, context_sha256
         FROM l02_runtime.checkpoints
         WHERE checkpoint_id = $1
         """
@@ -376,26 +457,39 @@ class StateManager:
                     message=f"Checkpoint {checkpoint_id} not found"
                 )
 
-            # Decompress if needed
-            context_bytes = row['context_data']
-            if row['compressed']:
-                context_bytes = gzip.decompress(context_bytes)
-
-            # Deserialize context
-            context_json = context_bytes.decode('utf-8')
-            context = json.loads(context_json)
-
-            # Parse metadata
-            metadata = json.loads(row['metadata']) if row['metadata'] else {}
-
-            return StateSnapshot(
-                agent_id=row['agent_id'],
-                session_id=row['session_id'],
-                state=AgentState(row['state']),
-                context=context,
-                timestamp=row['created_at'],
-                metadata=metadata,
-            )
+            if row['chunk_hashes'] is not None:
+                # Reassemble chunked checkpoint (verifies the content hash)
+                try:
+                    context_bytes = await self._pipeline.load(
+                        conn,
+                        [bytes(h) for h in row['chunk_hashes']],
+                        row['context_sha256'],
+                    )
+                except ValueError as e:
+                    raise StateError(
+                        code="E2033",
+                        message=f"Checkpoint {checkpoint_id} is corrupt: {e}"
+                    )
+            else:
+                # Decompress if needed
+                context_bytes = row['context_data']
+                if row['compressed']:
+                    context_bytes = gzip.decompress(context_bytes)
+
+        # Deserialize context off the event loop
+        context = await asyncio.get_running_loop().run_in_executor(None, json.loads, context_bytes)
+
+        # Parse metadata
+        metadata = json.loads(row['metadata']) if row['metadata'] else {}
+
+        return StateSnapshot(
+            agent_id=row['agent_id'],
+            session_id=row['session_id'],
+            state=AgentState(row['state']),
+            context=context,
+            timestamp=row['created_at'],
+            metadata=metadata,
+        )
 
     async def save_hot_state(
         self,
@@ -416,11 +510,7 @@ class StateManager:
         try:
             key = f"l02:state:{agent_id}"
             value = json.dumps(state_data)
-            await self._redis_client.setex(
-                key,
-                timedelta(seconds=3600),  # 3600s TTL
-                value
-            )
+            await self._redis_client.setex(key, HOT_STATE_TTL, value)
             logger.debug(f"Hot state saved for agent {agent_id}")
 
         except Exception as e:
@@ -454,6 +544,86 @@ class StateManager:
             logger.warning(f"Failed to load hot state for agent {agent_id}: {e}")
             return None
 
+    async def append_hot_log(
+        self,
+        log_id: str,
+        entry: Dict[str, Any],
+        refresh_state: Sequence[str] = ()
+    ) -> bool:
+        """
+        Append an entry to a hot log (Redis list) and refresh its TTL.
+
+        Args:
+            log_id: Log identifier
+            entry: Entry to append
+            refresh_state: Hot state keys whose TTL is refreshed in the
+                same round trip (e.g. the snapshot the log continues)
+
+        Returns:
+            True if appended, False otherwise
+        """
+        if not self._redis_client:
+            logger.debug("Redis not available, skipping hot log append")
+            return False
+
+        try:
+            key = f"l02:log:{log_id}"
+            pipeline = self._redis_client.pipeline(transaction=False)
+            pipeline.rpush(key, json.dumps(entry))
+            pipeline.expire(key, HOT_STATE_TTL)
+            for agent_id in refresh_state:
+                pipeline.expire(f"l02:state:{agent_id}", HOT_STATE_TTL)
+            await pipeline.execute()
+            return True
+
+        except Exception as e:
+            logger.warning(f"Failed to append to hot log {log_id}: {e}")
+            return False
+
+    async def load_hot_log(
+        self,
+        log_id: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Load all entries of a hot log.
+
+        Args:
+            log_id: Log identifier
+
+        Returns:
+            Entries in append order (empty if not found)
+        """
+        if not self._redis_client:
+            return []
+
+        try:
+            values = await self._redis_client.lrange(f"l02:log:{log_id}", 0, -1)
+            return [json.loads(value) for value in values]
+
+        except Exception as e:
+            logger.warning(f"Failed to load hot log {log_id}: {e}")
+            return []
+
+    async def delete_hot_log(self, log_id: str) -> bool:
+        """
+        Delete a hot log.
+
+        Args:
+            log_id: Log identifier
+
+        Returns:
+            True if deleted, False otherwise
+        """
+        if not self._redis_client:
+            return False
+
+        try:
+            result = await self._redis_client.delete(f"l02:log:{log_id}")
+            return result > 0
+        except Exception as e:
+            logger.warning(f"Failed to delete hot log {log_id}: {e}")
+            return False
+
     async def save_agent_state(
         self,
         agent_id: str,
@@ -611,12 +781,24 @@ class StateManager:
         WHERE created_at < $1
         """
 
+        # Chunks unused since the cutoff that no checkpoint references
+        delete_chunks_sql = """
+        DELETE FROM l02_runtime.checkpoint_chunks c
+        WHERE c.last_used_at < $1
+          AND NOT EXISTS (
+              SELECT 1 FROM l02_runtime.checkpoints k
+              WHERE k.chunk_hashes @> ARRAY[c.chunk_hash]
+          )
+        """
+
         async with self._pg_pool.acquire() as conn:
             result = await conn.execute(delete_sql, cutoff_date)
             # Extract count from result string like "DELETE 5"
             count = int(result.split()[-1]) if result else 0
+            chunk_result = await conn.execute(delete_chunks_sql, cutoff_date)
+            chunk_count = int(chunk_result.split()[-1]) if chunk_result else 0
 
-        logger.info(f"Cleaned up {count} old checkpoints")
+        logger.info(f"Cleaned up {count} old checkpoints and {chunk_count} unused chunks")
         return count
 
     async def _auto_checkpoint_loop(self) -> None:
@@ -687,6 +869,25 @@ class StateManager:
                     row["agent_id"]: row["count"] for row in agent_counts
                 }
 
+                # Chunk storage against the size of the checkpoints they make up
+                chunks = await conn.fetchrow("""
+                    SELECT
+                        COUNT(*) as chunks,
+                        COALESCE(SUM(octet_length(data)), 0) as stored,
+                        (SELECT COALESCE(SUM(raw_size_bytes), 0)
+                         FROM l02_runtime.checkpoints
+                         WHERE chunk_hashes IS NOT NULL) as raw
+                    FROM l02_runtime.checkpoint_chunks
+                """)
+
+                if chunks:
+                    stats["chunk_count"] = chunks["chunks"]
+                    stats["chunk_stored_bytes"] = chunks["stored"]
+                    stats["chunked_raw_bytes"] = chunks["raw"]
+                    stats["chunk_storage_ratio"] = (
+                        chunks["stored"] / chunks["raw"] if chunks["raw"] else 0.0
+                    )
+
         except Exception as e:
             logger.warning(f"Failed to get checkpoint stats: {e}")
 
@@ -807,7 +1008,8 @@ class StateManager:
             "postgresql_available": self._pg_pool is not None,
             "redis_available": self._redis_client is not None,
             "retention_days": self.retention_days,
-            "compression_enabled": self.checkpoint_compression == "gzip",
+            "compression_enabled": self.checkpoint_compression != "none",
+            "checkpoint_pipeline": self._pipeline.get_stats() if self._pipeline else None,
         }
 
     async def cleanup(self) -> None:
@@ -822,10 +1024,14 @@ class StateManager:
             except asyncio.CancelledError:
                 pass
 
-        # Close PostgreSQL pool
+        # Commit queued checkpoints
+        if self._pipeline:
+            await self._pipeline.stop()
+
+        # Release the shared PostgreSQL pool
         if self._pg_pool:
             await self._pg_pool.close()
-            logger.info("PostgreSQL pool closed")
+            logger.info("PostgreSQL pool released")
 
         # Close Redis connection
         if self._redis_client:
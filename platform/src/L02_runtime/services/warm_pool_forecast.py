@@ -0,0 +1,600 @@
+"""
+Predictive Warm Pool Sizing
+
+Forecasts spawn arrivals per runtime class and sizes the warm pool ahead
+of demand instead of keeping a fixed number of instances:
+
+- ArrivalForecaster counts spawns per interval and keeps an EWMA of the
+  rate plus an additive Holt-Winters model (level, trend and a daily or
+  hourly season). The forecast is the larger of the two, so bursts that
+  repeat each season are anticipated and unseasonal bursts are followed
+  within an interval or two.
+- WarmPoolPlanner turns the arrivals expected within one lead time (time
+  until a replacement instance is ready) at the forecast peak before the
+  next re-plan into pool targets. Every class
+  gets its min size; further instances go one at a time to the class
+  whose next instance avoids the highest expected cold-start cost
+  (P(arrivals >= k) x cold-start latency x miss cost) per unit of idle
+  cost, until the class or total max size, the idle-cost cap, or the
+  minimum hit probability is reached.
+- replay_trace() drives a planner with a recorded spawn trace and reports
+  warm-hit ratio, spawn latency percentiles and idle cost, so fixed and
+  predictive sizing can be compared offline.
+
+Spawn traces are JSON lines of {"timestamp": <epoch seconds>,
+"runtime_class": "<class>"}; WarmPoolManager.export_spawn_trace() writes
+the spawns it has seen in this format.
+"""
+
+import heapq
+import json
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+from ..models import RuntimeClass, TrustLevel
+
+
+# Trust level whose sandbox runs on each runtime class (see SandboxManager)
+RUNTIME_CLASS_TRUST_LEVELS = {
+    RuntimeClass.RUNC.value: TrustLevel.TRUSTED,
+    RuntimeClass.GVISOR.value: TrustLevel.STANDARD,
+    RuntimeClass.KATA.value: TrustLevel.UNTRUSTED,
+    RuntimeClass.KATA_CC.value: TrustLevel.CONFIDENTIAL,
+}
+
+# Spawn latencies kept per runtime class for percentiles
+LATENCY_WINDOW = 10000
+
+# Bound on the variance/mean ratio of arrival counts
+MAX_DISPERSION = 50.0
+
+# Spawn events kept for export_spawn_trace()
+TRACE_WINDOW = 100000
+
+
+def percentile(values: Iterable[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0-100), 0.0 if there are no values."""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+    return ordered[min(rank, len(ordered) - 1)]
+
+
+def _arrival_tail(mean: float, dispersion: float, count: int) -> List[float]:
+    """
+    P(N >= k) for k = 1..count.
+
+    N is Poisson(mean) or, for bursty arrivals (variance/mean ratio
+    dispersion > 1), negative binomial with the same mean.
+    """
+    if mean <= 0:
+        return [0.0] * count
+    if dispersion <= 1.0:
+        pmf = math.exp(-mean) if mean < 700 else 0.0
+
+        def ratio(k: int) -> float:
+            return mean / k
+    else:
+        r = mean / (dispersion - 1.0)
+        q = 1.0 - 1.0 / dispersion
+        pmf = math.exp(r * math.log(1.0 / dispersion))
+
+        def ratio(k: int) -> float:
+            return (k - 1 + r) / k * q
+    if pmf == 0.0:
+        # Normal approximation where the pmf underflows
+        std = math.sqrt(mean * max(dispersion, 1.0))
+        return [0.5 * math.erfc((k - 0.5 - mean) / (std * math.sqrt(2))) for k in range(1, count + 1)]
+    tail = []
+    cdf = 0.0
+    for k in range(1, count + 1):
+        cdf += pmf
+        tail.append(max(1.0 - cdf, 0.0))
+        pmf *= ratio(k)
+    return tail
+
+
+class ArrivalForecaster:
+    """
+    Spawn arrival forecast of one runtime class.
+
+    Arrivals are counted per interval; closed intervals (including empty
+    ones) update an EWMA, an additive Holt-Winters model, and a slower
+    EWMA of the squared deviation from the rate, which measures how
+    bursty the arrivals are.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 10.0,
+        season_seconds: float = 86400.0,
+        ewma_alpha: float = 0.3,
+        variance_alpha: float = 0.02,
+        alpha: float = 0.2,
+        beta: float = 0.01,
+        gamma: float = 0.1,
+    ):
+        """
+        Initialize forecaster.
+
+        Args:
+            interval_seconds: Length of a counting interval
+            season_seconds: Season of the Holt-Winters model (0 disables
+                the seasonal component)
+            ewma_alpha: Smoothing of the EWMA rate
+            variance_alpha: Smoothing of the EWMA variance
+            alpha: Holt-Winters level smoothing
+            beta: Holt-Winters trend smoothing
+            gamma: Holt-Winters seasonal smoothing
+        """
+        self.interval = interval_seconds
+        self.season_length = max(int(season_seconds // interval_seconds), 0)
+        self.ewma_alpha = ewma_alpha
+        self.variance_alpha = variance_alpha
+        self.alpha = alpha
+        self.beta = beta
+        self.gamma = gamma
+
+        self.ewma = 0.0
+        self.variance = 0.0
+        self.level: Optional[float] = None
+        self.trend = 0.0
+        self.seasonal = [0.0] * self.season_length
+        self.intervals = 0
+
+        self._current: Optional[int] = None  # index of the open interval
+        self._count = 0
+
+    def record(self, timestamp: float, count: int = 1) -> None:
+        """Count arrivals at a time (events must come in time order)."""
+        self.advance(timestamp)
+        self._count += count
+
+    def advance(self, now: float) -> None:
+        """Close the intervals that ended before now."""
+        index = int(now // self.interval)
+        if self._current is None:
+            self._current = index
+            return
+        # A long gap only needs one season of empty intervals to decay the model
+        gap = index - self._current
+        limit = max(self.season_length, 64)
+        if gap > limit:
+            self._current = index - limit
+        while self._current < index:
+            self._update(self._count, self._current)
+            self._count = 0
+            self._current += 1
+
+    def _update(self, observed: float, index: int) -> None:
+        self.intervals += 1
+        deviation = observed - self.ewma
+        self.variance += self.variance_alpha * (deviation * deviation - self.variance)
+        self.ewma += self.ewma_alpha * deviation
+        position = index % self.season_length if self.season_length else 0
+        season = self.seasonal[position] if self.season_length else 0.0
+        if self.level is None:
+            self.level = observed - season
+            return
+        level = self.alpha * (observed - season) + (1 - self.alpha) * (self.level + self.trend)
+        self.trend = self.beta * (level - self.level) + (1 - self.beta) * self.trend
+        self.level = level
+        if self.season_length:
+            self.seasonal[position] = self.gamma * (observed - level) + (1 - self.gamma) * season
+
+    def dispersion(self) -> float:
+        """Variance/mean ratio of interval counts (1.0 for Poisson arrivals)."""
+        if self.ewma <= 1e-6:
+            return 1.0
+        return min(max(self.variance / self.ewma, 1.0), MAX_DISPERSION)
+
+    def rate(self, now: float) -> float:
+        """Arrivals per interval expected now."""
+        self.advance(now)
+        rate = self.ewma
+        # Burst within the open interval
+        elapsed = now - self._current * self.interval if self._current is not None else 0.0
+        if elapsed > 0.25 * self.interval:
+            rate = max(rate, self._count * self.interval / elapsed)
+        return rate
+
+    def peak_rate(self, horizon_seconds: float, now: float) -> float:
+        """
+        Highest arrivals per interval expected within a horizon.
+
+        Args:
+            horizon_seconds: Forecast horizon
+            now: Current time (epoch seconds)
+        """
+        rate = self.rate(now)
+        if self.level is None or self._current is None:
+            return rate
+
+        # Holt-Winters over the intervals of the horizon, starting with the open one
+        seasonal_ready = self.season_length and self.intervals >= self.season_length
+        peak = 0.0
+        for h in range(1, max(int(math.ceil(horizon_seconds / self.interval)), 1) + 1):
+            value = self.level + h * self.trend
+            if seasonal_ready:
+                value += self.seasonal[(self._current + h - 1) % self.season_length]
+            peak = max(peak, value)
+        return max(rate, peak)
+
+
+@dataclass
+class ClassStats:
+    """Spawn outcomes of one runtime class."""
+    hits: int = 0
+    misses: int = 0
+    latencies: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def to_dict(self) -> Dict[str, Any]:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "warm_hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            "p50_spawn_latency_seconds": round(percentile(self.latencies, 50), 4),
+            "p99_spawn_latency_seconds": round(percentile(self.latencies, 99), 4),
+        }
+
+
+class WarmPoolPlanner:
+    """Sizes per-runtime-class warm pools from spawn forecasts."""
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize planner.
+
+        Args:
+            config: Configuration dict with:
+                - runtime_classes: Classes to keep warm instances of
+                - interval_seconds: Forecast counting interval
+                - season_seconds: Holt-Winters season (default one day)
+                - min_size / max_size: Per-class bounds (int or class -> int)
+                - max_total_size: Bound on all warm instances together
+                - idle_cost_per_hour: Cost of one idle instance (float or class -> float)
+                - max_idle_cost_per_hour: Cap on the idle cost of the pool
+                - miss_cost: Weight of a cold start (float or class -> float)
+                - cold_start_seconds: Cold-start latency until measured
+                - warm_start_seconds: Latency of a warm allocation
+                - lead_time_seconds: Time a warm instance takes to replace;
+                  defaults to the cold-start latency
+                - replenish_interval_seconds: How often targets are applied
+                - min_hit_probability: Do not keep an instance that is
+                  used with a lower probability within the lead time
+        """
+        self.config = config or {}
+        self.runtime_classes: List[str] = list(self.config.get("runtime_classes", [RuntimeClass.GVISOR.value]))
+        self.interval = self.config.get("interval_seconds", 10.0)
+        self.season_seconds = self.config.get("season_seconds", 86400.0)
+        self.max_total_size = self.config.get("max_total_size", 50)
+        self.max_idle_cost = self.config.get("max_idle_cost_per_hour")
+        self.warm_start_seconds = self.config.get("warm_start_seconds", 0.05)
+        self.lead_time = self.config.get("lead_time_seconds")
+        self.replenish_interval = self.config.get("replenish_interval_seconds", 30.0)
+        self.min_hit_probability = self.config.get("min_hit_probability", 0.01)
+
+        self._forecasters: Dict[str, ArrivalForecaster] = {}
+        self._cold_start: Dict[str, float] = {}
+        self._stats: Dict[str, ClassStats] = {}
+        self._targets: Dict[str, int] = {}
+        self._forecasts: Dict[str, float] = {}
+        self.trace: Deque[Tuple[float, str]] = deque(maxlen=TRACE_WINDOW)
+
+    def _per_class(self, key: str, runtime_class: str, default: Any) -> Any:
+        value = self.config.get(key, default)
+        if isinstance(value, dict):
+            return value.get(runtime_class, default)
+        return value
+
+    def min_size(self, runtime_class: str) -> int:
+        return self._per_class("min_size", runtime_class, 1)
+
+    def max_size(self, runtime_class: str) -> int:
+        return self._per_class("max_size", runtime_class, 20)
+
+    def cold_start_seconds(self, runtime_class: str) -> float:
+        """Measured (EWMA) or configured cold-start latency."""
+        return self._cold_start.get(
+            runtime_class, self._per_class("cold_start_seconds", runtime_class, 5.0)
+        )
+
+    def _forecaster(self, runtime_class: str) -> ArrivalForecaster:
+        if runtime_class not in self._forecasters:
+            self._forecasters[runtime_class] = ArrivalForecaster(
+                interval_seconds=self.interval,
+                season_seconds=self.season_seconds,
+            )
+            if runtime_class not in self.runtime_classes:
+                self.runtime_classes.append(runtime_class)
+        return self._forecasters[runtime_class]
+
+    def _class_stats(self, runtime_class: str) -> ClassStats:
+        if runtime_class not in self._stats:
+            self._stats[runtime_class] = ClassStats()
+        return self._stats[runtime_class]
+
+    def record_spawn(
+        self,
+        runtime_class: str,
+        warm: bool,
+        latency_seconds: Optional[float] = None,
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """
+        Record a spawn request.
+
+        Args:
+            runtime_class: Runtime class the agent needed
+            warm: Whether a warm instance was allocated
+            latency_seconds: Spawn latency; a miss defaults to the cold-start latency
+            timestamp: Request time (epoch seconds, default now)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        self._forecaster(runtime_class).record(timestamp)
+        self.trace.append((timestamp, runtime_class))
+        stats = self._class_stats(runtime_class)
+        if warm:
+            stats.hits += 1
+        else:
+            stats.misses += 1
+        if latency_seconds is None:
+            latency_seconds = self.warm_start_seconds if warm else self.cold_start_seconds(runtime_class)
+        stats.latencies.append(latency_seconds)
+
+    def record_cold_start(self, runtime_class: str, seconds: float) -> None:
+        """Record how long creating an instance took."""
+        current = self._cold_start.get(runtime_class)
+        self._cold_start[runtime_class] = seconds if current is None else current + 0.2 * (seconds - current)
+
+    def lead_time_seconds(self, runtime_class: str) -> float:
+        if self.lead_time is not None:
+            return self.lead_time
+        return self.cold_start_seconds(runtime_class)
+
+    def expected_arrivals(self, runtime_class: str, now: float) -> float:
+        """
+        Arrivals the pool of a class has to absorb.
+
+        Allocations are replaced as they happen, so the pool only has to
+        cover the arrivals during one lead time, at the busiest point
+        until the next re-plan.
+        """
+        forecaster = self._forecaster(runtime_class)
+        peak = forecaster.peak_rate(self.replenish_interval + self.lead_time_seconds(runtime_class), now)
+        return peak * self.lead_time_seconds(runtime_class) / forecaster.interval
+
+    def plan(self, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Warm pool target per runtime class.
+
+        Args:
+            now: Current time (epoch seconds, default now)
+        """
+        now = time.time() if now is None else now
+        targets: Dict[str, int] = {}
+        idle_cost: Dict[str, float] = {}
+        budget = self.max_idle_cost if self.max_idle_cost is not None else math.inf
+        heap: List[Tuple[float, str, int]] = []
+        tails: Dict[str, List[float]] = {}
+
+        for runtime_class in self.runtime_classes:
+            mean = self.expected_arrivals(runtime_class, now)
+            self._forecasts[runtime_class] = mean
+            targets[runtime_class] = self.min_size(runtime_class)
+            idle_cost[runtime_class] = max(self._per_class("idle_cost_per_hour", runtime_class, 1.0), 1e-9)
+            budget -= targets[runtime_class] * idle_cost[runtime_class]
+
+            headroom = self.max_size(runtime_class) - targets[runtime_class]
+            if headroom <= 0:
+                continue
+            dispersion = self._forecaster(runtime_class).dispersion()
+            tails[runtime_class] = _arrival_tail(mean, dispersion, self.max_size(runtime_class))
+            self._push(heap, runtime_class, targets[runtime_class] + 1, tails, idle_cost)
+
+        total = sum(targets.values())
+        while heap and total < self.max_total_size:
+            _, runtime_class, k = heapq.heappop(heap)
+            if tails[runtime_class][k - 1] < self.min_hit_probability:
+                continue
+            if idle_cost[runtime_class] > budget:
+                continue
+            budget -= idle_cost[runtime_class]
+            targets[runtime_class] = k
+            total += 1
+            if k < self.max_size(runtime_class):
+                self._push(heap, runtime_class, k + 1, tails, idle_cost)
+
+        self._targets = targets
+        return dict(targets)
+
+    def _push(self, heap, runtime_class: str, k: int, tails, idle_cost) -> None:
+        """Queue the k-th instance of a class by expected miss cost avoided per idle cost."""
+        miss_cost = (
+            tails[runtime_class][k - 1]
+            * max(self.cold_start_seconds(runtime_class) - self.warm_start_seconds, 0.0)
+            * self._per_class("miss_cost", runtime_class, 1.0)
+        )
+        heapq.heappush(heap, (-miss_cost / idle_cost[runtime_class], runtime_class, k))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Forecast, target and spawn outcomes per runtime class."""
+        hits = sum(stats.hits for stats in self._stats.values())
+        total = hits + sum(stats.misses for stats in self._stats.values())
+        latencies = [latency for stats in self._stats.values() for latency in stats.latencies]
+        return {
+            "warm_hit_ratio": round(hits / total, 4) if total else 0.0,
+            "p99_spawn_latency_seconds": round(percentile(latencies, 99), 4),
+            "classes": {
+                runtime_class: {
+                    "target": self._targets.get(runtime_class, 0),
+                    "forecast_arrivals": round(self._forecasts.get(runtime_class, 0.0), 3),
+                    "cold_start_seconds": round(self.cold_start_seconds(runtime_class), 3),
+                    **self._class_stats(runtime_class).to_dict(),
+                }
+                for runtime_class in self.runtime_classes
+            },
+        }
+
+
+def load_trace(path: str) -> List[Tuple[float, str]]:
+    """Read a spawn trace (JSON lines) sorted by time."""
+    events = []
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                events.append((float(record["timestamp"]), record["runtime_class"]))
+    events.sort()
+    return events
+
+
+def dump_trace(events: Iterable[Tuple[float, str]], path: str) -> int:
+    """Write a spawn trace as JSON lines; returns the number of events."""
+    count = 0
+    with open(path, "w") as f:
+        for timestamp, runtime_class in events:
+            f.write(json.dumps({"timestamp": timestamp, "runtime_class": runtime_class}) + "\n")
+            count += 1
+    return count
+
+
+@dataclass
+class SimulationResult:
+    """Outcome of replaying a spawn trace."""
+    spawns: int
+    hits: int
+    mean_latency_seconds: float
+    p50_latency_seconds: float
+    p99_latency_seconds: float
+    idle_instance_hours: float
+    idle_cost: float
+    instances_created: int
+
+    @property
+    def warm_hit_ratio(self) -> float:
+        return self.hits / self.spawns if self.spawns else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "spawns": self.spawns,
+            "hits": self.hits,
+            "warm_hit_ratio": round(self.warm_hit_ratio, 4),
+            "mean_latency_seconds": round(self.mean_latency_seconds, 4),
+            "p50_latency_seconds": round(self.p50_latency_seconds, 4),
+            "p99_latency_seconds": round(self.p99_latency_seconds, 4),
+            "idle_instance_hours": round(self.idle_instance_hours, 3),
+            "idle_cost": round(self.idle_cost, 3),
+            "instances_created": self.instances_created,
+        }
+
+
+def replay_trace(
+    events: List[Tuple[float, str]],
+    planner: WarmPoolPlanner,
+    cold_start_seconds: Dict[str, float],
+    fixed_size: Optional[int] = None,
+) -> SimulationResult:
+    """
+    Replay a spawn trace against a simulated warm pool.
+
+    Every replenish interval the targets are re-planned and the pool of
+    each class is topped up (new instances become ready after the class's
+    cold-start latency) or trimmed to its target; a warm allocation tops
+    its class up to the current target right away. A spawn
+    takes a ready instance if there is one, otherwise it waits for a cold
+    start.
+
+    Args:
+        events: (timestamp, runtime_class) in time order
+        planner: Planner to size the pool (fed with the replayed spawns)
+        cold_start_seconds: Cold-start latency per runtime class
+        fixed_size: Keep this many instances per class instead of planning
+
+    Returns:
+        SimulationResult
+    """
+    if not events:
+        return SimulationResult(0, 0, 0.0, 0.0, 0.0, 0.0, 0.0, 0)
+
+    for runtime_class in sorted({runtime_class for _, runtime_class in events}):
+        planner._forecaster(runtime_class)
+        planner.record_cold_start(runtime_class, cold_start_seconds.get(runtime_class, 5.0))
+
+    ready: Dict[str, int] = {runtime_class: 0 for runtime_class in planner.runtime_classes}
+    starting: List[Tuple[float, str]] = []  # (ready_at, class) heap
+    latencies: List[float] = []
+    hits = 0
+    created = 0
+    idle_seconds: Dict[str, float] = {runtime_class: 0.0 for runtime_class in ready}
+
+    clock = events[0][0]
+    next_replenish = clock
+
+    def advance(until: float) -> None:
+        nonlocal clock
+        while starting and starting[0][0] <= until:
+            ready_at, runtime_class = heapq.heappop(starting)
+            for cls in ready:
+                idle_seconds[cls] += ready[cls] * (ready_at - clock)
+            clock = ready_at
+            ready[runtime_class] += 1
+        for cls in ready:
+            idle_seconds[cls] += ready[cls] * (until - clock)
+        clock = until
+
+    targets: Dict[str, int] = {}
+
+    def replenish(now: float, replan: bool) -> None:
+        nonlocal created, targets
+        if replan:
+            if fixed_size is not None:
+                targets = {runtime_class: fixed_size for runtime_class in ready}
+            else:
+                targets = planner.plan(now)
+        for runtime_class, target in targets.items():
+            in_flight = sum(1 for _, cls in starting if cls == runtime_class)
+            for _ in range(target - ready[runtime_class] - in_flight):
+                heapq.heappush(starting, (now + cold_start_seconds.get(runtime_class, 5.0), runtime_class))
+                created += 1
+            if replan and ready[runtime_class] > target:
+                ready[runtime_class] = target
+
+    for timestamp, runtime_class in events:
+        while next_replenish <= timestamp:
+            advance(next_replenish)
+            replenish(next_replenish, replan=True)
+            next_replenish += planner.replenish_interval
+        advance(timestamp)
+        warm = ready.get(runtime_class, 0) > 0
+        if warm:
+            ready[runtime_class] -= 1
+            hits += 1
+            latency = planner.warm_start_seconds
+        else:
+            latency = cold_start_seconds.get(runtime_class, 5.0)
+        latencies.append(latency)
+        planner.record_spawn(runtime_class, warm, latency, timestamp)
+        if warm:
+            # An allocation tops its class up to the current target
+            replenish(timestamp, replan=False)
+
+    idle_cost = sum(
+        seconds / 3600 * planner._per_class("idle_cost_per_hour", runtime_class, 1.0)
+        for runtime_class, seconds in idle_seconds.items()
+    )
+    return SimulationResult(
+        spawns=len(events),
+        hits=hits,
+        mean_latency_seconds=sum(latencies) / len(latencies),
+        p50_latency_seconds=percentile(latencies, 50),
+        p99_latency_seconds=percentile(latencies, 99),
+        idle_instance_hours=sum(idle_seconds.values()) / 3600,
+        idle_cost=idle_cost,
+        instances_created=created,
+    )
@@ -2,19 +2,22 @@
 Warm Pool Manager
 
 Manages pre-warmed agent instances for fast allocation.
-Maintains a pool of ready-to-use agent instances.
+Maintains a pool of ready-to-use agent instances per runtime class, sized
+ahead of demand from spawn-rate forecasts (see warm_pool_forecast).
 
 Based on Section 3.3.10 warm_pool configuration
 """
 
 import asyncio
 import logging
+import time
 from typing import Dict, Any, Optional, List
 from datetime import datetime, timedelta, timezone
 from dataclasses import dataclass
 
 from ..models import AgentConfig, AgentState, SpawnResult, RuntimeClass, TrustLevel, ResourceLimits
 from ..models.fleet_models import WarmInstance
+from .warm_pool_forecast import RUNTIME_CLASS_TRUST_LEVELS, WarmPoolPlanner, dump_trace
 
 
 logger = logging.getLogger(__name__)
@@ -38,6 +41,7 @@ class WarmPoolManager:
     - Refresh stale instances
     - Monitor pool health
     - Replenish pool as instances are allocated
+    - Size the pool per runtime class from spawn forecasts
     """
 
     def __init__(self, config: Optional[Dict[str, Any]] = None):
@@ -47,10 +51,16 @@ class WarmPoolManager:
         Args:
             config: Configuration dict with:
                 - enabled: Enable warm pool
-                - size: Target pool size
+                - size: Target pool size (initial size when predictive)
                 - runtime_class: Runtime class for warm instances
+                - runtime_classes: Runtime classes to keep warm (default: runtime_class)
                 - refresh_interval_seconds: Instance refresh interval
                 - max_instance_age_seconds: Maximum instance age
+                - replenish_interval_seconds: How often the pool is re-sized
+                - predictive: Size the pool from spawn forecasts
+                - forecast: WarmPoolPlanner configuration (min_size,
+                  max_size, max_total_size, idle_cost_per_hour,
+                  max_idle_cost_per_hour, miss_cost, ...)
         """
         self.config = config or {}
 
@@ -62,6 +72,26 @@ class WarmPoolManager:
         )
         self.refresh_interval = self.config.get("refresh_interval_seconds", 3600)
         self.max_instance_age = self.config.get("max_instance_age_seconds", 7200)
+        self.replenish_interval = self.config.get("replenish_interval_seconds", 30)
+        self.predictive = self.config.get("predictive", True)
+        self.runtime_classes = [
+            RuntimeClass(runtime_class).value
+            for runtime_class in self.config.get("runtime_classes", [self.runtime_class.value])
+        ]
+
+        # Spawn forecasts and per-class targets
+        self._planner = WarmPoolPlanner({
+            **self.config.get("forecast", {}),
+            "runtime_classes": self.runtime_classes,
+            "replenish_interval_seconds": self.replenish_interval,
+        })
+        # Until the first forecast: size for the default class, min size for others
+        self._targets: Dict[str, int] = {
+            runtime_class: self._planner.min_size(runtime_class) for runtime_class in self.runtime_classes
+        }
+        if self.runtime_class.value in self._targets:
+            self._targets[self.runtime_class.value] = self.pool_size
+        self._replenish_wakeup = asyncio.Event()
 
         # Warm pool: instance_id -> WarmInstance
         self._pool: Dict[str, WarmInstance] = {}
@@ -108,28 +138,67 @@ class WarmPoolManager:
         logger.info("WarmPoolManager initialization complete")
 
     async def _fill_pool(self) -> None:
-        """Fill pool to target size"""
-        current_size = len(self._pool)
-        needed = self.pool_size - current_size
+        """Fill pool to the target size of each runtime class"""
+        for runtime_class, target in self._targets.items():
+            current_size = self._class_size(runtime_class)
+            needed = target - current_size
 
-        if needed <= 0:
-            return
+            if needed <= 0:
+                continue
 
-        logger.info(f"Filling warm pool: {current_size} -> {self.pool_size} (+{needed})")
+            logger.info(
+                f"Filling warm pool ({runtime_class}): "
+                f"{current_size} -> {target} (+{needed})"
+            )
 
-        for i in range(needed):
-            try:
-                instance = await self._create_warm_instance()
-                self._pool[instance.agent_id] = instance
-            except Exception as e:
-                logger.error(f"Failed to create warm instance: {e}")
+            for i in range(needed):
+                try:
+                    instance = await self._create_warm_instance(runtime_class)
+                    self._pool[instance.agent_id] = instance
+                except Exception as e:
+                    logger.error(f"Failed to create warm instance: {e}")
 
         logger.info(f"Warm pool filled: {len(self._pool)} instances")
 
-    async def _create_warm_instance(self) -> WarmInstance:
+    async def _trim_pool(self) -> None:
+        """Terminate the oldest idle instances above each class's target"""
+        for runtime_class in {inst.runtime_class for inst in self._pool.values()}:
+            surplus = self._class_size(runtime_class) - self._targets.get(runtime_class, 0)
+            if surplus <= 0:
+                continue
+
+            instances = sorted(
+                (inst for inst in self._pool.values() if inst.runtime_class == runtime_class),
+                key=lambda x: x.created_at
+            )
+            logger.info(f"Trimming warm pool ({runtime_class}): -{surplus}")
+            for instance in instances[:surplus]:
+                del self._pool[instance.agent_id]
+                await self._terminate_instance(instance.agent_id)
+
+    def _class_size(self, runtime_class: str) -> int:
+        return sum(1 for inst in self._pool.values() if inst.runtime_class == runtime_class)
+
+    def _runtime_class_for(self, config: Optional[AgentConfig]) -> str:
+        """Runtime class an agent configuration is sandboxed in"""
+        if config is None:
+            return self.runtime_class.value
+        mapping = getattr(self._sandbox_manager, "TRUST_LEVEL_MAPPING", None)
+        if not isinstance(mapping, dict):
+            mapping = {
+                trust_level: RuntimeClass(runtime_class)
+                for runtime_class, trust_level in RUNTIME_CLASS_TRUST_LEVELS.items()
+            }
+        runtime_class = mapping.get(config.trust_level)
+        return runtime_class.value if runtime_class else self.runtime_class.value
+
+    async def _create_warm_instance(self, runtime_class: Optional[str] = None) -> WarmInstance:
         """
         Create a new warm instance.
 
+        Args:
+            runtime_class: Runtime class of the instance (default: runtime_class)
+
         Returns:
             WarmInstance
         """
@@ -139,23 +208,27 @@ class WarmPoolManager:
                 message="Lifecycle manager not available"
             )
 
-        # Create agent config for warm instance
+        runtime_class = runtime_class or self.runtime_class.value
+
+        # Create agent config for warm instance; the trust level selects the sandbox
         agent_config = AgentConfig(
             agent_id=f"warm-{datetime.now(timezone.utc).timestamp()}",
-            trust_level=TrustLevel.STANDARD,
+            trust_level=RUNTIME_CLASS_TRUST_LEVELS.get(runtime_class, TrustLevel.STANDARD),
             resource_limits=ResourceLimits(),
             tools=[],
             environment={"WARM_POOL": "true"},
         )
 
-        # Spawn instance
+        # Spawn instance; this is what a cold start costs
+        started = time.monotonic()
         result = await self._lifecycle_manager.spawn(agent_config)
+        self._planner.record_cold_start(runtime_class, time.monotonic() - started)
 
         # Create warm instance record
         warm_instance = WarmInstance(
             agent_id=result.agent_id,
             session_id=result.session_id,
-            runtime_class=self.runtime_class.value,
+            runtime_class=runtime_class,
             created_at=datetime.now(timezone.utc),
             allocated=False,
         )
@@ -171,6 +244,10 @@ class WarmPoolManager:
         """
         Allocate an instance from the warm pool.
 
+        The instance is taken from the pool of the runtime class the
+        configuration's trust level maps to, and the request is recorded
+        for the spawn forecast.
+
         Args:
             config: Optional agent configuration to apply
 
@@ -184,15 +261,20 @@ class WarmPoolManager:
             logger.debug("Warm pool is disabled")
             return None
 
-        if not self._pool:
-            logger.warning("Warm pool is empty")
+        started = time.monotonic()
+        runtime_class = self._runtime_class_for(config)
+        candidates = [inst for inst in self._pool.values() if inst.runtime_class == runtime_class]
+        if not candidates:
+            logger.warning(f"Warm pool is empty ({runtime_class})")
+            self._planner.record_spawn(runtime_class, warm=False)
+            self._replenish_wakeup.set()
             raise WarmPoolError(
                 code="E2092",
                 message="Warm pool exhausted"
             )
 
         # Get oldest instance from pool
-        instance = min(self._pool.values(), key=lambda x: x.created_at)
+        instance = min(candidates, key=lambda x: x.created_at)
 
         # Remove from pool
         del self._pool[instance.agent_id]
@@ -207,6 +289,9 @@ class WarmPoolManager:
             f"(pool size: {len(self._pool)})"
         )
 
+        self._planner.record_spawn(runtime_class, warm=True, latency_seconds=time.monotonic() - started)
+        self._replenish_wakeup.set()
+
         # TODO: Apply configuration to allocated instance if provided
 
         return instance
@@ -294,17 +379,35 @@ class WarmPoolManager:
                 logger.error(f"Error in refresh loop: {e}")
 
     async def _replenish_loop(self) -> None:
-        """Background task to replenish pool"""
+        """
+        Background task to replenish pool.
+
+        Every replenish interval the targets are re-planned from the spawn
+        forecast and surplus instances are trimmed; an allocation wakes
+        the loop to top its class up to the current target right away.
+        """
         logger.info("Starting warm pool replenish loop")
+        last_plan = time.monotonic()
 
         while True:
             try:
-                await asyncio.sleep(30)  # Check every 30 seconds
+                try:
+                    await asyncio.wait_for(
+                        self._replenish_wakeup.wait(),
+                        timeout=self.replenish_interval
+                    )
+                except asyncio.TimeoutError:
+                    pass
+                self._replenish_wakeup.clear()
+
+                if self.predictive and time.monotonic() - last_plan >= self.replenish_interval:
+                    last_plan = time.monotonic()
+                    self._targets = self._planner.plan()
+                    await self._trim_pool()
 
                 # Replenish pool if below target size
-                current_size = len(self._pool)
-                if current_size < self.pool_size:
-                    logger.debug(f"Replenishing pool: {current_size}/{self.pool_size}")
+                if any(self._class_size(cls) < target for cls, target in self._targets.items()):
+                    logger.debug(f"Replenishing pool: {len(self._pool)}/{sum(self._targets.values())}")
                     await self._fill_pool()
 
             except asyncio.CancelledError:
@@ -326,9 +429,13 @@ class WarmPoolManager:
             "current_size": len(self._pool),
             "allocated_count": len(self._allocated),
             "runtime_class": self.runtime_class.value,
+            "predictive": self.predictive,
+            "targets": dict(self._targets),
+            "forecast": self._planner.get_stats(),
             "instances": [
                 {
                     "agent_id": inst.agent_id,
+                    "runtime_class": inst.runtime_class,
                     "age_seconds": (datetime.now(timezone.utc) - inst.created_at).total_seconds(),
                     "allocated": inst.allocated,
                 }
@@ -336,6 +443,20 @@ class WarmPoolManager:
             ],
         }
 
+    async def export_spawn_trace(self, path: str) -> int:
+        """
+        Write the spawns seen so far as a trace for replay_trace().
+
+        Args:
+            path: Output file (JSON lines)
+
+        Returns:
+            Number of spawn events written
+        """
+        events = list(self._planner.trace)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, dump_trace, events, path)
+
     async def cleanup(self) -> None:
         """Cleanup warm pool manager"""
         logger.info("Cleaning up WarmPoolManager")
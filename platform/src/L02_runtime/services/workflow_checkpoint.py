@@ -0,0 +1,272 @@
+"""
+Incremental Workflow Checkpoints
+
+Workflow checkpoints are written as a snapshot plus an append-only log of
+per-node deltas instead of re-serializing the whole graph and state after
+every node:
+
+- The serialized graph is stored once under its content hash
+  (graph_<sha256>); snapshots only reference it.
+- A snapshot holds the full state, visited nodes, execution path and
+  scheduler frontier, and names the delta log that continues it. The
+  frontier lists the nodes the scheduler finished, in order, with the
+  outgoing edges each fired; resume rebuilds the ready queue from it.
+- After each node, a delta with the state keys written since the last
+  checkpoint, the newly executed and finished nodes and the depth is
+  appended to the log. Every compact_every deltas a new snapshot (with a
+  new log) is written and the old log deleted.
+
+Resume loads the snapshot and replays the deltas of its log in sequence
+order, up to the first missing one. Checkpoints written before this format (graph embedded, no log)
+are still read as a plain snapshot.
+"""
+
+import hashlib
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+# Re-store a graph whose hot-state copy is older than this (TTL is 1h)
+GRAPH_REFRESH_SECONDS = 1800
+
+
+def graph_hash(graph_data: Dict[str, Any]) -> str:
+    """Content hash of a serialized graph."""
+    encoded = json.dumps(graph_data, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def graph_key(digest: str) -> str:
+    """Hot-state key a graph is stored under."""
+    return f"graph_{digest}"
+
+
+class TrackedState(dict):
+    """
+    Workflow state that records which top-level keys changed.
+
+    Writes and deletes mark a key; so do reads through [] or get() that
+    return a dict or list, since the caller may mutate it in place.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._dirty: Set[str] = set()
+        self._deleted: Set[str] = set()
+
+    def __setitem__(self, key, value) -> None:
+        super().__setitem__(key, value)
+        self._dirty.add(key)
+        self._deleted.discard(key)
+
+    def __delitem__(self, key) -> None:
+        super().__delitem__(key)
+        self._dirty.discard(key)
+        self._deleted.add(key)
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        if isinstance(value, (dict, list)):
+            self._dirty.add(key)
+        return value
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args, **kwargs) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def pop(self, key, *default):
+        if key in self:
+            self._dirty.discard(key)
+            self._deleted.add(key)
+        return super().pop(key, *default)
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._dirty.discard(key)
+        self._deleted.add(key)
+        return key, value
+
+    def clear(self) -> None:
+        self._deleted.update(self.keys())
+        self._dirty.clear()
+        super().clear()
+
+    def drain(self) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Changes since the last drain.
+
+        Returns:
+            (changed, deleted): current values of changed keys, and deleted keys
+        """
+        changed = {key: dict.__getitem__(self, key) for key in self._dirty if key in self}
+        deleted = sorted(self._deleted)
+        self._dirty.clear()
+        self._deleted.clear()
+        return changed, deleted
+
+
+class CheckpointLog:
+    """Checkpoint bookkeeping of one running workflow."""
+
+    def __init__(
+        self,
+        workflow_id: str,
+        graph_digest: str,
+        compact_every: int,
+        previous_log: Optional[str] = None,
+    ):
+        """
+        Initialize checkpoint log.
+
+        Args:
+            workflow_id: Workflow identifier
+            graph_digest: Content hash of the workflow's graph
+            compact_every: Deltas between snapshots
+            previous_log: Log of the checkpoint this run resumed from,
+                deleted once the first snapshot is written
+        """
+        self.workflow_id = workflow_id
+        self.graph_digest = graph_digest
+        self.compact_every = max(compact_every, 1)
+        self.log_id: Optional[str] = None
+        self.previous_log = previous_log
+        self.seq = 0
+        self.deltas = 0
+        self.path_length = 0
+        self.finished_length = 0
+
+    def needs_snapshot(self) -> bool:
+        return self.log_id is None or self.deltas >= self.compact_every
+
+    def snapshot(self, context: Any) -> Tuple[Dict[str, Any], Optional[str]]:
+        """
+        Start a new log with a full snapshot.
+
+        Returns:
+            (snapshot record, log to delete once the snapshot is stored)
+        """
+        stale_log = self.log_id or self.previous_log
+        self.previous_log = None
+        self.log_id = f"{self.workflow_id}:{uuid4().hex[:12]}"
+        self.deltas = 0
+        self.path_length = len(context.execution_path)
+        self.finished_length = len(context.finished)
+        if isinstance(context.state, TrackedState):
+            context.state.drain()
+        record = {
+            "workflow_id": self.workflow_id,
+            "state": dict(context.state),
+            "visited_nodes": list(context.visited_nodes),
+            "execution_path": list(context.execution_path),
+            "finished": [[node_id, list(fired)] for node_id, fired in context.finished],
+            "depth": context.depth,
+            "graph": {"hash": self.graph_digest, "entry_node": context.graph.entry_node},
+            "log": self.log_id,
+            "seq": self.seq,
+            "checkpoint_time": datetime.now(timezone.utc).isoformat(),
+        }
+        return record, stale_log
+
+    def delta(self, context: Any) -> Dict[str, Any]:
+        """Next delta record of the current log."""
+        changed, deleted = context.state.drain()
+        path = context.execution_path[self.path_length:]
+        self.path_length += len(path)
+        finished = context.finished[self.finished_length:]
+        self.finished_length += len(finished)
+        self.seq += 1
+        self.deltas += 1
+        return {
+            "seq": self.seq,
+            "state": changed,
+            "deleted": deleted,
+            "path": list(path),
+            "finished": [[node_id, list(fired)] for node_id, fired in finished],
+            "depth": context.depth,
+        }
+
+
+def replay(checkpoint_data: Dict[str, Any], deltas: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Apply a snapshot's deltas in sequence order.
+
+    Replay stops at the first missing sequence number, so the result is
+    the state as of the last delta with no gap before it (at worst the
+    snapshot itself).
+
+    Args:
+        checkpoint_data: Snapshot record
+        deltas: Delta records of the snapshot's log
+
+    Returns:
+        Checkpoint data as of the last delta
+    """
+    state = dict(checkpoint_data.get("state", {}))
+    visited = list(checkpoint_data.get("visited_nodes", []))
+    execution_path = list(checkpoint_data.get("execution_path", []))
+    finished = list(checkpoint_data.get("finished", []))
+    depth = checkpoint_data.get("depth", 0)
+    seq = checkpoint_data.get("seq", 0)
+
+    for delta in sorted(deltas, key=lambda d: d["seq"]):
+        if delta["seq"] <= seq:
+            continue
+        if delta["seq"] != seq + 1:
+            logger.warning(
+                f"Checkpoint log {checkpoint_data.get('log')} is missing delta {seq + 1}; "
+                f"resuming from delta {seq}"
+            )
+            break
+        seq = delta["seq"]
+        state.update(delta.get("state", {}))
+        for key in delta.get("deleted", []):
+            state.pop(key, None)
+        execution_path.extend(delta.get("path", []))
+        visited.extend(delta.get("path", []))
+        finished.extend(delta.get("finished", []))
+        depth = delta.get("depth", depth)
+
+    return {
+        **checkpoint_data,
+        "state": state,
+        "visited_nodes": visited,
+        "execution_path": execution_path,
+        "finished": finished,
+        "depth": depth,
+        "seq": seq,
+    }
+
+
+class GraphStore:
+    """Remembers which graphs have a fresh hot-state copy."""
+
+    def __init__(self):
+        self._stored: Dict[str, float] = {}
+
+    def needs_store(self, digest: str) -> bool:
+        stored_at = self._stored.get(digest)
+        return stored_at is None or time.monotonic() - stored_at > GRAPH_REFRESH_SECONDS
+
+    def mark_stored(self, digest: str) -> None:
+        now = time.monotonic()
+        if len(self._stored) > 1024:
+            self._stored = {
+                key: stored_at for key, stored_at in self._stored.items()
+                if now - stored_at <= GRAPH_REFRESH_SECONDS
+            }
+        self._stored[digest] = now
@@ -0,0 +1,285 @@
+"""
+Workflow Graph Compiler
+
+Compiles a WorkflowGraph into index-based adjacency lists and in-degree
+counts with precompiled edge conditions, so that the WorkflowEngine
+scheduler routes a finished node in O(out-degree) instead of scanning
+every edge of the graph, and parses each condition string once instead
+of on every evaluation.
+
+Edge semantics of a compiled graph:
+- Conditional nodes take exactly one outgoing edge: the first whose
+  condition holds, otherwise the first edge without a condition.
+- Other nodes fan out along every outgoing edge whose condition holds
+  (edges without a condition always fire).
+- A node with several incoming edges is a join: it runs once, after all
+  of its reachable predecessors have finished or been skipped, provided
+  at least one edge into it fired. Nodes none of whose incoming edges
+  fire are skipped, and the skip propagates downstream.
+"""
+
+import ast
+import logging
+import operator
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from ..models.workflow_models import WorkflowGraph, WorkflowNode, NodeType
+
+
+logger = logging.getLogger(__name__)
+
+# condition(result, context) -> bool
+ConditionFn = Callable[[Any, Any], bool]
+
+_COMPARISON = re.compile(r'(state|result)\.(\w+(?:\.\w+)*)\s*(==|!=|>=|<=|>|<|in)\s*(.+)')
+
+_OPERATORS: Dict[str, Callable[[Any, Any], bool]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "in": lambda value, target: value in target,
+}
+
+_MISSING = object()
+
+
+def _literal(value_str: str) -> Any:
+    """Comparison operand: a Python literal, else the unquoted string."""
+    value_str = value_str.strip()
+    try:
+        return ast.literal_eval(value_str)
+    except (ValueError, SyntaxError):
+        return value_str.strip('"\'')
+
+
+def _lookup(container: Any, key_path: Tuple[str, ...]) -> Any:
+    """Value at a dotted key path, or _MISSING."""
+    current = container
+    for key in key_path:
+        if isinstance(current, dict) and key in current:
+            current = current[key]
+        else:
+            return _MISSING
+    return current
+
+
+def _compile_comparison(source: str, key_path: Tuple[str, ...], op: str, target: Any) -> ConditionFn:
+    compare = _OPERATORS[op]
+
+    def evaluate(result: Any, context: Any) -> bool:
+        container = context.state if source == "state" else result
+        value = _lookup(container, key_path)
+        if value is _MISSING:
+            return False
+        return bool(compare(value, target))
+
+    return evaluate
+
+
+def _compile_expression(condition: str) -> ConditionFn:
+    try:
+        tree = ast.parse(condition, mode='eval')
+    except SyntaxError:
+        return lambda result, context: False
+
+    # Function calls and imports are not allowed in conditions
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Call, ast.Import, ast.ImportFrom)):
+            return lambda result, context: False
+
+    code = compile(tree, '<condition>', 'eval')
+
+    def evaluate(result: Any, context: Any) -> bool:
+        safe_context = {
+            "result": result if isinstance(result, dict) else {"value": result},
+            "state": context.state,
+            "depth": context.depth,
+            "visited_count": len(context.visited_nodes),
+            "True": True,
+            "False": False,
+            "None": None,
+        }
+        return bool(eval(code, {"__builtins__": {}}, safe_context))
+
+    return evaluate
+
+
+def _success(result: Any, context: Any) -> bool:
+    if isinstance(result, dict):
+        return bool(result.get("success", True))
+    return bool(result)
+
+
+def _failure(result: Any, context: Any) -> bool:
+    return not _success(result, context)
+
+
+@lru_cache(maxsize=4096)
+def compile_condition(condition: str) -> ConditionFn:
+    """
+    Compile an edge condition into an evaluator.
+
+    Supports the same conditions as WorkflowEngine._evaluate_condition:
+    success/failure/always/never, state.<path> and result.<path>
+    comparisons, and restricted Python expressions over result, state,
+    depth and visited_count. Evaluation errors count as False.
+
+    Args:
+        condition: Condition string
+
+    Returns:
+        Callable(result, context) -> bool
+    """
+    if condition == "success":
+        evaluate = _success
+    elif condition == "failure":
+        evaluate = _failure
+    elif condition == "always":
+        return lambda result, context: True
+    elif condition == "never":
+        return lambda result, context: False
+    elif condition.startswith(("state.", "result.")):
+        match = _COMPARISON.match(condition)
+        if not match:
+            return lambda result, context: False
+        source, key_path, op, value_str = match.groups()
+        evaluate = _compile_comparison(source, tuple(key_path.split('.')), op, _literal(value_str))
+    else:
+        evaluate = _compile_expression(condition)
+
+    def guarded(result: Any, context: Any) -> bool:
+        try:
+            return evaluate(result, context)
+        except Exception as e:
+            logger.warning(f"Condition evaluation failed: {condition}, error: {e}")
+            return False
+
+    return guarded
+
+
+class CompiledGraph:
+    """
+    Index-based form of a WorkflowGraph.
+
+    Nodes are numbered in graph.nodes order; successors[i] and
+    conditions[i] hold the targets and condition evaluators (None for
+    unconditional edges) of node i's outgoing edges in graph.edges order.
+    """
+
+    def __init__(self, graph: WorkflowGraph):
+        """
+        Compile a workflow graph.
+
+        Args:
+            graph: Graph to compile
+
+        Raises:
+            ValueError: If an edge references a node that is not in the graph
+        """
+        self.graph = graph
+        self.node_ids: List[str] = list(graph.nodes)
+        self.nodes: List[WorkflowNode] = list(graph.nodes.values())
+        self.index: Dict[str, int] = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.successors: List[List[int]] = [[] for _ in self.nodes]
+        self.conditions: List[List[Optional[ConditionFn]]] = [[] for _ in self.nodes]
+        self.exclusive: List[bool] = [node.node_type == NodeType.CONDITIONAL for node in self.nodes]
+
+        for edge in graph.edges:
+            for node_id in (edge.source, edge.target):
+                if node_id not in self.index:
+                    raise ValueError(f"Edge {edge.source} -> {edge.target} references unknown node {node_id}")
+            source = self.index[edge.source]
+            self.successors[source].append(self.index[edge.target])
+            self.conditions[source].append(compile_condition(edge.condition) if edge.condition else None)
+
+        # start node -> (in-degrees within its reachable subgraph, node on a cycle)
+        self._plans: Dict[int, Tuple[List[int], Optional[str]]] = {}
+
+    def plan(self, start: int) -> Tuple[List[int], Optional[str]]:
+        """
+        In-degrees of the subgraph reachable from a start node.
+
+        Only edges from reachable nodes are counted, so that joins do not
+        wait for predecessors that can never run (e.g. when resuming from
+        the middle of a graph).
+
+        Args:
+            start: Index of the start node
+
+        Returns:
+            (in_degree, cycle_node): in-degree per node index, and the id
+            of a node on a cycle if the reachable subgraph is not acyclic
+        """
+        if start in self._plans:
+            return self._plans[start]
+
+        reachable = [False] * len(self.nodes)
+        reachable[start] = True
+        in_degree = [0] * len(self.nodes)
+        queue = deque([start])
+        while queue:
+            source = queue.popleft()
+            for target in self.successors[source]:
+                in_degree[target] += 1
+                if not reachable[target]:
+                    reachable[target] = True
+                    queue.append(target)
+
+        # Kahn's algorithm; nodes left with unresolved edges are on or behind a cycle
+        remaining = list(in_degree)
+        queue = deque([start] if remaining[start] == 0 else [])
+        resolved = 0
+        while queue:
+            source = queue.popleft()
+            resolved += 1
+            for target in self.successors[source]:
+                remaining[target] -= 1
+                if remaining[target] == 0:
+                    queue.append(target)
+
+        cycle_node = None
+        if resolved < sum(reachable):
+            cycle_node = next(
+                self.node_ids[i] for i, count in enumerate(remaining) if reachable[i] and count > 0
+            )
+
+        self._plans[start] = (in_degree, cycle_node)
+        return self._plans[start]
+
+    def route(self, index: int, result: Any, context: Any) -> List[bool]:
+        """
+        Which outgoing edges of a finished node fire.
+
+        Args:
+            index: Index of the finished node
+            result: Node result (for result.* and success/failure conditions)
+            context: Execution context (for state.* and expression conditions)
+
+        Returns:
+            One flag per outgoing edge, in successors[index] order
+        """
+        conditions = self.conditions[index]
+        if self.exclusive[index]:
+            fired = [False] * len(conditions)
+            for position, condition in enumerate(conditions):
+                if condition is not None and condition(result, context):
+                    fired[position] = True
+                    return fired
+            # No condition matched, use the first default edge
+            for position, condition in enumerate(conditions):
+                if condition is None:
+                    fired[position] = True
+                    break
+            return fired
+        return [condition is None or condition(result, context) for condition in conditions]
+
+
+def compile_graph(graph: WorkflowGraph) -> CompiledGraph:
+    """Compile a workflow graph for the ready-queue scheduler."""
+    return CompiledGraph(graph)
@@ -4,12 +4,22 @@ Workflow Engine
 Executes graph-based agent workflows with conditional routing and parallel execution.
 Implements state machine patterns inspired by LangGraph.
 
+Graphs are compiled (see workflow_compiler) and run by an iterative
+ready-queue scheduler: a node becomes ready when all of its reachable
+predecessors have finished, ready nodes run concurrently up to
+max_parallel_branches, and nodes with several incoming edges join the
+branches that lead into them. Checkpoints record the scheduler frontier
+(finished nodes and the edges they fired), from which resume rebuilds
+the ready queue.
+
 Based on Section 3.3.2 of agent-runtime-layer-specification-v1.2-final-ASCII.md
 """
 
 import asyncio
 import logging
-from typing import Dict, Any, Optional, List, Callable, Set
+from collections import deque
+from itertools import repeat
+from typing import Dict, Any, Optional, List, Callable, Set, Tuple
 from datetime import datetime, timezone
 from dataclasses import dataclass, field
 from enum import Enum
@@ -22,6 +32,15 @@ from ..models.workflow_models import (
     NodeType,
     ExecutionStatus,
 )
+from .workflow_compiler import CompiledGraph, compile_condition, compile_graph
+from .workflow_checkpoint import (
+    CheckpointLog,
+    GraphStore,
+    TrackedState,
+    graph_hash,
+    graph_key,
+    replay,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -46,6 +65,11 @@ class ExecutionContext:
     depth: int = 0
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    # Compiled form of graph, shared with parallel branches
+    compiled: Optional[CompiledGraph] = None
+    # Nodes the workflow's scheduler finished, in order, with the
+    # outgoing edges each fired (the resume frontier)
+    finished: List[Tuple[str, List[bool]]] = field(default_factory=list)
 
 
 class WorkflowEngine:
@@ -68,9 +92,11 @@ class WorkflowEngine:
         Args:
             config: Configuration dict with:
                 - max_graph_depth: Maximum graph depth
-                - max_parallel_branches: Maximum parallel branches
+                - max_parallel_branches: Maximum parallel branches (also the
+                  number of nodes the scheduler runs concurrently)
                 - cycle_detection: Enable cycle detection
                 - checkpoint_on_node_complete: Checkpoint after each node
+                - checkpoint_compact_every: Node deltas between full snapshots
                 - timeout_seconds: Workflow timeout
         """
         self.config = config or {}
@@ -82,6 +108,7 @@ class WorkflowEngine:
         self.checkpoint_on_node_complete = self.config.get(
             "checkpoint_on_node_complete", True
         )
+        self.checkpoint_compact_every = self.config.get("checkpoint_compact_every", 50)
         self.workflow_timeout = self.config.get("timeout_seconds", 3600)
 
         # Node handlers: node_type -> callable
@@ -90,6 +117,10 @@ class WorkflowEngine:
         # Active executions: workflow_id -> ExecutionContext
         self._active_executions: Dict[str, ExecutionContext] = {}
 
+        # Incremental checkpoints: workflow_id -> CheckpointLog
+        self._checkpoint_logs: Dict[str, CheckpointLog] = {}
+        self._graph_store = GraphStore()
+
         # Dependencies (to be injected)
         self._agent_executor = None
         self._state_manager = None
@@ -164,7 +195,7 @@ class WorkflowEngine:
         context = ExecutionContext(
             workflow_id=workflow_id,
             graph=graph,
-            state=initial_state or {},
+            state=TrackedState(initial_state or {}),
             started_at=datetime.now(timezone.utc),
         )
 
@@ -202,6 +233,7 @@ class WorkflowEngine:
         finally:
             if workflow_id in self._active_executions:
                 del self._active_executions[workflow_id]
+            self._checkpoint_logs.pop(workflow_id, None)
 
     async def _execute_graph(
         self,
@@ -224,11 +256,260 @@ class WorkflowEngine:
                 message="No entry node found in graph"
             )
 
-        # Execute from entry node
-        await self._execute_node(entry_node, context)
+        # Execute from entry node; a resumed context continues from its frontier
+        await self._execute_compiled(context, entry_node, frontier=context.finished)
 
         return context.state
 
+    async def _execute_compiled(
+        self,
+        context: ExecutionContext,
+        start_node_id: str,
+        frontier: Optional[List[Tuple[str, List[bool]]]] = None
+    ) -> Any:
+        """
+        Compile the context's graph and run it from a start node.
+
+        Parallel nodes run each branch through here as well, reusing the
+        graph compiled for the workflow.
+
+        Args:
+            context: Execution context
+            start_node_id: Node to start from
+            frontier: Finished nodes and their fired edges; entries already
+                in it are replayed instead of run, and nodes finished by
+                this run are appended (see _schedule)
+
+        Returns:
+            Result of the last node that ended a path
+        """
+        compiled = context.compiled
+        if compiled is None or compiled.graph is not context.graph:
+            try:
+                compiled = compile_graph(context.graph)
+            except ValueError as e:
+                raise WorkflowError(code="E2012", message=str(e))
+            context.compiled = compiled
+
+        start = compiled.index.get(start_node_id)
+        if start is None:
+            raise WorkflowError(
+                code="E2012",
+                message=f"Node {start_node_id} not found in graph"
+            )
+
+        in_degree, cycle_node = compiled.plan(start)
+        if cycle_node is not None:
+            if self.cycle_detection:
+                logger.warning(f"Cycle detected at node {cycle_node}")
+                raise WorkflowError(
+                    code="E2010",
+                    message=f"Graph cycle detected at node {cycle_node}"
+                )
+            # Joins cannot be counted on cyclic graphs; run them step by step
+            return await self._execute_node(start_node_id, context)
+
+        return await self._schedule(compiled, start, in_degree, context, frontier)
+
+    async def _schedule(
+        self,
+        compiled: CompiledGraph,
+        start: int,
+        in_degree: List[int],
+        context: ExecutionContext,
+        frontier: Optional[List[Tuple[str, List[bool]]]] = None
+    ) -> Any:
+        """
+        Run a compiled acyclic graph with a ready queue.
+
+        Each node counts its unresolved incoming edges; when the count
+        reaches zero the node is queued if at least one of those edges
+        fired and skipped otherwise. Up to max_parallel_branches nodes run
+        concurrently; a lone ready node runs inline without a task.
+
+        When resuming, frontier holds the nodes a previous run finished.
+        Releasing their recorded edges in finishing order rebuilds the
+        pending counts, arrivals and depths of that run, and the ready
+        queue is what is left once the finished nodes are taken out.
+
+        Args:
+            compiled: Compiled graph
+            start: Index of the start node
+            in_degree: In-degrees of the subgraph reachable from start
+            context: Execution context
+            frontier: Finished nodes to replay; nodes finished by this run
+                are appended before their checkpoint
+
+        Returns:
+            Result of the last node none of whose outgoing edges fired
+        """
+        pending = list(in_degree)
+        arrived = [False] * len(pending)
+        # Longest chain of executed ancestors per node (for max_graph_depth)
+        depths = [0] * len(pending)
+        depths[start] = context.depth
+
+        ready = deque([start])
+        running: Dict[asyncio.Task, int] = {}
+        last_result = None
+
+        def finish(index: int, outcome: Tuple[Any, List[bool]]) -> None:
+            """Record a finished node's result and release its edges."""
+            nonlocal last_result
+            result, fired = outcome
+            if not any(fired):
+                last_result = result
+            release(index, fired)
+
+        def release(index: int, fired) -> None:
+            """Resolve a finished or skipped node's outgoing edges."""
+            stack = [(index, fired)]
+            while stack:
+                source, fired = stack.pop()
+                for target, hit in zip(compiled.successors[source], fired):
+                    if hit:
+                        arrived[target] = True
+                        depths[target] = max(depths[target], depths[source] + 1)
+                    pending[target] -= 1
+                    if pending[target] == 0:
+                        if arrived[target]:
+                            ready.append(target)
+                        else:
+                            stack.append((target, repeat(False)))
+
+        if frontier:
+            # Depths are rebuilt from the start node, not the restored maximum
+            depths[start] = 0
+            done = set()
+            for node_id, fired in frontier:
+                index = compiled.index[node_id]
+                done.add(index)
+                release(index, fired)
+            remaining = [index for index in ready if index not in done]
+            ready.clear()
+            ready.extend(remaining)
+
+        try:
+            while ready or running:
+                if not running and len(ready) == 1:
+                    index = ready.popleft()
+                    finish(index, await self._run_compiled_node(
+                        compiled, index, depths[index], context, frontier
+                    ))
+                    continue
+
+                while ready and len(running) < self.max_parallel_branches:
+                    index = ready.popleft()
+                    task = asyncio.create_task(
+                        self._run_compiled_node(compiled, index, depths[index], context, frontier)
+                    )
+                    running[task] = index
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in sorted(done, key=running.get):
+                    index = running.pop(task)
+                    finish(index, task.result())
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return last_result
+
+    async def _run_compiled_node(
+        self,
+        compiled: CompiledGraph,
+        index: int,
+        depth: int,
+        context: ExecutionContext,
+        frontier: Optional[List[Tuple[str, List[bool]]]] = None
+    ) -> Tuple[Any, List[bool]]:
+        """
+        Execute one node of a compiled graph.
+
+        The handler gets its own ExecutionContext (sharing the workflow's
+        state, visited nodes and path) so that concurrent branches do not
+        see each other's depth.
+
+        Args:
+            compiled: Compiled graph
+            index: Node index
+            depth: Number of executed ancestors on the longest path to the node
+            context: Workflow execution context
+            frontier: List the node and its fired edges are appended to
+
+        Returns:
+            Node result and which of its outgoing edges fired
+        """
+        if depth >= self.max_graph_depth:
+            raise WorkflowError(
+                code="E2011",
+                message=f"Max graph depth ({self.max_graph_depth}) exceeded"
+            )
+
+        node = compiled.nodes[index]
+        node_id = node.node_id
+
+        if self.cycle_detection and node_id in context.visited_nodes:
+            logger.warning(f"Cycle detected at node {node_id}")
+            raise WorkflowError(
+                code="E2010",
+                message=f"Graph cycle detected at node {node_id}"
+            )
+
+        handler = self._node_handlers.get(node.node_type.value)
+        if not handler:
+            raise WorkflowError(
+                code="E2012",
+                message=f"No handler for node type {node.node_type.value}"
+            )
+
+        context.visited_nodes.add(node_id)
+        context.execution_path.append(node_id)
+        context.depth = max(context.depth, depth + 1)
+        node_context = self._branch_context(context, depth + 1)
+
+        logger.debug(f"Executing node {node_id} (type={node.node_type.value})")
+
+        try:
+            result = await handler(node, node_context)
+        except WorkflowError:
+            raise
+        except Exception as e:
+            logger.error(f"Node {node_id} execution failed: {e}")
+            raise WorkflowError(
+                code="E2012",
+                message=f"Node execution failed: {str(e)}"
+            )
+
+        fired = compiled.route(index, result, node_context)
+        if frontier is not None:
+            frontier.append((node_id, fired))
+
+        if self.checkpoint_on_node_complete and self._state_manager:
+            await self._checkpoint_workflow(node_context)
+
+        return result, fired
+
+    def _branch_context(
+        self,
+        context: ExecutionContext,
+        depth: int
+    ) -> ExecutionContext:
+        """Execution context of one branch, sharing the workflow's state."""
+        return ExecutionContext(
+            workflow_id=context.workflow_id,
+            graph=context.graph,
+            state=context.state,
+            visited_nodes=context.visited_nodes,
+            execution_path=context.execution_path,
+            depth=depth,
+            started_at=context.started_at,
+            compiled=context.compiled,
+            finished=context.finished,
+        )
+
     async def _execute_node(
         self,
         node_id: str,
@@ -384,180 +665,7 @@ class WorkflowEngine:
         Returns:
             True if condition is met
         """
-        try:
-            # Simple boolean conditions
-            if condition == "success":
-                if isinstance(result, dict):
-                    return result.get("success", True)
-                return bool(result)
-            elif condition == "failure":
-                if isinstance(result, dict):
-                    return not result.get("success", True)
-                return not bool(result)
-            elif condition == "always":
-                return True
-            elif condition == "never":
-                return False
-
-            # State-based conditions: state.key == value
-            if condition.startswith("state."):
-                return self._evaluate_state_condition(condition, context.state)
-
-            # Result-based conditions: result.key == value
-            if condition.startswith("result."):
-                return self._evaluate_result_condition(condition, result)
-
-            # Expression-based condition (safe evaluation)
-            return self._evaluate_expression(condition, result, context)
-
-        except Exception as e:
-            logger.warning(f"Condition evaluation failed: {condition}, error: {e}")
-            return False
-
-    def _evaluate_state_condition(
-        self,
-        condition: str,
-        state: Dict[str, Any]
-    ) -> bool:
-        """Evaluate state-based condition."""
-        # Parse condition: state.key op value
-        import re
-
-        # Match patterns like: state.key == "value" or state.key > 10
-        pattern = r'state\.(\w+(?:\.\w+)*)\s*(==|!=|>|<|>=|<=|in)\s*(.+)'
-        match = re.match(pattern, condition)
-
-        if not match:
-            return False
-
-        key_path, operator, value_str = match.groups()
-
-        # Get value from state using dot notation
-        current = state
-        for key in key_path.split('.'):
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            else:
-                return False
-
-        # Parse the comparison value
-        try:
-            # Try to evaluate as Python literal
-            import ast
-            target_value = ast.literal_eval(value_str.strip())
-        except (ValueError, SyntaxError):
-            target_value = value_str.strip().strip('"\'')
-
-        # Perform comparison
-        if operator == "==":
-            return current == target_value
-        elif operator == "!=":
-            return current != target_value
-        elif operator == ">":
-            return current > target_value
-        elif operator == "<":
-            return current < target_value
-        elif operator == ">=":
-            return current >= target_value
-        elif operator == "<=":
-            return current <= target_value
-        elif operator == "in":
-            return current in target_value
-
-        return False
-
-    def _evaluate_result_condition(
-        self,
-        condition: str,
-        result: Any
-    ) -> bool:
-        """Evaluate result-based condition."""
-        import re
-
-        pattern = r'result\.(\w+(?:\.\w+)*)\s*(==|!=|>|<|>=|<=|in)\s*(.+)'
-        match = re.match(pattern, condition)
-
-        if not match:
-            return False
-
-        key_path, operator, value_str = match.groups()
-
-        # Get value from result
-        if not isinstance(result, dict):
-            return False
-
-        current = result
-        for key in key_path.split('.'):
-            if isinstance(current, dict) and key in current:
-                current = current[key]
-            else:
-                return False
-
-        try:
-            import ast
-            target_value = ast.literal_eval(value_str.strip())
-        except (ValueError, SyntaxError):
-            target_value = value_str.strip().strip('"\'')
-
-        if operator == "==":
-            return current == target_value
-        elif operator == "!=":
-            return current != target_value
-        elif operator == ">":
-            return current > target_value
-        elif operator == "<":
-            return current < target_value
-        elif operator == ">=":
-            return current >= target_value
-        elif operator == "<=":
-            return current <= target_value
-        elif operator == "in":
-            return current in target_value
-
-        return False
-
-    def _evaluate_expression(
-        self,
-        condition: str,
-        result: Any,
-        context: ExecutionContext
-    ) -> bool:
-        """Safely evaluate an expression condition."""
-        # Build a safe evaluation context
-        safe_context = {
-            "result": result if isinstance(result, dict) else {"value": result},
-            "state": context.state,
-            "depth": context.depth,
-            "visited_count": len(context.visited_nodes),
-            "True": True,
-            "False": False,
-            "None": None,
-        }
-
-        # Only allow safe operations
-        allowed_names = set(safe_context.keys())
-
-        try:
-            import ast
-
-            # Parse the expression
-            tree = ast.parse(condition, mode='eval')
-
-            # Check for unsafe operations
-            for node in ast.walk(tree):
-                if isinstance(node, ast.Name) and node.id not in allowed_names:
-                    # Allow checking dict keys
-                    pass
-                elif isinstance(node, (ast.Call, ast.Import, ast.ImportFrom)):
-                    # Disallow function calls and imports
-                    return False
-
-            # Evaluate safely
-            code = compile(tree, '<condition>', 'eval')
-            return bool(eval(code, {"__builtins__": {}}, safe_context))
-
-        except Exception:
-            return False
+        return compile_condition(condition)(result, context)
 
     async def _execute_agent_node(
         self,
@@ -764,9 +872,9 @@ class WorkflowEngine:
                 message=f"Parallel branch limit ({self.max_parallel_branches}) exceeded"
             )
 
-        # Execute children in parallel
+        # Run each child's subgraph through the scheduler, each branch with its own depth
         tasks = [
-            self._execute_node(child_id, context)
+            self._execute_compiled(self._branch_context(context, context.depth), child_id)
             for child_id in child_nodes
         ]
 
@@ -801,29 +909,59 @@ class WorkflowEngine:
         self,
         context: ExecutionContext
     ) -> None:
-        """Save workflow checkpoint with graph for recovery"""
+        """
+        Save workflow checkpoint for recovery.
+
+        The first checkpoint of a run, and every checkpoint_compact_every
+        nodes after it, is a full snapshot referencing the graph by content
+        hash; the others append the node's state delta to the snapshot's
+        log (see workflow_checkpoint) and refresh the TTL of the snapshot
+        and graph. A delta that cannot be appended is replaced by a new
+        snapshot.
+        """
         if not self._state_manager:
             return
 
         try:
-            # Serialize graph for recovery
-            graph_data = self._serialize_graph(context.graph)
+            log = self._checkpoint_logs.get(context.workflow_id)
+            if log is None:
+                graph_data = self._serialize_graph(context.graph)
+                log = CheckpointLog(
+                    context.workflow_id,
+                    graph_hash(graph_data),
+                    self.checkpoint_compact_every,
+                )
+                self._checkpoint_logs[context.workflow_id] = log
+
+            if not log.needs_snapshot() and isinstance(context.state, TrackedState):
+                # Keep the snapshot and graph alive as long as the log
+                appended = await self._state_manager.append_hot_log(
+                    log.log_id,
+                    log.delta(context),
+                    refresh_state=[context.workflow_id, graph_key(log.graph_digest)],
+                )
+                if appended:
+                    return
+                # A lost delta would leave a gap in the log; snapshot instead
 
-            checkpoint_data = {
-                "workflow_id": context.workflow_id,
-                "state": context.state,
-                "visited_nodes": list(context.visited_nodes),
-                "execution_path": context.execution_path,
-                "depth": context.depth,
-                "graph": graph_data,
-                "checkpoint_time": datetime.now(timezone.utc).isoformat(),
-            }
+            # Built before any await so that concurrent nodes append to the new log
+            snapshot, stale_log = log.snapshot(context)
+
+            if self._graph_store.needs_store(log.graph_digest):
+                await self._state_manager.save_hot_state(
+                    agent_id=graph_key(log.graph_digest),
+                    state_data={"graph": self._serialize_graph(context.graph)}
+                )
+                self._graph_store.mark_stored(log.graph_digest)
 
             await self._state_manager.save_hot_state(
                 agent_id=context.workflow_id,
-                state_data=checkpoint_data
+                state_data=snapshot
             )
 
+            if stale_log:
+                await self._state_manager.delete_hot_log(stale_log)
+
         except Exception as e:
             logger.warning(f"Failed to checkpoint workflow: {e}")
 
@@ -927,6 +1065,11 @@ class WorkflowEngine:
             # Reconstruct context
             checkpoint_data = snapshot if isinstance(snapshot, dict) else snapshot.context
 
+            # Replay node deltas written after the snapshot
+            if checkpoint_data.get("log"):
+                deltas = await self._state_manager.load_hot_log(checkpoint_data["log"])
+                checkpoint_data = replay(checkpoint_data, deltas)
+
             # Find the last executed node
             execution_path = checkpoint_data.get("execution_path", [])
             if not execution_path:
@@ -948,33 +1091,55 @@ class WorkflowEngine:
                     message="Cannot resume: graph not found in checkpoint"
                 )
 
+            # Nodes that started but did not finish run again, so only
+            # finished nodes count as visited
+            finished = [(node_id, list(fired)) for node_id, fired in checkpoint_data.get("finished", [])]
+            visited_nodes = (
+                {node_id for node_id, _ in finished} if finished
+                else set(checkpoint_data.get("visited_nodes", []))
+            )
+
             # Create execution context from checkpoint
             context = ExecutionContext(
                 workflow_id=workflow_id,
                 graph=graph,
-                state=checkpoint_data.get("state", {}),
-                visited_nodes=set(checkpoint_data.get("visited_nodes", [])),
+                state=TrackedState(checkpoint_data.get("state", {})),
+                visited_nodes=visited_nodes,
                 execution_path=execution_path.copy(),
                 depth=checkpoint_data.get("depth", 0),
                 started_at=datetime.now(timezone.utc),
+                finished=finished,
             )
 
             self._active_executions[workflow_id] = context
 
-            # Find the resume node (next node after last executed)
-            resume_node = await self._find_resume_node(context, execution_path)
+            graph_ref = checkpoint_data.get("graph")
+            self._checkpoint_logs[workflow_id] = CheckpointLog(
+                workflow_id,
+                graph_ref["hash"] if isinstance(graph_ref, dict) and "hash" in graph_ref
+                else graph_hash(self._serialize_graph(graph)),
+                self.checkpoint_compact_every,
+                previous_log=checkpoint_data.get("log"),
+            )
+
+            if finished:
+                # Rebuild the ready queue from the scheduler frontier
+                run = self._execute_graph(context)
+            else:
+                # Checkpoints without a frontier (older checkpoints, cyclic
+                # graphs) continue after the last executed node
+                resume_node = await self._find_resume_node(context, execution_path)
+
+                if not resume_node:
+                    # No more nodes to execute, workflow was already complete
+                    logger.info(f"Workflow {workflow_id} was already complete")
+                    return checkpoint_data.get("state", {})
 
-            if not resume_node:
-                # No more nodes to execute, workflow was already complete
-                logger.info(f"Workflow {workflow_id} was already complete")
-                return checkpoint_data.get("state", {})
+                run = self._execute_from_node(context, resume_node)
 
             try:
-                # Continue execution from resume node
-                result = await asyncio.wait_for(
-                    self._execute_from_node(context, resume_node),
-                    timeout=self.workflow_timeout
-                )
+                # Continue execution
+                result = await asyncio.wait_for(run, timeout=self.workflow_timeout)
 
                 context.completed_at = datetime.now(timezone.utc)
 
@@ -988,6 +1153,7 @@ class WorkflowEngine:
             finally:
                 if workflow_id in self._active_executions:
                     del self._active_executions[workflow_id]
+                self._checkpoint_logs.pop(workflow_id, None)
 
         except WorkflowError:
             raise
@@ -1016,6 +1182,10 @@ class WorkflowEngine:
         # Check if graph is embedded in checkpoint
         graph_data = checkpoint_data.get("graph")
 
+        # Incremental checkpoints reference the graph by content hash
+        if isinstance(graph_data, dict) and "hash" in graph_data and "nodes" not in graph_data:
+            graph_data = await self._load_stored_graph(graph_data["hash"])
+
         if graph_data:
             # Reconstruct from embedded graph data
             try:
@@ -1064,6 +1234,26 @@ class WorkflowEngine:
 
         return None
 
+    async def _load_stored_graph(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Serialized graph stored under a content hash, or None."""
+        if not self._state_manager:
+            return None
+
+        try:
+            stored = await self._state_manager.load_hot_state(graph_key(digest))
+        except Exception as e:
+            logger.warning(f"Failed to load graph {digest}: {e}")
+            return None
+
+        if not stored or "graph" not in stored:
+            return None
+
+        if graph_hash(stored["graph"]) != digest:
+            logger.warning(f"Stored graph {digest} does not match its hash")
+            return None
+
+        return stored["graph"]
+
     async def _find_resume_node(
         self,
         context: ExecutionContext,
@@ -1072,6 +1262,10 @@ class WorkflowEngine:
         """
         Find the node to resume execution from.
 
+        Only used for checkpoints without a scheduler frontier: it follows
+        a single successor of the last executed node, so it cannot resume
+        branches of a fan-out that had not run yet.
+
         Args:
             context: Execution context
             execution_path: Executed nodes path
@@ -1130,11 +1324,7 @@ class WorkflowEngine:
         """
         logger.info(f"Executing workflow from node {start_node_id}")
 
-        # Reset visited nodes for the new execution path
-        # Keep the nodes that were already visited before checkpoint
-        # but allow revisiting if needed for the new execution
-
-        await self._execute_node(start_node_id, context)
+        await self._execute_compiled(context, start_node_id)
 
         return context.state
 
@@ -1168,6 +1358,7 @@ class WorkflowEngine:
 
         # Remove from active executions
         del self._active_executions[workflow_id]
+        self._checkpoint_logs.pop(workflow_id, None)
 
         return True
 
@@ -1236,5 +1427,6 @@ class WorkflowEngine:
         finally:
             # Force clear even on timeout
             self._active_executions.clear()
+            self._checkpoint_logs.clear()
             self._node_handlers.clear()
         logger.info("WorkflowEngine cleanup complete")
@@ -6,10 +6,12 @@ Basic tests for fleet scaling and warm pool operations.
 
 import pytest
 import asyncio
+from unittest.mock import MagicMock
 
 from ..services.fleet_manager import FleetManager, ScalingDecision
-from ..services.warm_pool_manager import WarmPoolManager
-from ..models import AgentConfig, TrustLevel, ResourceLimits
+from ..services.warm_pool_manager import WarmPoolManager, WarmPoolError
+from ..services.warm_pool_forecast import WarmPoolPlanner, replay_trace
+from ..models import AgentConfig, AgentState, SpawnResult, TrustLevel, ResourceLimits
 from ..models.fleet_models import ScalingMetrics
 
 
@@ -159,3 +161,89 @@ async def test_warm_pool_cache_key_generation(warm_pool_manager):
     """Test warm pool manager configuration"""
     assert warm_pool_manager.pool_size == 3
     assert warm_pool_manager.max_instance_age == 300
+
+
+def test_warm_pool_planner_sizes_by_forecast():
+    """Test planner gives warm instances to the class with the highest miss cost"""
+    planner = WarmPoolPlanner({
+        "runtime_classes": ["runc", "kata"],
+        "cold_start_seconds": {"runc": 1.0, "kata": 10.0},
+        "min_size": 1,
+        "max_size": 20,
+        "max_total_size": 8,
+    })
+    # Same arrival rate for both classes: 1 spawn per second
+    start = 1_700_000_000.0
+    for i in range(300):
+        planner.record_spawn("runc", warm=True, timestamp=start + i)
+        planner.record_spawn("kata", warm=True, timestamp=start + i)
+
+    targets = planner.plan(now=start + 300)
+
+    assert sum(targets.values()) == 8
+    assert targets["kata"] > targets["runc"] >= 1
+
+    # Idle-cost cap limits the pool below max_total_size
+    planner.max_idle_cost = 3.0
+    assert sum(planner.plan(now=start + 300).values()) == 3
+
+
+def test_warm_pool_replay_trace():
+    """Test replaying a spawn trace against fixed and predictive pools"""
+    start = 1_700_000_000.0
+    # Quiet minute, then a 20-spawn burst every 5 minutes
+    events = []
+    for cycle in range(12):
+        base = start + cycle * 300
+        events += [(base + i * 30, "gvisor") for i in range(10)]
+        events += [(base + 290 + i * 0.5, "gvisor") for i in range(20)]
+    config = {"runtime_classes": ["gvisor"], "season_seconds": 300, "max_size": 30}
+
+    fixed = replay_trace(events, WarmPoolPlanner(config), {"gvisor": 5.0}, fixed_size=2)
+    predictive = replay_trace(events, WarmPoolPlanner(config), {"gvisor": 5.0})
+
+    assert fixed.spawns == predictive.spawns == len(events)
+    assert predictive.warm_hit_ratio > fixed.warm_hit_ratio
+    assert predictive.p99_latency_seconds <= fixed.p99_latency_seconds
+
+
+@pytest.mark.asyncio
+async def test_warm_pool_allocation_per_runtime_class():
+    """Test allocation takes an instance of the requested runtime class"""
+    lifecycle = MagicMock()
+    spawned = []
+
+    async def spawn(config):
+        spawned.append(config.trust_level)
+        return SpawnResult(
+            agent_id=f"{config.agent_id}-{len(spawned)}",
+            session_id="s",
+            state=AgentState.RUNNING,
+            sandbox_type="runc",
+        )
+
+    lifecycle.spawn = spawn
+    manager = WarmPoolManager(config={
+        "size": 2,
+        "runtime_class": "gvisor",
+        "runtime_classes": ["gvisor", "kata"],
+        "forecast": {"min_size": 1},
+    })
+    manager._lifecycle_manager = lifecycle
+    await manager._fill_pool()
+
+    assert manager._class_size("gvisor") == 2
+    assert manager._class_size("kata") == 1
+    assert TrustLevel.UNTRUSTED in spawned
+
+    instance = await manager.allocate_instance(
+        AgentConfig(agent_id="a1", trust_level=TrustLevel.UNTRUSTED)
+    )
+    assert instance.runtime_class == "kata"
+
+    with pytest.raises(WarmPoolError):
+        await manager.allocate_instance(AgentConfig(agent_id="a2", trust_level=TrustLevel.UNTRUSTED))
+
+    stats = (await manager.get_pool_status())["forecast"]["classes"]["kata"]
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
@@ -224,3 +224,54 @@ async def test_parse_memory_limit(resource_manager):
     assert resource_manager._parse_memory_to_mb("512Mi") == 512.0
     assert resource_manager._parse_memory_to_mb("2G") == 2000.0
     assert resource_manager._parse_memory_to_mb("256M") == 256.0
+
+
+@pytest.mark.asyncio
+async def test_container_stats_pushed_to_quota(resource_manager, tmp_path):
+    """Test cgroup samples reach the quota without polling"""
+    from ..backends.container_stats import ContainerStatsCollector
+
+    container_id = "c" * 64
+    (tmp_path / "cgroup.controllers").write_text("cpu memory\n")
+    cgroup = tmp_path / "docker" / container_id
+    cgroup.mkdir(parents=True)
+    (cgroup / "cpu.stat").write_text("usage_usec 2500000\nuser_usec 2000000\n")
+    (cgroup / "memory.current").write_text(str(1500 * 1024 * 1024))
+    (cgroup / "memory.max").write_text(str(3000 * 1024 * 1024))
+
+    await resource_manager.initialize()
+    await resource_manager.create_quota(agent_id="test-agent-1")
+
+    collector = ContainerStatsCollector(config={
+        "source": "cgroup",
+        "interval_seconds": 0.01,
+        "cgroup_root": str(tmp_path),
+    })
+    collector.subscribe(resource_manager.on_container_stats)
+    await collector.start()
+    collector.track(container_id, "test-agent-1")
+
+    try:
+        for _ in range(100):
+            if await resource_manager.get_agent_metrics("test-agent-1"):
+                break
+            await asyncio.sleep(0.01)
+
+        sample = collector.get(container_id)
+        assert sample.source == "cgroup"
+        assert sample.cpu_seconds == 2.5
+        assert sample.memory_mb == 1500
+        usage = sample.to_resource_usage()
+        assert usage.memory_peak_mb == 1500
+
+        metrics = await resource_manager.get_agent_metrics("test-agent-1")
+        assert metrics["memory_percent"] == 50.0
+
+        # Over the 1Gi limit: pushed into the quota as it was sampled
+        quota = await resource_manager.get_quota("test-agent-1")
+        assert quota.usage.memory_peak_mb == 1500
+        assert quota.usage.cpu_seconds == 0.0
+    finally:
+        await collector.stop()
+
+    assert collector.get(container_id) is None
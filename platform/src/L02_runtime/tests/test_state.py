@@ -149,3 +149,119 @@ async def test_session_cleanup(session_bridge):
 
     assert len(session_bridge._sessions) == 0
     assert len(session_bridge._heartbeat_tasks) == 0
+
+
+def test_checkpoint_chunks_round_trip():
+    """Test chunked checkpoints deduplicate and restore byte-exact"""
+    from collections import OrderedDict
+    from ..services.checkpoint_pipeline import ChunkCodec, encode_checkpoint, encode_json, split_chunks
+
+    messages = [{"role": "user", "content": ", ".join(str(i * j) for j in range(200))} for i in range(50)]
+    first = encode_json({"step": 1, "messages": messages})
+    second = encode_json({"step": 2, "messages": messages + [{"role": "tool", "content": "done"}]})
+    assert b"".join(split_chunks(first)) == first
+
+    codec = ChunkCodec("zstd")
+    known = OrderedDict()
+    store = {}
+    for raw in (first, second):
+        encoded = encode_checkpoint(raw, codec, known)
+        for chunk in encoded.new_chunks:
+            store[chunk.chunk_hash] = chunk
+            known[chunk.chunk_hash] = (0.0, len(chunk.data))
+        restored = b"".join(
+            codec.decompress(store[h].codec, store[h].dict_id, store[h].data)
+            for h in encoded.chunk_hashes
+        )
+        assert restored == raw
+
+    # The shared message prefix is stored once
+    assert len(encoded.new_chunks) < len(encoded.chunk_hashes)
+
+
+class FakeCheckpointDB:
+    """Pool and connection storing checkpoint chunks and rows in dicts; writes
+    of a transaction are applied when it commits"""
+
+    def __init__(self, failures=0):
+        self.chunks = {}
+        self.checkpoints = {}
+        self.failures = failures
+        self._writes = None
+
+    def acquire(self):
+        db = self
+
+        class Acquire:
+            async def __aenter__(self):
+                return db
+
+            async def __aexit__(self, *exc):
+                return False
+
+        return Acquire()
+
+    def transaction(self):
+        db = self
+
+        class Transaction:
+            async def __aenter__(self):
+                db._writes = ({}, {})
+
+            async def __aexit__(self, exc_type, *exc):
+                if exc_type is None:
+                    db.chunks.update(db._writes[0])
+                    db.checkpoints.update(db._writes[1])
+                return False
+
+        return Transaction()
+
+    async def executemany(self, sql, args):
+        if "checkpoint_chunks" in sql:
+            self._writes[0].update((a[0], a) for a in args)
+            return
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("connection reset")
+        self._writes[1].update((a[0], a) for a in args)
+
+    async def fetch(self, sql, hashes):
+        return [{"chunk_hash": h} for h in hashes if h in self.chunks or h in self._writes[0]]
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_pipeline_reencodes_missing_chunks():
+    """Test a checkpoint whose referenced chunks are missing is re-sent in full"""
+    from ..services.checkpoint_pipeline import CheckpointPipeline, encode_json
+
+    db = FakeCheckpointDB()
+    pipeline = CheckpointPipeline(db, compression="gzip", batch_interval_ms=1)
+    await pipeline.start()
+    raw = encode_json({"messages": [", ".join(str(i * j) for j in range(300)) for i in range(20)]})
+
+    await pipeline.submit("cp-1", "agent", "session", "running", raw, {})
+    # Lose the stored chunks; the next checkpoint only references them
+    db.chunks.clear()
+    await pipeline.submit("cp-2", "agent", "session", "running", raw, {})
+    await pipeline.submit("cp-3", "other", "session", "running", b'{"small": true}', {})
+    await pipeline.stop()
+
+    assert set(db.checkpoints) == {"cp-1", "cp-2", "cp-3"}
+    assert all(h in db.chunks for h in db.checkpoints["cp-2"][7])
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_pipeline_retries_failed_batch():
+    """Test write-behind checkpoints of a failed batch are committed on retry"""
+    from ..services.checkpoint_pipeline import CheckpointPipeline
+
+    db = FakeCheckpointDB(failures=2)
+    pipeline = CheckpointPipeline(db, compression="gzip", batch_interval_ms=1, retry_delay_ms=1)
+    await pipeline.start()
+
+    await pipeline.submit("cp-1", "agent", "session", "running", b'{"step": 1}', {}, wait=False)
+    await pipeline.stop()
+
+    assert "cp-1" in db.checkpoints
+    assert pipeline.pending("cp-1") is None
+    assert pipeline.get_stats()["failures"] == 0
@@ -204,3 +204,135 @@ async def test_cleanup(workflow_engine):
     await workflow_engine.cleanup()
 
     assert len(workflow_engine._active_executions) == 0
+
+
+def _graph(graph_id, nodes, edges, entry):
+    """Build a graph from (node_id, node_type) pairs and (source, target, condition) triples."""
+    graph = WorkflowGraph(graph_id=graph_id, name=graph_id, entry_node=entry)
+    for node_id, node_type in nodes:
+        graph.nodes[node_id] = WorkflowNode(node_id=node_id, node_type=node_type, name=node_id)
+    for source, target, condition in edges:
+        graph.edges.append(WorkflowEdge(source=source, target=target, condition=condition))
+    return graph
+
+
+@pytest.mark.asyncio
+async def test_fan_out_and_join(workflow_engine):
+    """Test branches fan out concurrently and the join runs once after all of them"""
+    await workflow_engine.initialize()
+
+    order = []
+
+    async def record(node, context):
+        order.append(node.node_id)
+        context.state[node.node_id] = True
+        return {"success": True}
+
+    workflow_engine.register_node_handler("agent", record)
+
+    graph = _graph(
+        "diamond",
+        [("split", NodeType.AGENT), ("a", NodeType.AGENT), ("b", NodeType.AGENT),
+         ("join", NodeType.AGENT), ("end", NodeType.END)],
+        [("split", "a", ""), ("split", "b", ""), ("a", "join", ""),
+         ("b", "join", ""), ("join", "end", "")],
+        "split",
+    )
+
+    result = await workflow_engine.execute_workflow("diamond-workflow", graph)
+
+    assert order[0] == "split"
+    assert sorted(order[1:3]) == ["a", "b"]
+    assert order[3:] == ["join"]
+    assert result["a"] and result["b"] and result["join"]
+
+
+@pytest.mark.asyncio
+async def test_conditional_branch_skipped_at_join(workflow_engine):
+    """Test a join waits only for the branch the conditional node took"""
+    await workflow_engine.initialize()
+
+    graph = _graph(
+        "conditional-diamond",
+        [("check", NodeType.CONDITIONAL), ("yes", NodeType.END), ("no", NodeType.END),
+         ("join", NodeType.END)],
+        [("check", "yes", "state.flag == True"), ("check", "no", ""),
+         ("yes", "join", ""), ("no", "join", "")],
+        "check",
+    )
+
+    executed = []
+
+    async def record_end(node, context):
+        executed.append(node.node_id)
+        return {"completed": True}
+
+    workflow_engine.register_node_handler("end", record_end)
+    await workflow_engine.execute_workflow("conditional-workflow", graph, {"flag": False})
+
+    assert executed == ["no", "join"]
+
+
+@pytest.mark.asyncio
+async def test_deep_chain_runs_iteratively():
+    """Test a chain deeper than the recursion limit runs without recursion"""
+    engine = WorkflowEngine(config={"max_graph_depth": 5000, "checkpoint_on_node_complete": False})
+    await engine.initialize()
+
+    executed = []
+
+    async def no_op(node, context):
+        executed.append(node.node_id)
+        return {"success": True}
+
+    engine.register_node_handler("agent", no_op)
+
+    count = 3000
+    graph = _graph(
+        "deep-chain",
+        [(f"n{i}", NodeType.AGENT) for i in range(count)],
+        [(f"n{i}", f"n{i + 1}", "") for i in range(count - 1)],
+        "n0",
+    )
+
+    await engine.execute_workflow("deep-chain-workflow", graph)
+
+    assert len(executed) == count
+    assert executed[-1] == f"n{count - 1}"
+
+
+@pytest.mark.asyncio
+async def test_parallel_branches_use_scheduler(workflow_engine):
+    """Test parallel children run as sub-DAGs, fanning out and joining"""
+    await workflow_engine.initialize()
+
+    order = []
+
+    async def record(node, context):
+        order.append(node.node_id)
+        return {"node_id": node.node_id}
+
+    workflow_engine.register_node_handler("agent", record)
+
+    graph = _graph(
+        "parallel-dags",
+        [("fork", NodeType.PARALLEL), ("a", NodeType.AGENT), ("b", NodeType.AGENT),
+         ("c", NodeType.AGENT), ("join", NodeType.AGENT), ("x", NodeType.AGENT)],
+        [("a", "b", ""), ("a", "c", ""), ("b", "join", ""), ("c", "join", "")],
+        "fork",
+    )
+    graph.nodes["fork"].config["children"] = ["a", "x"]
+
+    results = []
+    parallel = workflow_engine._execute_parallel_node
+
+    async def record_parallel(node, context):
+        results.extend(await parallel(node, context))
+        return results
+
+    workflow_engine.register_node_handler("parallel", record_parallel)
+    await workflow_engine.execute_workflow("parallel-workflow", graph)
+
+    assert sorted(order) == ["a", "b", "c", "join", "x"]
+    assert order.index("join") > max(order.index("b"), order.index("c"))
+    assert results == [{"node_id": "join"}, {"node_id": "x"}]
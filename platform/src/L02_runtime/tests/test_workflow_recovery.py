@@ -6,9 +6,11 @@ Tests for workflow resume from checkpoint.
 
 import pytest
 import asyncio
+import json
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, MagicMock
 
+from ..services.workflow_checkpoint import replay
 from ..services.workflow_engine import (
     WorkflowEngine,
     WorkflowError,
@@ -42,6 +44,36 @@ def mock_state_manager():
     return manager
 
 
+class InMemoryStateManager:
+    """Hot state and hot logs kept in dicts, stored as JSON like Redis"""
+
+    def __init__(self):
+        self.hot_state = {}
+        self.hot_logs = {}
+        self.bytes_written = 0
+
+    async def save_hot_state(self, agent_id, state_data):
+        value = json.dumps(state_data)
+        self.bytes_written += len(value)
+        self.hot_state[agent_id] = value
+
+    async def load_hot_state(self, agent_id):
+        value = self.hot_state.get(agent_id)
+        return json.loads(value) if value else None
+
+    async def append_hot_log(self, log_id, entry, refresh_state=()):
+        value = json.dumps(entry)
+        self.bytes_written += len(value)
+        self.hot_logs.setdefault(log_id, []).append(value)
+        return True
+
+    async def load_hot_log(self, log_id):
+        return [json.loads(value) for value in self.hot_logs.get(log_id, [])]
+
+    async def delete_hot_log(self, log_id):
+        return self.hot_logs.pop(log_id, None) is not None
+
+
 @pytest.fixture
 def simple_graph():
     """Create a simple workflow graph"""
@@ -281,3 +313,186 @@ class TestWorkflowRecovery:
         # Middle and end nodes should have been executed
         assert "middle" in context.execution_path
         assert "end" in context.execution_path
+
+    @pytest.mark.asyncio
+    async def test_incremental_checkpoints_resume(self, workflow_engine):
+        """Test resume replays the snapshot and node deltas of an interrupted run"""
+        state_manager = InMemoryStateManager()
+        workflow_engine.checkpoint_compact_every = 3
+        await workflow_engine.initialize(state_manager=state_manager)
+
+        fail_at = {"n6"}
+
+        async def step(node, context):
+            if node.node_id in fail_at:
+                raise RuntimeError("interrupted")
+            context.state[node.node_id] = {"done": True}
+            context.state["last"] = node.node_id
+            return {"success": True}
+
+        workflow_engine.register_node_handler("agent", step)
+
+        graph = WorkflowGraph(graph_id="chain", entry_node="n0")
+        for i in range(8):
+            graph.nodes[f"n{i}"] = WorkflowNode(node_id=f"n{i}", node_type=NodeType.AGENT)
+            if i:
+                graph.edges.append(WorkflowEdge(source=f"n{i - 1}", target=f"n{i}"))
+
+        with pytest.raises(WorkflowError):
+            await workflow_engine.execute_workflow("chain-workflow", graph, {"input": 1})
+
+        # Graph stored once by content hash; snapshot references it
+        graph_keys = [key for key in state_manager.hot_state if key.startswith("graph_")]
+        assert len(graph_keys) == 1
+        snapshot = json.loads(state_manager.hot_state["chain-workflow"])
+        assert "nodes" not in snapshot["graph"]
+        # n4 was compacted into the snapshot, n5 is a delta in its log
+        assert snapshot["execution_path"] == ["n0", "n1", "n2", "n3", "n4"]
+        assert len(state_manager.hot_logs[snapshot["log"]]) == 1
+
+        fail_at.clear()
+        result = await workflow_engine.resume_workflow("chain-workflow")
+
+        assert result["input"] == 1
+        assert result["last"] == "n7"
+        assert all(result[f"n{i}"] == {"done": True} for i in range(8))
+        # The resumed run's first snapshot replaced the stale log
+        assert snapshot["log"] not in state_manager.hot_logs
+
+    @pytest.mark.asyncio
+    async def test_failed_delta_append_writes_snapshot(self, workflow_engine):
+        """Test a delta that cannot be appended is replaced by a snapshot"""
+        state_manager = InMemoryStateManager()
+        workflow_engine.checkpoint_compact_every = 10
+        await workflow_engine.initialize(state_manager=state_manager)
+
+        async def step(node, context):
+            context.state["last"] = node.node_id
+            return {"success": True}
+
+        async def lost_append(log_id, entry, refresh_state=()):
+            return False
+
+        workflow_engine.register_node_handler("agent", step)
+        state_manager.append_hot_log = lost_append
+
+        graph = WorkflowGraph(graph_id="chain", entry_node="n0")
+        for i in range(3):
+            graph.nodes[f"n{i}"] = WorkflowNode(node_id=f"n{i}", node_type=NodeType.AGENT)
+            if i:
+                graph.edges.append(WorkflowEdge(source=f"n{i - 1}", target=f"n{i}"))
+
+        await workflow_engine.execute_workflow("lossy-workflow", graph, {})
+
+        snapshot = json.loads(state_manager.hot_state["lossy-workflow"])
+        assert snapshot["execution_path"] == ["n0", "n1", "n2"]
+        assert snapshot["state"]["last"] == "n2"
+
+    @pytest.mark.asyncio
+    async def test_resume_fan_out_join_from_frontier(self, workflow_engine):
+        """Test resume runs the unfinished branch of a fan-out before the join"""
+        state_manager = InMemoryStateManager()
+        # One node at a time, so b finishes before c fails
+        workflow_engine.max_parallel_branches = 1
+        await workflow_engine.initialize(state_manager=state_manager)
+
+        runs = []
+        fail_at = {"c"}
+
+        async def step(node, context):
+            runs.append(node.node_id)
+            if node.node_id in fail_at:
+                raise RuntimeError("interrupted")
+            context.state[node.node_id] = {"done": True}
+            if node.node_id == "j":
+                context.state["joined"] = "b" in context.state and "c" in context.state
+            return {"success": True}
+
+        workflow_engine.register_node_handler("agent", step)
+
+        graph = WorkflowGraph(graph_id="diamond", entry_node="a")
+        for node_id in ("a", "b", "c", "j"):
+            graph.nodes[node_id] = WorkflowNode(node_id=node_id, node_type=NodeType.AGENT)
+        for source, target in (("a", "b"), ("a", "c"), ("b", "j"), ("c", "j")):
+            graph.edges.append(WorkflowEdge(source=source, target=target))
+
+        with pytest.raises(WorkflowError):
+            await workflow_engine.execute_workflow("diamond-workflow", graph, {})
+
+        assert runs == ["a", "b", "c"]
+
+        fail_at.clear()
+        runs.clear()
+        result = await workflow_engine.resume_workflow("diamond-workflow")
+
+        # c started before the crash but never finished, so it runs again
+        assert runs == ["c", "j"]
+        assert result["joined"] is True
+
+    @pytest.mark.asyncio
+    async def test_resume_keeps_skipped_branches_skipped(self, workflow_engine):
+        """Test edges that did not fire before the crash stay unfired on resume"""
+        state_manager = InMemoryStateManager()
+        workflow_engine.max_parallel_branches = 1
+        await workflow_engine.initialize(state_manager=state_manager)
+
+        runs = []
+        fail_at = {"j"}
+
+        async def step(node, context):
+            runs.append(node.node_id)
+            if node.node_id in fail_at:
+                raise RuntimeError("interrupted")
+            return {"success": node.node_id != "a"}
+
+        workflow_engine.register_node_handler("agent", step)
+
+        graph = WorkflowGraph(graph_id="guarded", entry_node="a")
+        for node_id in ("a", "ok", "fallback", "j"):
+            graph.nodes[node_id] = WorkflowNode(node_id=node_id, node_type=NodeType.AGENT)
+        graph.edges.extend([
+            WorkflowEdge(source="a", target="ok", condition="success"),
+            WorkflowEdge(source="a", target="fallback", condition="failure"),
+            WorkflowEdge(source="ok", target="j"),
+            WorkflowEdge(source="fallback", target="j"),
+        ])
+
+        with pytest.raises(WorkflowError):
+            await workflow_engine.execute_workflow("guarded-workflow", graph, {})
+
+        assert runs == ["a", "fallback", "j"]
+
+        fail_at.clear()
+        runs.clear()
+        await workflow_engine.resume_workflow("guarded-workflow")
+
+        assert runs == ["j"]
+
+    def test_replay_collects_finished_nodes(self):
+        """Test replay appends the finished nodes of each delta to the frontier"""
+        snapshot = {
+            "state": {}, "execution_path": ["a"], "visited_nodes": ["a"],
+            "finished": [["a", [True, True]]], "log": "l", "seq": 0,
+        }
+        deltas = [
+            {"seq": 1, "state": {}, "deleted": [], "path": ["b", "c"], "finished": [["b", [True]]], "depth": 2},
+        ]
+
+        result = replay(snapshot, deltas)
+
+        assert result["finished"] == [["a", [True, True]], ["b", [True]]]
+        assert result["execution_path"] == ["a", "b", "c"]
+
+    def test_replay_stops_at_missing_delta(self):
+        """Test replay does not apply deltas after a gap in the log"""
+        snapshot = {"state": {"a": 0}, "execution_path": ["n0"], "visited_nodes": ["n0"], "log": "l", "seq": 0}
+        deltas = [
+            {"seq": 1, "state": {"a": 1}, "deleted": [], "path": ["n1"], "depth": 1},
+            {"seq": 3, "state": {"a": 3}, "deleted": [], "path": ["n3"], "depth": 3},
+        ]
+
+        result = replay(snapshot, deltas)
+
+        assert result["seq"] == 1
+        assert result["state"] == {"a": 1}
+        assert result["execution_path"] == ["n0", "n1"]
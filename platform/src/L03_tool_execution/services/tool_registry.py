@@ -25,6 +25,8 @@ except ImportError:
     from psycopg_pool import AsyncConnectionPool
 import httpx
 
+from shared.db_pool import pool_config
+
 from ..models import (
     ToolDefinition,
     ToolVersion,
@@ -75,11 +77,16 @@ class ToolRegistry:
     async def initialize(self):
         """Initialize database connection pool and ensure schema exists"""
         try:
+            # Sized by the shared DB_POOL_OLTP_* settings; psycopg's
+            # equivalent of disabling the statement cache behind PgBouncer
+            # is turning off automatic prepared statements
+            config = pool_config("oltp")
             self.db_pool = AsyncConnectionPool(
                 self.db_connection_string,
-                min_size=2,
-                max_size=10,
-                timeout=30.0,
+                min_size=config.min_size,
+                max_size=config.max_size,
+                timeout=config.acquire_timeout,
+                kwargs={"prepare_threshold": None} if config.pgbouncer else None,
             )
             await self._ensure_schema()
             logger.info("Tool Registry initialized successfully")
@@ -0,0 +1,6 @@
+"""
+L04 Model Gateway Layer - Benchmarks
+
+Standalone benchmark scripts, run with:
+    python -m L04_model_gateway.benchmarks.<name> --help
+"""
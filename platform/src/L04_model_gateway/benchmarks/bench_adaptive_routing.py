@@ -0,0 +1,237 @@
+"""
+L04 Model Gateway Layer - Adaptive Routing Benchmark
+
+Replays a latency trace through LLMRouter and compares routing on the
+configured (static) model latencies with routing on live stats fed back
+from completed requests.
+
+A trace is a CSV of observed attempts with columns t_ms, model_id,
+latency_ms, ok. A simulated request to a model at time t draws one of
+that model's trace samples from the preceding second; failed attempts
+fail over to the decision's fallbacks. Stats reach the router only when
+an attempt completes, so feedback lags as it does in production.
+
+Without --trace a synthetic trace is generated in which the model that
+is configured as fastest degrades part-way through.
+
+Usage:
+    python -m L04_model_gateway.benchmarks.bench_adaptive_routing
+    python -m L04_model_gateway.benchmarks.bench_adaptive_routing --trace latencies.csv
+    python -m L04_model_gateway.benchmarks.bench_adaptive_routing --write-trace latencies.csv
+"""
+
+import argparse
+import bisect
+import csv
+import heapq
+import logging
+import random
+from collections import Counter, defaultdict
+
+from ..models import (
+    InferenceRequest,
+    Message,
+    MessageRole,
+    ModelConfig,
+    ModelCapabilities,
+    ModelStatus,
+    RoutingStrategy,
+)
+from ..services.model_registry import ModelRegistry
+from ..services.llm_router import LLMRouter
+from ..services.latency_tracker import LatencyTracker
+
+
+# Configured p50 per synthetic model; "fast" claims to be quickest
+SYNTHETIC_MODELS = {"fast": 250, "steady": 600, "spiky": 400}
+
+
+def synthetic_trace(duration_ms: int, seed: int = 1) -> list:
+    """Generate (t_ms, model_id, latency_ms, ok) rows"""
+    rng = random.Random(seed)
+    rows = []
+    for t in range(0, duration_ms, 50):
+        degraded = t > duration_ms * 0.4
+        # "fast" degrades: 6x slower with 10% errors
+        fast = rng.lognormvariate(5.5, 0.3) * (6 if degraded else 1)
+        rows.append((t, "fast", fast, not (degraded and rng.random() < 0.1)))
+        rows.append((t, "steady", rng.lognormvariate(6.2, 0.15), True))
+        # "spiky" has a heavy tail
+        spiky = 4000.0 if rng.random() < 0.05 else rng.lognormvariate(5.8, 0.25)
+        rows.append((t, "spiky", spiky, True))
+    return rows
+
+
+def load_trace(path: str) -> list:
+    """Read trace rows from CSV"""
+    with open(path, newline="") as f:
+        return [
+            (float(r["t_ms"]), r["model_id"], float(r["latency_ms"]),
+             r["ok"].strip().lower() in ("1", "true", "yes"))
+            for r in csv.DictReader(f)
+        ]
+
+
+def write_trace(path: str, rows: list) -> None:
+    """Write trace rows to CSV"""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["t_ms", "model_id", "latency_ms", "ok"])
+        for t, model_id, latency, ok in rows:
+            writer.writerow([int(t), model_id, round(latency, 1), int(ok)])
+
+
+class TraceSampler:
+    """Draw a model's latency at a point in time from the trace"""
+
+    def __init__(self, rows: list, seed: int, lookback_ms: float = 1000.0):
+        self.rng = random.Random(seed)
+        self.lookback_ms = lookback_ms
+        by_model = defaultdict(list)
+        for t, model_id, latency, ok in sorted(rows):
+            by_model[model_id].append((t, latency, ok))
+        self.samples = dict(by_model)
+        self.times = {m: [s[0] for s in rows] for m, rows in self.samples.items()}
+
+    def draw(self, model_id: str, t: float) -> tuple:
+        times = self.times[model_id]
+        hi = max(1, bisect.bisect_right(times, t))
+        lo = min(hi - 1, bisect.bisect_left(times, t - self.lookback_ms))
+        _, latency, ok = self.samples[model_id][self.rng.randrange(lo, hi)]
+        return latency, ok
+
+    def duration_ms(self) -> float:
+        return max(times[-1] for times in self.times.values())
+
+
+def build_router(models: dict, seed: int) -> LLMRouter:
+    """Router over one mock model per configured p50"""
+    registry = ModelRegistry()
+    for model_id, p50 in models.items():
+        registry.register_model(ModelConfig(
+            model_id=model_id,
+            provider="mock",
+            display_name=model_id,
+            capabilities=ModelCapabilities(),
+            context_window=8192,
+            max_output_tokens=1024,
+            cost_per_1m_input_tokens=0.0,
+            cost_per_1m_output_tokens=0.0,
+            latency_p50_ms=p50,
+            latency_p99_ms=p50 * 4,
+            status=ModelStatus.ACTIVE,
+        ))
+    return LLMRouter(registry, latency_tracker=LatencyTracker(), seed=seed)
+
+
+def simulate(
+    sampler: TraceSampler,
+    models: dict,
+    strategy: RoutingStrategy,
+    feedback: bool,
+    rate_per_s: float,
+    seed: int
+) -> dict:
+    """Replay the trace under one strategy; return latency summary"""
+    router = build_router(models, seed)
+    tracker = router.latency_tracker
+    request = InferenceRequest.create(
+        agent_did="did:key:bench",
+        messages=[Message(role=MessageRole.USER, content="Hello")],
+    )
+
+    rng = random.Random(seed)
+    completions = []  # (end_ms, model_id, latency_ms, ok)
+    latencies = []
+    primaries = Counter()
+    failovers = 0
+    t = 0.0
+    end = sampler.duration_ms()
+
+    while t < end:
+        while completions and completions[0][0] <= t:
+            _, model_id, latency, ok = heapq.heappop(completions)
+            if feedback:
+                tracker.finish(model_id, latency, ok)
+
+        decision = router.route(request, strategy)
+        primaries[decision.primary_model_id] += 1
+
+        elapsed = 0.0
+        for attempt, model_id in enumerate(
+            [decision.primary_model_id] + decision.fallback_models
+        ):
+            latency, ok = sampler.draw(model_id, t + elapsed)
+            if feedback:
+                tracker.start(model_id)
+            elapsed += latency
+            heapq.heappush(completions, (t + elapsed, model_id, latency, ok))
+            if ok:
+                break
+        if attempt > 0:
+            failovers += 1
+
+        latencies.append(elapsed)
+        t += rng.expovariate(rate_per_s) * 1000
+
+    latencies.sort()
+
+    def pct(q):
+        return latencies[min(len(latencies) - 1, int(q * len(latencies)))]
+
+    return {
+        "requests": len(latencies),
+        "mean": sum(latencies) / len(latencies),
+        "p50": pct(0.5),
+        "p95": pct(0.95),
+        "p99": pct(0.99),
+        "failover_pct": 100.0 * failovers / len(latencies),
+        "primaries": primaries,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--trace", help="CSV trace (t_ms,model_id,latency_ms,ok)")
+    parser.add_argument("--write-trace", help="write the synthetic trace to this path")
+    parser.add_argument("--duration", type=int, default=300, help="synthetic trace seconds")
+    parser.add_argument("--rate", type=float, default=20.0, help="requests per second")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    if args.trace:
+        rows = load_trace(args.trace)
+        # Unknown configured latency: give every model the same prior
+        models = {model_id: 1000 for model_id in sorted({r[1] for r in rows})}
+    else:
+        rows = synthetic_trace(args.duration * 1000, args.seed)
+        models = SYNTHETIC_MODELS
+        if args.write_trace:
+            write_trace(args.write_trace, rows)
+
+    runs = (
+        ("static latency_optimized", RoutingStrategy.LATENCY_OPTIMIZED, False),
+        ("live latency_optimized", RoutingStrategy.LATENCY_OPTIMIZED, True),
+        ("adaptive (p2c)", RoutingStrategy.ADAPTIVE, True),
+    )
+
+    print(f"\nTrace: {len(rows)} samples, {len(models)} models, {args.rate:.0f} req/s\n")
+    print(f"{'strategy':<26}{'mean':>8}{'p50':>8}{'p95':>8}{'p99':>8}{'failover%':>11}  primary share")
+    for name, strategy, feedback in runs:
+        sampler = TraceSampler(rows, args.seed)
+        result = simulate(sampler, models, strategy, feedback, args.rate, args.seed)
+        share = " ".join(
+            f"{m}={100 * n / result['requests']:.0f}%"
+            for m, n in sorted(result["primaries"].items())
+        )
+        print(
+            f"{name:<26}{result['mean']:>8.0f}{result['p50']:>8.0f}"
+            f"{result['p95']:>8.0f}{result['p99']:>8.0f}"
+            f"{result['failover_pct']:>11.1f}  {share}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+L04 Model Gateway Layer - Rate Limiter Benchmark
+
+Compares the previous client-side token bucket (HGETALL + HSET + EXPIRE per
+bucket, checked separately for RPM and TPM) with the single-script check and
+lease mode of RateLimiter.
+
+Reports throughput and Redis round trips per check while under the limit, and
+how many requests were admitted beyond the limit (plus refill) when
+concurrent traffic exceeds it.
+
+Usage:
+    python -m L04_model_gateway.benchmarks.bench_rate_limiter
+    python -m L04_model_gateway.benchmarks.bench_rate_limiter --redis-url redis://localhost:6379
+    python -m L04_model_gateway.benchmarks.bench_rate_limiter --fake
+"""
+
+import argparse
+import asyncio
+import logging
+import time
+import uuid
+
+from ..services.rate_limiter import RateLimiter
+from ..models import RateLimitError
+
+
+class LegacyTokenBucket:
+    """Previous RateLimiter token bucket: read, compute client-side, write back"""
+
+    def __init__(self, redis_client, rpm: int, tpm: int):
+        self.redis = redis_client
+        self.rpm = rpm
+        self.tpm = tpm
+        self.round_trips = 0
+
+    async def _bucket(self, key: str, tokens: int, capacity: int) -> bool:
+        now = time.time()
+        data = await self.redis.hgetall(key)
+        self.round_trips += 1
+        available = float(data.get("tokens", capacity)) if data else capacity
+        last_refill = float(data.get("last_refill", now)) if data else now
+        available = min(capacity, available + ((now - last_refill) / 60) * capacity)
+        if available < tokens:
+            return False
+        await self.redis.hset(
+            key, mapping={"tokens": str(available - tokens), "last_refill": str(now)}
+        )
+        await self.redis.expire(key, 120)
+        self.round_trips += 2
+        return True
+
+    async def check(self, agent: str, tokens: int) -> bool:
+        if not await self._bucket(f"legacy:rpm:{agent}", 1, self.rpm):
+            return False
+        return await self._bucket(f"legacy:tpm:{agent}", tokens, self.tpm)
+
+
+async def run_concurrent(check, total: int, concurrency: int) -> tuple:
+    """Run total checks with bounded concurrency; return (admitted, seconds)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    admitted = 0
+
+    async def one():
+        nonlocal admitted
+        async with semaphore:
+            if await check():
+                admitted += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*[one() for _ in range(total)])
+    return admitted, time.perf_counter() - start
+
+
+async def run_implementations(redis_client, total, concurrency, rpm, tokens):
+    """Run every implementation once; return rows of (name, admitted, seconds, trips)"""
+    tpm = rpm * tokens * 10
+    rows = []
+
+    legacy = LegacyTokenBucket(redis_client, rpm, tpm)
+    agent = uuid.uuid4().hex
+    admitted, seconds = await run_concurrent(
+        lambda: legacy.check(agent, tokens), total, concurrency
+    )
+    rows.append(("legacy (3 calls/bucket)", admitted, seconds, legacy.round_trips))
+
+    for name, kwargs in (
+        ("script (1 call)", {}),
+        ("script + lease", {"lease_requests": 50, "lease_tokens": 50 * tokens}),
+    ):
+        limiter = RateLimiter(default_rpm=rpm, default_tpm=tpm, **kwargs)
+        limiter._redis = redis_client
+        agent = uuid.uuid4().hex
+
+        async def check(limiter=limiter, agent=agent):
+            try:
+                return await limiter.check_rate_limit(agent, "bench", tokens)
+            except RateLimitError:
+                return False
+
+        admitted, seconds = await run_concurrent(check, total, concurrency)
+        rows.append((name, admitted, seconds, limiter.get_stats()["round_trips"]))
+
+    return rows
+
+
+async def bench(redis_client, total: int, concurrency: int, tokens: int):
+    # Throughput: limit never reached, every check is admitted
+    rows = await run_implementations(redis_client, total, concurrency, total * 100, tokens)
+    print(f"\nThroughput: {total} checks, concurrency={concurrency}\n")
+    print(f"{'implementation':<26}{'checks/s':>12}{'trips/check':>14}")
+    for name, _, seconds, trips in rows:
+        print(f"{name:<26}{total / seconds:>12.0f}{trips / total:>14.2f}")
+
+    # Contention: limit is half the traffic; anything above limit + refill is overspend
+    rpm = total // 2
+    rows = await run_implementations(redis_client, total, concurrency, rpm, tokens)
+    print(f"\nContention: {total} checks, concurrency={concurrency}, rpm limit={rpm}\n")
+    print(f"{'implementation':<26}{'admitted':>10}{'allowed':>10}{'overspend':>11}")
+    for name, admitted, seconds, _ in rows:
+        allowed = rpm + int(rpm * seconds / 60)
+        print(f"{name:<26}{admitted:>10}{allowed:>10}{max(0, admitted - allowed):>11}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--redis-url", default="redis://localhost:6379")
+    parser.add_argument("--fake", action="store_true", help="use fakeredis (no server)")
+    parser.add_argument("--total", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--tokens", type=int, default=200)
+    args = parser.parse_args()
+
+    if args.fake:
+        import fakeredis
+        redis_client = fakeredis.FakeAsyncRedis(decode_responses=True)
+    else:
+        import redis.asyncio as redis
+        redis_client = redis.from_url(args.redis_url, decode_responses=True)
+
+    # Rejections are expected in the contention run
+    logging.disable(logging.WARNING)
+    asyncio.run(bench(redis_client, args.total, args.concurrency, args.tokens))
+
+
+if __name__ == "__main__":
+    main()
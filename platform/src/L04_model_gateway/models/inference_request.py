@@ -96,8 +96,19 @@ class LogicalPrompt:
             result["frequency_penalty"] = self.frequency_penalty
         return result
 
-    def estimate_tokens(self) -> int:
-        """Rough estimate of token count (4 chars per token heuristic)"""
+    def estimate_tokens(self, counter: Optional[Any] = None) -> int:
+        """
+        Estimate token count
+
+        Args:
+            counter: Optional TokenCounter; without one a 4 chars per
+                token heuristic is used
+
+        Returns:
+            Estimated token count
+        """
+        if counter is not None:
+            return counter.count(self.system_prompt or "") + counter.count_messages(self.messages)
         total_chars = len(self.system_prompt or "")
         for message in self.messages:
             total_chars += len(message.content)
@@ -217,6 +228,6 @@ class InferenceRequest:
             result["model_id"] = self.model_id
         return result
 
-    def estimate_input_tokens(self) -> int:
-        """Estimate input token count"""
-        return self.logical_prompt.estimate_tokens()
+    def estimate_input_tokens(self, counter: Optional[Any] = None) -> int:
+        """Estimate input token count (see LogicalPrompt.estimate_tokens)"""
+        return self.logical_prompt.estimate_tokens(counter)
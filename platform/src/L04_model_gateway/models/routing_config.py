@@ -17,6 +17,7 @@ class RoutingStrategy(Enum):
     QUALITY_OPTIMIZED = "quality_optimized"  # Among capable models, select highest quality
     PROVIDER_PINNED = "provider_pinned"  # Route to specific provider regardless of cost
     ROUND_ROBIN = "round_robin"  # Distribute load evenly across capable models
+    ADAPTIVE = "adaptive"  # Least expected latency from live stats, power-of-two-choices
 
 
 class LatencyClass(Enum):
@@ -4,8 +4,9 @@ L04 Model Gateway Layer - Base Provider Adapter
 Defines the protocol that all provider adapters must implement.
 """
 
+import asyncio
 from abc import ABC, abstractmethod
-from typing import AsyncIterator, Optional, List
+from typing import AsyncIterator, Optional, List, Union
 import logging
 
 from ..models import (
@@ -14,7 +15,9 @@ from ..models import (
     ProviderHealth,
     ProviderStatus,
     CircuitState,
-    StreamChunk
+    StreamChunk,
+    ProviderError,
+    L04ErrorCode
 )
 
 logger = logging.getLogger(__name__)
@@ -123,6 +126,65 @@ class ProviderAdapter(ABC):
         """
         pass
 
+    def supports_batching(self) -> bool:
+        """
+        Check if complete_batch() sends one batched provider call
+
+        Adapters without a native batch endpoint return False so the
+        batch dispatcher calls complete() directly instead of waiting
+        for a batch to fill.
+        """
+        return False
+
+    async def complete_batch(
+        self,
+        requests: List[InferenceRequest],
+        model_id: str
+    ) -> List[Union[InferenceResponse, Exception]]:
+        """
+        Execute several completion requests for the same model
+
+        The default implementation runs complete() concurrently.
+
+        Args:
+            requests: InferenceRequests to execute
+            model_id: Model to use for every request
+
+        Returns:
+            One InferenceResponse or exception per request, in order
+        """
+        return await asyncio.gather(
+            *[self.complete(request, model_id) for request in requests],
+            return_exceptions=True
+        )
+
+    def supports_embeddings(self) -> bool:
+        """Check if embed() is implemented"""
+        return False
+
+    async def embed(
+        self,
+        texts: List[str],
+        model_id: str
+    ) -> List[List[float]]:
+        """
+        Embed several texts in one call
+
+        Args:
+            texts: Texts to embed
+            model_id: Embedding model
+
+        Returns:
+            One embedding vector per text, in order
+
+        Raises:
+            ProviderError: If embeddings are not supported
+        """
+        raise ProviderError(
+            L04ErrorCode.E4207_MODEL_NOT_SUPPORTED,
+            f"Provider {self.provider_id} does not support embeddings"
+        )
+
     def get_provider_id(self) -> str:
         """Get provider identifier"""
         return self.provider_id
@@ -5,7 +5,8 @@ Mock adapter for testing purposes.
 """
 
 import asyncio
-from typing import AsyncIterator
+import hashlib
+from typing import AsyncIterator, List
 from datetime import datetime
 
 from .base import ProviderAdapter
@@ -40,6 +41,7 @@ class MockAdapter(ProviderAdapter):
         self.latency_ms = latency_ms
         self.should_fail = should_fail
         self.call_count = 0
+        self.batch_call_count = 0
         self.supported_models = {"mock-model", "mock-vision", "mock-tools"}
 
     def supports_capability(self, capability: str) -> bool:
@@ -70,6 +72,14 @@ class MockAdapter(ProviderAdapter):
         # Simulate latency
         await asyncio.sleep(self.latency_ms / 1000.0)
 
+        return self._build_response(request, model_id)
+
+    def _build_response(
+        self,
+        request: InferenceRequest,
+        model_id: str
+    ) -> InferenceResponse:
+        """Build the canned response for a request"""
         # Simulate failure if configured
         if self.should_fail:
             from ..models import ProviderError, L04ErrorCode
@@ -107,6 +117,66 @@ class MockAdapter(ProviderAdapter):
             metadata={"call_count": self.call_count, "mock": True}
         )
 
+    def supports_batching(self) -> bool:
+        """Mock adapter serves a whole batch with one simulated call"""
+        return True
+
+    async def complete_batch(
+        self,
+        requests: List[InferenceRequest],
+        model_id: str
+    ) -> List:
+        """
+        Return mock responses for a batch after a single simulated latency
+
+        Args:
+            requests: InferenceRequests in the batch
+            model_id: Model ID
+
+        Returns:
+            One InferenceResponse or exception per request
+        """
+        self.batch_call_count += 1
+        self.call_count += len(requests)
+
+        await asyncio.sleep(self.latency_ms / 1000.0)
+
+        results = []
+        for request in requests:
+            try:
+                response = self._build_response(request, model_id)
+                response.metadata["batch_size"] = len(requests)
+                results.append(response)
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def supports_embeddings(self) -> bool:
+        """Mock adapter returns deterministic embeddings"""
+        return True
+
+    async def embed(
+        self,
+        texts: List[str],
+        model_id: str
+    ) -> List[List[float]]:
+        """
+        Return deterministic pseudo-embeddings derived from text hashes
+
+        Args:
+            texts: Texts to embed
+            model_id: Model ID
+
+        Returns:
+            One 16-dimensional vector per text
+        """
+        self.batch_call_count += 1
+        await asyncio.sleep(self.latency_ms / 1000.0)
+        return [
+            [byte / 255.0 for byte in hashlib.sha256(text.encode()).digest()[:16]]
+            for text in texts
+        ]
+
     async def stream(
         self,
         request: InferenceRequest,
@@ -180,4 +250,5 @@ class MockAdapter(ProviderAdapter):
     def reset(self):
         """Reset adapter state"""
         self.call_count = 0
+        self.batch_call_count = 0
         self.should_fail = False
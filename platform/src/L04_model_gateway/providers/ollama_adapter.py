@@ -233,6 +233,59 @@ class OllamaAdapter(BaseProviderAdapter):
                 {"error": str(e)}
             )
 
+    def supports_embeddings(self) -> bool:
+        """Ollama embeds many inputs per call via /api/embed"""
+        return True
+
+    async def embed(
+        self,
+        texts: List[str],
+        model_id: str
+    ) -> List[List[float]]:
+        """
+        Embed texts in one call via Ollama /api/embed
+
+        Args:
+            texts: Texts to embed
+            model_id: Embedding model (e.g. nomic-embed-text)
+
+        Returns:
+            One embedding vector per text
+        """
+        try:
+            await self._create_client()
+
+            response = await self._client.post(
+                "/api/embed",
+                json={"model": model_id, "input": texts},
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+
+            return response.json().get("embeddings", [])
+
+        except httpx.HTTPStatusError as e:
+            self.logger.error(f"Ollama embed HTTP error: {e}")
+            raise ProviderError(
+                L04ErrorCode.E4206_PROVIDER_API_ERROR,
+                f"Ollama API error: {e.response.status_code}",
+                {"status_code": e.response.status_code, "detail": str(e)}
+            )
+        except httpx.TimeoutException as e:
+            self.logger.error(f"Ollama embed timeout: {e}")
+            raise ProviderError(
+                L04ErrorCode.E4202_PROVIDER_TIMEOUT,
+                "Ollama request timed out",
+                {"timeout": self.timeout}
+            )
+        except Exception as e:
+            self.logger.error(f"Ollama embed error: {e}")
+            raise ProviderError(
+                L04ErrorCode.E4304_EMBEDDING_GENERATION_FAILED,
+                f"Ollama embed error: {str(e)}",
+                {"error": str(e)}
+            )
+
     async def health_check(self) -> ProviderHealth:
         """
         Check Ollama health status
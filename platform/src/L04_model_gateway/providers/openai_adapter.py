@@ -383,6 +383,67 @@ class OpenAIAdapter(BaseProviderAdapter):
                 {"error": str(e)}
             )
 
+    def supports_embeddings(self) -> bool:
+        """OpenAI embeds many inputs per call via /embeddings"""
+        return True
+
+    async def embed(
+        self,
+        texts: List[str],
+        model_id: str
+    ) -> List[List[float]]:
+        """
+        Embed texts in one call via the OpenAI Embeddings API.
+
+        Args:
+            texts: Texts to embed
+            model_id: Embedding model (e.g. text-embedding-3-small)
+
+        Returns:
+            One embedding vector per text, in input order
+
+        Raises:
+            ProviderError: If request fails
+        """
+        if not self.api_key:
+            raise ProviderError(
+                L04ErrorCode.E4203_PROVIDER_AUTH_FAILED,
+                "OpenAI API key not configured",
+                {"provider": "openai"}
+            )
+
+        try:
+            await self._create_client()
+
+            response = await self._client.post(
+                "/embeddings",
+                json={"model": model_id, "input": texts},
+                timeout=self.timeout
+            )
+
+            if response.status_code != 200:
+                self._handle_error_response(response)
+
+            data = response.json().get("data", [])
+            return [item["embedding"] for item in sorted(data, key=lambda d: d["index"])]
+
+        except ProviderError:
+            raise
+        except httpx.TimeoutException as e:
+            logger.error(f"OpenAI embeddings timeout: {e}")
+            raise ProviderError(
+                L04ErrorCode.E4202_PROVIDER_TIMEOUT,
+                "OpenAI request timed out",
+                {"timeout": self.timeout}
+            )
+        except Exception as e:
+            logger.error(f"OpenAI embeddings error: {e}")
+            raise ProviderError(
+                L04ErrorCode.E4304_EMBEDDING_GENERATION_FAILED,
+                f"OpenAI embeddings error: {str(e)}",
+                {"error": str(e)}
+            )
+
     async def health_check(self) -> ProviderHealth:
         """
         Check OpenAI API health.
@@ -3,11 +3,20 @@ L04 Model Gateway Layer - Token Counter
 
 Accurate token counting for different LLM providers.
 
-Uses tiktoken for OpenAI models and approximation for Anthropic models.
+Uses tiktoken for OpenAI models and approximation for Anthropic and
+other models. tiktoken encodings may need a download on first use, so
+inside an event loop they are loaded in an executor and counts are
+approximated until the encoding is ready.
+
+Counts are cached by content hash, so repeated system prompts and
+conversation prefixes are only tokenized once per counter.
 """
 
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from typing import List, Dict, Optional
+import asyncio
+import hashlib
 import logging
 
 from ..models import Message, MessageRole
@@ -18,10 +27,73 @@ logger = logging.getLogger(__name__)
 _counter_cache: Dict[str, "TokenCounter"] = {}
 
 
+def _content_hash(text: str) -> bytes:
+    """Stable 128-bit digest of text used as a cache key"""
+    return hashlib.blake2b(
+        text.encode("utf-8", "surrogatepass"), digest_size=16
+    ).digest()
+
+
 class TokenCounter(ABC):
-    """Abstract base class for token counting"""
+    """
+    Abstract base class for token counting
+
+    Subclasses implement _count_text (and optionally _count_texts for a
+    vectorized path) plus the per-message overhead. Text counts are cached
+    by content hash, and count_messages remembers the running total of
+    every message prefix it has seen, so an append-only conversation only
+    tokenizes the messages added since the last call.
+    """
+
+    # Tokens added once per message list (e.g. reply priming)
+    REPLY_PRIMING = 0
+
+    # Maximum entries in each of the text and prefix caches
+    CACHE_SIZE = 4096
+
+    def __init__(self, cache_size: Optional[int] = None):
+        """
+        Initialize counter caches
+
+        Args:
+            cache_size: Maximum cached texts and prefixes (LRU)
+        """
+        self.cache_size = cache_size or self.CACHE_SIZE
+        self._text_cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._prefix_cache: "OrderedDict[bytes, int]" = OrderedDict()
+        self._cache_stats = {
+            "text_hits": 0,
+            "text_misses": 0,
+            "prefix_hits": 0,
+            "messages_counted": 0
+        }
 
     @abstractmethod
+    def _count_text(self, text: str) -> int:
+        """
+        Count tokens in text without caching.
+
+        Args:
+            text: Non-empty text to count
+
+        Returns:
+            Number of tokens
+        """
+        pass
+
+    def _count_texts(self, texts: List[str]) -> List[int]:
+        """Count tokens in several texts without caching"""
+        return [self._count_text(text) for text in texts]
+
+    def _message_texts(self, message: Message) -> List[str]:
+        """Texts of a message that are tokenized"""
+        return [message.content or ""]
+
+    @abstractmethod
+    def _message_overhead(self, message: Message) -> int:
+        """Formatting tokens added for a message, excluding its texts"""
+        pass
+
     def count(self, text: str) -> int:
         """
         Count tokens in text.
@@ -32,20 +104,137 @@ class TokenCounter(ABC):
         Returns:
             Number of tokens
         """
-        pass
+        if not text:
+            return 0
+        return self.count_batch([text])[0]
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        """
+        Count tokens in many texts at once.
+
+        Cached texts are looked up by content hash; the remaining distinct
+        texts are counted in a single _count_texts call.
+
+        Args:
+            texts: Texts to count
+
+        Returns:
+            Token count for each text, in order
+        """
+        results = [0] * len(texts)
+        pending: Dict[bytes, List[int]] = {}
+        pending_texts: List[str] = []
+
+        for i, text in enumerate(texts):
+            if not text:
+                continue
+            key = _content_hash(text)
+            cached = self._text_cache.get(key)
+            if cached is not None:
+                self._text_cache.move_to_end(key)
+                self._cache_stats["text_hits"] += 1
+                results[i] = cached
+                continue
+            if key not in pending:
+                pending[key] = []
+                pending_texts.append(text)
+            pending[key].append(i)
+
+        if pending_texts:
+            self._cache_stats["text_misses"] += len(pending_texts)
+            counts = self._count_texts(pending_texts)
+            for (key, indexes), count in zip(pending.items(), counts):
+                self._remember(self._text_cache, key, count)
+                for i in indexes:
+                    results[i] = count
+
+        return results
 
-    @abstractmethod
     def count_messages(self, messages: List[Message]) -> int:
         """
         Count tokens in message list including overhead.
 
+        Each message extends a chained hash of (role, name, content), and
+        the running total is cached per chain hash. The longest cached
+        prefix is reused and only the messages after it are counted.
+
         Args:
             messages: List of messages to count
 
         Returns:
             Total token count including message formatting overhead
         """
-        pass
+        if not messages:
+            return self.REPLY_PRIMING
+
+        keys = []
+        chain = b""
+        for message in messages:
+            chain = self._chain_hash(chain, message)
+            keys.append(chain)
+
+        total = 0
+        start = 0
+        for i in range(len(keys) - 1, -1, -1):
+            cached = self._prefix_cache.get(keys[i])
+            if cached is not None:
+                self._prefix_cache.move_to_end(keys[i])
+                self._cache_stats["prefix_hits"] += 1
+                total = cached
+                start = i + 1
+                break
+
+        new_messages = messages[start:]
+        if new_messages:
+            self._cache_stats["messages_counted"] += len(new_messages)
+            texts_per_message = [self._message_texts(m) for m in new_messages]
+            counts = iter(self.count_batch(
+                [text for texts in texts_per_message for text in texts]
+            ))
+            for offset, (message, texts) in enumerate(
+                zip(new_messages, texts_per_message)
+            ):
+                total += self._message_overhead(message)
+                total += sum(next(counts) for _ in texts)
+                self._remember(self._prefix_cache, keys[start + offset], total)
+
+        return total + self.REPLY_PRIMING
+
+    def get_cache_stats(self) -> dict:
+        """Get token count cache statistics"""
+        lookups = self._cache_stats["text_hits"] + self._cache_stats["text_misses"]
+        return {
+            **self._cache_stats,
+            "text_hit_rate": (
+                self._cache_stats["text_hits"] / lookups if lookups > 0 else 0.0
+            ),
+            "cached_texts": len(self._text_cache),
+            "cached_prefixes": len(self._prefix_cache)
+        }
+
+    def clear_cache(self) -> None:
+        """Drop cached text and prefix counts"""
+        self._text_cache.clear()
+        self._prefix_cache.clear()
+
+    def _remember(self, cache: "OrderedDict[bytes, int]", key: bytes, count: int) -> None:
+        """Insert into an LRU cache, evicting the oldest entry when full"""
+        cache[key] = count
+        cache.move_to_end(key)
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def _chain_hash(previous: bytes, message: Message) -> bytes:
+        """Hash of a message prefix: previous prefix hash plus this message"""
+        role = getattr(message.role, "value", message.role)
+        digest = hashlib.blake2b(previous, digest_size=16)
+        digest.update(str(role).encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update((getattr(message, "name", None) or "").encode("utf-8"))
+        digest.update(b"\x00")
+        digest.update((message.content or "").encode("utf-8", "surrogatepass"))
+        return digest.digest()
 
 
 class TiktokenCounter(TokenCounter):
@@ -81,9 +270,34 @@ class TiktokenCounter(TokenCounter):
         Args:
             model: OpenAI model name to use for encoding
         """
+        super().__init__()
         self.model = model
         self._encoding = None
-        self._init_encoding()
+        self._encoding_failed = False
+        self._encoding_loading: Optional[asyncio.Future] = None
+
+    def _get_encoding(self):
+        """
+        The tiktoken encoding, or None while it is unavailable.
+
+        Outside an event loop the encoding is loaded inline. Inside one it
+        is loaded in an executor (the first load may download it) and None
+        is returned until it is ready.
+        """
+        if self._encoding is not None or self._encoding_failed:
+            return self._encoding
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._init_encoding()
+            return self._encoding
+
+        if self._encoding_loading is None:
+            self._encoding_loading = loop.run_in_executor(None, self._init_encoding)
+            # Approximate counts cached meanwhile are replaced by exact ones
+            self._encoding_loading.add_done_callback(lambda _: self.clear_cache())
+        return None
 
     def _init_encoding(self) -> None:
         """Initialize the tiktoken encoding"""
@@ -108,9 +322,13 @@ class TiktokenCounter(TokenCounter):
 
         except ImportError:
             logger.warning("tiktoken not available, using approximation")
-            self._encoding = None
+            self._encoding_failed = True
+        except Exception as e:
+            # e.g. the encoding could not be downloaded
+            logger.warning(f"tiktoken encoding for '{self.model}' unavailable, using approximation: {e}")
+            self._encoding_failed = True
 
-    def count(self, text: str) -> int:
+    def _count_text(self, text: str) -> int:
         """
         Count tokens in text using tiktoken.
 
@@ -120,62 +338,56 @@ class TiktokenCounter(TokenCounter):
         Returns:
             Token count
         """
-        if not text:
-            return 0
-
-        if self._encoding is None:
+        encoding = self._get_encoding()
+        if encoding is None:
             # Fallback to approximation if tiktoken unavailable
             return self._approximate_count(text)
 
-        return len(self._encoding.encode(text))
-
-    def _approximate_count(self, text: str) -> int:
-        """
-        Approximate token count when tiktoken unavailable.
-
-        Uses ~4 characters per token heuristic.
-        """
-        return max(1, len(text) // 4)
+        return len(encoding.encode(text))
 
-    def count_messages(self, messages: List[Message]) -> int:
+    def _count_texts(self, texts: List[str]) -> List[int]:
         """
-        Count tokens in messages including overhead.
-
-        OpenAI message format overhead:
-        - 4 tokens per message (role, content markers, etc.)
-        - 3 tokens for reply priming
+        Count tokens in several texts with one encode_batch call.
 
         Args:
-            messages: List of Message objects
+            texts: Texts to count
 
         Returns:
-            Total token count
+            Token count for each text
         """
-        if not messages:
-            return self.REPLY_PRIMING
-
-        total = 0
+        encoding = self._get_encoding()
+        if encoding is None:
+            return [self._approximate_count(text) for text in texts]
 
-        for msg in messages:
-            # Message overhead
-            total += self.MESSAGE_OVERHEAD
+        return [len(tokens) for tokens in encoding.encode_batch(texts)]
 
-            # Role token (user/assistant/system)
-            total += 1
+    def _approximate_count(self, text: str) -> int:
+        """
+        Approximate token count when tiktoken unavailable.
 
-            # Content tokens
-            if msg.content:
-                total += self.count(msg.content)
+        Uses ~4 characters per token heuristic.
+        """
+        return max(1, len(text) // 4)
 
-            # Name field if present
-            if hasattr(msg, "name") and msg.name:
-                total += self.count(msg.name)
-                total += 1  # Name formatting
+    def _message_texts(self, message: Message) -> List[str]:
+        """Content and name (if present) are tokenized"""
+        name = getattr(message, "name", None)
+        if name:
+            return [message.content or "", name]
+        return [message.content or ""]
 
-        # Reply priming
-        total += self.REPLY_PRIMING
+    def _message_overhead(self, message: Message) -> int:
+        """
+        OpenAI message format overhead.
 
-        return total
+        - 4 tokens per message (role, content markers, etc.)
+        - 1 token for the role
+        - 1 token for name formatting if a name is present
+        """
+        overhead = self.MESSAGE_OVERHEAD + 1
+        if getattr(message, "name", None):
+            overhead += 1
+        return overhead
 
 
 class AnthropicTokenCounter(TokenCounter):
@@ -199,9 +411,10 @@ class AnthropicTokenCounter(TokenCounter):
         Args:
             model: Claude model name (for future model-specific adjustments)
         """
+        super().__init__()
         self.model = model
 
-    def count(self, text: str) -> int:
+    def _count_text(self, text: str) -> int:
         """
         Count tokens in text using approximation.
 
@@ -214,9 +427,6 @@ class AnthropicTokenCounter(TokenCounter):
         Returns:
             Approximate token count
         """
-        if not text:
-            return 0
-
         # Base approximation: ~3.3 chars per token
         # This is more accurate than 4 chars/token for Claude
         base_count = len(text) / 3.3
@@ -228,36 +438,46 @@ class AnthropicTokenCounter(TokenCounter):
 
         return max(1, int(base_count + adjustment))
 
-    def count_messages(self, messages: List[Message]) -> int:
-        """
-        Count tokens in messages including Anthropic format overhead.
+    def _message_overhead(self, message: Message) -> int:
+        """Turn prefix overhead for Anthropic format"""
+        if message.role == MessageRole.USER:
+            return self.HUMAN_TURN_PREFIX
+        if message.role == MessageRole.ASSISTANT:
+            return self.ASSISTANT_TURN_PREFIX
+        if message.role == MessageRole.SYSTEM:
+            # System messages have minimal overhead in Anthropic format
+            return 1
+        return 0
 
-        Args:
-            messages: List of Message objects
 
-        Returns:
-            Total token count
-        """
-        if not messages:
-            return 0
+class ApproximateTokenCounter(TokenCounter):
+    """
+    Token counter for models without a known tokenizer.
 
-        total = 0
+    Uses the ~4 characters per token heuristic with OpenAI-style message
+    overhead.
+    """
+
+    MESSAGE_OVERHEAD = 4
+    REPLY_PRIMING = 3
+
+    def __init__(self, model: str = ""):
+        """
+        Initialize approximate token counter.
 
-        for msg in messages:
-            # Turn prefix overhead
-            if msg.role == MessageRole.USER:
-                total += self.HUMAN_TURN_PREFIX
-            elif msg.role == MessageRole.ASSISTANT:
-                total += self.ASSISTANT_TURN_PREFIX
-            elif msg.role == MessageRole.SYSTEM:
-                # System messages have minimal overhead in Anthropic format
-                total += 1
+        Args:
+            model: Model name
+        """
+        super().__init__()
+        self.model = model
 
-            # Content tokens
-            if msg.content:
-                total += self.count(msg.content)
+    def _count_text(self, text: str) -> int:
+        """Approximate token count (~4 characters per token)"""
+        return max(1, len(text) // 4)
 
-        return total
+    def _message_overhead(self, message: Message) -> int:
+        """Formatting tokens per message (role and markers)"""
+        return self.MESSAGE_OVERHEAD + 1
 
 
 def get_token_counter(model: str) -> TokenCounter:
@@ -288,9 +508,9 @@ def get_token_counter(model: str) -> TokenCounter:
     ):
         counter = AnthropicTokenCounter(model=model)
     else:
-        # Default to tiktoken with cl100k_base for unknown models
-        logger.info(f"Unknown model '{model}', defaulting to TiktokenCounter")
-        counter = TiktokenCounter(model=model)
+        # Local and other models: their tokenizers are not tiktoken's
+        logger.info(f"Unknown model '{model}', using approximate token counts")
+        counter = ApproximateTokenCounter(model=model)
 
     # Cache the counter
     _counter_cache[model] = counter
@@ -6,10 +6,15 @@ Exports all service classes for convenient imports.
 
 from .model_registry import ModelRegistry
 from .llm_router import LLMRouter
+from .latency_tracker import LatencyTracker
 from .semantic_cache import SemanticCache
+from .vector_index import VectorIndex, IVFVectorIndex, RediSearchVectorIndex
 from .rate_limiter import RateLimiter
 from .circuit_breaker import CircuitBreaker
 from .request_queue import RequestQueue, Priority
+from .request_coalescer import RequestCoalescer
+from .batch_dispatcher import BatchDispatcher
+from .hedging import HedgingPolicy
 from .model_gateway import ModelGateway
 from .l01_bridge import L01Bridge
 from .metrics import MetricsManager, get_metrics_manager, metrics
@@ -17,11 +22,18 @@ from .metrics import MetricsManager, get_metrics_manager, metrics
 __all__ = [
     "ModelRegistry",
     "LLMRouter",
+    "LatencyTracker",
     "SemanticCache",
+    "VectorIndex",
+    "IVFVectorIndex",
+    "RediSearchVectorIndex",
     "RateLimiter",
     "CircuitBreaker",
     "RequestQueue",
     "Priority",
+    "RequestCoalescer",
+    "BatchDispatcher",
+    "HedgingPolicy",
     "ModelGateway",
     "L01Bridge",
     "MetricsManager",
@@ -0,0 +1,221 @@
+"""
+L04 Model Gateway Layer - Batch Dispatcher Service
+
+Micro-batching of requests to the same provider and model.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from ..models import (
+    InferenceRequest,
+    InferenceResponse,
+    ProviderError,
+    L04ErrorCode
+)
+from ..providers import ProviderAdapter
+from .metrics import get_metrics_manager
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PendingBatch:
+    """Requests collected for one (provider, model, kind) within a window"""
+    provider: ProviderAdapter
+    model_id: str
+    kind: str
+    items: List[Tuple[Any, asyncio.Future, float]] = field(default_factory=list)
+    timer: Optional[asyncio.TimerHandle] = None
+
+
+class BatchDispatcher:
+    """
+    Micro-batching dispatcher for provider adapters
+
+    Collects requests for the same provider and model for up to
+    max_wait_ms (or until max_batch_size requests are waiting), sends them
+    as one batched provider call and resolves each caller's future with
+    its own result.
+
+    Completions are only batched for adapters whose supports_batching()
+    is True; other adapters are called directly. Embeddings are batched
+    for adapters whose supports_embeddings() is True.
+    """
+
+    def __init__(
+        self,
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Initialize batch dispatcher
+
+        Args:
+            max_batch_size: Maximum requests per batched call
+            max_wait_ms: Maximum time the first request waits for a batch to fill
+        """
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending: Dict[Tuple[str, str, str], _PendingBatch] = {}
+        self._inflight: set = set()
+        self.metrics = get_metrics_manager()
+        self._stats = {
+            "batches": 0,
+            "batched_items": 0,
+            "direct_calls": 0
+        }
+        logger.info(
+            f"BatchDispatcher initialized (max_batch_size={max_batch_size}, "
+            f"max_wait_ms={max_wait_ms})"
+        )
+
+    async def submit(
+        self,
+        provider: ProviderAdapter,
+        model_id: str,
+        request: InferenceRequest
+    ) -> InferenceResponse:
+        """
+        Execute a completion, batched with concurrent requests to the same model
+
+        Args:
+            provider: Provider adapter
+            model_id: Model to use
+            request: InferenceRequest to execute
+
+        Returns:
+            InferenceResponse for this request
+        """
+        if not provider.supports_batching():
+            self._stats["direct_calls"] += 1
+            return await provider.complete(request, model_id)
+        return await self._enqueue(provider, model_id, "complete", request)
+
+    async def submit_embedding(
+        self,
+        provider: ProviderAdapter,
+        model_id: str,
+        text: str
+    ) -> List[float]:
+        """
+        Embed text, batched with concurrent embeddings for the same model
+
+        Args:
+            provider: Provider adapter supporting embeddings
+            model_id: Embedding model
+            text: Text to embed
+
+        Returns:
+            Embedding vector
+        """
+        if not provider.supports_embeddings():
+            raise ProviderError(
+                L04ErrorCode.E4207_MODEL_NOT_SUPPORTED,
+                f"Provider {provider.provider_id} does not support embeddings"
+            )
+        return await self._enqueue(provider, model_id, "embed", text)
+
+    async def _enqueue(
+        self,
+        provider: ProviderAdapter,
+        model_id: str,
+        kind: str,
+        payload: Any
+    ) -> Any:
+        """Add an item to its pending batch and wait for the result"""
+        loop = asyncio.get_running_loop()
+        key = (provider.provider_id, model_id, kind)
+
+        batch = self._pending.get(key)
+        if batch is None:
+            batch = _PendingBatch(provider=provider, model_id=model_id, kind=kind)
+            batch.timer = loop.call_later(
+                self.max_wait_ms / 1000.0, self._flush, key
+            )
+            self._pending[key] = batch
+
+        future = loop.create_future()
+        batch.items.append((payload, future, time.monotonic()))
+
+        if len(batch.items) >= self.max_batch_size:
+            self._flush(key)
+
+        return await future
+
+    def _flush(self, key: Tuple[str, str, str]) -> None:
+        """Detach the pending batch for key and dispatch it"""
+        batch = self._pending.pop(key, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _dispatch(self, batch: _PendingBatch) -> None:
+        """Send one batched provider call and fan results out"""
+        now = time.monotonic()
+        payloads = [payload for payload, _, _ in batch.items]
+        futures = [future for _, future, _ in batch.items]
+
+        self._stats["batches"] += 1
+        self._stats["batched_items"] += len(payloads)
+        self.metrics.record_batch(
+            provider=batch.provider.provider_id,
+            model=batch.model_id,
+            kind=batch.kind,
+            batch_size=len(payloads),
+            queue_delays=[now - enqueued for _, _, enqueued in batch.items]
+        )
+
+        try:
+            if batch.kind == "embed":
+                results = await batch.provider.embed(payloads, batch.model_id)
+            else:
+                results = await batch.provider.complete_batch(payloads, batch.model_id)
+
+            if len(results) != len(futures):
+                raise ProviderError(
+                    L04ErrorCode.E4205_PROVIDER_INVALID_RESPONSE,
+                    f"Batched call returned {len(results)} results for {len(futures)} requests"
+                )
+        except Exception as e:
+            logger.warning(
+                f"Batched {batch.kind} on {batch.provider.provider_id}/{batch.model_id} "
+                f"failed for {len(futures)} requests: {e}"
+            )
+            results = [e] * len(futures)
+
+        for future, result in zip(futures, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def flush_all(self) -> None:
+        """Dispatch every pending batch and wait for in-flight batches"""
+        for key in list(self._pending):
+            self._flush(key)
+        if self._inflight:
+            await asyncio.gather(*list(self._inflight), return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        """Get dispatcher statistics"""
+        batches = self._stats["batches"]
+        return {
+            **self._stats,
+            "pending_batches": len(self._pending),
+            "average_batch_size": (
+                self._stats["batched_items"] / batches if batches > 0 else 0.0
+            ),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms
+        }
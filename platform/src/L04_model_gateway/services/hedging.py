@@ -0,0 +1,111 @@
+"""
+L04 Model Gateway Layer - Hedging Policy Service
+
+Deadline and budget rules for hedged requests.
+"""
+
+import logging
+
+from .latency_tracker import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+
+class HedgingPolicy:
+    """
+    Policy for hedging slow requests onto a fallback model
+
+    If the primary has not answered by the given latency percentile of
+    its recent attempts, the gateway sends the request to the first
+    fallback as well and keeps whichever answer arrives first.
+
+    Hedges are paid for from a budget: every request adds max_hedge_ratio
+    credits (up to burst) and every hedge spends one, so over time at most
+    max_hedge_ratio of traffic is hedged.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_hedge_ratio: float = 0.1,
+        burst: float = 10.0,
+        min_delay_ms: float = 50.0,
+        max_delay_ms: float = 30000.0
+    ):
+        """
+        Initialize hedging policy
+
+        Args:
+            percentile: Latency percentile of the primary used as deadline
+            max_hedge_ratio: Maximum fraction of requests that may be hedged
+            burst: Maximum unspent hedge credits
+            min_delay_ms: Lower bound on the hedge deadline
+            max_delay_ms: Upper bound on the hedge deadline
+        """
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.burst = burst
+        self.min_delay_ms = min_delay_ms
+        self.max_delay_ms = max_delay_ms
+        self._credits = 0.0
+        self._stats = {
+            "requests": 0,
+            "hedges_fired": 0,
+            "hedges_won": 0,
+            "budget_denied": 0
+        }
+        logger.info(
+            f"HedgingPolicy initialized (percentile={percentile}, "
+            f"max_hedge_ratio={max_hedge_ratio})"
+        )
+
+    def hedge_delay_ms(
+        self,
+        tracker: LatencyTracker,
+        model_id: str,
+        prior_ms: float
+    ) -> float:
+        """
+        How long to wait for the primary before hedging
+
+        Args:
+            tracker: Live latency stats
+            model_id: Primary model ID
+            prior_ms: Deadline used until the model has enough samples
+
+        Returns:
+            Delay in milliseconds
+        """
+        delay = tracker.percentile_ms(model_id, self.percentile, prior_ms)
+        return min(self.max_delay_ms, max(self.min_delay_ms, delay))
+
+    def record_request(self) -> None:
+        """Accrue hedge budget for one request eligible for hedging"""
+        self._stats["requests"] += 1
+        self._credits = min(self.burst, self._credits + self.max_hedge_ratio)
+
+    def try_acquire(self) -> bool:
+        """Spend one hedge credit if available"""
+        if self._credits < 1.0:
+            self._stats["budget_denied"] += 1
+            return False
+        self._credits -= 1.0
+        self._stats["hedges_fired"] += 1
+        return True
+
+    def record_win(self) -> None:
+        """Record a hedge that answered before the primary"""
+        self._stats["hedges_won"] += 1
+
+    def get_stats(self) -> dict:
+        """Get hedging statistics"""
+        requests = self._stats["requests"]
+        return {
+            **self._stats,
+            "hedge_ratio": (
+                self._stats["hedges_fired"] / requests if requests > 0 else 0.0
+            ),
+            "credits": round(self._credits, 2),
+            "percentile": self.percentile,
+            "max_hedge_ratio": self.max_hedge_ratio
+        }
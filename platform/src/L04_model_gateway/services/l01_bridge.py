@@ -63,11 +63,16 @@ class L01Bridge:
     async def _get_client(self) -> httpx.AsyncClient:
         """Get or create HTTP client with authentication headers."""
         if self._client is None:
-            headers = {"Content-Type": "application/json"}
+            # Imported here: the shared package's __init__ pulls in
+            # dependencies (e.g. PyJWT) that L04 does not need
+            from shared.wire import WireClient
+
+            headers = {}
             if self.api_key:
                 headers["Authorization"] = f"Bearer {self.api_key}"
 
-            self._client = httpx.AsyncClient(
+            # Pooled keep-alive connections, MessagePack bodies when available
+            self._client = WireClient(
                 base_url=self.base_url,
                 timeout=self.timeout,
                 headers=headers,
@@ -314,7 +319,8 @@ class L01Bridge:
             response = await client.get("/api/models/usage/stats", params=params)
             response.raise_for_status()
 
-            return response.json()
+            from shared.wire import decode_response
+            return decode_response(response)
 
         except Exception as e:
             logger.warning(f"Failed to get agent usage from L01: {e}")
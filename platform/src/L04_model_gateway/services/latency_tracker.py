@@ -0,0 +1,239 @@
+"""
+L04 Model Gateway Layer - Latency Tracker Service
+
+Live per-model latency and error statistics for adaptive routing.
+"""
+
+from collections import deque
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ModelLatencyStats:
+    """
+    Rolling latency and error statistics for one model
+
+    Keeps an EWMA of latency and error rate, plus a window of recent
+    latencies for percentiles. Until the first sample arrives, the EWMA
+    and P95 are seeded from the model's configured p50/p99; readers may
+    pass the priors again, since stats can be created before the config
+    is at hand.
+    """
+
+    def __init__(
+        self,
+        prior_latency_ms: float = 1000.0,
+        prior_p95_ms: float = 5000.0,
+        alpha: float = 0.2,
+        window: int = 256
+    ):
+        """
+        Initialize model stats
+
+        Args:
+            prior_latency_ms: Latency assumed before any samples
+            prior_p95_ms: P95 assumed before enough samples
+            alpha: EWMA smoothing factor (higher reacts faster)
+            window: Number of recent latencies kept for percentiles
+        """
+        self.alpha = alpha
+        self.ewma_latency_ms = float(prior_latency_ms)
+        self.ewma_error_rate = 0.0
+        self.prior_p95_ms = float(prior_p95_ms)
+        self.samples = 0
+        self.attempts = 0
+        self.inflight = 0
+        self._window: deque = deque(maxlen=window)
+        self._sorted: Optional[list] = None
+
+    def record(self, latency_ms: float, success: bool) -> None:
+        """
+        Record one completed attempt
+
+        Failures only move the error rate: fast failures (e.g. an open
+        circuit) must not make a model look quick.
+
+        Args:
+            latency_ms: Attempt latency
+            success: Whether the attempt succeeded
+        """
+        self.ewma_error_rate += self.alpha * ((0.0 if success else 1.0) - self.ewma_error_rate)
+        self.attempts += 1
+        if success:
+            self.observe_latency(latency_ms)
+
+    def observe_latency(self, latency_ms: float) -> None:
+        """Add a latency sample without counting an attempt outcome"""
+        if self.samples == 0:
+            self.ewma_latency_ms = float(latency_ms)
+        else:
+            self.ewma_latency_ms += self.alpha * (latency_ms - self.ewma_latency_ms)
+        self.samples += 1
+        self._window.append(float(latency_ms))
+        self._sorted = None
+
+    def percentile(self, q: float) -> Optional[float]:
+        """Latency percentile over the window (None without samples)"""
+        if not self._window:
+            return None
+        if self._sorted is None:
+            self._sorted = sorted(self._window)
+        index = min(len(self._sorted) - 1, int(q * len(self._sorted)))
+        return self._sorted[index]
+
+    def p95_ms(self, min_samples: int = 20, prior_p95_ms: Optional[float] = None) -> float:
+        """P95 latency, falling back to the prior with too few samples"""
+        if len(self._window) < min_samples:
+            return self.prior_p95_ms if prior_p95_ms is None else prior_p95_ms
+        return self.percentile(0.95)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary for serialization"""
+        return {
+            "samples": self.samples,
+            "attempts": self.attempts,
+            "inflight": self.inflight,
+            "ewma_latency_ms": round(self.ewma_latency_ms, 1),
+            "error_rate": round(self.ewma_error_rate, 4),
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.p95_ms()
+        }
+
+
+class LatencyTracker:
+    """
+    Live latency statistics for every routed model
+
+    ModelGateway reports each provider attempt here; LLMRouter reads the
+    expected latency and P95 to rank candidates.
+    """
+
+    def __init__(
+        self,
+        alpha: float = 0.2,
+        window: int = 256,
+        min_samples: int = 20,
+        inflight_penalty: float = 0.05
+    ):
+        """
+        Initialize latency tracker
+
+        Args:
+            alpha: EWMA smoothing factor
+            window: Recent latencies kept per model for percentiles
+            min_samples: Samples needed before the observed P95 is trusted
+            inflight_penalty: Fractional slowdown assumed per in-flight
+                request when estimating a model's latency
+        """
+        self.alpha = alpha
+        self.window = window
+        self.min_samples = min_samples
+        self.inflight_penalty = inflight_penalty
+        self._models: Dict[str, ModelLatencyStats] = {}
+
+    def get(
+        self,
+        model_id: str,
+        prior_latency_ms: float = 1000.0,
+        prior_p95_ms: float = 5000.0
+    ) -> ModelLatencyStats:
+        """Get stats for a model, creating them from the priors if new"""
+        stats = self._models.get(model_id)
+        if stats is None:
+            stats = ModelLatencyStats(
+                prior_latency_ms, prior_p95_ms, self.alpha, self.window
+            )
+            self._models[model_id] = stats
+        return stats
+
+    def start(self, model_id: str) -> None:
+        """Mark an attempt on model_id as in flight"""
+        self.get(model_id).inflight += 1
+
+    def finish(self, model_id: str, latency_ms: float, success: bool) -> None:
+        """
+        Record a finished attempt
+
+        Args:
+            model_id: Model that served the attempt
+            latency_ms: Attempt latency
+            success: Whether the attempt succeeded
+        """
+        stats = self.get(model_id)
+        stats.inflight = max(0, stats.inflight - 1)
+        stats.record(latency_ms, success)
+
+    def abandon(self, model_id: str, elapsed_ms: float) -> None:
+        """
+        Record an attempt cancelled before it finished (e.g. a hedge loser)
+
+        The elapsed time is a lower bound on the attempt's latency, so it
+        is kept as a latency sample; the error rate is left unchanged.
+
+        Args:
+            model_id: Model that served the attempt
+            elapsed_ms: Time until cancellation
+        """
+        stats = self.get(model_id)
+        stats.inflight = max(0, stats.inflight - 1)
+        stats.observe_latency(elapsed_ms)
+
+    def expected_latency_ms(
+        self,
+        model_id: str,
+        prior_latency_ms: float = 1000.0,
+        prior_p95_ms: float = 5000.0
+    ) -> float:
+        """
+        Expected latency of the next request to model_id
+
+        A failed attempt is assumed to cost about a P95 before failover
+        completes, and every in-flight request adds inflight_penalty.
+        The priors apply until the model has enough samples, even if its
+        stats were already created by start().
+
+        Args:
+            model_id: Model ID
+            prior_latency_ms: Latency assumed before the first sample
+            prior_p95_ms: P95 assumed before min_samples samples
+
+        Returns:
+            Expected latency in milliseconds
+        """
+        stats = self.get(model_id, prior_latency_ms, prior_p95_ms)
+        latency = stats.ewma_latency_ms if stats.samples else prior_latency_ms
+        p95 = stats.p95_ms(self.min_samples, prior_p95_ms)
+        base = latency + stats.ewma_error_rate * p95
+        return base * (1.0 + self.inflight_penalty * stats.inflight)
+
+    def p95_ms(
+        self,
+        model_id: str,
+        prior_p95_ms: float = 5000.0
+    ) -> float:
+        """Observed P95 for model_id (prior until min_samples)"""
+        stats = self._models.get(model_id)
+        if stats is None:
+            return prior_p95_ms
+        return stats.p95_ms(self.min_samples, prior_p95_ms)
+
+    def percentile_ms(
+        self,
+        model_id: str,
+        q: float,
+        prior_ms: float
+    ) -> float:
+        """Observed latency percentile q for model_id (prior until min_samples)"""
+        stats = self._models.get(model_id)
+        if stats is None or stats.samples < self.min_samples:
+            return prior_ms
+        return stats.percentile(q)
+
+    def get_stats(self) -> dict:
+        """Get per-model statistics"""
+        return {
+            model_id: stats.to_dict()
+            for model_id, stats in self._models.items()
+        }
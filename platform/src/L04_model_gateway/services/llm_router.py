@@ -4,6 +4,7 @@ L04 Model Gateway Layer - LLM Router Service
 Intelligent model selection based on requirements, cost, and availability.
 """
 
+import random
 from typing import List, Optional, Dict
 import logging
 
@@ -19,6 +20,7 @@ from ..models import (
     RoutingError
 )
 from .model_registry import ModelRegistry
+from .latency_tracker import LatencyTracker
 
 logger = logging.getLogger(__name__)
 
@@ -33,12 +35,18 @@ class LLMRouter:
     - Latency requirements
     - Provider health
     - Data residency
+
+    Latency filtering and ranking use live per-model statistics from the
+    LatencyTracker once enough samples exist, and the configured
+    p50/p99 values until then.
     """
 
     def __init__(
         self,
         registry: ModelRegistry,
-        default_strategy: RoutingStrategy = RoutingStrategy.CAPABILITY_FIRST
+        default_strategy: RoutingStrategy = RoutingStrategy.CAPABILITY_FIRST,
+        latency_tracker: Optional[LatencyTracker] = None,
+        seed: Optional[int] = None
     ):
         """
         Initialize router
@@ -46,10 +54,14 @@ class LLMRouter:
         Args:
             registry: ModelRegistry instance
             default_strategy: Default routing strategy
+            latency_tracker: Live latency stats (creates default if None)
+            seed: Optional seed for the adaptive strategy's random choices
         """
         self.registry = registry
         self.default_strategy = default_strategy
         self.provider_health: Dict[str, ProviderHealth] = {}
+        self.latency_tracker = latency_tracker or LatencyTracker()
+        self._rng = random.Random(seed)
         logger.info(f"LLMRouter initialized with strategy: {default_strategy.value}")
 
     def update_provider_health(self, health: ProviderHealth) -> None:
@@ -149,6 +161,7 @@ class LLMRouter:
                 estimated_tokens,
                 request.requirements.max_output_tokens
             )
+            estimated_latency = self._expected_latency(primary)
 
             decision = RoutingDecision(
                 primary_model_id=primary.model_id,
@@ -156,11 +169,15 @@ class LLMRouter:
                 fallback_models=fallbacks,
                 routing_strategy=strategy,
                 estimated_cost_cents=estimated_cost,
-                estimated_latency_ms=primary.latency_p50_ms,
+                estimated_latency_ms=int(estimated_latency),
                 reason=self._generate_reason(primary, strategy),
                 metadata={
                     "candidates_count": len(candidates),
-                    "estimated_input_tokens": estimated_tokens
+                    "estimated_input_tokens": estimated_tokens,
+                    # Deadline after which a hedged request may be sent
+                    "hedge_after_ms": int(self.latency_tracker.p95_ms(
+                        primary.model_id, primary.latency_p99_ms
+                    ))
                 }
             )
 
@@ -281,11 +298,11 @@ class LLMRouter:
 
         filtered = [
             m for m in candidates
-            if m.latency_p99_ms <= max_latency
+            if self.latency_tracker.p95_ms(m.model_id, m.latency_p99_ms) <= max_latency
         ]
 
         logger.debug(
-            f"Latency filter: {len(filtered)} models with p99 <= {max_latency}ms"
+            f"Latency filter: {len(filtered)} models with tail latency <= {max_latency}ms"
         )
         return filtered if filtered else candidates  # Don't eliminate all candidates
 
@@ -309,6 +326,9 @@ class LLMRouter:
         elif strategy == RoutingStrategy.PROVIDER_PINNED:
             return self._filter_by_preferred_providers(request, candidates)
 
+        elif strategy == RoutingStrategy.ADAPTIVE:
+            return self._rank_adaptive(candidates)
+
         else:  # CAPABILITY_FIRST (default)
             return self._rank_by_cost(request, candidates)
 
@@ -334,7 +354,33 @@ class LLMRouter:
         candidates: List[ModelConfig]
     ) -> List[ModelConfig]:
         """Rank models by latency (fastest first)"""
-        return sorted(candidates, key=lambda m: m.latency_p50_ms)
+        return sorted(candidates, key=self._expected_latency)
+
+    def _expected_latency(self, model: ModelConfig) -> float:
+        """Expected latency of model from live stats (config values as prior)"""
+        return self.latency_tracker.expected_latency_ms(
+            model.model_id, model.latency_p50_ms, model.latency_p99_ms
+        )
+
+    def _rank_adaptive(
+        self,
+        candidates: List[ModelConfig]
+    ) -> List[ModelConfig]:
+        """
+        Rank models by expected latency using power-of-two-choices
+
+        The primary is the faster of two randomly sampled candidates, so
+        load spreads across near-equal models instead of herding onto
+        whichever one currently looks best. Remaining candidates follow
+        in expected-latency order as fallbacks.
+        """
+        ranked = sorted(candidates, key=self._expected_latency)
+        if len(ranked) <= 2:
+            return ranked
+
+        first, second = self._rng.sample(ranked, 2)
+        primary = min(first, second, key=self._expected_latency)
+        return [primary] + [m for m in ranked if m is not primary]
 
     def _rank_by_quality(
         self,
@@ -0,0 +1,181 @@
+"""
+L04 Model Gateway Layer - Local Cache Service
+
+Bounded in-process cache with LRU eviction and TinyLFU admission.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class _FrequencySketch:
+    """
+    Count-min sketch of recent access frequency
+
+    Four rows of 4-bit saturating counters. Every counter is halved once
+    the number of recorded accesses reaches sample_size, so the sketch
+    tracks recent popularity rather than all-time counts.
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+    SEEDS = (0x9E3779B9, 0x85EBCA6B, 0xC2B2AE35, 0x27D4EB2F)
+
+    def __init__(self, capacity: int):
+        width = 16
+        while width < capacity * 4:
+            width <<= 1
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in range(self.DEPTH)]
+        self._sample_size = max(10 * capacity, 16)
+        self._additions = 0
+
+    def _indexes(self, key: Hashable):
+        h = hash(key)
+        for seed in self.SEEDS:
+            yield ((h ^ seed) * 0x9E3779B97F4A7C15 >> 17) & self._mask
+
+    def increment(self, key: Hashable) -> None:
+        """Record one access to key"""
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+
+        self._additions += 1
+        if self._additions >= self._sample_size:
+            self._age()
+
+    def estimate(self, key: Hashable) -> int:
+        """Estimated recent access count for key"""
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def _age(self) -> None:
+        """Halve every counter"""
+        for row in self._rows:
+            for i, count in enumerate(row):
+                if count:
+                    row[i] = count >> 1
+        self._additions //= 2
+
+
+class LocalCache:
+    """
+    In-process LRU cache with TinyLFU admission
+
+    Entries are evicted least-recently-used first. When the cache is full a
+    new key only displaces the LRU victim if the frequency sketch has seen
+    it more often recently, so one-off keys cannot flush out hot entries.
+    Entries also expire after ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 60.0
+    ):
+        """
+        Initialize local cache
+
+        Args:
+            max_entries: Maximum number of entries held
+            ttl_seconds: Default entry lifetime
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._sketch = _FrequencySketch(max_entries)
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "rejections": 0
+        }
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Get a value, refreshing its recency
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None if absent or expired
+        """
+        self._sketch.increment(key)
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self._stats["misses"] += 1
+            return None
+
+        value, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            self._stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self._stats["hits"] += 1
+        return value
+
+    def put(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl_seconds: Optional[float] = None
+    ) -> bool:
+        """
+        Store a value if the admission policy accepts it
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl_seconds: Entry lifetime (defaults to the cache TTL)
+
+        Returns:
+            True if the value was stored
+        """
+        self._sketch.increment(key)
+        expires_at = time.monotonic() + (ttl_seconds or self.ttl_seconds)
+
+        if key in self._entries:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            return True
+
+        if len(self._entries) >= self.max_entries:
+            victim, (_, victim_expires_at) = next(iter(self._entries.items()))
+            expired = victim_expires_at <= time.monotonic()
+            if not expired and self._sketch.estimate(key) <= self._sketch.estimate(victim):
+                self._stats["rejections"] += 1
+                return False
+            del self._entries[victim]
+            self._stats["evictions"] += 1
+
+        self._entries[key] = (value, expires_at)
+        return True
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Remove key; returns True if it was present"""
+        return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> dict:
+        """Get local cache statistics"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            **self._stats,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": self._stats["hits"] / lookups if lookups > 0 else 0.0
+        }
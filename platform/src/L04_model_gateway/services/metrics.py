@@ -5,7 +5,7 @@ Provides observability metrics for monitoring and alerting.
 """
 
 from prometheus_client import Counter, Histogram, Gauge, Info
-from typing import Optional
+from typing import Optional, List
 import logging
 
 logger = logging.getLogger(__name__)
@@ -40,6 +40,31 @@ RATE_LIMIT_REJECTIONS_TOTAL = Counter(
     ["agent_did"]
 )
 
+# Coalesced request counter
+COALESCED_REQUESTS_TOTAL = Counter(
+    "l04_coalesced_requests_total",
+    "Total number of requests served by sharing an identical in-flight request"
+)
+
+# Hedged request counters
+HEDGES_FIRED_TOTAL = Counter(
+    "l04_hedges_fired_total",
+    "Total number of hedged requests sent to a fallback model",
+    ["model"]
+)
+
+HEDGES_WON_TOTAL = Counter(
+    "l04_hedges_won_total",
+    "Total number of hedged requests that answered before the primary",
+    ["model"]
+)
+
+HEDGE_WASTED_TOKENS_TOTAL = Counter(
+    "l04_hedge_wasted_tokens_total",
+    "Estimated tokens spent on the losing side of hedged requests",
+    ["model"]
+)
+
 # Token usage counters
 TOKEN_USAGE_TOTAL = Counter(
     "l04_token_usage_total",
@@ -61,6 +86,38 @@ INFERENCE_LATENCY_SECONDS = Histogram(
 )
 
 
+# Streaming latency histograms
+TIME_TO_FIRST_TOKEN_SECONDS = Histogram(
+    "l04_time_to_first_token_seconds",
+    "Time from stream start to the first content chunk",
+    ["provider", "model"],
+    buckets=[0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0, 10.0]
+)
+
+INTER_TOKEN_LATENCY_SECONDS = Histogram(
+    "l04_inter_token_latency_seconds",
+    "Time between consecutive content chunks of a stream",
+    ["provider", "model"],
+    buckets=[0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0]
+)
+
+
+# Micro-batching histograms
+BATCH_SIZE = Histogram(
+    "l04_batch_size",
+    "Number of requests sent in one batched provider call",
+    ["provider", "model", "kind"],
+    buckets=[1, 2, 4, 8, 16, 32, 64, 128]
+)
+
+BATCH_QUEUE_DELAY_SECONDS = Histogram(
+    "l04_batch_queue_delay_seconds",
+    "Time a request waited for its batch to be dispatched",
+    ["provider", "model", "kind"],
+    buckets=[0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25]
+)
+
+
 # =============================================================================
 # Gauges
 # =============================================================================
@@ -180,6 +237,38 @@ class MetricsManager:
         """Record a cache miss."""
         CACHE_MISSES_TOTAL.inc()
 
+    def record_coalesced_request(self):
+        """Record a request that shared another request's provider call."""
+        COALESCED_REQUESTS_TOTAL.inc()
+
+    def record_hedge_fired(self, model: str):
+        """
+        Record a hedge sent because the primary missed its deadline.
+
+        Args:
+            model: Primary model ID
+        """
+        HEDGES_FIRED_TOTAL.labels(model=model).inc()
+
+    def record_hedge_won(self, model: str):
+        """
+        Record a hedge that answered before the primary.
+
+        Args:
+            model: Primary model ID
+        """
+        HEDGES_WON_TOTAL.labels(model=model).inc()
+
+    def record_hedge_wasted_tokens(self, model: str, tokens: int):
+        """
+        Record tokens spent on the losing side of a hedge.
+
+        Args:
+            model: Model whose attempt lost
+            tokens: Estimated tokens consumed by the losing attempt
+        """
+        HEDGE_WASTED_TOKENS_TOTAL.labels(model=model).inc(tokens)
+
     def record_rate_limit_rejection(self, agent_did: str):
         """
         Record a rate limit rejection.
@@ -191,6 +280,72 @@ class MetricsManager:
         safe_did = agent_did.replace(":", "_").replace("-", "_")[:64]
         RATE_LIMIT_REJECTIONS_TOTAL.labels(agent_did=safe_did).inc()
 
+    # =========================================================================
+    # Streaming Metrics
+    # =========================================================================
+
+    def record_time_to_first_token(
+        self,
+        provider: str,
+        model: str,
+        seconds: float
+    ):
+        """
+        Record time to the first streamed content chunk.
+
+        Args:
+            provider: Provider name
+            model: Model ID
+            seconds: Time from stream start to first content
+        """
+        TIME_TO_FIRST_TOKEN_SECONDS.labels(provider=provider, model=model).observe(seconds)
+
+    def record_inter_token_latency(
+        self,
+        provider: str,
+        model: str,
+        seconds: float
+    ):
+        """
+        Record the gap between two consecutive streamed content chunks.
+
+        Args:
+            provider: Provider name
+            model: Model ID
+            seconds: Time since the previous content chunk
+        """
+        INTER_TOKEN_LATENCY_SECONDS.labels(provider=provider, model=model).observe(seconds)
+
+    # =========================================================================
+    # Batching Metrics
+    # =========================================================================
+
+    def record_batch(
+        self,
+        provider: str,
+        model: str,
+        kind: str,
+        batch_size: int,
+        queue_delays: List[float]
+    ):
+        """
+        Record a dispatched micro-batch.
+
+        Args:
+            provider: Provider name
+            model: Model ID
+            kind: Batch kind ("complete" or "embed")
+            batch_size: Number of requests in the batch
+            queue_delays: Seconds each request waited before dispatch
+        """
+        BATCH_SIZE.labels(provider=provider, model=model, kind=kind).observe(batch_size)
+
+        delay_histogram = BATCH_QUEUE_DELAY_SECONDS.labels(
+            provider=provider, model=model, kind=kind
+        )
+        for delay in queue_delays:
+            delay_histogram.observe(delay)
+
     # =========================================================================
     # Circuit Breaker Metrics
     # =========================================================================
@@ -4,14 +4,18 @@ L04 Model Gateway Layer - Model Gateway Service
 Main gateway service that coordinates all components.
 """
 
+import asyncio
 import logging
-from typing import Optional, Dict, AsyncIterator
+import time
+from dataclasses import replace
+from typing import Optional, Dict, AsyncIterator, List
 from datetime import datetime
 
 from ..models import (
     InferenceRequest,
     InferenceResponse,
     StreamChunk,
+    TokenUsage,
     RoutingStrategy,
     L04Error,
     L04ErrorCode,
@@ -20,16 +24,23 @@ from ..models import (
     RoutingError
 )
 from ..providers import ProviderAdapter, OllamaAdapter, MockAdapter
+from ..providers.token_counter import get_token_counter
 from .model_registry import ModelRegistry
 from .llm_router import LLMRouter
 from .semantic_cache import SemanticCache
 from .rate_limiter import RateLimiter
 from .circuit_breaker import CircuitBreaker
 from .request_queue import RequestQueue, Priority
+from .request_coalescer import RequestCoalescer
+from .batch_dispatcher import BatchDispatcher
+from .hedging import HedgingPolicy
 from .metrics import get_metrics_manager
 
 logger = logging.getLogger(__name__)
 
+# Tokenizer used for input estimates before a model has been chosen
+DEFAULT_COUNTER_MODEL = "gpt-4"
+
 
 class ModelGateway:
     """
@@ -39,6 +50,9 @@ class ModelGateway:
     with caching, rate limiting, routing, and failover.
     """
 
+    # Characters per chunk when replaying a cached response as a stream
+    REPLAY_CHUNK_CHARS = 32
+
     def __init__(
         self,
         registry: Optional[ModelRegistry] = None,
@@ -48,7 +62,10 @@ class ModelGateway:
         circuit_breaker: Optional[CircuitBreaker] = None,
         request_queue: Optional[RequestQueue] = None,
         providers: Optional[Dict[str, ProviderAdapter]] = None,
-        l01_bridge = None
+        l01_bridge = None,
+        coalescer: Optional[RequestCoalescer] = None,
+        batch_dispatcher: Optional[BatchDispatcher] = None,
+        hedging_policy: Optional[HedgingPolicy] = None
     ):
         """
         Initialize Model Gateway
@@ -62,6 +79,12 @@ class ModelGateway:
             request_queue: RequestQueue instance (creates default if None)
             providers: Dictionary of provider adapters (creates defaults if None)
             l01_bridge: Optional L04Bridge instance for L01 integration
+            coalescer: RequestCoalescer for deduplicating identical in-flight
+                requests (creates an in-process one if None)
+            batch_dispatcher: BatchDispatcher for micro-batching provider
+                calls (creates default if None)
+            hedging_policy: Optional HedgingPolicy; when set, slow primaries
+                are hedged onto the first fallback model
         """
         # Initialize registry
         self.registry = registry or ModelRegistry()
@@ -74,6 +97,9 @@ class ModelGateway:
         self.rate_limiter = rate_limiter or RateLimiter()
         self.circuit_breaker = circuit_breaker or CircuitBreaker()
         self.request_queue = request_queue or RequestQueue()
+        self.coalescer = coalescer or RequestCoalescer()
+        self.batch_dispatcher = batch_dispatcher or BatchDispatcher()
+        self.hedging_policy = hedging_policy
 
         # Initialize L01 bridge (optional)
         self.l01_bridge = l01_bridge
@@ -83,6 +109,12 @@ class ModelGateway:
         if not self.providers:
             self._setup_default_providers()
 
+        # Route cache embeddings through the batched provider endpoint
+        ollama = self.providers.get("ollama")
+        if self.cache.embedder is None and ollama and ollama.supports_embeddings():
+            embedding_model = self.cache.embedding_model
+            self.cache.embedder = lambda text: self.embed(text, embedding_model, "ollama")
+
         # Initialize metrics
         self.metrics = get_metrics_manager()
         self.metrics.initialize()
@@ -115,6 +147,10 @@ class ModelGateway:
         5. Cache response
         6. Return result
 
+        Steps 3-5 are coalesced for cacheable requests: concurrent requests
+        with the same cache key share one provider call, and each caller
+        receives the response under its own request_id.
+
         Args:
             request: InferenceRequest to execute
             routing_strategy: Optional routing strategy override
@@ -133,7 +169,7 @@ class ModelGateway:
             logger.info(f"Executing request {request.request_id}")
 
             # Step 1: Check rate limits
-            estimated_tokens = request.estimate_input_tokens()
+            estimated_tokens = self._estimate_input_tokens(request)
             try:
                 await self.rate_limiter.check_rate_limit(
                     agent_did=request.agent_did,
@@ -155,33 +191,29 @@ class ModelGateway:
             else:
                 self.metrics.record_cache_miss()
 
-            # Step 3: Route to model
-            routing_decision = self.router.route(request, routing_strategy)
-            provider_id = routing_decision.primary_provider
-            model_id = routing_decision.primary_model_id
-            logger.info(
-                f"Routed to {routing_decision.primary_model_id} "
-                f"({routing_decision.primary_provider})"
-            )
-
-            # Track active request
-            self.metrics.start_request(provider_id)
-
-            try:
-                # Step 4: Execute with failover
-                response = await self._execute_with_failover(
-                    request,
-                    routing_decision.primary_model_id,
-                    routing_decision.primary_provider,
-                    routing_decision.fallback_models
+            # Steps 3-5: Route, execute and cache (coalesced if cacheable)
+            if request.enable_cache:
+                cache_key = self.cache._generate_cache_key(request)
+                response, leader = await self.coalescer.run(
+                    cache_key,
+                    lambda: self._route_and_execute(request, routing_strategy),
+                    encode=self.cache._serialize_response,
+                    decode=lambda data: self.cache._deserialize_response(
+                        data, request.request_id
+                    )
                 )
-            finally:
-                # Always end active request tracking
-                self.metrics.end_request(provider_id)
+                if not leader:
+                    logger.info(
+                        f"Request {request.request_id} coalesced with in-flight "
+                        f"request {response.request_id}"
+                    )
+                    self.metrics.record_coalesced_request()
+                    return self._share_response(response, request)
+            else:
+                response = await self._route_and_execute(request, routing_strategy)
 
-            # Step 5: Cache response (if enabled and successful)
-            if request.enable_cache and response.is_success():
-                await self.cache.set(request, response)
+            provider_id = response.provider
+            model_id = response.model_id
 
             # Step 6: Record usage in L01 (if bridge is enabled)
             if self.l01_bridge:
@@ -234,6 +266,74 @@ class ModelGateway:
                 {"error": str(e)}
             )
 
+    async def _route_and_execute(
+        self,
+        request: InferenceRequest,
+        routing_strategy: Optional[RoutingStrategy] = None
+    ) -> InferenceResponse:
+        """
+        Route request, execute it with failover and cache the result
+
+        Args:
+            request: InferenceRequest to execute
+            routing_strategy: Optional routing strategy override
+
+        Returns:
+            InferenceResponse from the provider
+        """
+        routing_decision = self.router.route(request, routing_strategy)
+        provider_id = routing_decision.primary_provider
+        logger.info(
+            f"Routed to {routing_decision.primary_model_id} "
+            f"({routing_decision.primary_provider})"
+        )
+
+        # Track active request
+        self.metrics.start_request(provider_id)
+
+        try:
+            response = await self._execute_with_failover(
+                request,
+                routing_decision.primary_model_id,
+                routing_decision.primary_provider,
+                routing_decision.fallback_models
+            )
+        finally:
+            # Always end active request tracking
+            self.metrics.end_request(provider_id)
+
+        # Cache response (if enabled and successful)
+        if request.enable_cache and response.is_success():
+            await self.cache.set(request, response)
+
+        return response
+
+    def _share_response(
+        self,
+        response: InferenceResponse,
+        request: InferenceRequest
+    ) -> InferenceResponse:
+        """
+        Copy a coalesced response for another caller
+
+        Args:
+            response: Response produced for the leading request
+            request: Request that shared the call
+
+        Returns:
+            InferenceResponse carrying the caller's request_id
+        """
+        return replace(
+            response,
+            request_id=request.request_id,
+            cached=False,
+            metadata={
+                **response.metadata,
+                "coalesced": True,
+                "coalesced_with": response.request_id
+            }
+        )
+
     async def complete(
         self,
         request: InferenceRequest,
@@ -262,6 +362,13 @@ class ModelGateway:
         """
         Execute streaming inference request
 
+        Streaming pipeline:
+        1. Check rate limits on estimated input + output tokens
+        2. Replay a cached response as a stream (if cache enabled)
+        3. Route and stream from the provider through the circuit breaker
+        4. Cache the completed stream as a response (if cache enabled)
+        5. Reconcile the rate limit with actual token usage
+
         Args:
             request: InferenceRequest to execute
             routing_strategy: Optional routing strategy override
@@ -275,26 +382,39 @@ class ModelGateway:
         start_time = datetime.utcnow()
         provider_id = "unknown"
         model_id = request.model_id or "unknown"
+        input_tokens = self._estimate_input_tokens(request)
+        reserved_tokens = input_tokens + (request.logical_prompt.max_tokens or 0)
+        actual_tokens = reserved_tokens
+        admitted = False
 
         try:
             logger.info(f"Executing streaming request {request.request_id}")
 
-            # Check rate limits
-            estimated_tokens = request.estimate_input_tokens()
+            # Step 1: Check rate limits on the estimated total
             try:
                 await self.rate_limiter.check_rate_limit(
                     agent_did=request.agent_did,
                     provider="gateway",
-                    tokens=estimated_tokens
+                    tokens=reserved_tokens
                 )
             except RateLimitError:
                 self.metrics.record_rate_limit_rejection(request.agent_did)
                 raise
+            admitted = True
 
-            # Note: Streaming bypasses cache
+            # Step 2: Replay cached response
+            if request.enable_cache:
+                cached = await self.cache.get(request)
+                if cached:
+                    logger.info(f"Cache hit for streaming request {request.request_id}")
+                    self.metrics.record_cache_hit()
+                    actual_tokens = cached.token_usage.total_tokens
+                    for chunk in self._replay_as_stream(cached):
+                        yield chunk
+                    return
             self.metrics.record_cache_miss()
 
-            # Route to model
+            # Step 3: Route to model
             routing_decision = self.router.route(request, routing_strategy)
             provider_id = routing_decision.primary_provider
             model_id = routing_decision.primary_model_id
@@ -310,6 +430,11 @@ class ModelGateway:
             # Track active request
             self.metrics.start_request(provider_id)
 
+            content_parts = []
+            output_tokens = None
+            finish_reason = None
+            actual_tokens = input_tokens
+
             try:
                 # Execute streaming with circuit breaker
                 async def stream_operation():
@@ -320,16 +445,34 @@ class ModelGateway:
                     stream_operation
                 )
 
-                # Track token usage from stream
-                total_output_tokens = 0
+                stream_start = time.perf_counter()
+                last_token_at = None
 
-                # Yield chunks
                 async for chunk in stream_gen:
-                    # Estimate output tokens from chunk
                     if chunk.content_delta:
-                        total_output_tokens += len(chunk.content_delta) // 4
+                        now = time.perf_counter()
+                        if last_token_at is None:
+                            self.metrics.record_time_to_first_token(
+                                provider_id, model_id, now - stream_start
+                            )
+                        else:
+                            self.metrics.record_inter_token_latency(
+                                provider_id, model_id, now - last_token_at
+                            )
+                        last_token_at = now
+                        content_parts.append(chunk.content_delta)
+
+                    if chunk.token_count is not None:
+                        output_tokens = chunk.token_count
+                    if chunk.finish_reason:
+                        finish_reason = chunk.finish_reason
                     yield chunk
 
+                content = "".join(content_parts)
+                if output_tokens is None:
+                    output_tokens = get_token_counter(model_id).count(content)
+                actual_tokens = input_tokens + output_tokens
+
                 # Record success metrics after stream completes
                 latency_seconds = (datetime.utcnow() - start_time).total_seconds()
                 self.metrics.record_inference_request(
@@ -337,14 +480,35 @@ class ModelGateway:
                     model=model_id,
                     status="success",
                     latency_seconds=latency_seconds,
-                    input_tokens=estimated_tokens,
-                    output_tokens=total_output_tokens,
+                    input_tokens=input_tokens,
+                    output_tokens=output_tokens,
                     cached=False
                 )
 
+                # Step 4: Cache the completed stream
+                if request.enable_cache and content:
+                    await self.cache.set(request, InferenceResponse(
+                        request_id=request.request_id,
+                        model_id=model_id,
+                        provider=provider_id,
+                        content=content,
+                        token_usage=TokenUsage(
+                            input_tokens=input_tokens,
+                            output_tokens=output_tokens
+                        ),
+                        latency_ms=int(latency_seconds * 1000),
+                        finish_reason=finish_reason,
+                        metadata={"streamed": True}
+                    ))
+
             finally:
                 # Always end active request tracking
                 self.metrics.end_request(provider_id)
+                if output_tokens is None and content_parts:
+                    # Stream ended early: charge for what was produced
+                    actual_tokens = input_tokens + get_token_counter(model_id).count(
+                        "".join(content_parts)
+                    )
 
         except Exception as e:
             # Record error metrics
@@ -368,6 +532,67 @@ class ModelGateway:
                 {"error": str(e)}
             )
 
+        finally:
+            # Step 5: Settle the up-front reservation against actual usage
+            if admitted:
+                await self.rate_limiter.reconcile_tokens(
+                    agent_did=request.agent_did,
+                    provider="gateway",
+                    reserved_tokens=reserved_tokens,
+                    actual_tokens=actual_tokens
+                )
+
+    def _estimate_input_tokens(
+        self,
+        request: InferenceRequest,
+        model_id: Optional[str] = None
+    ) -> int:
+        """
+        Count input tokens with the (cached) tokenizer for a model
+
+        Counts are cached per counter by content hash, so repeated system
+        prompts and growing conversations are cheap to re-count.
+
+        Args:
+            request: Inference request
+            model_id: Model to count for (default: request.model_id)
+
+        Returns:
+            Input token count
+        """
+        counter = get_token_counter(
+            model_id or request.model_id or DEFAULT_COUNTER_MODEL
+        )
+        return request.estimate_input_tokens(counter)
+
+    def _replay_as_stream(self, response: InferenceResponse) -> List[StreamChunk]:
+        """
+        Split a cached response into stream chunks
+
+        Args:
+            response: Cached InferenceResponse
+
+        Returns:
+            StreamChunks covering the content, the last one marked final
+        """
+        content = response.content
+        size = self.REPLAY_CHUNK_CHARS
+        chunks = [
+            StreamChunk(
+                request_id=response.request_id,
+                content_delta=content[i:i + size]
+            )
+            for i in range(0, len(content), size)
+        ]
+        chunks.append(StreamChunk(
+            request_id=response.request_id,
+            content_delta="",
+            is_final=True,
+            token_count=response.token_usage.output_tokens,
+            finish_reason=response.finish_reason or "stop"
+        ))
+        return chunks
+
     async def _execute_with_failover(
         self,
         request: InferenceRequest,
@@ -390,8 +615,17 @@ class ModelGateway:
         Raises:
             ProviderError: If all attempts fail
         """
-        # Try primary model
+        fallback_models = list(fallback_models)
+
+        # Try primary model (hedged onto the first fallback if enabled)
         try:
+            if self.hedging_policy and fallback_models:
+                return await self._execute_hedged(
+                    request,
+                    primary_model_id,
+                    primary_provider,
+                    fallback_models
+                )
             return await self._execute_on_provider(
                 request,
                 primary_model_id,
@@ -429,6 +663,109 @@ class ModelGateway:
             {"primary": primary_model_id, "fallbacks": fallback_models}
         )
 
+    async def _execute_hedged(
+        self,
+        request: InferenceRequest,
+        primary_model_id: str,
+        primary_provider: str,
+        fallback_models: List[str]
+    ) -> InferenceResponse:
+        """
+        Execute on the primary, hedging onto the first fallback if it is slow
+
+        If the primary has not answered by the hedging policy's deadline and
+        the hedge budget allows, the first fallback is started in parallel.
+        The first successful answer wins and the other attempt is cancelled.
+        A hedged fallback is removed from fallback_models so failover does
+        not retry it.
+
+        Args:
+            request: InferenceRequest
+            primary_model_id: Primary model to try
+            primary_provider: Primary provider
+            fallback_models: Fallback model IDs (modified in place)
+
+        Returns:
+            InferenceResponse from whichever attempt answered first
+
+        Raises:
+            Exception: The last attempt's error if every attempt failed
+        """
+        policy = self.hedging_policy
+        policy.record_request()
+
+        primary_config = self.registry.get_model(primary_model_id)
+        delay_ms = policy.hedge_delay_ms(
+            self.router.latency_tracker,
+            primary_model_id,
+            primary_config.latency_p99_ms if primary_config else policy.max_delay_ms
+        )
+
+        primary = asyncio.ensure_future(
+            self._execute_on_provider(request, primary_model_id, primary_provider)
+        )
+        attempts = {primary: primary_model_id}
+
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay_ms / 1000)
+            hedge_model = self.registry.get_model(fallback_models[0])
+            if done or not hedge_model or not policy.try_acquire():
+                return await primary
+
+            fallback_models.pop(0)
+            self.metrics.record_hedge_fired(primary_model_id)
+            logger.info(
+                f"Primary {primary_model_id} slower than {delay_ms:.0f}ms, "
+                f"hedging request {request.request_id} on {hedge_model.model_id}"
+            )
+            hedge = asyncio.ensure_future(
+                self._execute_on_provider(request, hedge_model.model_id, hedge_model.provider)
+            )
+            attempts[hedge] = hedge_model.model_id
+
+            pending = set(attempts)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winners = [task for task in done if task.exception() is None]
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                if not winners:
+                    continue
+
+                winner = winners[0]
+                response = winner.result()
+
+                # Losing attempts: finished ones used all their tokens,
+                # cancelled ones at least consumed the prompt
+                for task in winners[1:]:
+                    self.metrics.record_hedge_wasted_tokens(
+                        attempts[task], task.result().token_usage.total_tokens
+                    )
+                for task in pending:
+                    task.cancel()
+                    self.metrics.record_hedge_wasted_tokens(
+                        attempts[task],
+                        self._estimate_input_tokens(request, attempts[task])
+                    )
+
+                if winner is hedge:
+                    policy.record_win()
+                    self.metrics.record_hedge_won(primary_model_id)
+                response.metadata["hedged"] = True
+                response.metadata["hedge_won"] = winner is hedge
+                return response
+
+            raise error
+
+        finally:
+            for task in attempts:
+                if not task.done():
+                    task.cancel()
+
     async def _execute_on_provider(
         self,
         request: InferenceRequest,
@@ -457,11 +794,63 @@ class ModelGateway:
                 f"Provider not configured: {provider_id}"
             )
 
-        # Execute through circuit breaker
+        # Execute through circuit breaker, batched with concurrent requests
         async def execute_operation():
-            return await provider.complete(request, model_id)
+            return await self.batch_dispatcher.submit(provider, model_id, request)
+
+        # Feed attempt latency and outcome to the router's live stats
+        tracker = self.router.latency_tracker
+        tracker.start(model_id)
+        started = time.perf_counter()
+        try:
+            response = await self.circuit_breaker.call(provider_id, execute_operation)
+        except asyncio.CancelledError:
+            tracker.abandon(model_id, (time.perf_counter() - started) * 1000)
+            raise
+        except Exception:
+            tracker.finish(model_id, (time.perf_counter() - started) * 1000, False)
+            raise
+
+        tracker.finish(
+            model_id, (time.perf_counter() - started) * 1000, response.is_success()
+        )
+        return response
+
+    async def embed(
+        self,
+        text: str,
+        model_id: str,
+        provider_id: str = "ollama"
+    ) -> List[float]:
+        """
+        Generate an embedding, batched with concurrent embedding calls
+
+        Embeddings go through their own "<provider>:embed" circuit, so
+        failing cache embeddings do not open the provider's completion
+        circuit.
+
+        Args:
+            text: Text to embed
+            model_id: Embedding model ID
+            provider_id: Provider to use
+
+        Returns:
+            Embedding vector
+
+        Raises:
+            ProviderError: If the provider is missing or embedding fails
+        """
+        provider = self.providers.get(provider_id)
+        if not provider:
+            raise ProviderError(
+                L04ErrorCode.E4002_PROVIDER_NOT_CONFIGURED,
+                f"Provider not configured: {provider_id}"
+            )
+
+        async def embed_operation():
+            return await self.batch_dispatcher.submit_embedding(provider, model_id, text)
 
-        return await self.circuit_breaker.call(provider_id, execute_operation)
+        return await self.circuit_breaker.call(f"{provider_id}:embed", embed_operation)
 
     async def health_check(self) -> Dict[str, dict]:
         """
@@ -476,6 +865,12 @@ class ModelGateway:
             "registry": self.registry.get_stats(),
             "cache": self.cache.get_stats(),
             "queue": self.request_queue.get_stats(),
+            "coalescer": self.coalescer.get_stats(),
+            "batching": self.batch_dispatcher.get_stats(),
+            "latency": self.router.latency_tracker.get_stats(),
+            "hedging": (
+                self.hedging_policy.get_stats() if self.hedging_policy else None
+            ),
             "circuit_breaker": self.circuit_breaker.get_stats(),
             "providers": {}
         }
@@ -502,12 +897,18 @@ class ModelGateway:
         """Cleanup resources"""
         logger.info("Closing ModelGateway")
 
+        if self.batch_dispatcher:
+            await self.batch_dispatcher.flush_all()
+
         if self.cache:
             await self.cache.close()
 
         if self.rate_limiter:
             await self.rate_limiter.close()
 
+        if self.coalescer:
+            await self.coalescer.close()
+
         if self.l01_bridge:
             await self.l01_bridge.cleanup()
 
@@ -4,8 +4,10 @@ L04 Model Gateway Layer - Rate Limiter Service
 Token bucket rate limiting with Redis backend for distributed state.
 """
 
+import asyncio
 import time
-from typing import Optional, Dict
+from dataclasses import dataclass
+from typing import Optional, Dict, Tuple
 import logging
 
 from ..models import (
@@ -16,19 +18,114 @@ from ..models import (
 logger = logging.getLogger(__name__)
 
 
+# Bucket check results returned by the token bucket script
+BUCKET_ALLOWED = 0
+BUCKET_RPM_EXCEEDED = 1
+BUCKET_TPM_EXCEEDED = 2
+
+
+# Lua script checking the RPM and TPM buckets atomically in one round trip.
+# Both buckets are refilled, and tokens are consumed from both only if both
+# have capacity, so concurrent gateways can never overspend either bucket.
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local refill_period = tonumber(ARGV[2])
+local requests = tonumber(ARGV[3])
+local rpm_capacity = tonumber(ARGV[4])
+local tokens = tonumber(ARGV[5])
+local tpm_capacity = tonumber(ARGV[6])
+
+local function refill(key, capacity)
+    local state = redis.call('HMGET', key, 'tokens', 'last_refill')
+    local available = tonumber(state[1]) or capacity
+    local last_refill = tonumber(state[2]) or now
+    local elapsed = math.max(0, now - last_refill)
+    return math.min(capacity, available + (elapsed / refill_period) * capacity)
+end
+
+local rpm_available = refill(KEYS[1], rpm_capacity)
+local tpm_available = refill(KEYS[2], tpm_capacity)
+
+if rpm_available < requests then
+    return {1, math.floor(rpm_available), math.floor(tpm_available)}
+end
+if tpm_available < tokens then
+    return {2, math.floor(rpm_available), math.floor(tpm_available)}
+end
+
+rpm_available = rpm_available - requests
+tpm_available = tpm_available - tokens
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(rpm_available), 'last_refill', tostring(now))
+redis.call('EXPIRE', KEYS[1], refill_period * 2)
+redis.call('HSET', KEYS[2], 'tokens', tostring(tpm_available), 'last_refill', tostring(now))
+redis.call('EXPIRE', KEYS[2], refill_period * 2)
+
+return {0, math.floor(rpm_available), math.floor(tpm_available)}
+"""
+
+
+# Lua script crediting (positive delta) or debiting (negative delta) a token
+# bucket after the fact, e.g. when a request's actual usage differs from the
+# estimate it was admitted with. Debits may push the bucket below zero, down
+# to -capacity, so overruns delay subsequent requests.
+ADJUST_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local refill_period = tonumber(ARGV[2])
+local capacity = tonumber(ARGV[3])
+local delta = tonumber(ARGV[4])
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'last_refill')
+local available = tonumber(state[1]) or capacity
+local last_refill = tonumber(state[2]) or now
+local elapsed = math.max(0, now - last_refill)
+available = math.min(capacity, available + (elapsed / refill_period) * capacity)
+available = math.max(-capacity, math.min(capacity, available + delta))
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(available), 'last_refill', tostring(now))
+redis.call('EXPIRE', KEYS[1], refill_period * 2)
+
+return math.floor(available)
+"""
+
+
+@dataclass
+class BucketLease:
+    """Requests and tokens reserved from the shared buckets for local spending"""
+    requests: int
+    tokens: int
+    expires_at: float
+
+    def covers(self, tokens: int, now: float) -> bool:
+        """Check if the lease can pay for one request of the given size"""
+        return now < self.expires_at and self.requests >= 1 and self.tokens >= tokens
+
+
 class RateLimiter:
     """
     Token bucket rate limiter
 
     Implements distributed rate limiting using Redis for state storage.
     Supports both RPM (requests per minute) and TPM (tokens per minute) limits.
+
+    Both buckets are checked and debited by a single Lua script, so a check
+    is one round trip and is atomic across gateway replicas.
+
+    In lease mode (lease_requests > 0) the gateway reserves a batch of
+    requests and tokens from the shared buckets and spends them in memory,
+    so most checks make no network call. Unspent lease capacity lapses
+    after lease_seconds, which bounds how long one replica can hold
+    capacity that others cannot use.
     """
 
     def __init__(
         self,
         redis_url: str = "redis://localhost:6379",
         default_rpm: int = 60,
-        default_tpm: int = 100000
+        default_tpm: int = 100000,
+        lease_requests: int = 0,
+        lease_tokens: int = 0,
+        lease_seconds: float = 1.0
     ):
         """
         Initialize rate limiter
@@ -37,15 +134,31 @@ class RateLimiter:
             redis_url: Redis connection URL
             default_rpm: Default requests per minute limit
             default_tpm: Default tokens per minute limit
+            lease_requests: Requests reserved per lease (0 disables lease mode)
+            lease_tokens: Tokens reserved per lease (grown to fit large requests)
+            lease_seconds: How long a lease may be spent locally
         """
         self.redis_url = redis_url
         self.default_rpm = default_rpm
         self.default_tpm = default_tpm
+        self.lease_requests = lease_requests
+        self.lease_tokens = lease_tokens
+        self.lease_seconds = lease_seconds
         self._redis = None
-        self._local_cache: Dict[str, dict] = {}
+        self._script_sha: Optional[str] = None
+        self._leases: Dict[str, BucketLease] = {}
+        self._lease_locks: Dict[str, asyncio.Lock] = {}
+        self._stats = {
+            "checks": 0,
+            "round_trips": 0,
+            "lease_hits": 0,
+            "leases_acquired": 0,
+            "reconciliations": 0
+        }
         logger.info(
             f"RateLimiter initialized "
-            f"(default_rpm={default_rpm}, default_tpm={default_tpm})"
+            f"(default_rpm={default_rpm}, default_tpm={default_tpm}, "
+            f"lease_requests={lease_requests})"
         )
 
     async def check_rate_limit(
@@ -76,9 +189,21 @@ class RateLimiter:
         tpm_limit = tpm_limit or self.default_tpm
 
         try:
-            # Check RPM limit
             rpm_key = f"ratelimit:rpm:{agent_did}:{provider}"
-            if not await self._check_token_bucket(rpm_key, 1, rpm_limit, 60):
+            tpm_key = f"ratelimit:tpm:{agent_did}:{provider}"
+            self._stats["checks"] += 1
+
+            if self.lease_requests > 0:
+                result = await self._check_with_lease(
+                    rpm_key, tpm_key, tokens, rpm_limit, tpm_limit
+                )
+            else:
+                result, _, _ = await self._check_buckets(
+                    rpm_key, tpm_key, 1, tokens, rpm_limit, tpm_limit, 60
+                )
+
+            # Check RPM limit
+            if result == BUCKET_RPM_EXCEEDED:
                 logger.warning(
                     f"RPM limit exceeded for {agent_did} on {provider}"
                 )
@@ -93,8 +218,7 @@ class RateLimiter:
                 )
 
             # Check TPM limit
-            tpm_key = f"ratelimit:tpm:{agent_did}:{provider}"
-            if not await self._check_token_bucket(tpm_key, tokens, tpm_limit, 60):
+            if result == BUCKET_TPM_EXCEEDED:
                 logger.warning(
                     f"TPM limit exceeded for {agent_did} on {provider}"
                 )
@@ -150,72 +274,182 @@ class RateLimiter:
             tpm_limit=tpm_limit
         )
 
-    async def _check_token_bucket(
+    async def reconcile_tokens(
         self,
-        key: str,
+        agent_did: str,
+        provider: str,
+        reserved_tokens: int,
+        actual_tokens: int,
+        tpm_limit: Optional[int] = None
+    ) -> None:
+        """
+        Settle a request admitted on estimated tokens against its actual usage
+
+        Refunds unused tokens to the TPM bucket, or debits the overrun.
+
+        Args:
+            agent_did: Agent DID
+            provider: Provider identifier
+            reserved_tokens: Tokens consumed by check_rate_limit
+            actual_tokens: Tokens the request actually used
+            tpm_limit: Optional override for TPM limit
+        """
+        delta = reserved_tokens - actual_tokens
+        if delta == 0:
+            return
+
+        try:
+            redis_client = await self._get_redis_client()
+            tpm_key = f"ratelimit:tpm:{agent_did}:{provider}"
+            self._stats["reconciliations"] += 1
+            self._stats["round_trips"] += 1
+            await redis_client.eval(
+                ADJUST_BUCKET_SCRIPT, 1, tpm_key,
+                time.time(), 60, tpm_limit or self.default_tpm, delta
+            )
+        except Exception as e:
+            logger.error(f"Rate limit reconcile error: {e}")
+
+    async def _check_buckets(
+        self,
+        rpm_key: str,
+        tpm_key: str,
+        requests: int,
         tokens: int,
-        capacity: int,
+        rpm_capacity: int,
+        tpm_capacity: int,
         refill_period: int
-    ) -> bool:
+    ) -> Tuple[int, int, int]:
         """
-        Check token bucket and consume tokens if available
+        Check both token buckets and consume from both if available
+
+        Runs TOKEN_BUCKET_SCRIPT, so the check is a single atomic round trip.
 
         Args:
-            key: Redis key for bucket
+            rpm_key: Redis key for the request bucket
+            tpm_key: Redis key for the token bucket
+            requests: Number of requests to consume
             tokens: Number of tokens to consume
-            capacity: Bucket capacity
+            rpm_capacity: Request bucket capacity
+            tpm_capacity: Token bucket capacity
             refill_period: Refill period in seconds
 
         Returns:
-            True if tokens available and consumed
+            Tuple of (BUCKET_* result, requests remaining, tokens remaining)
         """
+        redis_client = await self._get_redis_client()
+        if self._script_sha is None:
+            self._script_sha = await redis_client.script_load(TOKEN_BUCKET_SCRIPT)
+
+        args = (
+            time.time(),
+            refill_period,
+            requests,
+            rpm_capacity,
+            tokens,
+            tpm_capacity
+        )
+        self._stats["round_trips"] += 1
+
         try:
-            redis_client = await self._get_redis_client()
-            current_time = time.time()
+            result = await redis_client.evalsha(
+                self._script_sha, 2, rpm_key, tpm_key, *args
+            )
+        except Exception as e:
+            if "NOSCRIPT" not in str(e):
+                raise
+            # Script cache was flushed (e.g. Redis restart); reload once
+            self._script_sha = await redis_client.script_load(TOKEN_BUCKET_SCRIPT)
+            result = await redis_client.evalsha(
+                self._script_sha, 2, rpm_key, tpm_key, *args
+            )
 
-            # Get current bucket state
-            bucket_data = await redis_client.hgetall(key)
+        return int(result[0]), int(result[1]), int(result[2])
 
-            if not bucket_data:
-                # Initialize new bucket
-                bucket_data = {
-                    "tokens": str(capacity),
-                    "last_refill": str(current_time)
-                }
+    async def _check_with_lease(
+        self,
+        rpm_key: str,
+        tpm_key: str,
+        tokens: int,
+        rpm_capacity: int,
+        tpm_capacity: int
+    ) -> int:
+        """
+        Check limits against a locally held lease
 
-            # Parse bucket state
-            available_tokens = float(bucket_data.get("tokens", capacity))
-            last_refill = float(bucket_data.get("last_refill", current_time))
-
-            # Calculate refill
-            elapsed = current_time - last_refill
-            refill_amount = (elapsed / refill_period) * capacity
-            available_tokens = min(capacity, available_tokens + refill_amount)
-
-            # Check if enough tokens
-            if available_tokens >= tokens:
-                # Consume tokens
-                available_tokens -= tokens
-
-                # Update bucket state
-                await redis_client.hset(
-                    key,
-                    mapping={
-                        "tokens": str(available_tokens),
-                        "last_refill": str(current_time)
-                    }
-                )
-                await redis_client.expire(key, refill_period * 2)
+        Spends from the current lease when it covers the request; otherwise
+        reserves a new lease from the shared buckets. If a full lease cannot
+        be reserved, falls back to an exact single-request check.
 
-                return True
-            else:
-                # Not enough tokens
-                return False
+        Args:
+            rpm_key: Redis key for the request bucket
+            tpm_key: Redis key for the token bucket
+            tokens: Number of tokens in request
+            rpm_capacity: Request bucket capacity
+            tpm_capacity: Token bucket capacity
 
-        except Exception as e:
-            logger.error(f"Token bucket error: {e}")
-            # On error, allow the request (fail open)
-            return True
+        Returns:
+            BUCKET_* result
+        """
+        if self._spend_lease(rpm_key, tokens):
+            return BUCKET_ALLOWED
+
+        lock = self._lease_locks.setdefault(rpm_key, asyncio.Lock())
+        async with lock:
+            # Another coroutine may have renewed the lease while we waited
+            if self._spend_lease(rpm_key, tokens):
+                return BUCKET_ALLOWED
+
+            # A request larger than the token bucket can never be admitted;
+            # reserving a lease for it would only drain the shared bucket
+            if tokens > tpm_capacity:
+                return BUCKET_TPM_EXCEEDED
+
+            lease_requests = min(self.lease_requests, rpm_capacity)
+            lease_tokens = min(max(self.lease_tokens, tokens), tpm_capacity)
+
+            result, _, _ = await self._check_buckets(
+                rpm_key, tpm_key, lease_requests, lease_tokens,
+                rpm_capacity, tpm_capacity, 60
+            )
+            if result == BUCKET_ALLOWED:
+                self._leases[rpm_key] = BucketLease(
+                    requests=lease_requests,
+                    tokens=lease_tokens,
+                    expires_at=time.monotonic() + self.lease_seconds
+                )
+                self._stats["leases_acquired"] += 1
+                if self._spend_lease(rpm_key, tokens):
+                    return BUCKET_ALLOWED
+                return BUCKET_TPM_EXCEEDED
+
+            # Not enough capacity for a whole lease; charge this request only
+            self._leases.pop(rpm_key, None)
+            result, _, _ = await self._check_buckets(
+                rpm_key, tpm_key, 1, tokens, rpm_capacity, tpm_capacity, 60
+            )
+            return result
+
+    def _spend_lease(self, rpm_key: str, tokens: int) -> bool:
+        """Debit one request from the local lease if it covers it"""
+        lease = self._leases.get(rpm_key)
+        if lease is None or not lease.covers(tokens, time.monotonic()):
+            return False
+        lease.requests -= 1
+        lease.tokens -= tokens
+        self._stats["lease_hits"] += 1
+        return True
+
+    def get_stats(self) -> dict:
+        """Get rate limiter statistics"""
+        checks = self._stats["checks"]
+        return {
+            **self._stats,
+            "active_leases": len(self._leases),
+            "round_trips_per_check": (
+                self._stats["round_trips"] / checks if checks > 0 else 0.0
+            )
+        }
 
     async def get_usage(
         self,
@@ -287,6 +521,7 @@ class RateLimiter:
             tpm_key = f"ratelimit:tpm:{agent_did}:{provider}"
 
             await redis_client.delete(rpm_key, tpm_key)
+            self._leases.pop(rpm_key, None)
             logger.info(f"Reset rate limits for {agent_did} on {provider}")
 
         except Exception as e:
@@ -0,0 +1,291 @@
+"""
+L04 Model Gateway Layer - Request Coalescer Service
+
+Single-flight deduplication of identical in-flight inference requests.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import logging
+
+from ..models import (
+    ProviderError,
+    L04ErrorCode
+)
+
+logger = logging.getLogger(__name__)
+
+
+# Delete the lock only if this process still owns it
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class _Flight:
+    """An in-flight shared operation and the number of callers awaiting it"""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class RequestCoalescer:
+    """
+    Single-flight request coalescer
+
+    Concurrent calls with the same key share one execution: the first caller
+    (the leader) starts the operation and every caller awaits its result.
+
+    In distributed mode the leader of each process also takes a Redis lock
+    for the key. Processes that lose the race subscribe to a notification
+    channel and receive the leader's encoded result instead of calling the
+    provider themselves. If no result arrives within wait_timeout_seconds
+    (for example because the leader died), the waiter executes on its own.
+    """
+
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        distributed: bool = False,
+        lock_ttl_seconds: float = 120.0,
+        wait_timeout_seconds: float = 120.0,
+        result_ttl_seconds: float = 5.0
+    ):
+        """
+        Initialize request coalescer
+
+        Args:
+            redis_url: Redis connection URL (distributed mode only)
+            distributed: Whether to coalesce across gateway replicas
+            lock_ttl_seconds: Expiry of the cross-process leader lock
+            wait_timeout_seconds: How long followers wait for a remote leader
+            result_ttl_seconds: How long a finished result stays readable
+                for followers that subscribed late
+        """
+        self.redis_url = redis_url
+        self.distributed = distributed
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self.result_ttl_seconds = result_ttl_seconds
+        self._redis = None
+        self._inflight: Dict[str, _Flight] = {}
+        self._stats = {
+            "leaders": 0,
+            "followers": 0,
+            "remote_followers": 0,
+            "remote_timeouts": 0
+        }
+        logger.info(f"RequestCoalescer initialized (distributed={distributed})")
+
+    async def run(
+        self,
+        key: str,
+        operation: Callable[[], Awaitable[Any]],
+        encode: Optional[Callable[[Any], str]] = None,
+        decode: Optional[Callable[[str], Any]] = None
+    ) -> Tuple[Any, bool]:
+        """
+        Run operation once per key among concurrent callers
+
+        The operation runs in its own task that every caller awaits through
+        asyncio.shield, so cancelling one caller (the first included) does
+        not affect the others. The task is cancelled once no caller is
+        waiting for it anymore.
+
+        Args:
+            key: Deduplication key
+            operation: Coroutine factory producing the result
+            encode: Result serializer (required for distributed mode)
+            decode: Result deserializer (required for distributed mode)
+
+        Returns:
+            Tuple of (result, True if this caller started the operation
+            and it was executed in this process)
+
+        Raises:
+            Whatever the shared operation raised
+        """
+        flight = self._inflight.get(key)
+        started = flight is None
+        if started:
+            flight = _Flight(asyncio.ensure_future(self._execute(key, operation, encode, decode)))
+            self._inflight[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, flight))
+        else:
+            self._stats["followers"] += 1
+
+        flight.waiters += 1
+        try:
+            result, executed = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Nobody wants the result anymore
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+                flight.task.cancel()
+
+        return result, started and executed
+
+    async def _execute(
+        self,
+        key: str,
+        operation: Callable[[], Awaitable[Any]],
+        encode: Optional[Callable[[Any], str]],
+        decode: Optional[Callable[[str], Any]]
+    ) -> Tuple[Any, bool]:
+        """Run the shared operation (in its own task)"""
+        if self.distributed and encode and decode:
+            result, executed = await self._run_distributed(key, operation, encode, decode)
+        else:
+            result, executed = await operation(), True
+        if executed:
+            self._stats["leaders"] += 1
+        return result, executed
+
+    def _finish(self, key: str, flight: "_Flight") -> None:
+        """Forget a finished flight"""
+        if self._inflight.get(key) is flight:
+            del self._inflight[key]
+        # Mark exceptions retrieved when nobody was waiting
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+    async def _run_distributed(
+        self,
+        key: str,
+        operation: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], str],
+        decode: Callable[[str], Any]
+    ) -> Tuple[Any, bool]:
+        """Coalesce across processes through a Redis lock and pub/sub"""
+        try:
+            redis_client = await self._get_redis_client()
+            token = uuid.uuid4().hex
+            lock_key = f"coalesce:lock:{key}"
+            acquired = await redis_client.set(
+                lock_key, token, nx=True, px=int(self.lock_ttl_seconds * 1000)
+            )
+        except Exception as e:
+            logger.warning(f"Coalescer lock unavailable, executing locally: {e}")
+            return await operation(), True
+
+        if not acquired:
+            payload = await self._wait_for_remote(key)
+            if payload is not None:
+                self._stats["remote_followers"] += 1
+                if "error" in payload:
+                    raise ProviderError(
+                        L04ErrorCode.E4200_PROVIDER_ERROR,
+                        f"Coalesced request failed: {payload['error']}"
+                    )
+                return decode(payload["result"]), False
+
+            self._stats["remote_timeouts"] += 1
+            logger.warning(f"No result from remote leader for {key[:16]}, executing locally")
+            return await operation(), True
+
+        try:
+            result = await operation()
+            await self._publish(key, {"result": encode(result)})
+            return result, True
+        except Exception as e:
+            await self._publish(key, {"error": str(e)})
+            raise
+        finally:
+            try:
+                await redis_client.eval(RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+            except Exception as e:
+                logger.debug(f"Failed to release coalescer lock {lock_key}: {e}")
+
+    async def _publish(self, key: str, payload: dict) -> None:
+        """Store and broadcast the leader's outcome"""
+        try:
+            redis_client = await self._get_redis_client()
+            data = json.dumps(payload)
+            await redis_client.set(
+                f"coalesce:result:{key}", data,
+                px=int(self.result_ttl_seconds * 1000)
+            )
+            await redis_client.publish(f"coalesce:done:{key}", data)
+        except Exception as e:
+            logger.warning(f"Failed to publish coalesced result: {e}")
+
+    async def _wait_for_remote(self, key: str) -> Optional[dict]:
+        """Wait for another process's leader to publish its outcome"""
+        redis_client = await self._get_redis_client()
+        channel = f"coalesce:done:{key}"
+        pubsub = redis_client.pubsub()
+
+        try:
+            await pubsub.subscribe(channel)
+
+            # The leader may have finished before we subscribed
+            data = await redis_client.get(f"coalesce:result:{key}")
+            if data:
+                return json.loads(data)
+
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.wait_timeout_seconds
+            while True:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    return None
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=min(remaining, 1.0)
+                )
+                if message and message.get("type") == "message":
+                    return json.loads(message["data"])
+
+                # Leader lost its lock without publishing (crashed)
+                if not await redis_client.exists(f"coalesce:lock:{key}"):
+                    data = await redis_client.get(f"coalesce:result:{key}")
+                    return json.loads(data) if data else None
+
+        except Exception as e:
+            logger.warning(f"Error waiting for coalesced result: {e}")
+            return None
+        finally:
+            try:
+                await pubsub.unsubscribe(channel)
+                await pubsub.close()
+            except Exception:
+                pass
+
+    def inflight_count(self) -> int:
+        """Get number of keys currently being executed"""
+        return len(self._inflight)
+
+    def get_stats(self) -> dict:
+        """Get coalescer statistics"""
+        return {
+            **self._stats,
+            "inflight": self.inflight_count(),
+            "distributed": self.distributed
+        }
+
+    async def _get_redis_client(self):
+        """Get or create Redis client"""
+        if self._redis is None:
+            import redis.asyncio as redis
+            self._redis = redis.from_url(
+                self.redis_url,
+                encoding="utf-8",
+                decode_responses=True
+            )
+        return self._redis
+
+    async def close(self) -> None:
+        """Close Redis connection"""
+        if self._redis:
+            await self._redis.close()
+            self._redis = None
@@ -6,7 +6,9 @@ Embedding-based caching for similar prompts using Redis and vector similarity.
 
 import hashlib
 import json
-from typing import Optional, List
+import uuid
+from dataclasses import replace
+from typing import Awaitable, Callable, Optional, List, Tuple
 from datetime import datetime, timedelta
 import logging
 import asyncio
@@ -17,9 +19,18 @@ from ..models import (
     CacheError,
     L04ErrorCode
 )
+from .vector_index import VectorIndex, create_default_vector_index
+from .local_cache import LocalCache
 
 logger = logging.getLogger(__name__)
 
+# Pub/sub channel announcing exact-match keys changed by any replica
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+# Pub/sub channel announcing embeddings written by any replica, so that
+# in-process vector indexes see each other's entries
+VECTOR_CHANNEL = "cache:vectors"
+
 
 class SemanticCache:
     """
@@ -27,6 +38,20 @@ class SemanticCache:
 
     Uses Redis for storage and embedding similarity for cache lookups.
     Falls back to exact match if embedding generation fails.
+
+    Similarity lookups go through a VectorIndex (in-process IVF by default)
+    so a miss costs one index query instead of a scan over every stored
+    embedding. Without an index the cache falls back to scanning Redis.
+    An in-process index is filled in the background: once the pub/sub
+    subscription is live it restores its snapshot and indexes the
+    embeddings already in Redis, while new embeddings from every replica
+    arrive on the vector channel. Lookups use whatever is indexed so far.
+
+    Exact-match hits are served from an in-process L1 tier (LRU with
+    TinyLFU admission) holding already-deserialized responses. Writes and
+    invalidations are broadcast on a Redis pub/sub channel so every replica
+    drops its stale L1 copies; L1 is only used while that subscription is
+    live and is emptied whenever it drops.
     """
 
     def __init__(
@@ -36,7 +61,12 @@ class SemanticCache:
         similarity_threshold: float = 0.85,
         embedding_model: str = "nomic-embed-text",
         ollama_base_url: str = "http://localhost:11434",
-        enable_embeddings: bool = True
+        enable_embeddings: bool = True,
+        vector_index: Optional[VectorIndex] = None,
+        index_snapshot_path: Optional[str] = None,
+        embedder: Optional[Callable[[str], Awaitable[List[float]]]] = None,
+        l1_max_entries: int = 1024,
+        l1_ttl_seconds: float = 60.0
     ):
         """
         Initialize semantic cache
@@ -48,6 +78,16 @@ class SemanticCache:
             embedding_model: Model to use for embeddings
             ollama_base_url: Ollama API URL for embeddings
             enable_embeddings: Whether to use embeddings (falls back to exact match)
+            vector_index: Optional VectorIndex for similarity search
+                (defaults to an in-process IVF index when numpy is available)
+            index_snapshot_path: Optional file used to persist the default index
+            embedder: Optional coroutine function mapping text to an embedding
+                (e.g. ModelGateway.embed, which batches concurrent calls);
+                defaults to calling the Ollama embeddings API directly
+            l1_max_entries: Capacity of the in-process exact-match tier
+                (0 disables it)
+            l1_ttl_seconds: Maximum lifetime of an L1 entry, bounding
+                staleness if an invalidation message is lost
         """
         self.redis_url = redis_url
         self.ttl_seconds = ttl_seconds
@@ -55,12 +95,30 @@ class SemanticCache:
         self.embedding_model = embedding_model
         self.ollama_base_url = ollama_base_url
         self.enable_embeddings = enable_embeddings
+        self.embedder = embedder
         self._redis = None
+        self.vector_index = vector_index
+        if self.vector_index is None and enable_embeddings:
+            self.vector_index = create_default_vector_index(index_snapshot_path)
+        self._index_loaded = False
+        self._index_load_task: Optional[asyncio.Task] = None
+        self.l1 = (
+            LocalCache(l1_max_entries, min(l1_ttl_seconds, ttl_seconds))
+            if l1_max_entries > 0 else None
+        )
+        self._instance_id = uuid.uuid4().hex
+        self._l1_coherent = False
+        self._listener_task: Optional[asyncio.Task] = None
         self._stats = {
             "hits": 0,
             "misses": 0,
             "writes": 0,
-            "errors": 0
+            "errors": 0,
+            "exact_lookups": 0,
+            "exact_hits": 0,
+            "semantic_lookups": 0,
+            "semantic_hits": 0,
+            "invalidations_received": 0
         }
         logger.info(
             f"SemanticCache initialized (ttl={ttl_seconds}s, "
@@ -81,21 +139,38 @@ class SemanticCache:
             # Generate cache key
             cache_key = self._generate_cache_key(request)
 
-            # Try exact match first
+            # Try the in-process tier first
+            if self.l1 is not None:
+                self._ensure_invalidation_listener()
+                if self._l1_coherent:
+                    local = self.l1.get(cache_key)
+                    if local is not None:
+                        logger.debug(f"L1 cache hit for {request.request_id}")
+                        self._stats["hits"] += 1
+                        return self._copy_for_request(local, request.request_id)
+
+            # Then exact match in Redis
+            self._stats["exact_lookups"] += 1
             redis_client = await self._get_redis_client()
             cached_data = await redis_client.get(f"cache:exact:{cache_key}")
 
             if cached_data:
                 logger.debug(f"Exact cache hit for {request.request_id}")
                 self._stats["hits"] += 1
-                return self._deserialize_response(cached_data, request.request_id)
+                self._stats["exact_hits"] += 1
+                response = self._deserialize_response(cached_data, request.request_id)
+                # The caller may mutate its response; keep a separate copy
+                self._store_local(cache_key, self._copy_for_request(response, response.request_id))
+                return response
 
             # Try semantic similarity if enabled
             if self.enable_embeddings:
+                self._stats["semantic_lookups"] += 1
                 similar_response = await self._find_similar(request)
                 if similar_response:
                     logger.debug(f"Semantic cache hit for {request.request_id}")
                     self._stats["hits"] += 1
+                    self._stats["semantic_hits"] += 1
                     return similar_response
 
             # Cache miss
@@ -127,13 +202,23 @@ class SemanticCache:
             # Serialize response
             serialized = self._serialize_response(response)
 
-            # Store in Redis with TTL
+            # Store in Redis with TTL, telling other replicas to drop their copy
             redis_client = await self._get_redis_client()
-            await redis_client.setex(
-                f"cache:exact:{cache_key}",
-                self.ttl_seconds,
-                serialized
-            )
+            if self.l1 is not None:
+                pipe = redis_client.pipeline(transaction=False)
+                pipe.setex(f"cache:exact:{cache_key}", self.ttl_seconds, serialized)
+                pipe.publish(INVALIDATION_CHANNEL, self._invalidation_message([cache_key]))
+                await pipe.execute()
+                self._store_local(
+                    cache_key,
+                    self._deserialize_response(serialized, response.request_id)
+                )
+            else:
+                await redis_client.setex(
+                    f"cache:exact:{cache_key}",
+                    self.ttl_seconds,
+                    serialized
+                )
 
             # Store embedding for semantic search if enabled
             if self.enable_embeddings:
@@ -207,6 +292,131 @@ class SemanticCache:
             metadata=response_dict.get("metadata", {})
         )
 
+    def _copy_for_request(
+        self,
+        response: InferenceResponse,
+        request_id: str
+    ) -> InferenceResponse:
+        """Copy a locally cached response for a new request"""
+        return replace(
+            response,
+            request_id=request_id,
+            metadata=dict(response.metadata),
+            timestamp=datetime.utcnow()
+        )
+
+    def _store_local(self, cache_key: str, response: InferenceResponse) -> None:
+        """Keep a deserialized response in L1 while invalidations are received"""
+        if self.l1 is not None and self._l1_coherent:
+            self.l1.put(cache_key, response)
+
+    def _invalidation_message(self, cache_keys: Optional[List[str]] = None) -> str:
+        """Encode an invalidation for cache_keys (None means every key)"""
+        return json.dumps({
+            "origin": self._instance_id,
+            "keys": cache_keys
+        })
+
+    async def _publish_invalidation(self, cache_keys: Optional[List[str]] = None) -> None:
+        """Drop cache_keys from this and every other replica's L1"""
+        if self.l1 is None or cache_keys == []:
+            return
+
+        if cache_keys is None:
+            self.l1.clear()
+        else:
+            for cache_key in cache_keys:
+                self.l1.invalidate(cache_key)
+
+        try:
+            redis_client = await self._get_redis_client()
+            await redis_client.publish(
+                INVALIDATION_CHANNEL, self._invalidation_message(cache_keys)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish cache invalidation: {e}")
+
+    def _ensure_invalidation_listener(self) -> None:
+        """Start the pub/sub subscriber on first use"""
+        if self._listener_task is None or self._listener_task.done():
+            self._listener_task = asyncio.create_task(self._listen_for_invalidations())
+
+    async def _listen_for_invalidations(self) -> None:
+        """
+        Apply other replicas' invalidations to L1 and their embeddings to
+        the local vector index, resubscribing on failure
+        """
+        syncs_index = self.vector_index is not None and not self.vector_index.shared
+        channels = [INVALIDATION_CHANNEL] + ([VECTOR_CHANNEL] if syncs_index else [])
+        backoff = 1.0
+        while True:
+            pubsub = None
+            try:
+                redis_client = await self._get_redis_client()
+                pubsub = redis_client.pubsub()
+                await pubsub.subscribe(*channels)
+                self._l1_coherent = True
+                backoff = 1.0
+
+                # Embeddings written before (or while unsubscribed) come from Redis
+                if syncs_index:
+                    self._start_index_load()
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    if message.get("channel") == VECTOR_CHANNEL:
+                        await self._apply_vector(message["data"])
+                    elif self.l1 is not None:
+                        self._apply_invalidation(message["data"])
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation subscription lost: {e}")
+            finally:
+                # Messages missed while unsubscribed could leave stale entries
+                self._l1_coherent = False
+                if self.l1 is not None:
+                    self.l1.clear()
+                if pubsub is not None:
+                    try:
+                        await pubsub.close()
+                    except Exception:
+                        pass
+
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def _apply_invalidation(self, data: str) -> None:
+        """Apply one invalidation message to L1"""
+        try:
+            payload = json.loads(data)
+        except (TypeError, ValueError):
+            logger.debug(f"Ignoring malformed invalidation message: {data!r}")
+            return
+
+        if payload.get("origin") == self._instance_id:
+            return
+
+        self._stats["invalidations_received"] += 1
+        keys = payload.get("keys")
+        if keys is None:
+            self.l1.clear()
+        else:
+            for cache_key in keys:
+                self.l1.invalidate(cache_key)
+
+    async def _apply_vector(self, data: str) -> None:
+        """Index an embedding written by another replica"""
+        try:
+            payload = json.loads(data)
+            if payload.get("origin") == self._instance_id:
+                return
+            await self.vector_index.add(payload["key"], payload["embedding"], payload.get("ttl"))
+        except Exception as e:
+            logger.debug(f"Ignoring vector message: {e}")
+
     async def _find_similar(
         self,
         request: InferenceRequest
@@ -215,8 +425,8 @@ class SemanticCache:
         Find similar cached responses using embeddings and cosine similarity.
 
         Uses a two-phase approach:
-        1. Retrieve candidate embeddings from Redis
-        2. Compute cosine similarity to find best match
+        1. Query the vector index (or scan Redis) for the nearest embedding
+        2. Load the matching exact-cache entry
 
         Args:
             request: InferenceRequest
@@ -230,62 +440,178 @@ class SemanticCache:
             if not query_embedding:
                 return None
 
-            # Get all cached embeddings
-            redis_client = await self._get_redis_client()
-
-            # Scan for embedding keys
-            cursor = 0
-            best_match = None
-            best_similarity = 0.0
-
-            while True:
-                cursor, keys = await redis_client.scan(
-                    cursor=cursor,
-                    match="cache:embedding:*",
-                    count=100
+            if self.vector_index is not None:
+                self._ensure_index_loaded()
+                matches = await self.vector_index.search(
+                    query_embedding,
+                    k=1,
+                    min_similarity=self.similarity_threshold
                 )
-
-                for key in keys:
-                    try:
-                        # Get stored embedding
-                        stored_data = await redis_client.hgetall(key)
-                        if not stored_data or "embedding" not in stored_data:
-                            continue
-
-                        stored_embedding = json.loads(stored_data["embedding"])
-                        cache_key = stored_data.get("cache_key")
-
-                        # Compute cosine similarity
-                        similarity = self._cosine_similarity(
-                            query_embedding, stored_embedding
-                        )
-
-                        if similarity > best_similarity and similarity >= self.similarity_threshold:
-                            best_similarity = similarity
-                            best_match = cache_key
-
-                    except Exception as e:
-                        logger.debug(f"Error processing cached embedding {key}: {e}")
-                        continue
-
-                if cursor == 0:
-                    break
+                best_match, best_similarity = matches[0] if matches else (None, 0.0)
+            else:
+                best_match, best_similarity = await self._scan_similar(query_embedding)
 
             # Return best match if found
             if best_match:
                 logger.debug(
                     f"Semantic match found (similarity={best_similarity:.3f})"
                 )
+                redis_client = await self._get_redis_client()
                 cached_data = await redis_client.get(f"cache:exact:{best_match}")
                 if cached_data:
                     return self._deserialize_response(cached_data, request.request_id)
 
+                # Entry expired in Redis, drop it from the index
+                if self.vector_index is not None:
+                    await self.vector_index.remove(best_match)
+
             return None
 
         except Exception as e:
             logger.error(f"Semantic search error: {e}")
             return None
 
+    async def _scan_similar(
+        self,
+        query_embedding: List[float]
+    ) -> Tuple[Optional[str], float]:
+        """
+        Find the most similar stored embedding by scanning Redis.
+
+        Linear in the number of cached entries; used only when no
+        vector index is configured.
+
+        Args:
+            query_embedding: Embedding of the incoming request
+
+        Returns:
+            Tuple of (best matching cache key or None, similarity)
+        """
+        redis_client = await self._get_redis_client()
+
+        cursor = 0
+        best_match = None
+        best_similarity = 0.0
+
+        while True:
+            cursor, keys = await redis_client.scan(
+                cursor=cursor,
+                match="cache:embedding:*",
+                count=100
+            )
+
+            for key in keys:
+                try:
+                    # Get stored embedding
+                    stored_data = await redis_client.hgetall(key)
+                    if not stored_data or "embedding" not in stored_data:
+                        continue
+
+                    stored_embedding = json.loads(stored_data["embedding"])
+                    cache_key = stored_data.get("cache_key")
+
+                    # Compute cosine similarity
+                    similarity = self._cosine_similarity(
+                        query_embedding, stored_embedding
+                    )
+
+                    if similarity > best_similarity and similarity >= self.similarity_threshold:
+                        best_similarity = similarity
+                        best_match = cache_key
+
+                except Exception as e:
+                    logger.debug(f"Error processing cached embedding {key}: {e}")
+                    continue
+
+            if cursor == 0:
+                break
+
+        return best_match, best_similarity
+
+    def _ensure_index_loaded(self) -> None:
+        """
+        Start filling the vector index on first use.
+
+        The subscriber starts the load once it is subscribed, so that no
+        embedding written meanwhile is missed (see _load_index).
+        """
+        if self._index_loaded:
+            return
+
+        if self.vector_index.shared:
+            # Shared backends are populated by every replica's writes
+            self._index_loaded = True
+            return
+
+        self._ensure_invalidation_listener()
+
+    def _start_index_load(self) -> None:
+        """Load the vector index in the background unless already loading"""
+        if self._index_load_task is None or self._index_load_task.done():
+            self._index_load_task = asyncio.create_task(self._load_index())
+
+    async def _load_index(self) -> None:
+        """
+        Restore the snapshot (first load only), then index every embedding
+        in Redis (written before startup, or while unsubscribed).
+        """
+        if not self._index_loaded and hasattr(self.vector_index, "load_async"):
+            try:
+                await self.vector_index.load_async()
+            except Exception as e:
+                logger.warning(f"Failed to load vector index snapshot: {e}")
+
+        try:
+            indexed = await self.rebuild_index()
+        except Exception as e:
+            logger.warning(f"Failed to index existing embeddings: {e}")
+            return
+
+        self._index_loaded = True
+        logger.info(f"Vector index ready ({indexed} embeddings from Redis)")
+
+    async def rebuild_index(self) -> int:
+        """
+        Index every embedding currently stored in Redis.
+
+        Returns:
+            Number of embeddings indexed
+        """
+        if self.vector_index is None:
+            return 0
+
+        redis_client = await self._get_redis_client()
+        indexed = 0
+        cursor = 0
+
+        while True:
+            cursor, keys = await redis_client.scan(
+                cursor=cursor,
+                match="cache:embedding:*",
+                count=500
+            )
+
+            for key in keys:
+                try:
+                    stored_data = await redis_client.hgetall(key)
+                    if not stored_data or "embedding" not in stored_data:
+                        continue
+
+                    ttl = await redis_client.ttl(key)
+                    await self.vector_index.add(
+                        stored_data.get("cache_key", key.split(":", 2)[2]),
+                        json.loads(stored_data["embedding"]),
+                        ttl if ttl and ttl > 0 else self.ttl_seconds
+                    )
+                    indexed += 1
+                except Exception as e:
+                    logger.debug(f"Error indexing cached embedding {key}: {e}")
+
+            if cursor == 0:
+                break
+
+        return indexed
+
     def _cosine_similarity(
         self,
         vec1: List[float],
@@ -345,6 +671,16 @@ class SemanticCache:
                 self.ttl_seconds
             )
 
+            if self.vector_index is not None:
+                await self.vector_index.add(cache_key, embedding, self.ttl_seconds)
+                if not self.vector_index.shared:
+                    await redis_client.publish(VECTOR_CHANNEL, json.dumps({
+                        "origin": self._instance_id,
+                        "key": cache_key,
+                        "embedding": embedding,
+                        "ttl": self.ttl_seconds
+                    }))
+
             # Store metadata separately for quick lookups
             await redis_client.hset(
                 f"cache:meta:{cache_key}",
@@ -373,11 +709,14 @@ class SemanticCache:
             Embedding vector or None if failed
         """
         try:
-            import httpx
-
             # Format prompt for embedding
             prompt = self._format_prompt_for_embedding(request)
 
+            if self.embedder is not None:
+                return await self.embedder(prompt)
+
+            import httpx
+
             # Call Ollama embeddings API
             async with httpx.AsyncClient() as client:
                 response = await client.post(
@@ -444,6 +783,11 @@ class SemanticCache:
                 if cursor == 0:
                     break
 
+            if self.vector_index is not None:
+                await self.vector_index.clear()
+
+            await self._publish_invalidation()
+
             logger.info("Cache cleared")
         except Exception as e:
             logger.error(f"Cache clear error: {e}")
@@ -457,13 +801,38 @@ class SemanticCache:
         total_requests = self._stats["hits"] + self._stats["misses"]
         hit_rate = (self._stats["hits"] / total_requests) if total_requests > 0 else 0.0
 
+        def ratio(hits: int, lookups: int) -> float:
+            return hits / lookups if lookups > 0 else 0.0
+
+        l1_stats = self.l1.get_stats() if self.l1 is not None else None
+        if l1_stats is not None:
+            l1_stats["coherent"] = self._l1_coherent
+
         return {
             "hits": self._stats["hits"],
             "misses": self._stats["misses"],
             "writes": self._stats["writes"],
             "errors": self._stats["errors"],
             "hit_rate": hit_rate,
-            "total_requests": total_requests
+            "total_requests": total_requests,
+            "tiers": {
+                "l1": l1_stats,
+                "redis_exact": {
+                    "lookups": self._stats["exact_lookups"],
+                    "hits": self._stats["exact_hits"],
+                    "hit_rate": ratio(
+                        self._stats["exact_hits"], self._stats["exact_lookups"]
+                    )
+                },
+                "semantic": {
+                    "lookups": self._stats["semantic_lookups"],
+                    "hits": self._stats["semantic_hits"],
+                    "hit_rate": ratio(
+                        self._stats["semantic_hits"], self._stats["semantic_lookups"]
+                    )
+                }
+            },
+            "invalidations_received": self._stats["invalidations_received"]
         }
 
     async def invalidate(
@@ -549,6 +918,17 @@ class SemanticCache:
                     await redis_client.delete(*batch)
                     invalidated += len(batch)
 
+                if self.vector_index is not None:
+                    for key in keys_list:
+                        if key.startswith("cache:embedding:"):
+                            await self.vector_index.remove(key.split(":", 2)[2])
+
+                await self._publish_invalidation([
+                    key.split(":", 2)[2]
+                    for key in keys_list
+                    if key.startswith("cache:exact:")
+                ])
+
             logger.info(f"Invalidated {invalidated} cache entries")
             return invalidated
 
@@ -595,6 +975,9 @@ class SemanticCache:
             "redis_connected": self._redis is not None,
             "embeddings_enabled": self.enable_embeddings,
             "stats": self.get_stats(),
+            "vector_index": (
+                self.vector_index.get_stats() if self.vector_index is not None else None
+            ),
             "config": {
                 "ttl_seconds": self.ttl_seconds,
                 "similarity_threshold": self.similarity_threshold,
@@ -605,6 +988,24 @@ class SemanticCache:
 
     async def close(self) -> None:
         """Close Redis connection"""
+        for task in (self._listener_task, self._index_load_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._listener_task = None
+        self._index_load_task = None
+
+        if self.vector_index is not None:
+            if hasattr(self.vector_index, "save"):
+                try:
+                    self.vector_index.save()
+                except Exception as e:
+                    logger.warning(f"Failed to save vector index snapshot: {e}")
+            await self.vector_index.close()
+
         if self._redis:
             await self._redis.close()
             self._redis = None
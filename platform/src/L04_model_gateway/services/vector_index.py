@@ -0,0 +1,823 @@
+"""
+L04 Model Gateway Layer - Vector Index
+
+Approximate-nearest-neighbour indexes used by SemanticCache for embedding lookups.
+
+Two backends are provided:
+- IVFVectorIndex: in-process inverted-file index over a float32 matrix (numpy),
+  with snapshot persistence to disk
+- RediSearchVectorIndex: server-side HNSW index in Redis Stack (RediSearch),
+  shared by all gateway replicas
+"""
+
+import asyncio
+import os
+import math
+import random
+import struct
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence, Tuple
+import logging
+
+from ..models import CacheError, L04ErrorCode
+
+logger = logging.getLogger(__name__)
+
+
+class VectorIndex(ABC):
+    """
+    Abstract base class for vector indexes
+
+    Vectors are keyed by the SemanticCache cache key. Similarity is cosine
+    similarity in [-1.0, 1.0]; entries expire after ttl_seconds.
+    """
+
+    # True when the index lives outside the process and is shared by replicas
+    shared: bool = False
+
+    @abstractmethod
+    async def add(
+        self,
+        key: str,
+        vector: Sequence[float],
+        ttl_seconds: Optional[int] = None
+    ) -> None:
+        """
+        Add or replace a vector
+
+        Args:
+            key: Cache key the vector belongs to
+            vector: Embedding vector
+            ttl_seconds: Optional expiry for the entry
+        """
+        pass
+
+    @abstractmethod
+    async def remove(self, key: str) -> bool:
+        """
+        Remove a vector
+
+        Args:
+            key: Cache key to remove
+
+        Returns:
+            True if the key was indexed
+        """
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        vector: Sequence[float],
+        k: int = 1,
+        min_similarity: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the nearest vectors
+
+        Args:
+            vector: Query embedding
+            k: Maximum number of results
+            min_similarity: Minimum cosine similarity for a result
+
+        Returns:
+            List of (cache_key, similarity) sorted by descending similarity
+        """
+        pass
+
+    @abstractmethod
+    async def clear(self) -> None:
+        """Remove all vectors"""
+        pass
+
+    @abstractmethod
+    def size(self) -> int:
+        """Get number of indexed vectors"""
+        pass
+
+    def get_stats(self) -> dict:
+        """Get index statistics"""
+        return {"backend": self.__class__.__name__, "size": self.size()}
+
+    async def close(self) -> None:
+        """Release backend resources"""
+        pass
+
+
+class IVFVectorIndex(VectorIndex):
+    """
+    In-process inverted-file (IVF) vector index
+
+    Vectors are L2-normalised and stored in a contiguous float32 matrix, so
+    cosine similarity is a single matrix-vector product. Once the index holds
+    train_threshold vectors it clusters them with k-means into ~sqrt(N) lists
+    and a query only scores the n_probe lists closest to it, making lookups
+    sub-linear in the number of entries. Below the threshold (and as a
+    fallback) an exact scan over the matrix is used.
+
+    k-means runs in an executor on a copy of the vectors; the index keeps
+    serving (and accepting writes) with its previous lists meanwhile, and
+    rows written during training are assigned to the new lists when it
+    finishes.
+
+    Requires numpy.
+    """
+
+    def __init__(
+        self,
+        n_probe: int = 8,
+        train_threshold: int = 4096,
+        kmeans_iterations: int = 10,
+        snapshot_path: Optional[str] = None,
+        seed: int = 0
+    ):
+        """
+        Initialize IVF index
+
+        Args:
+            n_probe: Number of inverted lists scanned per query
+            train_threshold: Minimum vectors before clustering is used
+            kmeans_iterations: Lloyd iterations per (re)training
+            snapshot_path: Optional file path for save()/load() snapshots
+            seed: Random seed for centroid initialisation
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            raise CacheError(
+                L04ErrorCode.E4301_CACHE_UNAVAILABLE,
+                "numpy package not installed"
+            )
+
+        self._np = np
+        self.n_probe = n_probe
+        self.train_threshold = train_threshold
+        self.kmeans_iterations = kmeans_iterations
+        self.snapshot_path = snapshot_path
+        self._rng = random.Random(seed)
+
+        self._dim: Optional[int] = None
+        self._matrix = None  # float32 [capacity, dim]
+        self._expires = None  # float64 [capacity], 0 = no expiry
+        self._keys: List[Optional[str]] = []
+        self._key_to_row: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+
+        self._centroids = None  # float32 [nlist, dim]
+        self._row_list = None  # int32 [capacity], -1 = unassigned
+        self._lists: List[List[int]] = []
+        self._trained_size = 0
+        self._training: Optional[asyncio.Task] = None
+        # Rows written or released while training runs
+        self._dirty_rows: Optional[set] = None
+
+        self._stats = {
+            "searches": 0,
+            "exact_searches": 0,
+            "trainings": 0,
+            "expired": 0
+        }
+
+    # =========================================================================
+    # VectorIndex interface
+    # =========================================================================
+
+    async def add(
+        self,
+        key: str,
+        vector: Sequence[float],
+        ttl_seconds: Optional[int] = None
+    ) -> None:
+        """Add or replace a vector"""
+        vec = self._normalize(vector)
+        if vec is None:
+            return
+
+        self._put(key, vec, time.time() + ttl_seconds if ttl_seconds else 0.0)
+        self._maybe_train()
+
+    async def remove(self, key: str) -> bool:
+        """Remove a vector"""
+        row = self._key_to_row.pop(key, None)
+        if row is None:
+            return False
+        self._release_row(row)
+        return True
+
+    async def search(
+        self,
+        vector: Sequence[float],
+        k: int = 1,
+        min_similarity: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """Find the nearest vectors"""
+        np = self._np
+        self._stats["searches"] += 1
+
+        if not self._key_to_row:
+            return []
+
+        query = self._normalize(vector)
+        if query is None or query.shape[0] != self._dim:
+            return []
+
+        if self._centroids is not None:
+            centroid_scores = self._centroids @ query
+            probe = np.argsort(-centroid_scores)[:self.n_probe]
+            rows = [row for list_id in probe for row in self._lists[list_id]]
+            candidates = np.asarray(rows, dtype=np.int64)
+        else:
+            self._stats["exact_searches"] += 1
+            candidates = np.fromiter(self._key_to_row.values(), dtype=np.int64)
+
+        if candidates.size == 0:
+            return []
+
+        now = time.time()
+        expires = self._expires[candidates]
+        expired = candidates[(expires > 0) & (expires <= now)]
+        if expired.size:
+            self._evict_rows(expired)
+            candidates = candidates[(expires == 0) | (expires > now)]
+            if candidates.size == 0:
+                return []
+
+        scores = self._matrix[candidates] @ query
+        if k < scores.size:
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(scores.size)
+        top = top[np.argsort(-scores[top])]
+
+        results = []
+        for idx in top:
+            score = float(scores[idx])
+            if score < min_similarity:
+                break
+            results.append((self._keys[int(candidates[idx])], score))
+        return results
+
+    async def clear(self) -> None:
+        """Remove all vectors"""
+        self._reset_storage()
+
+    def size(self) -> int:
+        """Get number of indexed vectors"""
+        return len(self._key_to_row)
+
+    def get_stats(self) -> dict:
+        """Get index statistics"""
+        return {
+            "backend": "ivf",
+            "size": self.size(),
+            "dimension": self._dim,
+            "capacity": len(self._keys),
+            "lists": len(self._lists),
+            "trained": self._centroids is not None,
+            "n_probe": self.n_probe,
+            **self._stats
+        }
+
+    # =========================================================================
+    # Snapshots
+    # =========================================================================
+
+    def save(self, path: Optional[str] = None) -> bool:
+        """
+        Persist the index to disk
+
+        Only live vectors are written; inverted lists are rebuilt on load.
+
+        Args:
+            path: Snapshot file (defaults to snapshot_path)
+
+        Returns:
+            True if a snapshot was written
+        """
+        np = self._np
+        path = path or self.snapshot_path
+        if not path or self._dim is None:
+            return False
+
+        rows = np.fromiter(self._key_to_row.values(), dtype=np.int64)
+        keys = np.array([self._keys[r] for r in rows], dtype=object)
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                vectors=self._matrix[rows],
+                expires=self._expires[rows],
+                keys=keys.astype(str)
+            )
+        os.replace(tmp_path, path)
+
+        logger.info(f"Saved vector index snapshot ({rows.size} vectors) to {path}")
+        return True
+
+    def load(self, path: Optional[str] = None) -> int:
+        """
+        Restore the index from a snapshot written by save()
+
+        Expired entries are skipped, as are keys already in the index.
+
+        Args:
+            path: Snapshot file (defaults to snapshot_path)
+
+        Returns:
+            Number of vectors loaded
+        """
+        return self._restore(self._read_snapshot(path))
+
+    async def load_async(self, path: Optional[str] = None) -> int:
+        """
+        Restore the index from a snapshot without blocking the event loop
+
+        The file is read in an executor; vectors already in the index are
+        kept (they are newer than the snapshot).
+
+        Args:
+            path: Snapshot file (defaults to snapshot_path)
+
+        Returns:
+            Number of vectors loaded
+        """
+        snapshot = await asyncio.get_running_loop().run_in_executor(None, self._read_snapshot, path)
+        return self._restore(snapshot)
+
+    async def wait_for_training(self) -> None:
+        """Wait until a running k-means training has been applied"""
+        while self._training is not None:
+            await asyncio.shield(self._training)
+
+    def _read_snapshot(self, path: Optional[str] = None):
+        """Live (vectors, expires, keys) of a snapshot file, or None"""
+        np = self._np
+        path = path or self.snapshot_path
+        if not path or not os.path.exists(path):
+            return None
+
+        with np.load(path, allow_pickle=False) as data:
+            vectors = data["vectors"].astype(np.float32, copy=False)
+            expires = data["expires"]
+            keys = data["keys"]
+
+        now = time.time()
+        live = (expires == 0) | (expires > now)
+        return vectors[live], expires[live], keys[live]
+
+    def _restore(self, snapshot) -> int:
+        """Add snapshot vectors whose keys are not indexed yet"""
+        if snapshot is None:
+            return 0
+        vectors, expires, keys = snapshot
+        if vectors.shape[0] == 0:
+            return 0
+
+        if self.size() == 0:
+            self._reset_storage()
+            count, dim = vectors.shape
+            self._allocate(dim, max(1024, count))
+            self._matrix[:count] = vectors
+            self._expires[:count] = expires
+            for row, key in enumerate(keys.tolist()):
+                self._keys[row] = key
+                self._key_to_row[key] = row
+            self._free_rows = list(range(len(self._keys) - 1, count - 1, -1))
+        else:
+            if vectors.shape[1] != self._dim:
+                logger.warning(f"Ignoring vector index snapshot of dimension {vectors.shape[1]}")
+                return 0
+            count = 0
+            for vec, expires_at, key in zip(vectors, expires.tolist(), keys.tolist()):
+                if key not in self._key_to_row:
+                    self._put(key, vec, expires_at)
+                    count += 1
+
+        self._maybe_train()
+
+        logger.info(f"Loaded vector index snapshot ({count} vectors)")
+        return count
+
+    # =========================================================================
+    # Storage
+    # =========================================================================
+
+    def _normalize(self, vector: Sequence[float]):
+        """Convert to a unit-length float32 vector (None for zero vectors)"""
+        np = self._np
+        vec = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = float(np.linalg.norm(vec))
+        if norm == 0.0 or not math.isfinite(norm):
+            return None
+        return vec / norm
+
+    def _put(self, key: str, vec, expires_at: float) -> None:
+        """Store a normalised vector in the key's row"""
+        if self._dim is None:
+            self._allocate(vec.shape[0], 1024)
+        elif vec.shape[0] != self._dim:
+            raise CacheError(
+                L04ErrorCode.E4305_SIMILARITY_SEARCH_FAILED,
+                f"Vector dimension {vec.shape[0]} does not match index dimension {self._dim}"
+            )
+
+        row = self._key_to_row.get(key)
+        if row is None:
+            row = self._take_row()
+            self._keys[row] = key
+            self._key_to_row[key] = row
+        else:
+            self._unassign(row)
+
+        self._matrix[row] = vec
+        self._expires[row] = expires_at
+        if self._dirty_rows is not None:
+            self._dirty_rows.add(row)
+
+        if self._centroids is not None:
+            self._assign(row)
+
+    def _reset_storage(self) -> None:
+        """Drop all vectors and inverted lists"""
+        if self._training is not None:
+            self._training.cancel()
+            self._training = None
+        self._dirty_rows = None
+        self._dim = None
+        self._matrix = None
+        self._expires = None
+        self._keys = []
+        self._key_to_row = {}
+        self._free_rows = []
+        self._centroids = None
+        self._row_list = None
+        self._lists = []
+        self._trained_size = 0
+
+    def _allocate(self, dim: int, capacity: int) -> None:
+        """Allocate empty storage"""
+        np = self._np
+        self._dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._expires = np.zeros(capacity, dtype=np.float64)
+        self._row_list = np.full(capacity, -1, dtype=np.int32)
+        self._keys = [None] * capacity
+        self._free_rows = list(range(capacity - 1, -1, -1))
+
+    def _grow(self) -> None:
+        """Double storage capacity"""
+        np = self._np
+        old = len(self._keys)
+        new = old * 2
+        matrix = np.zeros((new, self._dim), dtype=np.float32)
+        matrix[:old] = self._matrix
+        expires = np.zeros(new, dtype=np.float64)
+        expires[:old] = self._expires
+        row_list = np.full(new, -1, dtype=np.int32)
+        row_list[:old] = self._row_list
+
+        self._matrix = matrix
+        self._expires = expires
+        self._row_list = row_list
+        self._keys.extend([None] * (new - old))
+        self._free_rows.extend(range(new - 1, old - 1, -1))
+
+    def _take_row(self) -> int:
+        """Get a free matrix row"""
+        if not self._free_rows:
+            self._grow()
+        return self._free_rows.pop()
+
+    def _release_row(self, row: int) -> None:
+        """Return a row to the free list"""
+        self._unassign(row)
+        self._keys[row] = None
+        self._expires[row] = 0.0
+        self._free_rows.append(row)
+        if self._dirty_rows is not None:
+            self._dirty_rows.add(row)
+
+    def _evict_rows(self, rows) -> None:
+        """Drop expired rows"""
+        for row in rows.tolist():
+            key = self._keys[row]
+            if key is not None and self._key_to_row.get(key) == row:
+                del self._key_to_row[key]
+                self._release_row(row)
+                self._stats["expired"] += 1
+
+    # =========================================================================
+    # Clustering
+    # =========================================================================
+
+    def _should_train(self) -> bool:
+        """Train on first reaching the threshold and whenever size doubles"""
+        size = self.size()
+        if size < self.train_threshold or self._training is not None:
+            return False
+        return self._centroids is None or size >= self._trained_size * 2
+
+    def _maybe_train(self) -> None:
+        """
+        Start training in the background if due
+
+        Outside an event loop (e.g. load() from a script) training runs
+        inline.
+        """
+        if not self._should_train():
+            return
+
+        np = self._np
+        rows = np.fromiter(self._key_to_row.values(), dtype=np.int64)
+        data = self._matrix[rows]
+        self._dirty_rows = set()
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._install(rows, *self._kmeans(data))
+            self._dirty_rows = None
+            return
+
+        self._training = loop.create_task(self._train(loop, rows, data))
+
+    async def _train(self, loop, rows, data) -> None:
+        """Cluster a copy of the live vectors off the event loop"""
+        try:
+            centroids, assignment = await loop.run_in_executor(None, self._kmeans, data)
+            self._install(rows, centroids, assignment)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"IVF vector index training failed: {e}")
+        finally:
+            if self._training is asyncio.current_task():
+                self._training = None
+                self._dirty_rows = None
+
+    def _kmeans(self, data):
+        """
+        Cluster vectors with k-means (runs in an executor thread)
+
+        Returns:
+            (centroids, list id of each vector)
+        """
+        np = self._np
+        count = data.shape[0]
+        nlist = max(1, int(math.sqrt(count)))
+
+        seed_rows = self._rng.sample(range(count), nlist)
+        centroids = data[seed_rows].copy()
+
+        for _ in range(self.kmeans_iterations):
+            assignment = np.argmax(data @ centroids.T, axis=1)
+            for list_id in range(nlist):
+                members = data[assignment == list_id]
+                if members.shape[0] == 0:
+                    # Re-seed empty clusters from a random vector
+                    centroids[list_id] = data[self._rng.randrange(count)]
+                    continue
+                centroid = members.mean(axis=0)
+                norm = np.linalg.norm(centroid)
+                if norm > 0:
+                    centroids[list_id] = centroid / norm
+
+        assignment = np.argmax(data @ centroids.T, axis=1)
+        return centroids.astype(np.float32), assignment
+
+    def _install(self, rows, centroids, assignment) -> None:
+        """Replace the inverted lists with a training result"""
+        dirty = self._dirty_rows or set()
+        self._centroids = centroids
+        self._lists = [[] for _ in range(centroids.shape[0])]
+        self._row_list[:] = -1
+        for row, list_id in zip(rows.tolist(), assignment.tolist()):
+            if row not in dirty:
+                self._lists[list_id].append(row)
+                self._row_list[row] = list_id
+        # Rows written or released while training ran
+        for row in dirty:
+            if self._keys[row] is not None:
+                self._assign(row)
+
+        self._trained_size = rows.size
+        self._stats["trainings"] += 1
+        logger.info(f"Trained IVF vector index ({rows.size} vectors, {len(self._lists)} lists)")
+
+    def _assign(self, row: int) -> None:
+        """Append a row to its nearest inverted list"""
+        list_id = int(self._np.argmax(self._centroids @ self._matrix[row]))
+        self._lists[list_id].append(row)
+        self._row_list[row] = list_id
+
+    def _unassign(self, row: int) -> None:
+        """Remove a row from its inverted list"""
+        if self._row_list is None:
+            return
+        list_id = int(self._row_list[row])
+        if list_id >= 0:
+            self._lists[list_id].remove(row)
+            self._row_list[row] = -1
+
+
+class RediSearchVectorIndex(VectorIndex):
+    """
+    Vector index backed by a RediSearch HNSW index (Redis Stack)
+
+    Vectors are stored as float32 blobs in cache:vec:{key} hashes that expire
+    with the cache entry, so every gateway replica shares one index and Redis
+    evicts stale vectors on its own.
+    """
+
+    KEY_PREFIX = "cache:vec:"
+    shared = True
+
+    def __init__(
+        self,
+        redis_url: str = "redis://localhost:6379",
+        index_name: str = "l04_cache_vectors",
+        m: int = 16,
+        ef_construction: int = 200
+    ):
+        """
+        Initialize RediSearch index
+
+        Args:
+            redis_url: Redis Stack connection URL
+            index_name: RediSearch index name
+            m: HNSW graph degree
+            ef_construction: HNSW build-time candidate list size
+        """
+        self.redis_url = redis_url
+        self.index_name = index_name
+        self.m = m
+        self.ef_construction = ef_construction
+        self._redis = None
+        self._dim: Optional[int] = None
+        self._size = 0
+
+    async def add(
+        self,
+        key: str,
+        vector: Sequence[float],
+        ttl_seconds: Optional[int] = None
+    ) -> None:
+        """Add or replace a vector"""
+        redis_client = await self._get_redis_client()
+        await self._ensure_index(len(vector))
+
+        redis_key = f"{self.KEY_PREFIX}{key}"
+        await redis_client.hset(
+            redis_key,
+            mapping={"cache_key": key, "vector": self._pack(vector)}
+        )
+        if ttl_seconds:
+            await redis_client.expire(redis_key, ttl_seconds)
+
+    async def remove(self, key: str) -> bool:
+        """Remove a vector"""
+        redis_client = await self._get_redis_client()
+        return bool(await redis_client.delete(f"{self.KEY_PREFIX}{key}"))
+
+    async def search(
+        self,
+        vector: Sequence[float],
+        k: int = 1,
+        min_similarity: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """Find the nearest vectors"""
+        redis_client = await self._get_redis_client()
+        await self._ensure_index(len(vector))
+
+        raw = await redis_client.execute_command(
+            "FT.SEARCH", self.index_name,
+            f"*=>[KNN {k} @vector $vec AS distance]",
+            "PARAMS", 2, "vec", self._pack(vector),
+            "SORTBY", "distance",
+            "RETURN", 2, "cache_key", "distance",
+            "LIMIT", 0, k,
+            "DIALECT", 2
+        )
+
+        results = []
+        # Reply layout: [total, doc_id, [field, value, ...], doc_id, [...], ...]
+        for fields in raw[2::2]:
+            values = dict(zip(fields[::2], fields[1::2]))
+            # COSINE distance is 1 - cosine similarity
+            similarity = 1.0 - float(values.get("distance", 1.0))
+            if similarity >= min_similarity and "cache_key" in values:
+                results.append((values["cache_key"], similarity))
+        return results
+
+    async def clear(self) -> None:
+        """Drop the index and its vectors"""
+        redis_client = await self._get_redis_client()
+        try:
+            await redis_client.execute_command("FT.DROPINDEX", self.index_name, "DD")
+        except Exception as e:
+            logger.debug(f"FT.DROPINDEX {self.index_name} failed: {e}")
+        self._dim = None
+
+    def size(self) -> int:
+        """Get number of indexed vectors (as of the last ensure/info call)"""
+        return self._size
+
+    def get_stats(self) -> dict:
+        """Get index statistics"""
+        return {
+            "backend": "redisearch",
+            "index_name": self.index_name,
+            "dimension": self._dim,
+            "size": self._size
+        }
+
+    async def refresh_stats(self) -> None:
+        """Refresh size from FT.INFO"""
+        redis_client = await self._get_redis_client()
+        info = await redis_client.execute_command("FT.INFO", self.index_name)
+        info = dict(zip(info[::2], info[1::2]))
+        self._size = int(info.get("num_docs", 0))
+
+    async def _ensure_index(self, dim: int) -> None:
+        """Create the RediSearch index on first use"""
+        if self._dim is not None:
+            if dim != self._dim:
+                raise CacheError(
+                    L04ErrorCode.E4305_SIMILARITY_SEARCH_FAILED,
+                    f"Vector dimension {dim} does not match index dimension {self._dim}"
+                )
+            return
+
+        redis_client = await self._get_redis_client()
+        try:
+            await redis_client.execute_command(
+                "FT.CREATE", self.index_name,
+                "ON", "HASH",
+                "PREFIX", 1, self.KEY_PREFIX,
+                "SCHEMA",
+                "cache_key", "TAG",
+                "vector", "VECTOR", "HNSW", 10,
+                "TYPE", "FLOAT32",
+                "DIM", dim,
+                "DISTANCE_METRIC", "COSINE",
+                "M", self.m,
+                "EF_CONSTRUCTION", self.ef_construction
+            )
+            logger.info(f"Created RediSearch index {self.index_name} (dim={dim})")
+        except Exception as e:
+            if "already exists" not in str(e).lower():
+                raise CacheError(
+                    L04ErrorCode.E4301_CACHE_UNAVAILABLE,
+                    f"Failed to create RediSearch index: {e}"
+                )
+        self._dim = dim
+
+    @staticmethod
+    def _pack(vector: Sequence[float]) -> bytes:
+        """Encode vector as little-endian float32 blob"""
+        return struct.pack(f"<{len(vector)}f", *vector)
+
+    async def _get_redis_client(self):
+        """Get or create Redis client"""
+        if self._redis is None:
+            try:
+                import redis.asyncio as redis
+                self._redis = redis.from_url(
+                    self.redis_url,
+                    encoding="utf-8",
+                    decode_responses=True
+                )
+            except ImportError:
+                logger.error("redis package not installed")
+                raise CacheError(
+                    L04ErrorCode.E4301_CACHE_UNAVAILABLE,
+                    "Redis package not installed"
+                )
+        return self._redis
+
+    async def close(self) -> None:
+        """Close Redis connection"""
+        if self._redis:
+            await self._redis.close()
+            self._redis = None
+
+
+def create_default_vector_index(
+    snapshot_path: Optional[str] = None
+) -> Optional[VectorIndex]:
+    """
+    Create the default in-process index
+
+    Args:
+        snapshot_path: Optional snapshot file for persistence
+
+    Returns:
+        IVFVectorIndex, or None if numpy is unavailable
+    """
+    try:
+        return IVFVectorIndex(snapshot_path=snapshot_path)
+    except CacheError:
+        logger.warning("numpy not available, semantic cache will use linear scan")
+        return None
@@ -29,6 +29,7 @@ from L04_model_gateway.services import (
     RateLimiter,
     CircuitBreaker,
     L01Bridge,
+    HedgingPolicy,
 )
 from L04_model_gateway.providers import MockAdapter
 
@@ -183,6 +184,77 @@ class TestE2ECaching:
             assert response2.content == response1.content
 
 
+@pytest.mark.l04
+@pytest.mark.integration
+@pytest.mark.e2e
+@pytest.mark.asyncio
+class TestE2ECoalescing:
+    """End-to-end tests for single-flight request coalescing."""
+
+    async def test_identical_concurrent_requests_share_one_call(
+        self, model_gateway, mock_provider
+    ):
+        """Test concurrent identical requests make a single provider call."""
+        import asyncio
+
+        requests = [
+            InferenceRequest.create(
+                agent_did=f"did:key:agent-{i}",
+                messages=[Message(role=MessageRole.USER, content="Same prompt")],
+                model_id="mock",
+            )
+            for i in range(5)
+        ]
+
+        responses = await asyncio.gather(
+            *[model_gateway.execute(r) for r in requests]
+        )
+
+        assert mock_provider.get_call_count() == 1
+        assert [r.request_id for r in responses] == [r.request_id for r in requests]
+        assert len({r.content for r in responses}) == 1
+        assert sum(1 for r in responses if r.metadata.get("coalesced")) == 4
+
+    async def test_different_requests_are_not_coalesced(
+        self, model_gateway, mock_provider
+    ):
+        """Test requests with different prompts each call the provider."""
+        import asyncio
+
+        requests = [
+            InferenceRequest.create(
+                agent_did="did:key:test-agent",
+                messages=[Message(role=MessageRole.USER, content=f"Prompt {i}")],
+                model_id="mock",
+            )
+            for i in range(3)
+        ]
+
+        await asyncio.gather(*[model_gateway.execute(r) for r in requests])
+
+        assert mock_provider.get_call_count() == 3
+
+    async def test_cache_disabled_requests_are_not_coalesced(
+        self, model_gateway, mock_provider
+    ):
+        """Test requests that opt out of caching always call the provider."""
+        import asyncio
+
+        requests = [
+            InferenceRequest.create(
+                agent_did="did:key:test-agent",
+                messages=[Message(role=MessageRole.USER, content="Fresh answer")],
+                model_id="mock",
+                enable_cache=False,
+            )
+            for _ in range(3)
+        ]
+
+        await asyncio.gather(*[model_gateway.execute(r) for r in requests])
+
+        assert mock_provider.get_call_count() == 3
+
+
 @pytest.mark.l04
 @pytest.mark.integration
 @pytest.mark.e2e
@@ -307,6 +379,76 @@ class TestE2EStreaming:
         if hasattr(final_chunk, "token_usage") and final_chunk.token_usage:
             assert final_chunk.token_usage.total_tokens >= 0
 
+    async def test_completed_stream_is_cached(self, model_gateway):
+        """Test a finished stream is written to the cache as one response."""
+        model_gateway.cache.get = AsyncMock(return_value=None)
+        model_gateway.cache.set = AsyncMock()
+        request = InferenceRequest.create(
+            agent_did="did:key:test-agent",
+            messages=[Message(role=MessageRole.USER, content="Hello!")],
+            model_id="mock",
+        )
+
+        chunks = [chunk async for chunk in model_gateway.stream(request)]
+
+        model_gateway.cache.set.assert_awaited_once()
+        cached = model_gateway.cache.set.call_args.args[1]
+        assert cached.content == "".join(c.content_delta for c in chunks)
+        assert cached.finish_reason == "stop"
+        assert cached.token_usage.output_tokens > 0
+
+    async def test_cached_response_is_replayed_as_stream(
+        self, model_gateway, mock_provider
+    ):
+        """Test a cache hit streams the cached content without the provider."""
+        request = InferenceRequest.create(
+            agent_did="did:key:test-agent",
+            messages=[Message(role=MessageRole.USER, content="Hello!")],
+            model_id="mock",
+        )
+        content = "A cached answer long enough to be split into several chunks."
+        model_gateway.cache.get = AsyncMock(return_value=InferenceResponse(
+            request_id=request.request_id,
+            model_id="mock",
+            provider="mock",
+            content=content,
+            token_usage=TokenUsage(input_tokens=3, output_tokens=12),
+            latency_ms=0,
+            cached=True,
+        ))
+        calls_before = mock_provider.call_count
+
+        chunks = [chunk async for chunk in model_gateway.stream(request)]
+
+        assert len(chunks) > 2
+        assert "".join(c.content_delta for c in chunks) == content
+        assert chunks[-1].is_final is True
+        assert chunks[-1].token_count == 12
+        assert mock_provider.call_count == calls_before
+
+    async def test_stream_reconciles_rate_limit_with_actual_usage(self, model_gateway):
+        """Test the up-front token reservation is settled after the stream."""
+        model_gateway.cache.get = AsyncMock(return_value=None)
+        model_gateway.cache.set = AsyncMock()
+        model_gateway.rate_limiter.check_rate_limit = AsyncMock(return_value=True)
+        model_gateway.rate_limiter.reconcile_tokens = AsyncMock()
+        request = InferenceRequest.create(
+            agent_did="did:key:test-agent",
+            messages=[Message(role=MessageRole.USER, content="Hello!")],
+            model_id="mock",
+            max_tokens=500,
+        )
+
+        async for _ in model_gateway.stream(request):
+            pass
+
+        reserved = model_gateway.rate_limiter.check_rate_limit.call_args.kwargs["tokens"]
+        settle = model_gateway.rate_limiter.reconcile_tokens.call_args.kwargs
+        input_tokens = model_gateway._estimate_input_tokens(request)
+        assert reserved == input_tokens + 500
+        assert settle["reserved_tokens"] == reserved
+        assert input_tokens < settle["actual_tokens"] < reserved
+
 
 @pytest.mark.l04
 @pytest.mark.integration
@@ -459,3 +601,91 @@ class TestE2EFailover:
             pass
 
         await gateway.close()
+
+
+@pytest.mark.l04
+@pytest.mark.integration
+@pytest.mark.e2e
+@pytest.mark.asyncio
+class TestE2EHedging:
+    """End-to-end tests for hedged requests."""
+
+    def _gateway(self, primary_latency_ms, fallback_latency_ms, **policy_kwargs):
+        registry = ModelRegistry()
+        registry.register_model(create_mock_model_config("slow-model", "slow"))
+        registry.register_model(create_mock_model_config("fast-model", "fast"))
+        providers = {
+            "slow": MockAdapter(provider_id="slow", latency_ms=primary_latency_ms),
+            "fast": MockAdapter(provider_id="fast", latency_ms=fallback_latency_ms),
+        }
+        policy_kwargs.setdefault("min_delay_ms", 20)
+        policy_kwargs.setdefault("max_delay_ms", 20)
+        gateway = ModelGateway(
+            registry=registry,
+            providers=providers,
+            hedging_policy=HedgingPolicy(**policy_kwargs),
+        )
+        return gateway, providers
+
+    def _request(self):
+        return InferenceRequest.create(
+            agent_did="did:key:test-agent",
+            messages=[Message(role=MessageRole.USER, content="Hedge me")],
+        )
+
+    async def test_slow_primary_is_hedged(self):
+        """Test the fallback answers when the primary misses its deadline."""
+        gateway, providers = self._gateway(500, 10, max_hedge_ratio=1.0, burst=1.0)
+
+        response = await gateway._execute_with_failover(
+            self._request(), "slow-model", "slow", ["fast-model"]
+        )
+
+        assert response.model_id == "fast-model"
+        assert response.metadata["hedge_won"] is True
+        stats = gateway.hedging_policy.get_stats()
+        assert stats["hedges_fired"] == 1
+        assert stats["hedges_won"] == 1
+        # Losing primary was cancelled, not counted as a failure
+        assert gateway.router.latency_tracker.get_stats()["slow-model"]["error_rate"] == 0
+        await gateway.close()
+
+    async def test_fast_primary_is_not_hedged(self):
+        """Test no hedge is sent when the primary meets its deadline."""
+        gateway, providers = self._gateway(1, 1, max_hedge_ratio=1.0, burst=1.0)
+
+        response = await gateway._execute_with_failover(
+            self._request(), "slow-model", "slow", ["fast-model"]
+        )
+
+        assert response.model_id == "slow-model"
+        assert "hedged" not in response.metadata
+        assert providers["fast"].call_count == 0
+        await gateway.close()
+
+    async def test_budget_caps_hedge_ratio(self):
+        """Test hedges stop once the budget share of traffic is spent."""
+        gateway, providers = self._gateway(60, 1, max_hedge_ratio=0.25, burst=1.0)
+
+        for _ in range(8):
+            await gateway._execute_with_failover(
+                self._request(), "slow-model", "slow", ["fast-model"]
+            )
+
+        stats = gateway.hedging_policy.get_stats()
+        assert stats["hedges_fired"] == 2
+        assert stats["budget_denied"] == 6
+        await gateway.close()
+
+    async def test_hedge_failure_waits_for_primary(self):
+        """Test a failing hedge does not fail a slow but healthy primary."""
+        gateway, providers = self._gateway(60, 1, max_hedge_ratio=1.0, burst=1.0)
+        providers["fast"].should_fail = True
+
+        response = await gateway._execute_with_failover(
+            self._request(), "slow-model", "slow", ["fast-model"]
+        )
+
+        assert response.model_id == "slow-model"
+        assert response.metadata["hedge_won"] is False
+        await gateway.close()
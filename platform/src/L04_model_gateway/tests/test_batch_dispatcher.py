@@ -0,0 +1,131 @@
+"""
+L04 Model Gateway Layer - Batch Dispatcher Tests
+
+Tests for micro-batching of provider calls.
+"""
+
+import asyncio
+import pytest
+
+from L04_model_gateway.services import BatchDispatcher
+from L04_model_gateway.providers import MockAdapter
+from L04_model_gateway.models import ProviderError, L04ErrorCode
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestCompletionBatching:
+    """Tests for batched completions."""
+
+    async def test_concurrent_requests_share_one_call(self, sample_inference_request):
+        """Test requests inside the window go out as one batch."""
+        dispatcher = BatchDispatcher(max_batch_size=16, max_wait_ms=10)
+        adapter = MockAdapter(latency_ms=0)
+
+        responses = await asyncio.gather(*[
+            dispatcher.submit(adapter, "mock-model", sample_inference_request)
+            for _ in range(5)
+        ])
+
+        assert adapter.batch_call_count == 1
+        assert all(r.metadata["batch_size"] == 5 for r in responses)
+        assert dispatcher.get_stats()["average_batch_size"] == 5
+
+    async def test_full_batch_flushes_before_timer(self, sample_inference_request):
+        """Test reaching max_batch_size dispatches without waiting."""
+        dispatcher = BatchDispatcher(max_batch_size=4, max_wait_ms=10_000)
+        adapter = MockAdapter(latency_ms=0)
+
+        responses = await asyncio.wait_for(
+            asyncio.gather(*[
+                dispatcher.submit(adapter, "mock-model", sample_inference_request)
+                for _ in range(8)
+            ]),
+            timeout=1.0
+        )
+
+        assert len(responses) == 8
+        assert adapter.batch_call_count == 2
+
+    async def test_models_are_batched_separately(self, sample_inference_request):
+        """Test requests for different models never share a batch."""
+        dispatcher = BatchDispatcher(max_wait_ms=5)
+        adapter = MockAdapter(latency_ms=0)
+
+        await asyncio.gather(
+            dispatcher.submit(adapter, "mock-a", sample_inference_request),
+            dispatcher.submit(adapter, "mock-b", sample_inference_request),
+        )
+
+        assert adapter.batch_call_count == 2
+
+    async def test_batch_error_reaches_every_caller(self, sample_inference_request):
+        """Test a failed batch call fails each waiting request."""
+        dispatcher = BatchDispatcher(max_wait_ms=5)
+        adapter = MockAdapter(latency_ms=0)
+        adapter.should_fail = True
+
+        results = await asyncio.gather(
+            *[dispatcher.submit(adapter, "mock-model", sample_inference_request) for _ in range(3)],
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, ProviderError) for r in results)
+
+    async def test_non_batching_adapter_is_called_directly(self, sample_inference_request):
+        """Test adapters without batch support bypass the queue."""
+        dispatcher = BatchDispatcher()
+        adapter = MockAdapter(latency_ms=0)
+        adapter.supports_batching = lambda: False
+
+        await dispatcher.submit(adapter, "mock-model", sample_inference_request)
+
+        stats = dispatcher.get_stats()
+        assert stats["direct_calls"] == 1
+        assert stats["batches"] == 0
+        assert adapter.batch_call_count == 0
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestEmbeddingBatching:
+    """Tests for batched embeddings."""
+
+    async def test_embeddings_are_batched_in_order(self):
+        """Test each caller gets the vector for its own text."""
+        dispatcher = BatchDispatcher(max_wait_ms=5)
+        adapter = MockAdapter(latency_ms=0)
+        texts = [f"text {i}" for i in range(6)]
+
+        vectors = await asyncio.gather(*[
+            dispatcher.submit_embedding(adapter, "embed-model", text) for text in texts
+        ])
+
+        assert adapter.batch_call_count == 1
+        assert vectors == await adapter.embed(texts, "embed-model")
+
+    async def test_unsupported_provider_is_rejected(self):
+        """Test embedding on a provider without support raises."""
+        dispatcher = BatchDispatcher()
+        adapter = MockAdapter()
+        adapter.supports_embeddings = lambda: False
+
+        with pytest.raises(ProviderError) as exc_info:
+            await dispatcher.submit_embedding(adapter, "embed-model", "text")
+        assert exc_info.value.error_code == L04ErrorCode.E4207_MODEL_NOT_SUPPORTED
+
+    async def test_flush_all_dispatches_pending(self):
+        """Test flush_all sends batches still waiting on their timer."""
+        dispatcher = BatchDispatcher(max_wait_ms=10_000)
+        adapter = MockAdapter(latency_ms=0)
+
+        task = asyncio.create_task(
+            dispatcher.submit_embedding(adapter, "embed-model", "text")
+        )
+        await asyncio.sleep(0)
+        await dispatcher.flush_all()
+
+        assert len(await task) == 16
+        assert dispatcher.get_stats()["pending_batches"] == 0
@@ -4,6 +4,9 @@ L04 Model Gateway Layer - L01 Bridge Tests
 Tests for L01 Data Layer integration.
 """
 
+import os
+import subprocess
+import sys
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime, timezone
@@ -20,6 +23,8 @@ from ..models import (
     ResponseStatus,
 )
 
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 
 @pytest.mark.l04
 @pytest.mark.unit
@@ -49,6 +54,15 @@ class TestL01BridgeInit:
         bridge = L01Bridge(timeout=30.0)
         assert bridge.timeout == 30.0
 
+    def test_import_does_not_load_shared_package(self):
+        """Test importing the bridge does not pull in the shared package"""
+        code = (
+            "import sys; import L04_model_gateway.services.l01_bridge; "
+            "assert 'shared' not in sys.modules"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+
     def test_init_strips_trailing_slash(self):
         """Test bridge strips trailing slash from URL"""
         bridge = L01Bridge(base_url="http://localhost:8001/")
@@ -0,0 +1,221 @@
+"""
+L04 Model Gateway Layer - Local Cache Tests
+
+Tests for the in-process LRU/TinyLFU tier and its SemanticCache integration.
+"""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from L04_model_gateway.services.local_cache import LocalCache
+from L04_model_gateway.services import SemanticCache
+from L04_model_gateway.models import (
+    InferenceRequest,
+    InferenceResponse,
+    Message,
+    MessageRole,
+    TokenUsage,
+)
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+class TestLocalCache:
+    """Tests for LocalCache."""
+
+    def test_get_returns_stored_value(self):
+        """Test a stored value is returned and counted as a hit."""
+        cache = LocalCache(max_entries=4)
+        cache.put("a", 1)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get_stats()["hits"] == 1
+        assert cache.get_stats()["misses"] == 1
+
+    def test_expired_entries_are_not_returned(self, monkeypatch):
+        """Test entries past their TTL are dropped on read."""
+        import L04_model_gateway.services.local_cache as local_cache
+
+        now = [100.0]
+        monkeypatch.setattr(local_cache.time, "monotonic", lambda: now[0])
+        cache = LocalCache(ttl_seconds=5)
+        cache.put("a", 1)
+
+        now[0] += 10
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_hot_entries_survive_scan(self):
+        """Test one-off keys are not admitted over frequently read entries."""
+        cache = LocalCache(max_entries=10)
+        for i in range(10):
+            cache.put(f"hot-{i}", i)
+            for _ in range(3):
+                cache.get(f"hot-{i}")
+
+        for i in range(40):
+            cache.put(f"scan-{i}", i)
+
+        assert all(cache.get(f"hot-{i}") == i for i in range(10))
+        assert cache.get_stats()["rejections"] == 40
+
+    def test_frequent_newcomer_replaces_lru_victim(self):
+        """Test a key seen more often than the LRU entry is admitted."""
+        cache = LocalCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        for _ in range(5):
+            cache.get("c")
+
+        assert cache.put("c", 3) is True
+        assert cache.get("a") is None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_invalidate_and_clear(self):
+        """Test explicit removal."""
+        cache = LocalCache()
+        cache.put("a", 1)
+        cache.put("b", 2)
+
+        assert cache.invalidate("a") is True
+        assert cache.invalidate("a") is False
+        cache.clear()
+        assert len(cache) == 0
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSemanticCacheL1:
+    """Tests for the L1 tier in front of Redis exact lookups."""
+
+    @pytest.fixture
+    def redis_server(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        return fakeredis, fakeredis.FakeServer()
+
+    async def _cache(self, redis_server) -> SemanticCache:
+        fakeredis, server = redis_server
+        cache = SemanticCache(enable_embeddings=False)
+        cache._redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        cache._ensure_invalidation_listener()
+        for _ in range(100):
+            if cache._l1_coherent:
+                break
+            await asyncio.sleep(0.01)
+        return cache
+
+    def _request(self, content: str) -> InferenceRequest:
+        return InferenceRequest.create(
+            agent_did="did:key:test",
+            messages=[Message(role=MessageRole.USER, content=content)],
+        )
+
+    def _response(self, request: InferenceRequest, content: str) -> InferenceResponse:
+        return InferenceResponse(
+            request_id=request.request_id,
+            model_id="mock",
+            provider="mock",
+            content=content,
+            token_usage=TokenUsage(input_tokens=5, output_tokens=1),
+            latency_ms=10,
+        )
+
+    async def test_repeat_hits_are_served_locally(self, redis_server):
+        """Test an exact hit after a write does not read Redis."""
+        cache = await self._cache(redis_server)
+        request = self._request("hello")
+        await cache.set(request, self._response(request, "world"))
+
+        again = self._request("hello")
+        result = await cache.get(again)
+
+        assert result.content == "world"
+        assert result.cached is True
+        assert result.request_id == again.request_id
+        stats = cache.get_stats()
+        assert stats["tiers"]["l1"]["hits"] == 1
+        assert stats["tiers"]["redis_exact"]["lookups"] == 0
+        await cache.close()
+
+    async def test_redis_hit_is_promoted_to_l1(self, redis_server):
+        """Test a response written by another replica is kept locally after one read."""
+        writer = await self._cache(redis_server)
+        reader = await self._cache(redis_server)
+        request = self._request("hello")
+        await writer.set(request, self._response(request, "world"))
+
+        await reader.get(self._request("hello"))
+        await reader.get(self._request("hello"))
+
+        tiers = reader.get_stats()["tiers"]
+        assert tiers["redis_exact"]["hits"] == 1
+        assert tiers["l1"]["hits"] == 1
+        await writer.close()
+        await reader.close()
+
+    async def test_caller_mutation_does_not_leak_into_l1(self, redis_server):
+        """Test a response returned from a Redis hit is not the L1 instance."""
+        writer = await self._cache(redis_server)
+        reader = await self._cache(redis_server)
+        request = self._request("hello")
+        await writer.set(request, self._response(request, "world"))
+
+        first = await reader.get(self._request("hello"))
+        first.metadata["mutated"] = True
+        second = await reader.get(self._request("hello"))
+
+        assert reader.get_stats()["tiers"]["l1"]["hits"] == 1
+        assert "mutated" not in second.metadata
+        await writer.close()
+        await reader.close()
+
+    async def test_write_on_other_replica_invalidates_l1(self, redis_server):
+        """Test a replica never serves an L1 entry overwritten elsewhere."""
+        replica_a = await self._cache(redis_server)
+        replica_b = await self._cache(redis_server)
+        request = self._request("hello")
+        await replica_a.set(request, self._response(request, "old"))
+        assert (await replica_b.get(self._request("hello"))).content == "old"
+        received = replica_b.get_stats()["invalidations_received"]
+
+        await replica_a.set(request, self._response(request, "new"))
+        for _ in range(100):
+            if replica_b.get_stats()["invalidations_received"] > received:
+                break
+            await asyncio.sleep(0.01)
+
+        assert (await replica_b.get(self._request("hello"))).content == "new"
+        await replica_a.close()
+        await replica_b.close()
+
+    async def test_clear_empties_every_replica(self, redis_server):
+        """Test clear() drops L1 entries on other replicas."""
+        replica_a = await self._cache(redis_server)
+        replica_b = await self._cache(redis_server)
+        request = self._request("hello")
+        await replica_b.set(request, self._response(request, "world"))
+
+        await replica_a.clear()
+        for _ in range(100):
+            if len(replica_b.l1) == 0:
+                break
+            await asyncio.sleep(0.01)
+
+        assert await replica_b.get(self._request("hello")) is None
+        await replica_a.close()
+        await replica_b.close()
+
+    async def test_l1_unused_without_subscription(self):
+        """Test L1 is bypassed until invalidations can be received."""
+        cache = SemanticCache(enable_embeddings=False)
+        request = self._request("hello")
+        cache.l1.put(cache._generate_cache_key(request), self._response(request, "stale"))
+        cache._ensure_invalidation_listener = lambda: None
+        cache._redis = AsyncMock()
+        cache._redis.get.return_value = None
+
+        assert await cache.get(request) is None
+        cache._redis.get.assert_called_once()
@@ -21,6 +21,8 @@ from L04_model_gateway.services.metrics import (
     ACTIVE_REQUESTS,
     TOKEN_USAGE_TOTAL,
     GATEWAY_INFO,
+    TIME_TO_FIRST_TOKEN_SECONDS,
+    INTER_TOKEN_LATENCY_SECONDS,
 )
 
 
@@ -307,6 +309,38 @@ class TestCircuitBreakerMetrics:
         assert value == 2
 
 
+@pytest.mark.l04
+@pytest.mark.unit
+class TestStreamingMetrics:
+    """Tests for streaming latency metrics."""
+
+    def test_record_time_to_first_token(self):
+        """Test TTFT is observed per provider and model."""
+        manager = MetricsManager()
+        histogram = TIME_TO_FIRST_TOKEN_SECONDS.labels(
+            provider="ttft_test",
+            model="ttft_model"
+        )
+        initial_sum = histogram._sum.get()
+
+        manager.record_time_to_first_token("ttft_test", "ttft_model", 0.4)
+
+        assert histogram._sum.get() >= initial_sum + 0.4
+
+    def test_record_inter_token_latency(self):
+        """Test inter-token gaps are observed per provider and model."""
+        manager = MetricsManager()
+        histogram = INTER_TOKEN_LATENCY_SECONDS.labels(
+            provider="itl_test",
+            model="itl_model"
+        )
+        initial_sum = histogram._sum.get()
+
+        manager.record_inter_token_latency("itl_test", "itl_model", 0.02)
+
+        assert histogram._sum.get() >= initial_sum + 0.02
+
+
 @pytest.mark.l04
 @pytest.mark.unit
 class TestActiveRequestMetrics:
@@ -0,0 +1,198 @@
+"""
+L04 Model Gateway Layer - Rate Limiter Tests
+
+Tests for the atomic token bucket script and lease mode.
+"""
+
+import asyncio
+import pytest
+
+from L04_model_gateway.services import RateLimiter
+from L04_model_gateway.models import RateLimitError, L04ErrorCode
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+
+def make_limiter(**kwargs) -> RateLimiter:
+    """Create a rate limiter backed by an in-memory Redis."""
+    limiter = RateLimiter(**kwargs)
+    limiter._redis = fakeredis.FakeAsyncRedis(decode_responses=True)
+    return limiter
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestTokenBucketScript:
+    """Tests for the single round-trip RPM/TPM check."""
+
+    async def test_allows_within_limits(self):
+        """Test requests within both limits are allowed."""
+        limiter = make_limiter(default_rpm=5, default_tpm=1000)
+
+        assert await limiter.check_rate_limit("did:key:a", "gateway", 100) is True
+        assert limiter.get_stats()["round_trips"] == 1
+
+    async def test_rpm_limit_enforced(self):
+        """Test the request bucket rejects once empty."""
+        limiter = make_limiter(default_rpm=3, default_tpm=100000)
+
+        for _ in range(3):
+            await limiter.check_rate_limit("did:key:a", "gateway", 1)
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await limiter.check_rate_limit("did:key:a", "gateway", 1)
+        assert exc_info.value.error_code == L04ErrorCode.E4404_RPM_LIMIT_EXCEEDED
+
+    async def test_tpm_rejection_does_not_consume_request(self):
+        """Test a TPM rejection leaves the request bucket untouched."""
+        limiter = make_limiter(default_rpm=2, default_tpm=100)
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await limiter.check_rate_limit("did:key:a", "gateway", 500)
+        assert exc_info.value.error_code == L04ErrorCode.E4405_TPM_LIMIT_EXCEEDED
+
+        usage = await limiter.get_usage("did:key:a", "gateway")
+        assert usage["rpm"]["available"] == 2
+
+        # Both requests are still available
+        await limiter.check_rate_limit("did:key:a", "gateway", 10)
+        await limiter.check_rate_limit("did:key:a", "gateway", 10)
+
+    async def test_concurrent_checks_do_not_overspend(self):
+        """Test parallel checks never admit more than the bucket holds."""
+        limiter = make_limiter(default_rpm=10, default_tpm=100000)
+
+        async def attempt():
+            try:
+                await limiter.check_rate_limit("did:key:a", "gateway", 1)
+                return True
+            except RateLimitError:
+                return False
+
+        results = await asyncio.gather(*[attempt() for _ in range(50)])
+        assert sum(results) == 10
+
+    async def test_reloads_flushed_script(self):
+        """Test the script is reloaded after a NOSCRIPT error."""
+        limiter = make_limiter()
+        await limiter.check_rate_limit("did:key:a", "gateway", 1)
+
+        await limiter._redis.script_flush()
+        assert await limiter.check_rate_limit("did:key:a", "gateway", 1) is True
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestLeaseMode:
+    """Tests for locally spent leases."""
+
+    async def test_lease_serves_checks_without_round_trips(self):
+        """Test checks inside a lease make no Redis calls."""
+        limiter = make_limiter(
+            default_rpm=100, default_tpm=100000,
+            lease_requests=10, lease_tokens=1000
+        )
+
+        for _ in range(10):
+            await limiter.check_rate_limit("did:key:a", "gateway", 50)
+
+        stats = limiter.get_stats()
+        assert stats["leases_acquired"] == 1
+        assert stats["round_trips"] == 1
+        assert stats["lease_hits"] == 10
+
+        # The whole lease was debited from the shared bucket
+        usage = await limiter.get_usage("did:key:a", "gateway")
+        assert usage["rpm"]["available"] == 90
+
+    async def test_lease_never_exceeds_shared_limit(self):
+        """Test leasing cannot admit more requests than the RPM limit."""
+        limiter = make_limiter(
+            default_rpm=25, default_tpm=100000,
+            lease_requests=10, lease_tokens=1000
+        )
+
+        admitted = 0
+        for _ in range(40):
+            try:
+                await limiter.check_rate_limit("did:key:a", "gateway", 1)
+                admitted += 1
+            except RateLimitError:
+                pass
+
+        assert admitted == 25
+
+    async def test_expired_lease_is_renewed(self, monkeypatch):
+        """Test an expired lease is not spent."""
+        import L04_model_gateway.services.rate_limiter as rate_limiter
+
+        now = [1000.0]
+        monkeypatch.setattr(rate_limiter.time, "monotonic", lambda: now[0])
+        limiter = make_limiter(
+            default_rpm=100, default_tpm=100000,
+            lease_requests=10, lease_tokens=1000, lease_seconds=1.0
+        )
+
+        await limiter.check_rate_limit("did:key:a", "gateway", 1)
+        now[0] += 5
+        await limiter.check_rate_limit("did:key:a", "gateway", 1)
+
+        assert limiter.get_stats()["leases_acquired"] == 2
+
+    async def test_concurrent_checks_share_one_lease(self):
+        """Test concurrent coroutines wait for a single lease acquisition."""
+        limiter = make_limiter(
+            default_rpm=100, default_tpm=100000,
+            lease_requests=20, lease_tokens=1000
+        )
+
+        await asyncio.gather(*[
+            limiter.check_rate_limit("did:key:a", "gateway", 1)
+            for _ in range(20)
+        ])
+
+        assert limiter.get_stats()["leases_acquired"] == 1
+
+    async def test_request_larger_than_tpm_is_rejected(self):
+        """Test a request over the TPM capacity is not admitted by a lease."""
+        limiter = make_limiter(
+            default_rpm=100, default_tpm=1000,
+            lease_requests=10, lease_tokens=500
+        )
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await limiter.check_rate_limit("did:key:a", "gateway", 5000)
+
+        assert exc_info.value.error_code == L04ErrorCode.E4405_TPM_LIMIT_EXCEEDED
+        assert limiter.get_stats()["leases_acquired"] == 0
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestReconcileTokens:
+    """Tests for settling estimated tokens against actual usage."""
+
+    async def test_unused_tokens_are_refunded(self):
+        """Test a request that used less than reserved returns the difference."""
+        limiter = make_limiter(default_rpm=100, default_tpm=1000)
+        await limiter.check_rate_limit("did:key:a", "gateway", 600)
+
+        await limiter.reconcile_tokens("did:key:a", "gateway", 600, 100)
+
+        usage = await limiter.get_usage("did:key:a", "gateway")
+        assert usage["tpm"]["available"] >= 899
+
+    async def test_overrun_is_debited(self):
+        """Test a request that used more than reserved is charged the excess."""
+        limiter = make_limiter(default_rpm=100, default_tpm=1000)
+        await limiter.check_rate_limit("did:key:a", "gateway", 100)
+
+        await limiter.reconcile_tokens("did:key:a", "gateway", 100, 900)
+
+        with pytest.raises(RateLimitError) as exc_info:
+            await limiter.check_rate_limit("did:key:a", "gateway", 200)
+        assert exc_info.value.error_code == L04ErrorCode.E4405_TPM_LIMIT_EXCEEDED
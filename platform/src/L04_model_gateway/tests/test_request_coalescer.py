@@ -0,0 +1,228 @@
+"""
+L04 Model Gateway Layer - Request Coalescer Tests
+
+Tests for single-flight deduplication of in-flight requests.
+"""
+
+import asyncio
+import json
+import pytest
+
+from L04_model_gateway.services import RequestCoalescer
+from L04_model_gateway.models import ProviderError, L04ErrorCode
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestLocalCoalescing:
+    """Tests for in-process coalescing."""
+
+    async def test_concurrent_callers_share_one_execution(self):
+        """Test only the leader runs the operation."""
+        coalescer = RequestCoalescer()
+        calls = 0
+
+        async def operation():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return "result"
+
+        results = await asyncio.gather(
+            *[coalescer.run("key", operation) for _ in range(10)]
+        )
+
+        assert calls == 1
+        assert all(result == "result" for result, _ in results)
+        assert sum(1 for _, leader in results if leader) == 1
+        assert coalescer.get_stats()["followers"] == 9
+        assert coalescer.inflight_count() == 0
+
+    async def test_different_keys_run_separately(self):
+        """Test distinct keys are not coalesced."""
+        coalescer = RequestCoalescer()
+        calls = []
+
+        async def operation(key):
+            calls.append(key)
+            await asyncio.sleep(0.01)
+            return key
+
+        await asyncio.gather(
+            coalescer.run("a", lambda: operation("a")),
+            coalescer.run("b", lambda: operation("b")),
+        )
+
+        assert sorted(calls) == ["a", "b"]
+
+    async def test_sequential_calls_are_not_coalesced(self):
+        """Test a finished call does not serve later callers."""
+        coalescer = RequestCoalescer()
+        calls = 0
+
+        async def operation():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        await coalescer.run("key", operation)
+        result, leader = await coalescer.run("key", operation)
+
+        assert result == 2
+        assert leader is True
+
+    async def test_leader_error_propagates_to_followers(self):
+        """Test every waiter sees the leader's exception."""
+        coalescer = RequestCoalescer()
+
+        async def operation():
+            await asyncio.sleep(0.01)
+            raise ProviderError(L04ErrorCode.E4200_PROVIDER_ERROR, "boom")
+
+        results = await asyncio.gather(
+            *[coalescer.run("key", operation) for _ in range(3)],
+            return_exceptions=True
+        )
+
+        assert all(isinstance(r, ProviderError) for r in results)
+        assert coalescer.inflight_count() == 0
+
+    async def test_cancelled_follower_does_not_cancel_leader(self):
+        """Test cancelling a follower leaves the shared call running."""
+        coalescer = RequestCoalescer()
+
+        async def operation():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.create_task(coalescer.run("key", operation))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(coalescer.run("key", operation))
+        await asyncio.sleep(0)
+        follower.cancel()
+
+        assert await leader == ("done", True)
+
+    async def test_cancelled_leader_does_not_fail_followers(self):
+        """Test followers still get the result when the first caller is cancelled."""
+        coalescer = RequestCoalescer()
+        calls = 0
+
+        async def operation():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return "done"
+
+        leader = asyncio.create_task(coalescer.run("key", operation))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(coalescer.run("key", operation))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == ("done", False)
+        assert leader.cancelled()
+        assert calls == 1
+
+    async def test_operation_cancelled_when_every_caller_is(self):
+        """Test the shared operation stops once nobody waits for it."""
+        coalescer = RequestCoalescer()
+        cancelled = asyncio.Event()
+
+        async def operation():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(coalescer.run("key", operation)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+
+        await asyncio.wait_for(cancelled.wait(), 1.0)
+        assert coalescer.inflight_count() == 0
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestDistributedCoalescing:
+    """Tests for cross-process coalescing through Redis."""
+
+    @pytest.fixture
+    def redis_server(self):
+        fakeredis = pytest.importorskip("fakeredis")
+        pytest.importorskip("lupa")
+        return fakeredis, fakeredis.FakeServer()
+
+    def _coalescer(self, redis_server) -> RequestCoalescer:
+        fakeredis, server = redis_server
+        coalescer = RequestCoalescer(distributed=True, wait_timeout_seconds=5.0)
+        coalescer._redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+        return coalescer
+
+    async def test_replicas_share_one_execution(self, redis_server):
+        """Test a second replica receives the first replica's result."""
+        replica_a = self._coalescer(redis_server)
+        replica_b = self._coalescer(redis_server)
+        calls = []
+
+        async def operation(name):
+            calls.append(name)
+            await asyncio.sleep(0.2)
+            return {"content": "shared"}
+
+        async def run_b():
+            await asyncio.sleep(0.05)
+            return await replica_b.run(
+                "key", lambda: operation("b"), encode=json.dumps, decode=json.loads
+            )
+
+        (result_a, leader_a), (result_b, leader_b) = await asyncio.gather(
+            replica_a.run("key", lambda: operation("a"), encode=json.dumps, decode=json.loads),
+            run_b(),
+        )
+
+        assert calls == ["a"]
+        assert leader_a is True and leader_b is False
+        assert result_b == {"content": "shared"}
+        assert replica_b.get_stats()["remote_followers"] == 1
+
+    async def test_remote_error_is_raised(self, redis_server):
+        """Test a remote leader's failure is reported to followers."""
+        replica_a = self._coalescer(redis_server)
+        replica_b = self._coalescer(redis_server)
+
+        async def failing():
+            await asyncio.sleep(0.2)
+            raise RuntimeError("provider down")
+
+        async def run_b():
+            await asyncio.sleep(0.05)
+            return await replica_b.run(
+                "key", failing, encode=json.dumps, decode=json.loads
+            )
+
+        results = await asyncio.gather(
+            replica_a.run("key", failing, encode=json.dumps, decode=json.loads),
+            run_b(),
+            return_exceptions=True
+        )
+
+        assert isinstance(results[0], RuntimeError)
+        assert isinstance(results[1], ProviderError)
+        assert "provider down" in str(results[1])
+
+    async def test_lock_is_released_after_execution(self, redis_server):
+        """Test the leader lock does not outlive the call."""
+        replica = self._coalescer(redis_server)
+
+        async def operation():
+            return "ok"
+
+        await replica.run("key", operation, encode=json.dumps, decode=json.loads)
+
+        assert not await replica._redis.exists("coalesce:lock:key")
@@ -172,3 +172,116 @@ def test_route_with_fallbacks():
     assert isinstance(decision.fallback_models, list)
     # May have 0-2 fallbacks depending on available models
     assert len(decision.fallback_models) >= 0
+
+
+def _latency_registry(*latencies):
+    """Registry with one text model per (model_id, p50_ms) pair"""
+    from ..models import ModelConfig, ModelCapabilities, ModelStatus
+
+    registry = ModelRegistry()
+    for model_id, p50 in latencies:
+        registry.register_model(ModelConfig(
+            model_id=model_id,
+            provider="mock",
+            display_name=model_id,
+            capabilities=ModelCapabilities(supports_streaming=True),
+            context_window=8192,
+            max_output_tokens=1024,
+            cost_per_1m_input_tokens=0.0,
+            cost_per_1m_output_tokens=0.0,
+            latency_p50_ms=p50,
+            latency_p99_ms=p50 * 4,
+            status=ModelStatus.ACTIVE,
+        ))
+    return registry
+
+
+def _text_request():
+    return InferenceRequest.create(
+        agent_did="did:key:test",
+        messages=[Message(role=MessageRole.USER, content="Hello")],
+    )
+
+
+def test_latency_strategy_uses_observed_latency():
+    """Test live stats override configured latency once recorded"""
+    router = LLMRouter(_latency_registry(("a", 100), ("b", 500)))
+    for _ in range(30):
+        router.latency_tracker.finish("a", 2000, True)
+        router.latency_tracker.finish("b", 300, True)
+
+    decision = router.route(_text_request(), RoutingStrategy.LATENCY_OPTIMIZED)
+
+    assert decision.primary_model_id == "b"
+    assert decision.estimated_latency_ms == pytest.approx(300, abs=1)
+
+
+def test_adaptive_strategy_avoids_failing_model():
+    """Test error rate raises a model's expected latency"""
+    router = LLMRouter(_latency_registry(("a", 100), ("b", 150)), seed=1)
+    for _ in range(30):
+        router.latency_tracker.finish("a", 100, True)
+        router.latency_tracker.finish("b", 150, True)
+    for _ in range(10):
+        router.latency_tracker.finish("a", 5, False)
+
+    decision = router.route(_text_request(), RoutingStrategy.ADAPTIVE)
+
+    assert decision.primary_model_id == "b"
+    assert decision.fallback_models == ["a"]
+
+
+def test_adaptive_strategy_spreads_load_with_two_choices():
+    """Test near-equal models share traffic and the slowest is never primary"""
+    router = LLMRouter(
+        _latency_registry(("a", 100), ("b", 101), ("c", 102), ("d", 900)),
+        seed=7
+    )
+
+    primaries = [
+        router.route(_text_request(), RoutingStrategy.ADAPTIVE).primary_model_id
+        for _ in range(200)
+    ]
+
+    assert {"a", "b", "c"} <= set(primaries)
+    assert "d" not in primaries
+
+
+def test_decision_includes_hedge_deadline():
+    """Test the primary's P95 is exposed as the hedge deadline"""
+    router = LLMRouter(_latency_registry(("a", 100)))
+    for latency in range(1, 101):
+        router.latency_tracker.finish("a", latency, True)
+
+    decision = router.route(_text_request(), RoutingStrategy.ADAPTIVE)
+
+    assert decision.metadata["hedge_after_ms"] == 96
+
+
+def test_latency_tracker_ignores_failure_latency():
+    """Test fast failures do not make a model look faster"""
+    from ..services import LatencyTracker
+
+    tracker = LatencyTracker(min_samples=5)
+    for _ in range(5):
+        tracker.finish("a", 1000, True)
+    tracker.finish("a", 1, False)
+
+    stats = tracker.get_stats()["a"]
+    assert stats["ewma_latency_ms"] == 1000
+    assert stats["error_rate"] > 0
+    assert tracker.p95_ms("a") == 1000
+    assert tracker.p95_ms("unseen", prior_p95_ms=4000) == 4000
+
+
+def test_latency_tracker_uses_caller_priors_for_started_models():
+    """Test stats created by start() do not replace the configured priors"""
+    from ..services import LatencyTracker
+
+    tracker = LatencyTracker(min_samples=5)
+    tracker.start("fallback-model")
+    tracker.finish("fallback-model", 700, True)
+
+    assert tracker.p95_ms("fallback-model", 800) == 800
+    tracker.start("unused-model")
+    assert tracker.expected_latency_ms("unused-model", 300, 800) == pytest.approx(300 * 1.05)
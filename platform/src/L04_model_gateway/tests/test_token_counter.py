@@ -4,6 +4,7 @@ L04 Model Gateway Layer - Token Counter Tests
 Validation-first tests for token counting accuracy.
 """
 
+import asyncio
 import pytest
 from unittest.mock import patch, MagicMock
 
@@ -11,6 +12,7 @@ from ..providers.token_counter import (
     TokenCounter,
     TiktokenCounter,
     AnthropicTokenCounter,
+    ApproximateTokenCounter,
     get_token_counter,
 )
 from ..models import Message, MessageRole
@@ -299,3 +301,133 @@ class TestTokenCounterPerformance:
 
         # Should be fast (uses approximation)
         assert elapsed < 0.5, f"Took {elapsed:.2f}s for 100 iterations"
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+class TestTokenCountCache:
+    """Tests for content-hash caching, batching and incremental counts"""
+
+    def _conversation(self, turns):
+        messages = [Message(role=MessageRole.SYSTEM, content="You are helpful. " * 50)]
+        for i in range(turns):
+            messages.append(Message(role=MessageRole.USER, content=f"Question {i}?"))
+            messages.append(Message(role=MessageRole.ASSISTANT, content=f"Answer {i}."))
+        return messages
+
+    def test_repeated_text_is_counted_once(self):
+        """Test identical content is served from the cache"""
+        counter = AnthropicTokenCounter()
+        with patch.object(counter, "_count_text", wraps=counter._count_text) as spy:
+            first = counter.count("You are a helpful assistant.")
+            second = counter.count("You are a helpful assistant.")
+
+        assert first == second
+        assert spy.call_count == 1
+        assert counter.get_cache_stats()["text_hits"] == 1
+
+    def test_count_batch_matches_count(self):
+        """Test batched counts equal individual counts, in order"""
+        texts = ["Hello", "", "The quick brown fox.", "Hello", "def f(): pass"]
+        expected = [AnthropicTokenCounter().count(t) for t in texts]
+
+        assert AnthropicTokenCounter().count_batch(texts) == expected
+
+    def test_count_batch_uses_one_encode_batch_call(self):
+        """Test distinct uncached texts go to tiktoken in one call"""
+        counter = TiktokenCounter()
+        encoding = MagicMock()
+        encoding.encode_batch.side_effect = lambda texts: [[0] * len(t) for t in texts]
+        counter._encoding = encoding
+
+        counts = counter.count_batch(["ab", "abc", "ab", ""])
+        counter.count_batch(["abc", "abcd"])
+
+        assert counts == [2, 3, 2, 0]
+        assert encoding.encode_batch.call_args_list[0].args[0] == ["ab", "abc"]
+        assert encoding.encode_batch.call_args_list[1].args[0] == ["abcd"]
+        encoding.encode.assert_not_called()
+
+    def test_count_messages_matches_uncached_total(self):
+        """Test cached message counts equal a fresh counter's counts"""
+        messages = self._conversation(3)
+        messages.append(Message(role=MessageRole.USER, content="Hi", name="alice"))
+
+        warm = TiktokenCounter()
+        warm.count_messages(messages[:4])
+
+        assert warm.count_messages(messages) == TiktokenCounter().count_messages(messages)
+
+    def test_appended_conversation_counts_only_new_messages(self):
+        """Test an append-only conversation re-uses the cached prefix"""
+        counter = AnthropicTokenCounter()
+        messages = self._conversation(5)
+        counter.count_messages(messages)
+
+        messages = messages + [Message(role=MessageRole.USER, content="And now?")]
+        with patch.object(counter, "_count_texts", wraps=counter._count_texts) as spy:
+            total = counter.count_messages(messages)
+
+        assert spy.call_args.args[0] == ["And now?"]
+        assert counter.get_cache_stats()["prefix_hits"] == 1
+        assert total == AnthropicTokenCounter().count_messages(messages)
+
+    def test_edited_message_invalidates_later_prefix(self):
+        """Test changing an earlier message is not served from the cache"""
+        counter = TiktokenCounter()
+        messages = self._conversation(2)
+        counter.count_messages(messages)
+
+        edited = list(messages)
+        edited[1] = Message(role=MessageRole.USER, content="A much longer question " * 10)
+
+        assert counter.count_messages(edited) == TiktokenCounter().count_messages(edited)
+
+    def test_cache_is_bounded(self):
+        """Test the LRU evicts beyond cache_size"""
+        counter = AnthropicTokenCounter()
+        counter.cache_size = 8
+        counter.count_batch([f"text {i}" for i in range(20)])
+
+        assert counter.get_cache_stats()["cached_texts"] == 8
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+class TestEncodingLoading:
+    """Tests for loading tiktoken encodings off the hot path"""
+
+    def test_unavailable_encoding_falls_back_to_approximation(self):
+        """Test a failing encoding download does not break counting"""
+        tiktoken = MagicMock()
+        tiktoken.get_encoding.side_effect = OSError("network unreachable")
+
+        with patch.dict("sys.modules", {"tiktoken": tiktoken}):
+            counter = TiktokenCounter(model="gpt-4o")
+            assert counter.count("a" * 40) == 10
+
+        assert counter._encoding is None
+
+    @pytest.mark.asyncio
+    async def test_encoding_loads_in_executor(self):
+        """Test counting inside an event loop does not load the encoding inline"""
+        encoding = MagicMock()
+        encoding.encode_batch.side_effect = lambda texts: [[0] * 3 for _ in texts]
+        tiktoken = MagicMock()
+        tiktoken.get_encoding.return_value = encoding
+
+        with patch.dict("sys.modules", {"tiktoken": tiktoken}):
+            counter = TiktokenCounter(model="gpt-4o")
+            # Approximated while the encoding loads
+            assert counter.count("a" * 40) == 10
+            await counter._encoding_loading
+            await asyncio.sleep(0)
+
+            assert counter.count("a" * 40) == 3
+
+    def test_unknown_model_uses_approximation(self):
+        """Test models without a known tokenizer do not load tiktoken"""
+        counter = get_token_counter("llama3.1:8b")
+
+        assert isinstance(counter, ApproximateTokenCounter)
+        assert counter.count("a" * 40) == 10
@@ -0,0 +1,260 @@
+"""
+L04 Model Gateway Layer - Vector Index Tests
+
+Tests for the in-process IVF index and its SemanticCache integration.
+"""
+
+import asyncio
+import random
+import pytest
+from unittest.mock import AsyncMock
+
+np = pytest.importorskip("numpy")
+
+from L04_model_gateway.services import SemanticCache, IVFVectorIndex  # noqa: E402
+from L04_model_gateway.models import (  # noqa: E402
+    InferenceRequest,
+    InferenceResponse,
+    Message,
+    MessageRole,
+    TokenUsage,
+)
+
+
+def random_vectors(count: int, dim: int = 32, seed: int = 1):
+    """Generate reproducible random vectors."""
+    rng = random.Random(seed)
+    return [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(count)]
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestIVFVectorIndex:
+    """Tests for IVFVectorIndex."""
+
+    async def test_exact_search_returns_best_match(self):
+        """Test search below the training threshold scans all vectors."""
+        index = IVFVectorIndex(train_threshold=1000)
+        vectors = random_vectors(50)
+        for i, vec in enumerate(vectors):
+            await index.add(f"key-{i}", vec)
+
+        results = await index.search(vectors[7], k=3)
+
+        assert results[0][0] == "key-7"
+        assert results[0][1] == pytest.approx(1.0, abs=1e-5)
+        assert len(results) == 3
+        assert results[0][1] >= results[1][1] >= results[2][1]
+
+    async def test_min_similarity_filters_results(self):
+        """Test results below min_similarity are dropped."""
+        index = IVFVectorIndex()
+        await index.add("a", [1.0, 0.0])
+        await index.add("b", [0.0, 1.0])
+
+        results = await index.search([1.0, 0.1], k=2, min_similarity=0.9)
+
+        assert [key for key, _ in results] == ["a"]
+
+    async def test_trained_index_finds_indexed_vectors(self):
+        """Test IVF search after clustering still finds exact matches."""
+        index = IVFVectorIndex(train_threshold=200, n_probe=4)
+        vectors = random_vectors(400)
+        for i, vec in enumerate(vectors):
+            await index.add(f"key-{i}", vec)
+        await index.wait_for_training()
+
+        stats = index.get_stats()
+        assert stats["trained"] is True
+        assert stats["lists"] >= 14
+
+        for i in (0, 123, 399):
+            results = await index.search(vectors[i], k=1)
+            assert results[0][0] == f"key-{i}"
+
+        # Trained searches must not fall back to scanning every row
+        assert index.get_stats()["exact_searches"] == 0
+
+    async def test_training_runs_in_background(self):
+        """Test k-means runs off the event loop and keeps writes made meanwhile."""
+        index = IVFVectorIndex(train_threshold=200, n_probe=4)
+        vectors = random_vectors(260)
+        for i, vec in enumerate(vectors[:200]):
+            await index.add(f"key-{i}", vec)
+
+        # Training started but has not been applied yet
+        assert index.get_stats()["trained"] is False
+        for i, vec in enumerate(vectors[200:], start=200):
+            await index.add(f"key-{i}", vec)
+        await index.remove("key-0")
+        await index.wait_for_training()
+
+        assert index.get_stats()["trained"] is True
+        for i in (1, 150, 230, 259):
+            results = await index.search(vectors[i], k=1)
+            assert results[0][0] == f"key-{i}"
+        assert all(key != "key-0" for key, _ in await index.search(vectors[0], k=5))
+
+    async def test_replace_and_remove(self):
+        """Test re-adding a key replaces its vector and remove drops it."""
+        index = IVFVectorIndex()
+        await index.add("a", [1.0, 0.0])
+        await index.add("a", [0.0, 1.0])
+
+        assert index.size() == 1
+        results = await index.search([0.0, 1.0], k=1)
+        assert results[0][0] == "a"
+
+        assert await index.remove("a") is True
+        assert await index.remove("a") is False
+        assert await index.search([0.0, 1.0]) == []
+
+    async def test_expired_entries_are_evicted(self, monkeypatch):
+        """Test entries past their TTL are not returned."""
+        import L04_model_gateway.services.vector_index as vector_index
+
+        index = IVFVectorIndex()
+        now = 1_000_000.0
+        monkeypatch.setattr(vector_index.time, "time", lambda: now)
+        await index.add("short", [1.0, 0.0], ttl_seconds=10)
+        await index.add("long", [0.9, 0.1], ttl_seconds=1000)
+
+        monkeypatch.setattr(vector_index.time, "time", lambda: now + 60)
+        results = await index.search([1.0, 0.0], k=2)
+
+        assert [key for key, _ in results] == ["long"]
+        assert index.size() == 1
+
+    async def test_dimension_mismatch_returns_no_results(self):
+        """Test queries with a different dimension are ignored."""
+        index = IVFVectorIndex()
+        await index.add("a", [1.0, 0.0, 0.0])
+
+        assert await index.search([1.0, 0.0]) == []
+
+    async def test_snapshot_round_trip(self, tmp_path):
+        """Test save() and load() restore the indexed vectors."""
+        path = str(tmp_path / "index.npz")
+        index = IVFVectorIndex(snapshot_path=path)
+        vectors = random_vectors(20)
+        for i, vec in enumerate(vectors):
+            await index.add(f"key-{i}", vec, ttl_seconds=3600)
+
+        assert index.save() is True
+
+        restored = IVFVectorIndex(snapshot_path=path)
+        assert restored.load() == 20
+        results = await restored.search(vectors[5], k=1)
+        assert results[0][0] == "key-5"
+
+
+@pytest.mark.l04
+@pytest.mark.unit
+@pytest.mark.asyncio
+class TestSemanticCacheVectorIndex:
+    """Tests for SemanticCache lookups through the vector index."""
+
+    def _request(self, content: str) -> InferenceRequest:
+        return InferenceRequest.create(
+            agent_did="did:key:test",
+            messages=[Message(role=MessageRole.USER, content=content)],
+        )
+
+    async def test_similar_lookup_uses_index_instead_of_scan(self):
+        """Test semantic hits come from the index without SCANning Redis."""
+        index = IVFVectorIndex()
+        cache = SemanticCache(vector_index=index, similarity_threshold=0.9)
+        cache._index_loaded = True
+
+        original = self._request("What is the capital of France?")
+        response = InferenceResponse(
+            request_id=original.request_id,
+            model_id="mock",
+            provider="mock",
+            content="Paris",
+            token_usage=TokenUsage(input_tokens=5, output_tokens=1),
+            latency_ms=10,
+        )
+        await index.add(cache._generate_cache_key(original), [1.0, 0.0, 0.0])
+
+        redis_client = AsyncMock()
+        redis_client.get.return_value = cache._serialize_response(response)
+        cache._redis = redis_client
+        cache._generate_embedding = AsyncMock(return_value=[0.99, 0.05, 0.0])
+
+        query = self._request("Capital city of France?")
+        result = await cache._find_similar(query)
+
+        assert result is not None
+        assert result.content == "Paris"
+        assert result.request_id == query.request_id
+        assert result.cached is True
+        redis_client.scan.assert_not_called()
+
+    async def test_stale_index_entry_is_removed(self):
+        """Test index entries whose Redis value expired are dropped."""
+        index = IVFVectorIndex()
+        cache = SemanticCache(vector_index=index, similarity_threshold=0.9)
+        cache._index_loaded = True
+        await index.add("gone", [1.0, 0.0])
+
+        redis_client = AsyncMock()
+        redis_client.get.return_value = None
+        cache._redis = redis_client
+        cache._generate_embedding = AsyncMock(return_value=[1.0, 0.0])
+
+        assert await cache._find_similar(self._request("hello")) is None
+        assert index.size() == 0
+
+    async def test_embeddings_are_shared_between_replicas(self):
+        """Test a replica indexes embeddings written by another one."""
+        fakeredis = pytest.importorskip("fakeredis")
+        server = fakeredis.FakeServer()
+        embeddings = {"What is the capital of France?": [1.0, 0.0, 0.0]}
+
+        async def embed(text):
+            return embeddings.get(text.split(": ", 1)[1], [0.99, 0.05, 0.0])
+
+        def replica():
+            cache = SemanticCache(vector_index=IVFVectorIndex(), similarity_threshold=0.9, embedder=embed)
+            cache._redis = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+            return cache
+
+        writer, reader = replica(), replica()
+        before = self._request("What is the capital of France?")
+        await writer.set(before, self._response(before, "Paris"))
+
+        # The reader indexes existing embeddings once subscribed
+        reader._ensure_index_loaded()
+        for _ in range(100):
+            if reader._index_loaded:
+                break
+            await asyncio.sleep(0.01)
+        assert reader._index_loaded
+        assert reader.vector_index.size() == 1
+
+        # and receives later ones on the vector channel
+        embeddings["Who wrote Hamlet?"] = [0.0, 1.0, 0.0]
+        after = self._request("Who wrote Hamlet?")
+        await writer.set(after, self._response(after, "Shakespeare"))
+        for _ in range(100):
+            if reader.vector_index.size() == 2:
+                break
+            await asyncio.sleep(0.01)
+
+        embeddings["Hamlet author?"] = [0.05, 0.99, 0.0]
+        result = await reader._find_similar(self._request("Hamlet author?"))
+        assert result.content == "Shakespeare"
+        await writer.close()
+        await reader.close()
+
+    def _response(self, request: InferenceRequest, content: str) -> InferenceResponse:
+        return InferenceResponse(
+            request_id=request.request_id,
+            model_id="mock",
+            provider="mock",
+            content=content,
+            token_usage=TokenUsage(input_tokens=5, output_tokens=1),
+            latency_ms=10,
+        )
@@ -20,6 +20,8 @@ from typing import Dict, Any
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from shared.db_pool import get_pool_manager
+
 from .routers import roles_router
 from .services import (
     RoleRegistry,
@@ -51,10 +53,17 @@ async def lifespan(app: FastAPI):
     logger.info("Starting L13 Role Management Layer...")
 
     try:
-        # Initialize services
-        # TODO: Add database pool when L01 bridge is configured
+        # Initialize services; roles persist to PostgreSQL when
+        # L13_DATABASE_URL is set, otherwise they are kept in memory
+        db_pool = None
+        database_url = os.getenv("L13_DATABASE_URL")
+        if database_url:
+            try:
+                db_pool = await get_pool_manager().get_pool("oltp", database_url)
+            except Exception as e:
+                logger.warning(f"Database unavailable, using in-memory roles: {e}")
         role_registry = RoleRegistry(
-            db_pool=None,  # Will be injected when database is available
+            db_pool=db_pool,
             redis_client=None,  # Will be injected when Redis is available
             use_memory_fallback=True,
         )
@@ -96,6 +105,8 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down L13 Role Management Layer...")
+    if role_registry and role_registry.db_pool:
+        await role_registry.db_pool.close()
     logger.info("L13 Role Management Layer shut down")
 
 
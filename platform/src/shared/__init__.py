@@ -151,6 +151,19 @@ from .clients import (
     L01Client,
 )
 
+from .db_pool import (
+    PoolConfig,
+    PoolManager,
+    ManagedPool,
+    pool_config,
+    get_pool_manager,
+)
+
+from .wire import (
+    WireClient,
+    decode_response,
+)
+
 __all__ = [
     # Logging
     'setup_logging',
@@ -270,4 +283,13 @@ __all__ = [
     'SecurityScanner',
     # API Clients
     'L01Client',
+    # Database Pools
+    'PoolConfig',
+    'PoolManager',
+    'ManagedPool',
+    'pool_config',
+    'get_pool_manager',
+    # Wire Format
+    'WireClient',
+    'decode_response',
 ]
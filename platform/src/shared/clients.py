@@ -10,6 +10,8 @@ from uuid import UUID
 
 import httpx
 
+from .wire import MIN_LSN_HEADER, WRITE_LSN_HEADER, WireClient, decode_response, parse_lsn
+
 logger = logging.getLogger(__name__)
 
 
@@ -18,34 +20,58 @@ class L01Client:
     HTTP client for L01 Data Layer API.
 
     Provides methods for recording and retrieving data from L01,
-    used by bridges in L02-L11 layers.
+    used by bridges in L02-L11 layers. Reads are sent with the newest
+    write position seen, so replica reads reflect this client's writes.
     """
 
     def __init__(
         self,
         base_url: str = "http://localhost:8002",
-        timeout: float = 30.0
+        timeout: float = 30.0,
+        wire_format: Optional[str] = None,
+        limits: Optional[httpx.Limits] = None
     ):
         """Initialize L01 client.
 
         Args:
             base_url: Base URL for L01 Data Layer API
             timeout: Request timeout in seconds
+            wire_format: "msgpack" or "json" bodies (default: msgpack when installed)
+            limits: Connection pool limits shared by concurrent calls
         """
         self.base_url = base_url.rstrip("/")
         self.timeout = timeout
+        self.wire_format = wire_format
+        self.limits = limits
         self._client: Optional[httpx.AsyncClient] = None
+        self._last_write_lsn: Optional[str] = None
         logger.debug(f"L01Client initialized with base_url={base_url}")
 
     async def _get_client(self) -> httpx.AsyncClient:
-        """Get or create async HTTP client."""
+        """Get or create the pooled async HTTP client."""
         if self._client is None or self._client.is_closed:
-            self._client = httpx.AsyncClient(
+            headers = {}
+            if self._last_write_lsn:
+                headers[MIN_LSN_HEADER] = self._last_write_lsn
+            self._client = WireClient(
                 base_url=self.base_url,
-                timeout=self.timeout
+                timeout=self.timeout,
+                headers=headers,
+                wire_format=self.wire_format,
+                limits=self.limits,
+                event_hooks={"response": [self._track_write_lsn]}
             )
         return self._client
 
+    async def _track_write_lsn(self, response: httpx.Response) -> None:
+        """Remember the newest write position and send it with every request."""
+        lsn = response.headers.get(WRITE_LSN_HEADER)
+        if not lsn or parse_lsn(lsn) is None:
+            return
+        if self._last_write_lsn is None or parse_lsn(lsn) > parse_lsn(self._last_write_lsn):
+            self._last_write_lsn = lsn
+            self._client.headers[MIN_LSN_HEADER] = lsn
+
     async def close(self) -> None:
         """Close the HTTP client."""
         if self._client and not self._client.is_closed:
@@ -128,7 +154,7 @@ class L01Client:
 
         response = await client.post("/tools/tool-executions", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_tool_execution(
         self,
@@ -159,7 +185,7 @@ class L01Client:
             json=payload
         )
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_tool_execution_by_invocation(
         self,
@@ -180,7 +206,7 @@ class L01Client:
                 f"/tools/executions/by-invocation/{invocation_id}"
             )
             response.raise_for_status()
-            return response.json()
+            return decode_response(response)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
@@ -243,7 +269,7 @@ class L01Client:
 
         response = await client.post("/goals/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_goal_status(
         self,
@@ -272,7 +298,7 @@ class L01Client:
 
         response = await client.patch(f"/goals/{goal_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_goal(self, goal_id: str) -> Optional[Dict[str, Any]]:
         """Get goal by ID.
@@ -288,7 +314,7 @@ class L01Client:
         try:
             response = await client.get(f"/goals/{goal_id}")
             response.raise_for_status()
-            return response.json()
+            return decode_response(response)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
@@ -369,7 +395,7 @@ class L01Client:
 
         response = await client.post("/plans/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def update_plan_status(
         self,
@@ -428,7 +454,7 @@ class L01Client:
 
         response = await client.patch(f"/plans/{plan_id}", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_plan(self, plan_id: str) -> Optional[Dict[str, Any]]:
         """Get plan by ID.
@@ -444,7 +470,7 @@ class L01Client:
         try:
             response = await client.get(f"/plans/{plan_id}")
             response.raise_for_status()
-            return response.json()
+            return decode_response(response)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
@@ -468,7 +494,7 @@ class L01Client:
         try:
             response = await client.get(f"/agents/{agent_id}")
             response.raise_for_status()
-            return response.json()
+            return decode_response(response)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
@@ -498,7 +524,7 @@ class L01Client:
 
         response = await client.get("/agents/", params=params)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     # =========================================================================
     # Session Methods
@@ -530,7 +556,7 @@ class L01Client:
 
         response = await client.post("/sessions/", json=payload)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
 
     async def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get session by ID.
@@ -546,7 +572,7 @@ class L01Client:
         try:
             response = await client.get(f"/sessions/{session_id}")
             response.raise_for_status()
-            return response.json()
+            return decode_response(response)
         except httpx.HTTPStatusError as e:
             if e.response.status_code == 404:
                 return None
@@ -588,4 +614,4 @@ class L01Client:
 
         response = await client.post("/events/", json=event_data)
         response.raise_for_status()
-        return response.json()
+        return decode_response(response)
@@ -0,0 +1,347 @@
+"""
+Shared PostgreSQL Connection Pools
+
+One process-wide manager of asyncpg pools, split by workload so that
+long analytics queries and bulk loads cannot starve request handling:
+
+- oltp: short request-path queries (the default)
+- bulk: COPY and batch writes
+- analytics: aggregates, exports and scans
+
+Pool sizes and statement-cache settings come from environment variables
+so that the sum of all replicas' pools can be kept under the server's
+max_connections:
+
+    DB_POOL_<NAME>_MIN_SIZE, DB_POOL_<NAME>_MAX_SIZE,
+    DB_POOL_<NAME>_STATEMENT_CACHE_SIZE, DB_POOL_<NAME>_COMMAND_TIMEOUT
+    DB_PGBOUNCER=true   # transaction-pooling PgBouncer in front of Postgres
+
+Behind PgBouncer in transaction mode, server-side prepared statements
+cannot be reused across transactions, so the statement cache is
+disabled.
+
+Pools are reference counted: every get_pool() must be paired with a
+close() on the returned pool, and the underlying pool is closed when its
+last user closes it.
+
+Example:
+    pool = await get_pool_manager().get_pool("oltp", dsn)
+    async with pool.acquire() as conn:
+        await conn.fetch("SELECT 1")
+    await pool.close()
+"""
+
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import quote
+
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+
+try:
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:
+    Counter = Gauge = Histogram = None
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PoolConfig:
+    """Sizing and statement-cache settings of one workload pool."""
+    min_size: int = 2
+    max_size: int = 10
+    statement_cache_size: int = 1024
+    max_cached_statement_lifetime: float = 300.0
+    max_inactive_connection_lifetime: float = 300.0
+    command_timeout: Optional[float] = 60.0
+    acquire_timeout: float = 30.0
+    pgbouncer: bool = False
+
+
+# Defaults per workload, overridable from the environment
+DEFAULT_POOL_CONFIGS: Dict[str, PoolConfig] = {
+    "oltp": PoolConfig(min_size=2, max_size=10),
+    "bulk": PoolConfig(min_size=0, max_size=4, statement_cache_size=64, command_timeout=600.0),
+    "analytics": PoolConfig(min_size=0, max_size=4, statement_cache_size=256, command_timeout=300.0),
+}
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "").lower() in ("1", "true", "yes")
+
+
+def pool_config(name: str, base: Optional[PoolConfig] = None) -> PoolConfig:
+    """
+    Settings of a workload pool with environment overrides applied.
+
+    Args:
+        name: Workload name (oltp, bulk, analytics or a custom name)
+        base: Defaults to override (the workload default if omitted)
+    """
+    config = base or DEFAULT_POOL_CONFIGS.get(name, DEFAULT_POOL_CONFIGS["oltp"])
+    prefix = f"DB_POOL_{name.upper()}_"
+    overrides: Dict[str, Any] = {}
+    for field_name, cast in (
+        ("min_size", int),
+        ("max_size", int),
+        ("statement_cache_size", int),
+        ("command_timeout", float),
+        ("acquire_timeout", float),
+    ):
+        value = os.getenv(prefix + field_name.upper())
+        if value is not None:
+            overrides[field_name] = cast(value)
+    if _env_flag("DB_PGBOUNCER"):
+        overrides["pgbouncer"] = True
+    config = replace(config, **overrides)
+    if config.pgbouncer:
+        config = replace(config, statement_cache_size=0)
+    return config
+
+
+def default_dsn() -> str:
+    """DSN from DATABASE_URL or the POSTGRES_* variables (percent-encoded)."""
+    url = os.getenv("DATABASE_URL")
+    if url:
+        return url
+    return (
+        f"postgresql://{quote(os.getenv('POSTGRES_USER', 'postgres'), safe='')}:"
+        f"{quote(os.getenv('POSTGRES_PASSWORD', 'postgres'), safe='')}@"
+        f"{os.getenv('POSTGRES_HOST', 'localhost')}:"
+        f"{os.getenv('POSTGRES_PORT', '5432')}/"
+        f"{quote(os.getenv('POSTGRES_DB', 'agentic'), safe='')}"
+    )
+
+
+if Histogram is not None:
+    POOL_ACQUIRE_WAIT = Histogram(
+        "db_pool_acquire_wait_seconds",
+        "Time spent waiting for a pooled connection",
+        ["pool"],
+        buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+    )
+    POOL_ACQUIRE_TIMEOUTS = Counter(
+        "db_pool_acquire_timeouts_total",
+        "Connection acquisitions that timed out",
+        ["pool"],
+    )
+    POOL_CONNECTIONS = Gauge(
+        "db_pool_connections",
+        "Pooled connections by state",
+        ["pool", "state"],
+    )
+    POOL_UTILIZATION = Gauge(
+        "db_pool_utilization_ratio",
+        "Connections in use over the pool's max size",
+        ["pool"],
+    )
+
+
+class _AcquireContext:
+    """Acquire a connection with wait-time accounting; usable with async with or await."""
+
+    def __init__(self, pool: "ManagedPool", timeout: Optional[float]):
+        self._pool = pool
+        self._timeout = timeout
+        self._conn = None
+
+    async def _acquire(self):
+        start = time.perf_counter()
+        try:
+            conn = await self._pool.pool.acquire(timeout=self._timeout)
+        except asyncio.TimeoutError:
+            self._pool._record_timeout()
+            raise
+        self._pool._record_wait(time.perf_counter() - start)
+        return conn
+
+    def __await__(self):
+        return self._acquire().__await__()
+
+    async def __aenter__(self):
+        self._conn = await self._acquire()
+        return self._conn
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self._pool.pool.release(self._conn)
+        self._pool._update_gauges()
+
+
+class ManagedPool:
+    """
+    asyncpg pool wrapper that records acquire wait time and utilisation.
+
+    Exposes the asyncpg.Pool interface; close() releases this holder's
+    reference rather than closing the shared pool.
+    """
+
+    def __init__(self, manager: "PoolManager", key: Tuple[str, str], name: str,
+                 pool: "asyncpg.Pool", config: PoolConfig):
+        self._manager = manager
+        self._key = key
+        self.name = name
+        self.pool = pool
+        self.config = config
+        self._stats = {
+            "acquires": 0,
+            "timeouts": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+        }
+
+    def acquire(self, *, timeout: Optional[float] = None) -> _AcquireContext:
+        """Acquire a connection (async with pool.acquire() as conn)."""
+        return _AcquireContext(self, timeout if timeout is not None else self.config.acquire_timeout)
+
+    async def release(self, connection, *, timeout: Optional[float] = None) -> None:
+        """Release a connection obtained with await pool.acquire()."""
+        await self.pool.release(connection, timeout=timeout)
+        self._update_gauges()
+
+    async def close(self) -> None:
+        """Release this holder's reference; the last one closes the pool."""
+        await self._manager._release(self._key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size, usage and acquire wait statistics."""
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        acquires = self._stats["acquires"]
+        return {
+            "name": self.name,
+            "size": size,
+            "idle": idle,
+            "in_use": size - idle,
+            "min_size": self.pool.get_min_size(),
+            "max_size": self.pool.get_max_size(),
+            "utilization": (size - idle) / self.pool.get_max_size(),
+            "wait_seconds_avg": self._stats["wait_seconds_total"] / acquires if acquires else 0.0,
+            **self._stats,
+        }
+
+    def __getattr__(self, name: str) -> Any:
+        # fetch, fetchrow, execute, get_size, ... go to the asyncpg pool
+        return getattr(self.pool, name)
+
+    def _record_wait(self, seconds: float) -> None:
+        self._stats["acquires"] += 1
+        self._stats["wait_seconds_total"] += seconds
+        self._stats["wait_seconds_max"] = max(self._stats["wait_seconds_max"], seconds)
+        if Histogram is not None:
+            POOL_ACQUIRE_WAIT.labels(pool=self.name).observe(seconds)
+        self._update_gauges()
+
+    def _record_timeout(self) -> None:
+        self._stats["timeouts"] += 1
+        if Counter is not None:
+            POOL_ACQUIRE_TIMEOUTS.labels(pool=self.name).inc()
+
+    def _update_gauges(self) -> None:
+        if Gauge is None:
+            return
+        size = self.pool.get_size()
+        idle = self.pool.get_idle_size()
+        POOL_CONNECTIONS.labels(pool=self.name, state="idle").set(idle)
+        POOL_CONNECTIONS.labels(pool=self.name, state="in_use").set(size - idle)
+        POOL_UTILIZATION.labels(pool=self.name).set((size - idle) / self.pool.get_max_size())
+
+
+class PoolManager:
+    """Process-wide registry of named asyncpg pools."""
+
+    def __init__(self, configs: Optional[Dict[str, PoolConfig]] = None):
+        """
+        Initialize pool manager.
+
+        Args:
+            configs: Per-workload defaults (environment overrides still apply)
+        """
+        self._configs = {**DEFAULT_POOL_CONFIGS, **(configs or {})}
+        self._pools: Dict[Tuple[str, str], ManagedPool] = {}
+        self._refs: Dict[Tuple[str, str], int] = {}
+        self._lock = asyncio.Lock()
+
+    def get_config(self, name: str) -> PoolConfig:
+        """Effective settings of a workload pool."""
+        return pool_config(name, self._configs.get(name))
+
+    async def get_pool(self, name: str = "oltp", dsn: Optional[str] = None,
+                       defaults: Optional[PoolConfig] = None, **connect_kwargs) -> ManagedPool:
+        """
+        Get the pool for a workload, creating it on first use.
+
+        Args:
+            name: Workload name
+            dsn: Connection string (defaults to DATABASE_URL / POSTGRES_*)
+            defaults: Settings to use instead of the workload defaults
+                (environment overrides still apply; first caller wins)
+            connect_kwargs: Extra asyncpg.create_pool arguments (first caller wins)
+        """
+        if asyncpg is None:
+            raise RuntimeError("asyncpg is not installed")
+        dsn = dsn or default_dsn()
+        key = (name, dsn)
+        async with self._lock:
+            pool = self._pools.get(key)
+            if pool is None:
+                config = pool_config(name, defaults) if defaults else self.get_config(name)
+                raw = await asyncpg.create_pool(
+                    dsn,
+                    min_size=config.min_size,
+                    max_size=config.max_size,
+                    statement_cache_size=config.statement_cache_size,
+                    max_cached_statement_lifetime=config.max_cached_statement_lifetime,
+                    max_inactive_connection_lifetime=config.max_inactive_connection_lifetime,
+                    command_timeout=config.command_timeout,
+                    **connect_kwargs,
+                )
+                pool = ManagedPool(self, key, name, raw, config)
+                self._pools[key] = pool
+                self._refs[key] = 0
+                logger.info(
+                    f"Created {name} pool (size {config.min_size}-{config.max_size}, "
+                    f"statement cache {config.statement_cache_size})"
+                )
+            self._refs[key] += 1
+            return pool
+
+    async def close_all(self) -> None:
+        """Close every pool regardless of references."""
+        async with self._lock:
+            for pool in self._pools.values():
+                await pool.pool.close()
+            self._pools.clear()
+            self._refs.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistics of every open pool, keyed by workload name."""
+        return {pool.name: pool.get_stats() for pool in self._pools.values()}
+
+    async def _release(self, key: Tuple[str, str]) -> None:
+        async with self._lock:
+            if key not in self._refs:
+                return
+            self._refs[key] -= 1
+            if self._refs[key] <= 0:
+                pool = self._pools.pop(key)
+                del self._refs[key]
+                await pool.pool.close()
+                logger.info(f"Closed {pool.name} pool")
+
+
+_pool_manager: Optional[PoolManager] = None
+
+
+def get_pool_manager() -> PoolManager:
+    """Get the process-wide pool manager."""
+    global _pool_manager
+    if _pool_manager is None:
+        _pool_manager = PoolManager()
+    return _pool_manager
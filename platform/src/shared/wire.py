@@ -0,0 +1,137 @@
+"""
+Wire Format and HTTP Transport for Inter-Layer Clients
+
+Layer clients send request bodies as MessagePack and ask for MessagePack
+responses (Accept) when the msgpack package is installed, and fall back
+to JSON otherwise. Services that understand the format transcode it at
+the edge (see L01_data_layer.middleware.WireFormatMiddleware); any other
+service simply keeps answering JSON, which decode_response() accepts.
+
+Clients share tuned keep-alive pools and use HTTP/2 when the h2 package
+is installed, so that concurrent calls from a layer are multiplexed over
+a few long-lived connections instead of opening one per request. HTTP/2
+is negotiated with TLS (ALPN); plain-HTTP services keep using pooled
+HTTP/1.1 connections.
+
+Example:
+    client = WireClient(base_url=url, timeout=30.0)
+    response = await client.post("/metrics/", json=payload)
+    data = decode_response(response)
+"""
+
+import logging
+from typing import Any, Optional
+
+import httpx
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import h2  # noqa: F401  (httpx's HTTP/2 support)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+
+# Response header with L01's primary WAL position after a write
+WRITE_LSN_HEADER = "X-Write-LSN"
+
+# Request header with the oldest WAL position a read may be served from
+MIN_LSN_HEADER = "X-Min-LSN"
+
+# Connection pool defaults for layer-to-layer clients
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=60.0,
+)
+
+
+def default_wire_format() -> str:
+    """msgpack if the package is installed, else json."""
+    return "msgpack" if msgpack is not None else "json"
+
+
+def is_msgpack(content_type: Optional[str]) -> bool:
+    """Whether a Content-Type / Accept value names MessagePack."""
+    return bool(content_type) and MSGPACK_MEDIA_TYPE in content_type
+
+
+def parse_lsn(lsn: Optional[str]) -> Optional[int]:
+    """
+    Convert a pg_lsn text value ("16/B374D848") to a comparable integer.
+
+    Returns:
+        WAL byte position, or None if lsn is empty or malformed
+    """
+    if not lsn:
+        return None
+    try:
+        high, low = lsn.split("/")
+        return (int(high, 16) << 32) + int(low, 16)
+    except ValueError:
+        return None
+
+
+def pack(obj: Any) -> bytes:
+    """Encode a JSON-compatible object as MessagePack."""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def unpack(data: bytes) -> Any:
+    """Decode a MessagePack document."""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+def decode_response(response: httpx.Response) -> Any:
+    """Body of a JSON or MessagePack response."""
+    if is_msgpack(response.headers.get("content-type")):
+        return unpack(response.content)
+    return response.json()
+
+
+class WireClient(httpx.AsyncClient):
+    """
+    httpx.AsyncClient that sends json= bodies in the negotiated wire format.
+
+    Args:
+        wire_format: "msgpack" or "json" (default: msgpack when available)
+        limits: Connection pool limits (default: DEFAULT_LIMITS)
+        http2: Use HTTP/2 where the server supports it (default: when h2 is installed)
+        **kwargs: Other httpx.AsyncClient arguments
+    """
+
+    def __init__(self, *, wire_format: Optional[str] = None, limits: Optional[httpx.Limits] = None,
+                 http2: Optional[bool] = None, **kwargs):
+        wire_format = wire_format or default_wire_format()
+        if wire_format == "msgpack" and msgpack is None:
+            logger.warning("msgpack is not installed, falling back to JSON")
+            wire_format = "json"
+        self.wire_format = wire_format
+        headers = dict(kwargs.pop("headers", None) or {})
+        if wire_format == "msgpack":
+            headers.setdefault("Accept", f"{MSGPACK_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.9")
+        super().__init__(
+            headers=headers,
+            limits=limits or DEFAULT_LIMITS,
+            http2=HTTP2_AVAILABLE if http2 is None else http2,
+            **kwargs,
+        )
+
+    def build_request(self, method: str, url, *, json: Any = None, content=None, headers=None, **kwargs):
+        if json is not None and content is None and self.wire_format == "msgpack":
+            content = pack(json)
+            headers = {**dict(headers or {}), "Content-Type": MSGPACK_MEDIA_TYPE}
+            json = None
+        return super().build_request(method, url, json=json, content=content, headers=headers, **kwargs)